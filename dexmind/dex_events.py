@@ -2,18 +2,86 @@
 
 import asyncio
 import logging
+import re
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar, Union, cast
 from decimal import Decimal
+from eth_abi import decode as abi_decode
+from hexbytes import HexBytes
 from web3 import Web3
 from web3.contract import AsyncContract
 
 from arbitrage_bot.core.events.event_emitter import Event, EventEmitter
+from src.utils.log_decoding import hex_str
 
 logger = logging.getLogger(__name__)
 
 
+class _LogLayout(NamedTuple):
+    """How to decode the data section of one pool event."""
+
+    name: str
+    kind: str  # "swap", "mint", "burn" or "sync"
+    types: Tuple[str, ...]  # non-indexed parameter types
+    fields: Tuple[str, ...]  # names for the decoded values
+
+
+# Pool events by topic0, hashed once at import. Indexed parameters are not
+# needed for the standardized events and are left undecoded.
+_LOG_LAYOUTS: Dict[str, _LogLayout] = {
+    "0x" + Web3.keccak(text=signature).hex().removeprefix("0x"): layout
+    for signature, layout in {
+        # Uniswap V3 style
+        "Swap(address,address,int256,int256,uint160,uint128,int24)": _LogLayout(
+            "Swap", "swap",
+            ("int256", "int256", "uint160", "uint128", "int24"),
+            ("amount0", "amount1", "sqrtPriceX96", "liquidity", "tick"),
+        ),
+        "Mint(address,address,int24,int24,uint128,uint256,uint256)": _LogLayout(
+            "Mint", "mint",
+            ("address", "uint128", "uint256", "uint256"),
+            ("sender", "liquidity", "amount0", "amount1"),
+        ),
+        "Burn(address,int24,int24,uint128,uint256,uint256)": _LogLayout(
+            "Burn", "burn",
+            ("uint128", "uint256", "uint256"),
+            ("liquidity", "amount0", "amount1"),
+        ),
+        # Uniswap V2 style
+        "Swap(address,uint256,uint256,uint256,uint256,address)": _LogLayout(
+            "Swap", "swap",
+            ("uint256", "uint256", "uint256", "uint256"),
+            ("amount0In", "amount1In", "amount0Out", "amount1Out"),
+        ),
+        "Mint(address,uint256,uint256)": _LogLayout(
+            "Mint", "mint", ("uint256", "uint256"), ("amount0", "amount1")
+        ),
+        "Burn(address,uint256,uint256,address)": _LogLayout(
+            "Burn", "burn", ("uint256", "uint256"), ("amount0", "amount1")
+        ),
+        "Sync(uint112,uint112)": _LogLayout(
+            "Sync", "sync", ("uint112", "uint112"), ("reserve0", "reserve1")
+        ),
+    }.items()
+}
+
+# RPC error messages that mean the block range returned too many logs. Kept
+# specific: "too many requests" and "rate exceeded" are rate limits, not ranges.
+_RANGE_ERROR = re.compile(
+    r"more than \d+ results|too many (logs|results|blocks)|log response size|response size (is )?too"
+    r"|range (is )?too (large|wide|big)|exceeds? (the )?max(imum)? (block )?range|max(imum)? block range"
+    r"|limited to a [\d,]+ (block )?range|exceeds? max(imum)? results",
+    re.IGNORECASE,
+)
+
+# RPC error messages that mean the provider is throttling us
+_RATE_LIMIT_ERROR = re.compile(
+    r"\b429\b|too many requests|rate limit|rate exceeded|request rate|exceeded .*capacity",
+    re.IGNORECASE,
+)
+
+
 @dataclass
 class SwapEvent:
     """Standardized representation of a DEX swap event."""
@@ -48,6 +116,133 @@ class LiquidityEvent:
     raw_event: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class ReserveEvent:
+    """Pool reserves reported by a V2 style Sync event."""
+
+    dex_name: str
+    pool_address: str
+    token0_address: str
+    token1_address: str
+    reserve0: Decimal
+    reserve1: Decimal
+    block_number: int
+    transaction_hash: str
+    timestamp: float
+    raw_event: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class _PoolInfo:
+    """A monitored pool and the tokens its events are reported against."""
+
+    dex_name: str
+    address: str
+    token0: str
+    token1: str
+
+
+class PoolLogScanner:
+    """
+    Fetches pool logs with one eth_getLogs per block range.
+
+    Every request carries the full address list and the OR'd topic set, so
+    the number of RPCs depends only on the block window. When the node
+    rejects a range for returning too many logs, the range is halved and
+    retried; after each successful request it grows back toward
+    max_block_range. When the node rate limits a request, the same range is
+    retried after an exponential backoff.
+    """
+
+    def __init__(
+        self,
+        web3_manager,
+        topics: Sequence[str],
+        max_block_range: int = 2000,
+        min_block_range: int = 1,
+        rate_limit_retries: int = 5,
+        rate_limit_backoff: float = 0.5,
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            web3_manager: Web3Manager whose async w3 issues the requests
+            topics: topic0 values to match (any of them)
+            max_block_range: Largest number of blocks per request
+            min_block_range: Smallest number of blocks a range is split down to
+            rate_limit_retries: Retries of one rate-limited request before giving up
+            rate_limit_backoff: First backoff delay in seconds, doubled per retry
+        """
+        self.web3_manager = web3_manager
+        self.topics = list(topics)
+        self.max_block_range = max_block_range
+        self.min_block_range = min_block_range
+        self.rate_limit_retries = rate_limit_retries
+        self.rate_limit_backoff = rate_limit_backoff
+        self._block_range = max_block_range
+
+        self.stats = {"requests": 0, "splits": 0, "rate_limited": 0, "logs": 0}
+
+    async def scan(
+        self, addresses: Sequence[str], from_block: int, to_block: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all matching logs emitted by addresses in [from_block, to_block].
+
+        Args:
+            addresses: Contract addresses to match (any of them)
+            from_block: First block, inclusive
+            to_block: Last block, inclusive
+
+        Returns:
+            Logs in the order returned by the node
+        """
+        logs: List[Dict[str, Any]] = []
+        if not addresses:
+            return logs
+
+        start = from_block
+        throttled = 0
+        while start <= to_block:
+            end = min(to_block, start + self._block_range - 1)
+            self.stats["requests"] += 1
+            try:
+                chunk = await self.web3_manager.w3.eth.get_logs(
+                    {
+                        "address": list(addresses),
+                        "fromBlock": start,
+                        "toBlock": end,
+                        "topics": [self.topics],
+                    }
+                )
+            except Exception as e:
+                if _RATE_LIMIT_ERROR.search(str(e)) and throttled < self.rate_limit_retries:
+                    delay = self.rate_limit_backoff * 2 ** throttled
+                    throttled += 1
+                    self.stats["rate_limited"] += 1
+                    logger.debug(f"Log request rate limited, retrying {start}-{end} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                span = end - start + 1
+                if span <= self.min_block_range or not _RANGE_ERROR.search(str(e)):
+                    raise
+                self._block_range = max(self.min_block_range, span // 2)
+                self.stats["splits"] += 1
+                logger.debug(
+                    f"Log range {start}-{end} too large, retrying with {self._block_range} blocks"
+                )
+                continue
+
+            logs.extend(chunk)
+            self.stats["logs"] += len(chunk)
+            start = end + 1
+            throttled = 0
+            self._block_range = min(self.max_block_range, self._block_range * 2)
+
+        return logs
+
+
 class DEXEventMonitor:
     """
     Monitors DEX events across multiple exchanges.
@@ -63,6 +258,9 @@ class DEXEventMonitor:
         web3_manager,  # Avoiding circular import
         dex_manager=None,  # Avoiding circular import
         polling_interval: int = 15,
+        max_blocks: int = 2000,
+        pool_refresh_interval: float = 300,
+        pool_index=None,  # Avoiding circular import
     ):
         """
         Initialize DEX event monitor.
@@ -72,14 +270,31 @@ class DEXEventMonitor:
             web3_manager: Web3Manager instance for blockchain interaction
             dex_manager: DexManager instance for accessing DEXs (optional)
             polling_interval: Time between event polling in seconds
+            max_blocks: Most blocks scanned per poll, and per getLogs request
+            pool_refresh_interval: Seconds between re-resolving each DEX's pools
+            pool_index: PoolIndex of factory-created pools (optional); when set,
+                pools and their tokens are read from it instead of probed per pair
         """
         self.event_emitter = event_emitter
         self.web3_manager = web3_manager
         self.dex_manager = dex_manager
+        self.pool_index = pool_index
         self.polling_interval = polling_interval
+        self.max_blocks = max_blocks
+        self.pool_refresh_interval = pool_refresh_interval
+
+        # Last processed block (all pools are scanned together)
+        self._last_block: Optional[int] = None
 
-        # Last processed block per DEX
-        self._last_block: Dict[str, int] = {}
+        # Monitored pools by lowercase address, for routing logs
+        self._pools: Dict[str, _PoolInfo] = {}
+        self._pools_refreshed_at = 0.0
+        self._pool_reserves: Dict[str, ReserveEvent] = {}
+
+        # One getLogs per block range for every pool and pool event
+        self._scanner = PoolLogScanner(
+            web3_manager, list(_LOG_LAYOUTS), max_block_range=max_blocks
+        )
 
         # Running tasks
         self._tasks: Set[asyncio.Task] = set()
@@ -89,26 +304,15 @@ class DEXEventMonitor:
         self._shutdown_event = asyncio.Event()
         self._lock = asyncio.Lock()
 
-        # Store recently processed tx hashes to avoid duplicates
-        self._processed_txs: Set[str] = set()
-        self._max_processed_txs = 1000  # Prevent memory growth
+        # Store recently processed (tx hash, log index) keys to avoid duplicates
+        self._processed_logs: Dict[Tuple[str, int], None] = {}
+        self._max_processed_logs = 1000  # Prevent memory growth
 
         # Event cache
         self._swap_events_cache: List[SwapEvent] = []
         self._liquidity_events_cache: List[LiquidityEvent] = []
         self._max_cache_size = 5000  # Limit cache size
 
-        # Event signature lookup
-        self._event_signatures = {
-            # Common event signatures across DEXs
-            "Swap": "Swap(address,address,int256,int256,uint160,uint128,int24)",
-            "Mint": "Mint(address,address,int24,int24,uint128,uint256,uint256)",
-            "Burn": "Burn(address,int24,int24,uint128,uint256,uint256)",
-            "Transfer": "Transfer(address,address,uint256)",
-            "Sync": "Sync(uint112,uint112)",
-            "PoolCreated": "PoolCreated(address,address,uint24,int24,address)",
-        }
-
         logger.info("Initialized DEX event monitor")
 
     async def start(self) -> bool:
@@ -127,11 +331,9 @@ class DEXEventMonitor:
             self._running = True
             self._shutdown_event.clear()
 
-            # Initialize last blocks if not set
-            if not self._last_block and self.dex_manager:
-                current_block = await self.web3_manager.w3.eth.block_number
-                for dex_name in self.dex_manager.get_enabled_dexes():
-                    self._last_block[dex_name] = current_block
+            # Initialize last block if not set
+            if self._last_block is None and self.dex_manager:
+                self._last_block = await self.web3_manager.w3.eth.block_number
 
             # Start monitoring task
             monitoring_task = asyncio.create_task(self._monitor_events())
@@ -169,21 +371,17 @@ class DEXEventMonitor:
             while not self._shutdown_event.is_set():
                 try:
                     if self.dex_manager:
-                        # Fetch new events for each DEX
-                        for (
-                            dex_name,
-                            dex,
-                        ) in self.dex_manager.get_enabled_dexes().items():
-                            await self._fetch_dex_events(dex_name, dex)
+                        # One log scan covers every pool on every DEX
+                        await self._fetch_events()
 
                     # Process and analyze events
                     await self._process_events()
 
-                    # Prune old processed tx cache
-                    if len(self._processed_txs) > self._max_processed_txs:
-                        self._processed_txs = set(
-                            list(self._processed_txs)[-self._max_processed_txs :]
-                        )
+                    # Prune old processed log cache (dicts keep insertion order)
+                    excess = len(self._processed_logs) - self._max_processed_logs
+                    if excess > 0:
+                        for key in list(self._processed_logs)[:excess]:
+                            del self._processed_logs[key]
 
                     # Wait for next polling interval or shutdown
                     try:
@@ -205,77 +403,102 @@ class DEXEventMonitor:
         except Exception as e:
             logger.error(f"Unexpected error in DEX event monitor: {e}")
 
-    async def _fetch_dex_events(self, dex_name: str, dex) -> None:
-        """
-        Fetch events for a specific DEX.
-
-        Args:
-            dex_name: Name of the DEX
-            dex: DEX instance
-        """
+    async def _fetch_events(self) -> None:
+        """Fetch and dispatch new pool events across all enabled DEXs."""
         try:
             # Get current block
             current_block = await self.web3_manager.w3.eth.block_number
-            from_block = self._last_block.get(dex_name, current_block - 1000)
+            if self._last_block is None:
+                self._last_block = current_block - 1000
 
             # Don't fetch too many blocks at once
-            max_blocks = 2000
-            if current_block - from_block > max_blocks:
-                from_block = current_block - max_blocks
+            from_block = max(self._last_block + 1, current_block - self.max_blocks + 1)
 
             # Only proceed if there are new blocks
-            if from_block >= current_block:
+            if from_block > current_block:
+                return
+
+            await self._refresh_pools()
+
+            # No pools to monitor
+            if not self._pools:
+                logger.debug("No pools to monitor")
+                self._last_block = current_block
                 return
 
             logger.debug(
-                f"Fetching events for {dex_name} from block {from_block} to {current_block}"
+                f"Scanning {len(self._pools)} pools from block {from_block} to {current_block}"
             )
 
-            # Get pools to monitor based on DEX type
-            if hasattr(dex, "_get_pool_address"):
-                # For V3 style DEXs, get active pools
-                pools = await self._get_active_pools(dex)
-            else:
-                # For V2 style DEXs, get factory
-                pools = [dex.factory_address] if hasattr(dex, "factory_address") else []
+            logs = await self._scanner.scan(
+                [pool.address for pool in self._pools.values()], from_block, current_block
+            )
+            await self._dispatch_logs(logs)
 
-            # No pools to monitor
-            if not pools:
-                logger.debug(f"No pools to monitor for {dex_name}")
-                self._last_block[dex_name] = current_block
-                return
+            # Update last processed block
+            self._last_block = current_block
 
-            # Fetch events for each pool
-            for pool_address in pools:
-                # Get pool contract
-                if pool_address == dex.factory_address:
-                    contract = dex.factory
-                else:
-                    # Get V3 pool contract
-                    if hasattr(dex, "_get_pool_contract"):
-                        contract = await dex._get_pool_contract(pool_address)
-                    else:
-                        continue
+        except Exception as e:
+            logger.error(f"Error fetching DEX events: {e}")
+
+    async def _refresh_pools(self) -> None:
+        """
+        Register the pools of every enabled DEX for log routing.
+
+        Pools are resolved at most once per pool_refresh_interval, and token0/
+        token1 are read only when a pool is first seen.
+        """
+        now = time.time()
+        if self._pools and now - self._pools_refreshed_at < self.pool_refresh_interval:
+            return
+        self._pools_refreshed_at = now
+
+        for dex_name, dex in self.dex_manager.get_enabled_dexes().items():
+            # Indexed DEXs need no RPC at all, V2 factories included
+            if self.pool_index is not None and self.pool_index.covers(dex_name):
+                for pool in self.pool_index.pools(dex=dex_name):
+                    self._pools.setdefault(
+                        pool.address.lower(),
+                        _PoolInfo(
+                            dex_name=dex_name,
+                            address=pool.address,
+                            token0=pool.token0,
+                            token1=pool.token1,
+                        ),
+                    )
+                continue
+
+            # V2 style DEXs only expose their factory, which emits no pool events
+            if not hasattr(dex, "_get_pool_address") or not hasattr(
+                dex, "_get_pool_contract"
+            ):
+                continue
+
+            try:
+                pool_addresses = await self._get_active_pools(dex)
+            except Exception as e:
+                logger.error(f"Error getting pools for {dex_name}: {e}")
+                continue
+
+            for pool_address in pool_addresses:
+                if pool_address.lower() in self._pools:
+                    continue
 
+                contract = await dex._get_pool_contract(pool_address)
                 if not contract:
                     continue
 
-                # Fetch swap events
-                await self._fetch_swap_events(
-                    dex_name, contract, pool_address, from_block, current_block
-                )
+                token0, token1 = await self._get_pool_tokens(contract, pool_address)
+                if not token0 or not token1:
+                    continue
 
-                # Fetch liquidity events
-                await self._fetch_liquidity_events(
-                    dex_name, contract, pool_address, from_block, current_block
+                self._pools[pool_address.lower()] = _PoolInfo(
+                    dex_name=dex_name,
+                    address=Web3.to_checksum_address(pool_address),
+                    token0=token0,
+                    token1=token1,
                 )
 
-            # Update last processed block
-            self._last_block[dex_name] = current_block
-
-        except Exception as e:
-            logger.error(f"Error fetching events for {dex_name}: {e}")
-
     async def _get_active_pools(self, dex) -> List[str]:
         """
         Get list of active pool addresses for a DEX.
@@ -308,363 +531,207 @@ class DEXEventMonitor:
 
         return pools
 
-    async def _fetch_swap_events(
-        self,
-        dex_name: str,
-        contract: AsyncContract,
-        pool_address: str,
-        from_block: int,
-        to_block: int,
-    ) -> None:
+    async def _dispatch_logs(self, logs: List[Dict[str, Any]]) -> None:
         """
-        Fetch swap events for a specific contract.
+        Decode scanned logs and route them to their pools.
 
         Args:
-            dex_name: Name of the DEX
-            contract: Contract to fetch events from
-            pool_address: Address of the pool
-            from_block: Start block
-            to_block: End block
+            logs: Raw logs from PoolLogScanner, in any order
         """
-        try:
-            # Check if contract has Swap event
-            if not hasattr(contract.events, "Swap"):
-                return
-
-            # Get token addresses for the pool
-            token0, token1 = await self._get_pool_tokens(contract, pool_address)
-            if not token0 or not token1:
-                return
+        logs = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+        timestamps = await self._block_timestamps(logs)
+
+        for log in logs:
+            try:
+                pool = self._pools.get(log["address"].lower())
+                layout = _LOG_LAYOUTS.get(hex_str(log["topics"][0])) if log["topics"] else None
+                # Logs dropped by a reorg are re-delivered with removed set
+                if pool is None or layout is None or log.get("removed"):
+                    continue
 
-            # Get event signature
-            swap_signature = Web3.keccak(text=self._event_signatures["Swap"]).hex()
+                # Skip if already processed
+                tx_hash = hex_str(log["transactionHash"])
+                log_key = (tx_hash, log["logIndex"])
+                if log_key in self._processed_logs:
+                    continue
 
-            # Fetch logs
-            logs = await self.web3_manager.w3.eth.get_logs(
-                {
-                    "address": pool_address,
-                    "fromBlock": from_block,
-                    "toBlock": to_block,
-                    "topics": [swap_signature],
+                args = dict(zip(layout.fields, abi_decode(layout.types, HexBytes(log["data"]))))
+                block_number = log["blockNumber"]
+                timestamp = timestamps.get(block_number, time.time())
+                raw_event = {
+                    "event": layout.name,
+                    "args": args,
+                    "address": pool.address,
+                    "blockNumber": block_number,
+                    "logIndex": log["logIndex"],
+                    "transactionHash": tx_hash,
                 }
-            )
-
-            # Process swap events
-            for log in logs:
-                try:
-                    # Skip if already processed
-                    tx_hash = log.get("transactionHash").hex()
-                    if tx_hash in self._processed_txs:
-                        continue
-
-                    # Parse log
-                    parsed_log = contract.events.Swap().process_log(dict(log))
-
-                    # Get block timestamp
-                    block = await self.web3_manager.w3.eth.get_block(
-                        log.get("blockNumber")
-                    )
-                    timestamp = block.get("timestamp", time.time())
-
-                    # Extract values depending on DEX version
-                    if (
-                        "amount0" in parsed_log["args"]
-                        and "amount1" in parsed_log["args"]
-                    ):
-                        # V3 style
-                        amount0 = Decimal(str(parsed_log["args"]["amount0"]))
-                        amount1 = Decimal(str(parsed_log["args"]["amount1"]))
-                    elif (
-                        "amount0In" in parsed_log["args"]
-                        and "amount0Out" in parsed_log["args"]
-                    ):
-                        # V2 style
-                        amount0 = Decimal(
-                            str(parsed_log["args"]["amount0Out"])
-                        ) - Decimal(str(parsed_log["args"]["amount0In"]))
-                        amount1 = Decimal(
-                            str(parsed_log["args"]["amount1Out"])
-                        ) - Decimal(str(parsed_log["args"]["amount1In"]))
-                    else:
-                        # Unknown format
-                        continue
-
-                    # Calculate price (safe division)
-                    price = Decimal("0")
-                    if amount0 != 0 and amount1 != 0:
-                        price = abs(amount1 / amount0) if amount0 != 0 else 0
-
-                    # Create swap event object
-                    swap_event = SwapEvent(
-                        dex_name=dex_name,
-                        pool_address=pool_address,
-                        token0_address=token0,
-                        token1_address=token1,
-                        amount0_delta=amount0,
-                        amount1_delta=amount1,
-                        price=price,
-                        block_number=log.get("blockNumber"),
-                        transaction_hash=tx_hash,
-                        timestamp=timestamp,
-                        raw_event=parsed_log,
-                    )
 
-                    # Add to cache
-                    self._swap_events_cache.append(swap_event)
-                    if len(self._swap_events_cache) > self._max_cache_size:
-                        self._swap_events_cache.pop(0)
-
-                    # Mark as processed
-                    self._processed_txs.add(tx_hash)
-
-                    # Emit event
-                    await self.event_emitter.emit(
-                        "dex:swap", swap_event, source=f"dex_monitor:{dex_name}"
-                    )
+                if layout.kind == "swap":
+                    await self._handle_swap(pool, args, raw_event, timestamp)
+                elif layout.kind == "sync":
+                    await self._handle_sync(pool, args, raw_event, timestamp)
+                else:
+                    await self._handle_liquidity(layout.kind, pool, args, raw_event, timestamp)
 
-                except Exception as e:
-                    logger.debug(f"Error processing swap event: {e}")
+                # Mark as processed
+                self._processed_logs[log_key] = None
 
-        except Exception as e:
-            logger.error(
-                f"Error fetching swap events for {dex_name} pool {pool_address}: {e}"
-            )
+            except Exception as e:
+                logger.debug(f"Error processing pool log: {e}")
 
-    async def _fetch_liquidity_events(
-        self,
-        dex_name: str,
-        contract: AsyncContract,
-        pool_address: str,
-        from_block: int,
-        to_block: int,
-    ) -> None:
+    async def _block_timestamps(self, logs: List[Dict[str, Any]]) -> Dict[int, float]:
         """
-        Fetch liquidity events (Mint, Burn) for a specific contract.
+        Timestamps for the blocks of a set of logs.
 
-        Args:
-            dex_name: Name of the DEX
-            contract: Contract to fetch events from
-            pool_address: Address of the pool
-            from_block: Start block
-            to_block: End block
+        Uses the blockTimestamp field where the node provides it and fetches
+        each remaining block once, so the cost is bounded by the block window
+        rather than by the number of logs or pools.
         """
-        try:
-            # Check if contract has liquidity events
-            has_mint = hasattr(contract.events, "Mint")
-            has_burn = hasattr(contract.events, "Burn")
-
-            if not has_mint and not has_burn:
-                return
-
-            # Get token addresses for the pool
-            token0, token1 = await self._get_pool_tokens(contract, pool_address)
-            if not token0 or not token1:
-                return
-
-            # Process Mint events
-            if has_mint:
-                await self._process_mint_events(
-                    dex_name,
-                    contract,
-                    pool_address,
-                    token0,
-                    token1,
-                    from_block,
-                    to_block,
-                )
-
-            # Process Burn events
-            if has_burn:
-                await self._process_burn_events(
-                    dex_name,
-                    contract,
-                    pool_address,
-                    token0,
-                    token1,
-                    from_block,
-                    to_block,
+        timestamps: Dict[int, float] = {}
+        missing: Set[int] = set()
+        for log in logs:
+            block_number = log["blockNumber"]
+            if block_number in timestamps:
+                continue
+            block_timestamp = log.get("blockTimestamp")
+            if block_timestamp is not None:
+                timestamps[block_number] = float(
+                    int(block_timestamp, 16)
+                    if isinstance(block_timestamp, str)
+                    else block_timestamp
                 )
+            else:
+                missing.add(block_number)
 
-        except Exception as e:
-            logger.error(
-                f"Error fetching liquidity events for {dex_name} pool {pool_address}: {e}"
+        pending = sorted(missing - timestamps.keys())
+        if pending:
+            blocks = await asyncio.gather(
+                *(self.web3_manager.w3.eth.get_block(n) for n in pending),
+                return_exceptions=True,
             )
+            for block_number, block in zip(pending, blocks):
+                if not isinstance(block, Exception):
+                    timestamps[block_number] = block.get("timestamp", time.time())
 
-    async def _process_mint_events(
+        return timestamps
+
+    async def _handle_swap(
         self,
-        dex_name: str,
-        contract: AsyncContract,
-        pool_address: str,
-        token0: str,
-        token1: str,
-        from_block: int,
-        to_block: int,
+        pool: "_PoolInfo",
+        args: Dict[str, Any],
+        raw_event: Dict[str, Any],
+        timestamp: float,
     ) -> None:
-        """Process Mint events for a pool."""
-        try:
-            # Get event signature
-            mint_signature = Web3.keccak(text=self._event_signatures["Mint"]).hex()
-
-            # Fetch logs
-            logs = await self.web3_manager.w3.eth.get_logs(
-                {
-                    "address": pool_address,
-                    "fromBlock": from_block,
-                    "toBlock": to_block,
-                    "topics": [mint_signature],
-                }
-            )
-
-            # Process events
-            for log in logs:
-                try:
-                    # Skip if already processed
-                    tx_hash = log.get("transactionHash").hex()
-                    if tx_hash in self._processed_txs:
-                        continue
-
-                    # Parse log
-                    parsed_log = contract.events.Mint().process_log(dict(log))
-
-                    # Get block timestamp
-                    block = await self.web3_manager.w3.eth.get_block(
-                        log.get("blockNumber")
-                    )
-                    timestamp = block.get("timestamp", time.time())
-
-                    # Extract values
-                    amount0 = Decimal(str(parsed_log["args"].get("amount0", 0)))
-                    amount1 = Decimal(str(parsed_log["args"].get("amount1", 0)))
-                    liquidity = Decimal(str(parsed_log["args"].get("liquidity", 0)))
-
-                    # Create liquidity event
-                    liquidity_event = LiquidityEvent(
-                        dex_name=dex_name,
-                        pool_address=pool_address,
-                        token0_address=token0,
-                        token1_address=token1,
-                        amount0_delta=amount0,
-                        amount1_delta=amount1,
-                        liquidity_delta=liquidity,
-                        block_number=log.get("blockNumber"),
-                        transaction_hash=tx_hash,
-                        timestamp=timestamp,
-                        raw_event=parsed_log,
-                    )
-
-                    # Add to cache
-                    self._liquidity_events_cache.append(liquidity_event)
-                    if len(self._liquidity_events_cache) > self._max_cache_size:
-                        self._liquidity_events_cache.pop(0)
-
-                    # Mark as processed
-                    self._processed_txs.add(tx_hash)
-
-                    # Emit event
-                    await self.event_emitter.emit(
-                        "dex:liquidity_added",
-                        liquidity_event,
-                        source=f"dex_monitor:{dex_name}",
-                    )
+        """Build, cache and emit a SwapEvent from decoded log args."""
+        if "amount0" in args:
+            # V3 style
+            amount0 = Decimal(args["amount0"])
+            amount1 = Decimal(args["amount1"])
+        else:
+            # V2 style
+            amount0 = Decimal(args["amount0Out"]) - Decimal(args["amount0In"])
+            amount1 = Decimal(args["amount1Out"]) - Decimal(args["amount1In"])
+
+        # Calculate price (safe division)
+        price = Decimal("0")
+        if amount0 != 0 and amount1 != 0:
+            price = abs(amount1 / amount0)
+
+        swap_event = SwapEvent(
+            dex_name=pool.dex_name,
+            pool_address=pool.address,
+            token0_address=pool.token0,
+            token1_address=pool.token1,
+            amount0_delta=amount0,
+            amount1_delta=amount1,
+            price=price,
+            block_number=raw_event["blockNumber"],
+            transaction_hash=raw_event["transactionHash"],
+            timestamp=timestamp,
+            raw_event=raw_event,
+        )
 
-                except Exception as e:
-                    logger.debug(f"Error processing Mint event: {e}")
+        # Add to cache
+        self._swap_events_cache.append(swap_event)
+        if len(self._swap_events_cache) > self._max_cache_size:
+            self._swap_events_cache.pop(0)
 
-        except Exception as e:
-            logger.error(
-                f"Error processing Mint events for {dex_name} pool {pool_address}: {e}"
-            )
+        await self.event_emitter.emit(
+            "dex:swap", swap_event, source=f"dex_monitor:{pool.dex_name}"
+        )
 
-    async def _process_burn_events(
+    async def _handle_liquidity(
         self,
-        dex_name: str,
-        contract: AsyncContract,
-        pool_address: str,
-        token0: str,
-        token1: str,
-        from_block: int,
-        to_block: int,
+        kind: str,
+        pool: "_PoolInfo",
+        args: Dict[str, Any],
+        raw_event: Dict[str, Any],
+        timestamp: float,
     ) -> None:
-        """Process Burn events for a pool."""
-        try:
-            # Get event signature
-            burn_signature = Web3.keccak(text=self._event_signatures["Burn"]).hex()
-
-            # Fetch logs
-            logs = await self.web3_manager.w3.eth.get_logs(
-                {
-                    "address": pool_address,
-                    "fromBlock": from_block,
-                    "toBlock": to_block,
-                    "topics": [burn_signature],
-                }
-            )
-
-            # Process events
-            for log in logs:
-                try:
-                    # Skip if already processed
-                    tx_hash = log.get("transactionHash").hex()
-                    if tx_hash in self._processed_txs:
-                        continue
-
-                    # Parse log
-                    parsed_log = contract.events.Burn().process_log(dict(log))
-
-                    # Get block timestamp
-                    block = await self.web3_manager.w3.eth.get_block(
-                        log.get("blockNumber")
-                    )
-                    timestamp = block.get("timestamp", time.time())
-
-                    # Extract values
-                    amount0 = -Decimal(
-                        str(parsed_log["args"].get("amount0", 0))
-                    )  # Negative for liquidity removal
-                    amount1 = -Decimal(
-                        str(parsed_log["args"].get("amount1", 0))
-                    )  # Negative for liquidity removal
-                    liquidity = -Decimal(
-                        str(parsed_log["args"].get("liquidity", 0))
-                    )  # Negative for liquidity removal
-
-                    # Create liquidity event
-                    liquidity_event = LiquidityEvent(
-                        dex_name=dex_name,
-                        pool_address=pool_address,
-                        token0_address=token0,
-                        token1_address=token1,
-                        amount0_delta=amount0,
-                        amount1_delta=amount1,
-                        liquidity_delta=liquidity,
-                        block_number=log.get("blockNumber"),
-                        transaction_hash=tx_hash,
-                        timestamp=timestamp,
-                        raw_event=parsed_log,
-                    )
-
-                    # Add to cache
-                    self._liquidity_events_cache.append(liquidity_event)
-                    if len(self._liquidity_events_cache) > self._max_cache_size:
-                        self._liquidity_events_cache.pop(0)
+        """Build, cache and emit a LiquidityEvent from decoded Mint/Burn args."""
+        # Negative for liquidity removal
+        sign = 1 if kind == "mint" else -1
+        amount0 = sign * Decimal(args["amount0"])
+        amount1 = sign * Decimal(args["amount1"])
+        liquidity = sign * Decimal(args.get("liquidity", 0))
+
+        liquidity_event = LiquidityEvent(
+            dex_name=pool.dex_name,
+            pool_address=pool.address,
+            token0_address=pool.token0,
+            token1_address=pool.token1,
+            amount0_delta=amount0,
+            amount1_delta=amount1,
+            liquidity_delta=liquidity,
+            block_number=raw_event["blockNumber"],
+            transaction_hash=raw_event["transactionHash"],
+            timestamp=timestamp,
+            raw_event=raw_event,
+        )
 
-                    # Mark as processed
-                    self._processed_txs.add(tx_hash)
+        # Add to cache
+        self._liquidity_events_cache.append(liquidity_event)
+        if len(self._liquidity_events_cache) > self._max_cache_size:
+            self._liquidity_events_cache.pop(0)
 
-                    # Emit event
-                    await self.event_emitter.emit(
-                        "dex:liquidity_removed",
-                        liquidity_event,
-                        source=f"dex_monitor:{dex_name}",
-                    )
+        await self.event_emitter.emit(
+            "dex:liquidity_added" if kind == "mint" else "dex:liquidity_removed",
+            liquidity_event,
+            source=f"dex_monitor:{pool.dex_name}",
+        )
 
-                except Exception as e:
-                    logger.debug(f"Error processing Burn event: {e}")
+    async def _handle_sync(
+        self,
+        pool: "_PoolInfo",
+        args: Dict[str, Any],
+        raw_event: Dict[str, Any],
+        timestamp: float,
+    ) -> None:
+        """Record and emit the reserves from a V2 Sync log."""
+        current = self._pool_reserves.get(pool.address)
+        if current is not None and (current.block_number, current.raw_event["logIndex"]) > (
+            raw_event["blockNumber"], raw_event["logIndex"]
+        ):
+            return  # Older than the reserves already recorded
+
+        reserve_event = ReserveEvent(
+            dex_name=pool.dex_name,
+            pool_address=pool.address,
+            token0_address=pool.token0,
+            token1_address=pool.token1,
+            reserve0=Decimal(args["reserve0"]),
+            reserve1=Decimal(args["reserve1"]),
+            block_number=raw_event["blockNumber"],
+            transaction_hash=raw_event["transactionHash"],
+            timestamp=timestamp,
+            raw_event=raw_event,
+        )
+        self._pool_reserves[pool.address] = reserve_event
 
-        except Exception as e:
-            logger.error(
-                f"Error processing Burn events for {dex_name} pool {pool_address}: {e}"
-            )
+        await self.event_emitter.emit(
+            "dex:sync", reserve_event, source=f"dex_monitor:{pool.dex_name}"
+        )
 
     async def _get_pool_tokens(
         self, contract: AsyncContract, pool_address: str
@@ -927,3 +994,20 @@ class DEXEventMonitor:
                 break
 
         return filtered_events
+
+    def get_pool_reserves(self, pool_address: str) -> Optional[ReserveEvent]:
+        """
+        Get the latest reserves seen for a V2 style pool.
+
+        Args:
+            pool_address: Pool address (any case)
+
+        Returns:
+            Latest ReserveEvent, or None if no Sync has been seen
+        """
+        pool = self._pools.get(pool_address.lower())
+        return self._pool_reserves.get(pool.address) if pool else None
+
+    def get_scan_stats(self) -> Dict[str, int]:
+        """Request, split and log counts from the log scanner."""
+        return dict(self._scanner.stats)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+ABI Registry Benchmark
+======================
+
+Measures the per-trade cost of getting a router contract ready to encode a
+swap. The previous path read and parsed dex_abi_mapping.json and the DEX's
+ABI file, then built a fresh Contract, on every swap. The registry parses
+src/abis once and hands back a cached Contract per (chain, router).
+
+Both paths then build the same swapExactETHForTokens transaction with every
+field prefilled, so no RPC call is made and only local work is timed. The
+last row encodes the calldata from the registry's precomputed selector, as
+the executor does, instead of going through Contract.build_transaction.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3 import Web3
+
+from utils.abi_registry import ABI_DIR, AbiRegistry
+
+ROUTER = "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506"
+WETH = "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
+USDC = "0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8"
+WALLET = "0x000000000000000000000000000000000000dEaD"
+
+TX_PARAMS = {
+    'from': WALLET,
+    'value': 10**16,
+    'gas': 500000,
+    'gasPrice': 10**8,
+    'nonce': 0,
+    'chainId': 42161,
+}
+
+
+def load_from_disk(w3: Web3, dex: str):
+    """The previous per-swap path: mapping file, ABI file, new Contract."""
+    with open(ABI_DIR / "dex_abi_mapping.json", 'r') as f:
+        abi_type = json.load(f).get(dex, 'uniswap_v2_router')
+    with open(ABI_DIR / f"{abi_type}_abi.json", 'r') as f:
+        abi = json.load(f)
+    return w3.eth.contract(address=ROUTER, abi=abi)
+
+
+def build_swap(router_contract) -> dict:
+    return router_contract.functions.swapExactETHForTokens(
+        0, [WETH, USDC], WALLET, 2**32
+    ).build_transaction(dict(TX_PARAMS))
+
+
+def encode_swap(registry: AbiRegistry, dex: str) -> dict:
+    return {
+        **TX_PARAMS,
+        'to': ROUTER,
+        'data': registry.encode_call(registry.abi_name_for_dex(dex), 'swapExactETHForTokens',
+                                     [0, [WETH, USDC], WALLET, 2**32]),
+    }
+
+
+def time_per_call(func: Callable[[], object], iterations: int) -> float:
+    """Best-of-three microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--dex", default="sushiswap")
+    args = parser.parse_args(argv)
+
+    # Never contacted: every transaction field is prefilled
+    w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:1"))
+
+    start = time.perf_counter()
+    registry = AbiRegistry()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    expected = build_swap(load_from_disk(w3, args.dex))['data']
+    assert build_swap(registry.router_contract(w3, 'arbitrum', ROUTER, args.dex))['data'] == expected
+    assert encode_swap(registry, args.dex)['data'] == expected
+
+    disk_swap = time_per_call(lambda: build_swap(load_from_disk(w3, args.dex)), args.iterations)
+    rows = [
+        ("contract lookup",
+         time_per_call(lambda: load_from_disk(w3, args.dex), args.iterations),
+         time_per_call(lambda: registry.router_contract(w3, 'arbitrum', ROUTER, args.dex), args.iterations)),
+        ("lookup + build swap",
+         disk_swap,
+         time_per_call(lambda: build_swap(registry.router_contract(w3, 'arbitrum', ROUTER, args.dex)), args.iterations)),
+        ("encode_call swap",
+         disk_swap,
+         time_per_call(lambda: encode_swap(registry, args.dex), args.iterations)),
+    ]
+
+    print(f"Registry startup: {startup_ms:.1f}ms for {len(registry.abis)} ABIs (once per process)")
+    print(f"{'step':<22} {'from disk (us)':>15} {'registry (us)':>14} {'saved (us)':>11} {'speedup':>8}")
+    for name, before, after in rows:
+        print(f"{name:<22} {before:>15.1f} {after:>14.1f} {before - after:>11.1f} {before / after:>7.1f}x")
+
+    # A same-chain arbitrage builds two swaps
+    print(f"Per trade (2 legs): {2 * (rows[-1][1] - rows[-1][2]) / 1000:.2f}ms saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Multicall Balance Benchmark
+===========================
+
+Compares MulticallBalanceChecker's Multicall3 aggregate3 path (one eth_call
+for every balanceOf, decimals and native balance read) against the previous
+thread-pool path (one balanceOf eth_call per token plus get_balance).
+
+Runs against a local node such as anvil (--rpc-url) or, by default, an
+in-process eth-tester chain. The Multicall3 stand-in and test token from
+tests/fixtures/multicall are deployed first. --rpc-latency-ms adds a fixed
+delay per JSON-RPC request to model a remote provider.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3 import Web3
+
+from utils.multicall_balance_checker import MulticallBalanceChecker
+
+try:
+    from web3 import EthereumTesterProvider
+    import eth_tester  # noqa: F401
+    HAS_ETH_TESTER = True
+except ImportError:
+    HAS_ETH_TESTER = False
+
+CONTRACTS_PATH = Path(__file__).parent.parent / "tests" / "fixtures" / "multicall" / "contracts.json"
+
+
+def make_provider(rpc_url: Optional[str]):
+    """Build a provider whose latency_ms attribute delays every request."""
+    if rpc_url:
+        base = Web3.HTTPProvider
+        args = (rpc_url,)
+    elif HAS_ETH_TESTER:
+        base = EthereumTesterProvider
+        args = ()
+    else:
+        raise SystemExit("Install eth-tester[py-evm] or pass --rpc-url")
+
+    class DelayedProvider(base):
+        latency_ms = 0.0
+
+        def make_request(self, method, params):
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+            return super().make_request(method, params)
+
+    return DelayedProvider(*args)
+
+
+def deploy(w3: Web3, contracts: dict, name: str, *args):
+    contract = w3.eth.contract(abi=contracts[name]["abi"], bytecode=contracts[name]["bytecode"])
+    tx_hash = contract.constructor(*args).transact({"from": w3.eth.accounts[0]})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return w3.eth.contract(address=receipt.contractAddress, abi=contracts[name]["abi"])
+
+
+async def time_path(checker: MulticallBalanceChecker, wallet: str, token_names: List[str],
+                    threaded: bool, runs: int) -> float:
+    """Best-of-runs seconds for one full balance sweep."""
+    w3 = checker.web3_connections["bench"]
+    tokens = checker.token_addresses["bench"]
+    addresses = [tokens[name] for name in token_names if name != "ETH"]
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        if threaded:
+            await checker._read_balances_threaded(w3, wallet, True, addresses)
+        else:
+            await checker._read_balances(wallet, "bench", token_names)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rpc-url", default=None, help="Local node such as anvil")
+    parser.add_argument("--rpc-latency-ms", type=float, default=20.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    contracts = json.loads(CONTRACTS_PATH.read_text())
+    provider = make_provider(args.rpc_url)
+    w3 = Web3(provider)
+    multicall = deploy(w3, contracts, "Multicall3Standin")
+    wallet = w3.eth.accounts[1]
+
+    all_tokens = {"ETH": "0x0000000000000000000000000000000000000000"}
+    for index in range(max(args.tokens)):
+        token = deploy(w3, contracts, "TestToken", 18)
+        token.functions.mint(wallet, (index + 1) * 10**18).transact({"from": w3.eth.accounts[0]})
+        all_tokens[f"T{index}"] = token.address
+
+    checker = MulticallBalanceChecker({"bench": w3}, multicall_address=multicall.address)
+    if not args.rpc_url:
+        # The Vyper stand-in takes at most 256 calls per aggregate3
+        checker.max_calls_per_batch = 256
+    checker.token_addresses = {"bench": all_tokens}
+
+    # Only the timed sweeps pay the simulated network latency
+    provider.latency_ms = args.rpc_latency_ms
+
+    print(f"RPC latency: {args.rpc_latency_ms:.0f}ms per request")
+    print(f"{'tokens':>8} {'threaded (ms)':>14} {'multicall (ms)':>15} {'speedup':>8}")
+    for count in args.tokens:
+        token_names = ["ETH"] + [f"T{index}" for index in range(count)]
+        # Warm the decimals cache so both paths read balances only
+        asyncio.run(checker._read_balances(wallet, "bench", token_names))
+        threaded = asyncio.run(time_path(checker, wallet, token_names, True, args.runs))
+        batched = asyncio.run(time_path(checker, wallet, token_names, False, args.runs))
+        print(f"{count:>8} {threaded * 1000:>14.1f} {batched * 1000:>15.1f} {threaded / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Path Finder Benchmark
+=====================
+
+Compares the negative-cycle engine used by PathFinder against the previous
+networkx approach (enumerate every simple cycle, keep the ones that start at
+the requested token, repeat for every token) on synthetic markets with
+100, 1k and 10k edges.
+
+The networkx baseline is skipped when networkx is not installed and is cut
+off after a time budget, since it grows exponentially with graph size.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.arbitrage.path_finder import PathFinder
+
+try:
+    import networkx as nx
+    HAS_NETWORKX = True
+except ImportError:
+    HAS_NETWORKX = False
+
+
+def build_market(edge_count: int, seed: int = 7) -> Dict[str, Any]:
+    """Build a synthetic market with roughly edge_count directed edges."""
+    rng = random.Random(seed)
+    pair_count = edge_count // 2
+    token_count = max(8, int(pair_count ** 0.5) * 2)
+    dexes = [f"dex{i}" for i in range(8)]
+    usd_prices = {f"T{i}": rng.uniform(0.01, 5000.0) for i in range(token_count)}
+    tokens = list(usd_prices)
+
+    pairs = []
+    for _ in range(pair_count):
+        base, quote = rng.sample(tokens, 2)
+        fair_price = usd_prices[base] / usd_prices[quote]
+        # Mostly fair quotes with occasional mispricings
+        skew = rng.uniform(-0.002, 0.002)
+        if rng.random() < 0.02:
+            skew += rng.uniform(0.005, 0.03)
+        pairs.append({
+            "base_token": base,
+            "quote_token": quote,
+            "dex": rng.choice(dexes),
+            "price": fair_price * (1.0 + skew),
+            "liquidity": rng.uniform(1_000, 1_000_000),
+            "fee": 0.003,
+        })
+    return {"pairs": pairs}
+
+
+def run_cycle_engine(market: Dict[str, Any], max_path_length: int) -> Dict[str, Any]:
+    """Time PathFinder.find_all_arbitrage_paths on the cycle engine."""
+    finder = PathFinder(max_path_length=max_path_length)
+    finder.update_graph(market)
+    start = time.perf_counter()
+    all_paths = finder.find_all_arbitrage_paths()
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "cycles": sum(len(paths) for paths in all_paths.values()),
+    }
+
+
+def run_networkx_baseline(
+    market: Dict[str, Any], max_path_length: int, budget_seconds: float
+) -> Optional[Dict[str, Any]]:
+    """Time the previous simple_cycles-per-token approach."""
+    if not HAS_NETWORKX:
+        return None
+
+    graph = nx.DiGraph()
+    for pair in market["pairs"]:
+        graph.add_edge(pair["base_token"], pair["quote_token"], price=pair["price"])
+        graph.add_edge(pair["quote_token"], pair["base_token"], price=1.0 / pair["price"])
+
+    start = time.perf_counter()
+    deadline = start + budget_seconds
+    cycles = 0
+    timed_out = False
+
+    for token in list(graph.nodes()):
+        for cycle in nx.simple_cycles(graph):
+            if cycle[0] == token and len(cycle) <= max_path_length + 1:
+                cycles += 1
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+        if timed_out:
+            break
+
+    return {
+        "seconds": time.perf_counter() - start,
+        "cycles": cycles,
+        "timed_out": timed_out,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--max-path-length", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=30.0,
+                        help="Seconds before the networkx baseline is abandoned")
+    args = parser.parse_args(argv)
+
+    print(f"{'edges':>8} {'engine (s)':>12} {'cycles':>8} {'networkx (s)':>14} {'cycles':>8}")
+    for size in args.sizes:
+        market = build_market(size)
+        engine = run_cycle_engine(market, args.max_path_length)
+        baseline = run_networkx_baseline(market, args.max_path_length, args.budget)
+
+        if baseline is None:
+            baseline_time, baseline_cycles = "n/a", "n/a"
+        else:
+            suffix = "+" if baseline["timed_out"] else ""
+            baseline_time = f"{baseline['seconds']:.4f}{suffix}"
+            baseline_cycles = f"{baseline['cycles']}{suffix}"
+
+        print(
+            f"{size:>8} {engine['seconds']:>12.4f} {engine['cycles']:>8} "
+            f"{baseline_time:>14} {baseline_cycles:>8}"
+        )
+
+    if not HAS_NETWORKX:
+        print("networkx not installed; baseline skipped")
+    print("networkx counts all cycles, the engine only profitable ones; '+' marks a timed-out run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Spread Matrix Benchmark
+=======================
+
+Compares the simple-arbitrage pass of MultiDEXAggregator before and after
+the switch to a token x venue price matrix: the previous per-token sort and
+nested loop that built a dict for every profitable pair, against one NumPy
+broadcast over all venue pairs that only keeps the top-K spreads.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# Add the repo root and src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from feeds.multi_dex_aggregator import DEXPrice
+from feeds.price_matrix import PriceMatrix
+
+
+def build_quotes(dex_count: int, token_count: int, chain_count: int, seed: int = 7) -> List[DEXPrice]:
+    """Build one quote per (dex, chain, token) with a small random skew."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    quotes = []
+    for token in range(token_count):
+        base_price = rng.uniform(0.1, 5000.0)
+        for dex in range(dex_count):
+            for chain in range(chain_count):
+                quotes.append(DEXPrice(
+                    dex_name=f"dex{dex}",
+                    token=f"T{token}",
+                    price=base_price * rng.uniform(0.99, 1.01),
+                    chain=f"chain{chain}",
+                    timestamp=now,
+                ))
+    return quotes
+
+
+def run_nested_loop(quotes: List[DEXPrice], min_profit_percentage: float) -> int:
+    """The previous sort-and-double-loop pass."""
+    token_prices = {}
+    for quote in quotes:
+        token_prices.setdefault(quote.token, []).append(quote)
+
+    opportunities = []
+    for token, prices in token_prices.items():
+        prices.sort(key=lambda x: x.price)
+        for i, low_price in enumerate(prices[:-1]):
+            for high_price in prices[i + 1:]:
+                profit_pct = (high_price.price - low_price.price) / low_price.price * 100
+                if profit_pct >= min_profit_percentage:
+                    opportunities.append({
+                        'token': token,
+                        'buy_dex': low_price.dex_name,
+                        'sell_dex': high_price.dex_name,
+                        'buy_price': low_price.price,
+                        'sell_price': high_price.price,
+                        'profit_percentage': profit_pct,
+                    })
+    opportunities.sort(key=lambda x: x['profit_percentage'], reverse=True)
+    return len(opportunities)
+
+
+def run_matrix(quotes: List[DEXPrice], min_profit_percentage: float, top_k: int) -> int:
+    """The PriceMatrix pass, building dicts only for the top-K spreads."""
+    matrix = PriceMatrix(quotes)
+    spreads, _ = matrix.top_spreads(min_profit_percentage, top_k)
+    opportunities = []
+    for token, buy_venue, sell_venue, profit_pct in spreads:
+        low_price = matrix.quote(token, buy_venue)
+        high_price = matrix.quote(token, sell_venue)
+        opportunities.append({
+            'token': token,
+            'buy_dex': low_price.dex_name,
+            'sell_dex': high_price.dex_name,
+            'buy_price': low_price.price,
+            'sell_price': high_price.price,
+            'profit_percentage': profit_pct,
+        })
+    return len(opportunities)
+
+
+def best_of(runs: int, func, *args) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dexes", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--tokens", type=int, default=16)
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--min-profit", type=float, default=0.01)
+    parser.add_argument("--top-k", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'quotes':>8} {'nested (ms)':>12} {'pairs':>8} {'matrix (ms)':>12} {'kept':>6} {'speedup':>8}")
+    for dex_count in args.dexes:
+        quotes = build_quotes(dex_count, args.tokens, args.chains)
+        pairs = run_nested_loop(list(quotes), args.min_profit)
+        kept = run_matrix(quotes, args.min_profit, args.top_k)
+        nested = best_of(args.runs, run_nested_loop, list(quotes), args.min_profit)
+        vectorized = best_of(args.runs, run_matrix, quotes, args.min_profit, args.top_k)
+        print(
+            f"{len(quotes):>8} {nested * 1000:>12.2f} {pairs:>8} "
+            f"{vectorized * 1000:>12.2f} {kept:>6} {nested / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
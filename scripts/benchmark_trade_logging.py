@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Trade Logging Benchmark
+=======================
+
+Times MasterArbitrageSystem's scan → filter pass (aggregator scan,
+connected-network filtering and the per-opportunity filter decisions), and
+the filter decisions alone over every raw aggregator opportunity, with:
+
+  off        trade-path logging below the logger level
+  sync       every record formatted and written on the loop (FileHandler)
+  queued     every record handed to the background writer (JSONL sink)
+  sampled    the queued pipeline with the default per-category limits
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add the repo root and src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from feeds.multi_dex_aggregator import MultiDEXAggregator
+from src.core.master_arbitrage_system import MasterArbitrageSystem
+from src.utils.trade_log import DEFAULT_LIMITS, CategoryLimit, configure_limits, start_trade_logging
+
+UNLIMITED = {category: CategoryLimit() for category in DEFAULT_LIMITS}
+
+
+def build_system() -> MasterArbitrageSystem:
+    system = MasterArbitrageSystem({})
+    system.price_feeds = MultiDEXAggregator({})
+    return system
+
+
+async def scan_and_filter(system: MasterArbitrageSystem) -> int:
+    opportunities = await system._scan_for_opportunities()
+    return len(await system._filter_opportunities(opportunities))
+
+
+async def filter_only(system: MasterArbitrageSystem, opportunities: List[dict]) -> int:
+    return len(await system._filter_opportunities([dict(opp) for opp in opportunities]))
+
+
+def timings(runs: int, func, *args) -> List[float]:
+    async def run() -> List[float]:
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await func(*args)
+            samples.append(time.perf_counter() - start)
+        return samples
+    return asyncio.run(run())
+
+
+def summarize(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000
+    return f"{p50:>9.2f} {p95:>9.2f}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    system = build_system()
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.WARNING)
+    raw = asyncio.run(system.price_feeds.find_arbitrage_opportunities())
+    workloads = [
+        ("scan+filter", scan_and_filter, (system,)),
+        (f"filter x{len(raw)}", filter_only, (system, raw)),
+    ]
+    for _, func, func_args in workloads:
+        timings(args.warmup, func, *func_args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'workload':<14} {'mode':<8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'lines':>8}")
+        for name, func, func_args in workloads:
+            print(f"{name:<14} {'off':<8} {summarize(timings(args.runs, func, *func_args))} {0:>8}")
+
+            configure_limits(UNLIMITED)
+            sync_path = os.path.join(tmp, f"{name}.log")
+            handler = logging.FileHandler(sync_path)
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+            root.addHandler(handler)
+            root.setLevel(logging.INFO)
+            samples = timings(args.runs, func, *func_args)
+            root.removeHandler(handler)
+            handler.close()
+            root.setLevel(logging.WARNING)
+            with open(sync_path, encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            print(f"{name:<14} {'sync':<8} {summarize(samples)} {lines:>8}")
+
+            for mode, limits in (("queued", UNLIMITED), ("sampled", DEFAULT_LIMITS)):
+                pipeline = start_trade_logging(os.path.join(tmp, f"{name}-{mode}.jsonl"), console=False,
+                                               limits=limits)
+                samples = timings(args.runs, func, *func_args)
+                pipeline.stop()
+                stats = pipeline.get_stats()
+                print(f"{name:<14} {mode:<8} {summarize(samples)} {stats['written']:>8}")
+                if stats['queue_full_drops']:
+                    print(f"{'':<14} {'':<8} queue-full drops: {stats['queue_full_drops']}")
+
+
+if __name__ == "__main__":
+    main()
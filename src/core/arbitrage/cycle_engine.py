@@ -0,0 +1,332 @@
+"""Negative-cycle engine for arbitrage detection on log-price edge weights."""
+
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple, Any, Iterable
+
+import numpy as np
+
+from .graph_store import ArrayGraphStore, FORWARD, BACKWARD, build_csr
+
+logger = logging.getLogger(__name__)
+
+# Cycles whose log weight is not below -CYCLE_EPSILON are treated as break-even.
+CYCLE_EPSILON = 1e-12
+
+# (distance, node id, position of the edge into node, parent label)
+_Label = Tuple[float, int, int, Optional[tuple]]
+
+
+class NegativeCycleEngine:
+    """Finds profitable cycles with a hop-bounded Bellman-Ford/SPFA search.
+
+    Edges are weighted by -log(rate * (1 - fee)), so a cycle is profitable
+    exactly when the sum of its weights is negative. Every negative cycle has
+    a rotation whose partial sums are all negative, so each relaxation round
+    only extends labels whose running weight stays below zero. Every start
+    token is seeded in the same pass, so the live frontier stays small and
+    all profitable cycles up to max_hops are found without enumerating every
+    simple cycle per token.
+    """
+
+    def __init__(self, max_hops: int = 3, smoothing_sweeps: int = 3):
+        """Initialize the cycle engine.
+
+        Args:
+            max_hops: Maximum number of swaps in a reported cycle.
+            smoothing_sweeps: Relaxation sweeps used to refine node potentials.
+        """
+        self.max_hops = max_hops
+        self.smoothing_sweeps = smoothing_sweeps
+        self.store = ArrayGraphStore()
+
+    def clear(self) -> None:
+        """Remove all edges."""
+        self.store.clear()
+
+    def add_pair(
+        self,
+        base_token: str,
+        quote_token: str,
+        dex: str,
+        price: float,
+        liquidity: float,
+        fee: float = 0.0,
+    ) -> None:
+        """Add or reprice the forward and backward edges for a pool quote."""
+        inverse_price = 1.0 / price if price != 0 else 0.0
+        self.store.set_edge(base_token, quote_token, dex, price, liquidity, fee, FORWARD)
+        self.store.set_edge(quote_token, base_token, dex, inverse_price, liquidity, fee, BACKWARD)
+
+    # Repricing writes the same slots in place
+    update_pair = add_pair
+
+    def remove_pair(self, base_token: str, quote_token: str, dex: str) -> None:
+        """Remove a pool's forward and backward edges."""
+        self.store.remove_edge(base_token, quote_token, dex)
+        self.store.remove_edge(quote_token, base_token, dex)
+
+    @property
+    def tokens(self) -> Set[str]:
+        """All tokens that appear on at least one edge."""
+        return self.store.tokens
+
+    def __contains__(self, token: str) -> bool:
+        return self.store.has_token(token)
+
+    def strongly_connected_components(self, min_liquidity: float = 0.0) -> List[Set[str]]:
+        """Strongly connected components of the liquidity-filtered graph.
+
+        Every cycle lies inside a single component, so a change only needs
+        the components containing its tokens to be searched again.
+        """
+        store = self.store
+        offsets, edge_ids = build_csr(
+            store.src, np.flatnonzero(store.usable_mask(min_liquidity)), store.node_count
+        )
+        offsets = offsets.tolist()
+        successors = store.dst[edge_ids].tolist()
+
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[Set[str]] = []
+        counter = 0
+
+        # Iterative Tarjan to avoid recursion limits on large graphs
+        for root in range(store.node_count):
+            if root in index or offsets[root] == offsets[root + 1]:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors[offsets[root]:offsets[root + 1]]))]
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(successors[offsets[child]:offsets[child + 1]])))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(store.token_names[member])
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    def find_cycles(
+        self,
+        min_liquidity: float = 0.0,
+        tokens: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find profitable cycles ranked from most to least profitable.
+
+        Args:
+            min_liquidity: Minimum liquidity required for each edge.
+            tokens: Optional token subset; only edges with both endpoints in
+                the subset are searched.
+
+        Returns:
+            List of cycles. Each cycle has its closed token list, path (list of
+            edge dicts), log weight, profit ratio and profit percentage.
+        """
+        store = self.store
+        node_count = store.node_count
+        weights = store.weights()
+        mask = store.usable_mask(min_liquidity, weights)
+        if tokens is not None:
+            node_mask = np.zeros(node_count, dtype=bool)
+            node_mask[[store.token_ids[token] for token in tokens if token in store.token_ids]] = True
+            mask &= node_mask[store.src] & node_mask[store.dst]
+
+        edge_ids = self._best_edges(np.flatnonzero(mask), weights)
+        if not edge_ids.size:
+            return []
+
+        src = store.src[edge_ids]
+        dst = store.dst[edge_ids]
+        weight = weights[edge_ids]
+        potential = self._potentials(src, dst, store.log_rate[edge_ids], node_count)
+        reduced = weight + potential[src] - potential[dst]
+
+        # Out-edges per node sorted by reduced weight, so scans stop at the
+        # first edge that can no longer keep the prefix negative
+        order = np.lexsort((reduced, src))
+        offsets = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=node_count), out=offsets[1:])
+        offsets = offsets.tolist()
+        edge_ids = edge_ids[order]
+        dst_list = dst[order].tolist()
+        reduced_list = reduced[order].tolist()
+
+        # Frontier entries are (start node, label); every node starts at zero
+        frontier: List[Tuple[int, _Label]] = [
+            (node, (0.0, node, -1, None)) for node in range(node_count)
+            if offsets[node] != offsets[node + 1]
+        ]
+        cycles: Dict[Tuple[int, ...], List[int]] = {}
+
+        for hop in range(1, self.max_hops + 1):
+            next_frontier: List[Tuple[int, _Label]] = []
+            extend = hop < self.max_hops
+            for source, label in frontier:
+                distance = label[0]
+                u = label[1]
+                for position in range(offsets[u], offsets[u + 1]):
+                    candidate = distance + reduced_list[position]
+                    if candidate >= 0.0:
+                        break
+                    v = dst_list[position]
+                    if v == source:
+                        cycle = self._label_positions(label)
+                        cycle.append(position)
+                        cycles.setdefault(self._cycle_key(cycle), cycle)
+                    elif extend and not self._label_visits(label, v):
+                        next_frontier.append((source, (candidate, v, position, label)))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        results = [
+            self._describe_cycle([int(edge_ids[position]) for position in cycle], weights)
+            for cycle in cycles.values()
+        ]
+        results = [result for result in results if result["log_weight"] < -CYCLE_EPSILON]
+        results.sort(key=lambda result: result["log_weight"])
+
+        logger.debug(f"Cycle engine found {len(results)} profitable cycles")
+        return results
+
+    def _best_edges(self, edge_ids: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Keep only the best-rate edge per ordered token pair."""
+        if not edge_ids.size:
+            return edge_ids
+        store = self.store
+        pair_key = store.src[edge_ids].astype(np.int64) * store.node_count + store.dst[edge_ids]
+        order = np.lexsort((weights[edge_ids], pair_key))
+        sorted_keys = pair_key[order]
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        return edge_ids[order[first]]
+
+    def _potentials(
+        self, src: np.ndarray, dst: np.ndarray, log_rate: np.ndarray, node_count: int
+    ) -> np.ndarray:
+        """Estimate a log "fair price" for every token.
+
+        Reducing each weight by the potential difference leaves cycle sums
+        unchanged but brings edges like ETH->USDC (log rate ~8) close to the
+        pool fee, so only mispriced edges start a negative prefix. Potentials
+        are seeded along a BFS forest of fee-free log rates and then smoothed
+        towards the average of all quotes touching each token.
+        """
+        offsets, order = build_csr(src, np.arange(src.size), node_count)
+        offsets = offsets.tolist()
+        targets = dst[order].tolist()
+        rates = log_rate[order].tolist()
+
+        potential = [0.0] * node_count
+        seen = [False] * node_count
+        for root in range(node_count):
+            if seen[root] or offsets[root] == offsets[root + 1]:
+                continue
+            seen[root] = True
+            queue = [root]
+            while queue:
+                next_queue = []
+                for u in queue:
+                    for position in range(offsets[u], offsets[u + 1]):
+                        v = targets[position]
+                        if not seen[v]:
+                            seen[v] = True
+                            potential[v] = potential[u] - rates[position]
+                            next_queue.append(v)
+                queue = next_queue
+
+        potential = np.array(potential)
+        counts = np.bincount(dst, minlength=node_count) + np.bincount(src, minlength=node_count)
+        touched = counts > 0
+        for _ in range(self.smoothing_sweeps):
+            totals = (
+                np.bincount(dst, weights=potential[src] - log_rate, minlength=node_count)
+                + np.bincount(src, weights=potential[dst] + log_rate, minlength=node_count)
+            )
+            potential[touched] = totals[touched] / counts[touched]
+        return potential
+
+    @staticmethod
+    def _label_positions(label: _Label) -> List[int]:
+        """Edge positions on the walk that produced a label, in walk order."""
+        positions = []
+        while label[2] >= 0:
+            positions.append(label[2])
+            label = label[3]
+        positions.reverse()
+        return positions
+
+    @staticmethod
+    def _label_visits(label: _Label, node: int) -> bool:
+        """Whether the walk that produced a label already passed node."""
+        while label is not None:
+            if label[1] == node:
+                return True
+            label = label[3]
+        return False
+
+    @staticmethod
+    def _cycle_key(cycle: List[int]) -> Tuple[int, ...]:
+        """Rotation-invariant key for deduplicating cycles."""
+        start = cycle.index(min(cycle))
+        return tuple(cycle[start:] + cycle[:start])
+
+    def _describe_cycle(self, edge_ids: List[int], weights: np.ndarray) -> Dict[str, Any]:
+        """Build the result record for a cycle in canonical rotation."""
+        store = self.store
+        names = [store.token_names[store.src[edge_id]] for edge_id in edge_ids]
+        start = names.index(min(names))
+        rotated = edge_ids[start:] + edge_ids[:start]
+        log_weight = float(weights[rotated].sum())
+        profit_ratio = math.exp(-log_weight)
+        tokens = names[start:] + names[:start]
+        tokens.append(tokens[0])
+        return {
+            "tokens": tokens,
+            "path": [store.edge_dict(edge_id) for edge_id in rotated],
+            "hops": len(rotated),
+            "log_weight": log_weight,
+            "profit_ratio": profit_ratio,
+            "profit_percentage": (profit_ratio - 1.0) * 100.0,
+            "min_liquidity": float(store.liquidity[rotated].min()),
+        }
+
+
+def rotate_path(path: List[Dict[str, Any]], start_token: str) -> Optional[List[Dict[str, Any]]]:
+    """Rotate a cycle path so it starts and ends with start_token.
+
+    Returns:
+        The rotated path, or None if start_token is not on the cycle.
+    """
+    for index, edge in enumerate(path):
+        if edge.get("from_token") == start_token:
+            return path[index:] + path[:index]
+    return None
@@ -0,0 +1,360 @@
+"""Array-backed graph store for the arbitrage token graph."""
+
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple, Any, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORWARD = 0
+BACKWARD = 1
+DIRECTIONS = ("forward", "backward")
+
+# Parallel per-edge arrays and their dtypes
+_EDGE_FIELDS = {
+    "src": np.int32,
+    "dst": np.int32,
+    "dex_id": np.int32,
+    "log_rate": np.float64,
+    "fee": np.float64,
+    "liquidity": np.float64,
+    "direction": np.int8,
+    "active": np.bool_,
+}
+
+
+class ArrayGraphStore:
+    """Directed multigraph of swap edges held in parallel NumPy arrays.
+
+    Tokens and DEX names are interned to integer ids. Each edge occupies one
+    slot across the src, dst, dex_id, log_rate, fee, liquidity and direction
+    arrays. Removed edges are only deactivated, and re-adding the same
+    (from_token, to_token, dex) reuses its slot, so edge ids handed out in
+    paths stay valid until the next clear. CSR offsets per node over the
+    active edges are rebuilt lazily when the topology changes.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """Initialize the graph store.
+
+        Args:
+            capacity: Initial number of edge slots; grows by doubling.
+        """
+        self.token_ids: Dict[str, int] = {}
+        self.token_names: List[str] = []
+        self.dex_ids: Dict[str, int] = {}
+        self.dex_names: List[str] = []
+        # Packed (src, dst, dex_id) keys: a sorted array for the bulk of the
+        # edges plus a small dict of recent inserts merged in periodically
+        self._slot_keys = np.empty(0, dtype=np.int64)
+        self._slot_ids = np.empty(0, dtype=np.int64)
+        self._recent_slots: Dict[int, int] = {}
+        self._degree: List[int] = []
+        self._size = 0
+        self._active_count = 0
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        for name, dtype in _EDGE_FIELDS.items():
+            setattr(self, f"_{name}", np.zeros(capacity, dtype=dtype))
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._src)
+        for name in _EDGE_FIELDS:
+            old = getattr(self, f"_{name}")
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, f"_{name}", new)
+
+    # Views over the used slots
+
+    @property
+    def src(self) -> np.ndarray:
+        return self._src[:self._size]
+
+    @property
+    def dst(self) -> np.ndarray:
+        return self._dst[:self._size]
+
+    @property
+    def dex_id(self) -> np.ndarray:
+        return self._dex_id[:self._size]
+
+    @property
+    def log_rate(self) -> np.ndarray:
+        return self._log_rate[:self._size]
+
+    @property
+    def fee(self) -> np.ndarray:
+        return self._fee[:self._size]
+
+    @property
+    def liquidity(self) -> np.ndarray:
+        return self._liquidity[:self._size]
+
+    @property
+    def direction(self) -> np.ndarray:
+        return self._direction[:self._size]
+
+    @property
+    def active(self) -> np.ndarray:
+        return self._active[:self._size]
+
+    @property
+    def node_count(self) -> int:
+        """Number of interned tokens, including ones with no active edges."""
+        return len(self.token_names)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of active edges."""
+        return self._active_count
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the edge arrays."""
+        return sum(getattr(self, f"_{name}").nbytes for name in _EDGE_FIELDS)
+
+    def clear(self) -> None:
+        """Remove all edges and interned names."""
+        self.token_ids.clear()
+        self.token_names.clear()
+        self.dex_ids.clear()
+        self.dex_names.clear()
+        self._slot_keys = np.empty(0, dtype=np.int64)
+        self._slot_ids = np.empty(0, dtype=np.int64)
+        self._recent_slots.clear()
+        self._degree.clear()
+        self._size = 0
+        self._active_count = 0
+        self._csr = None
+        self._active[:] = False
+
+    def intern_token(self, token: str) -> int:
+        """Return the integer id for a token, assigning one if needed."""
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = len(self.token_names)
+            self.token_ids[token] = token_id
+            self.token_names.append(token)
+            self._degree.append(0)
+        return token_id
+
+    def intern_dex(self, dex: str) -> int:
+        """Return the integer id for a DEX, assigning one if needed."""
+        dex_id = self.dex_ids.get(dex)
+        if dex_id is None:
+            dex_id = len(self.dex_names)
+            self.dex_ids[dex] = dex_id
+            self.dex_names.append(dex)
+        return dex_id
+
+    def has_token(self, token: str) -> bool:
+        """Whether a token has at least one active edge."""
+        token_id = self.token_ids.get(token)
+        return token_id is not None and self._degree[token_id] > 0
+
+    @property
+    def tokens(self) -> Set[str]:
+        """All tokens with at least one active edge."""
+        return {
+            name for name, degree in zip(self.token_names, self._degree) if degree > 0
+        }
+
+    def find_edge(self, from_token: str, to_token: str, dex: str) -> Optional[int]:
+        """Return the id of an active edge, or None."""
+        src = self.token_ids.get(from_token)
+        dst = self.token_ids.get(to_token)
+        dex_id = self.dex_ids.get(dex)
+        if src is None or dst is None or dex_id is None:
+            return None
+        edge_id = self._lookup_slot(_slot_key(src, dst, dex_id))
+        if edge_id is None or not self._active[edge_id]:
+            return None
+        return edge_id
+
+    def set_edge(
+        self,
+        from_token: str,
+        to_token: str,
+        dex: str,
+        price: float,
+        liquidity: float,
+        fee: float = 0.0,
+        direction: int = FORWARD,
+    ) -> int:
+        """Add an edge or update the existing one in place.
+
+        Returns:
+            The edge id.
+        """
+        src = self.intern_token(from_token)
+        dst = self.intern_token(to_token)
+        dex_id = self.intern_dex(dex)
+        key = _slot_key(src, dst, dex_id)
+
+        edge_id = self._lookup_slot(key)
+        if edge_id is None:
+            if self._size == len(self._src):
+                self._grow()
+            edge_id = self._size
+            self._size += 1
+            self._recent_slots[key] = edge_id
+            if len(self._recent_slots) >= max(1024, len(self._slot_keys) // 8):
+                self._merge_slots()
+            self._src[edge_id] = src
+            self._dst[edge_id] = dst
+            self._dex_id[edge_id] = dex_id
+
+        if not self._active[edge_id]:
+            self._active[edge_id] = True
+            self._active_count += 1
+            self._degree[src] += 1
+            self._degree[dst] += 1
+            self._csr = None
+
+        self._log_rate[edge_id] = math.log(price) if price > 0 else -math.inf
+        self._fee[edge_id] = fee
+        self._liquidity[edge_id] = liquidity
+        self._direction[edge_id] = direction
+        return edge_id
+
+    def load(self, edges: Iterable[Tuple[str, str, str, float, float, float, int]]) -> None:
+        """Replace all edges in one vectorized pass.
+
+        Args:
+            edges: (from_token, to_token, dex, price, liquidity, fee, direction)
+                rows; later rows win for a repeated (from_token, to_token, dex).
+        """
+        self.clear()
+        rows: Dict[int, Tuple[int, int, int, float, float, float, int]] = {}
+        for from_token, to_token, dex, price, liquidity, fee, direction in edges:
+            src = self.intern_token(from_token)
+            dst = self.intern_token(to_token)
+            dex_id = self.intern_dex(dex)
+            rows[_slot_key(src, dst, dex_id)] = (src, dst, dex_id, price, liquidity, fee, direction)
+        if not rows:
+            return
+
+        count = len(rows)
+        while len(self._src) < count:
+            self._grow()
+        columns = list(zip(*rows.values()))
+        for name, column in zip(("src", "dst", "dex_id"), columns[:3]):
+            getattr(self, f"_{name}")[:count] = column
+        prices = np.array(columns[3], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._log_rate[:count] = np.where(prices > 0, np.log(prices), -np.inf)
+        self._liquidity[:count] = columns[4]
+        self._fee[:count] = columns[5]
+        self._direction[:count] = columns[6]
+        self._active[:count] = True
+
+        self._size = count
+        self._active_count = count
+        degree = np.bincount(self._src[:count], minlength=self.node_count)
+        degree += np.bincount(self._dst[:count], minlength=self.node_count)
+        self._degree = degree.tolist()
+
+        keys = np.fromiter(rows.keys(), dtype=np.int64, count=count)
+        order = np.argsort(keys)
+        self._slot_keys = keys[order]
+        self._slot_ids = order.astype(np.int64)
+
+    def remove_edge(self, from_token: str, to_token: str, dex: str) -> Optional[int]:
+        """Deactivate an edge, returning its id if it was active."""
+        edge_id = self.find_edge(from_token, to_token, dex)
+        if edge_id is not None:
+            self._active[edge_id] = False
+            self._active_count -= 1
+            self._degree[self._src[edge_id]] -= 1
+            self._degree[self._dst[edge_id]] -= 1
+            self._csr = None
+        return edge_id
+
+    def _lookup_slot(self, key: int) -> Optional[int]:
+        edge_id = self._recent_slots.get(key)
+        if edge_id is not None:
+            return edge_id
+        position = int(np.searchsorted(self._slot_keys, key))
+        if position < len(self._slot_keys) and self._slot_keys[position] == key:
+            return int(self._slot_ids[position])
+        return None
+
+    def _merge_slots(self) -> None:
+        keys = np.concatenate([self._slot_keys, np.fromiter(self._recent_slots.keys(), dtype=np.int64)])
+        ids = np.concatenate([self._slot_ids, np.fromiter(self._recent_slots.values(), dtype=np.int64)])
+        order = np.argsort(keys, kind="stable")
+        self._slot_keys = keys[order]
+        self._slot_ids = ids[order]
+        self._recent_slots.clear()
+
+    def weights(self) -> np.ndarray:
+        """Edge weights -log(rate * (1 - fee)); unusable edges are +inf."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = -(self.log_rate + np.log1p(-self.fee))
+        weight[~np.isfinite(weight)] = np.inf
+        return weight
+
+    def usable_mask(self, min_liquidity: float = 0.0, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Mask of active edges with finite weight and enough liquidity."""
+        if weights is None:
+            weights = self.weights()
+        return self.active & (self.liquidity >= min_liquidity) & np.isfinite(weights)
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR view of the active edges.
+
+        Returns:
+            (offsets, edge_ids) where the out-edges of node u are
+            edge_ids[offsets[u]:offsets[u + 1]].
+        """
+        if self._csr is None:
+            self._csr = build_csr(self.src, np.flatnonzero(self.active), self.node_count)
+        return self._csr
+
+    def out_edges(self, token: str) -> np.ndarray:
+        """Ids of the active out-edges of a token."""
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=np.int64)
+        offsets, edge_ids = self.csr()
+        return edge_ids[offsets[token_id]:offsets[token_id + 1]]
+
+    def edge_dict(self, edge_id: int) -> Dict[str, Any]:
+        """Return an edge in the path format used by the arbitrage engine."""
+        return {
+            "from_token": self.token_names[self._src[edge_id]],
+            "to_token": self.token_names[self._dst[edge_id]],
+            "dex": self.dex_names[self._dex_id[edge_id]],
+            "price": math.exp(self._log_rate[edge_id]),
+            "fee": float(self._fee[edge_id]),
+            "liquidity": float(self._liquidity[edge_id]),
+            "direction": DIRECTIONS[self._direction[edge_id]],
+            "edge_id": int(edge_id),
+        }
+
+
+def _slot_key(src: int, dst: int, dex_id: int) -> int:
+    """Pack an edge's endpoints and DEX into a single integer key."""
+    return (src << 42) | (dst << 21) | dex_id
+
+
+def build_csr(src: np.ndarray, edge_ids: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group edge ids by source node.
+
+    Args:
+        src: Source node of every edge slot.
+        edge_ids: Edge ids to include, in the order ties should keep.
+        node_count: Number of nodes.
+
+    Returns:
+        (offsets, ordered edge ids).
+    """
+    ordered = edge_ids[np.argsort(src[edge_ids], kind="stable")]
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src[ordered], minlength=node_count), out=offsets[1:])
+    return offsets, ordered
@@ -1,9 +1,14 @@
 """Path finder for arbitrage opportunities."""
 
 import logging
-import networkx as nx
+import math
 from typing import Dict, List, Optional, Set, Tuple, Any
 
+import numpy as np
+
+from .cycle_engine import NegativeCycleEngine, rotate_path
+from .graph_store import FORWARD, BACKWARD
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,7 +22,9 @@ class PathFinder:
             max_path_length: Maximum number of hops in a path.
         """
         self.max_path_length = max_path_length
-        self.graph = nx.DiGraph()
+        self.cycle_engine = NegativeCycleEngine(max_hops=max_path_length)
+        self._cycle_cache: Dict[float, List[Dict[str, Any]]] = {}
+        self._components: Dict[float, Dict[str, Set[str]]] = {}
     
     def update_graph(self, market_data: Dict[str, Any]) -> None:
         """Update the graph with market data.
@@ -25,10 +32,12 @@ class PathFinder:
         Args:
             market_data: Market data containing pairs information.
         """
-        # Clear the existing graph
-        self.graph.clear()
+        # Rebuild the graph from forward (base -> quote) and backward
+        # (quote -> base) edges for each pair
+        self._cycle_cache.clear()
+        self._components.clear()
+        edges = []
         
-        # Add edges for each pair
         for pair in market_data.get("pairs", []):
             base_token = pair.get("base_token")
             quote_token = pair.get("quote_token")
@@ -40,31 +49,146 @@ class PathFinder:
                 logger.warning(f"Skipping pair with missing data: {pair}")
                 continue
             
-            # Add forward edge (base -> quote)
-            self.graph.add_edge(
+            fee = pair.get("fee", 0.0)
+            inverse_price = 1.0 / price if price != 0 else 0.0
+            edges.append((base_token, quote_token, dex, price, liquidity, fee, FORWARD))
+            edges.append((quote_token, base_token, dex, inverse_price, liquidity, fee, BACKWARD))
+        
+        self.cycle_engine.store.load(edges)
+        
+        logger.info(
+            f"Updated graph with {len(self.cycle_engine.tokens)} nodes and "
+            f"{self.cycle_engine.store.edge_count} edges"
+        )
+    
+    def apply_pool_delta(self, delta: Dict[str, Any]) -> Set[str]:
+        """Apply a delta of changed pools without rebuilding the graph.
+        
+        Edges are updated in place and cached cycle results are refreshed by
+        searching only the strongly connected components that contain a
+        changed pool; cycles elsewhere cannot have changed.
+        
+        Args:
+            delta: Lists of pair dicts (same shape as market data pairs) under
+                "added", "removed" and "repriced". Removed pairs only need
+                base_token, quote_token and dex.
+                
+        Returns:
+            Tokens whose cycles were searched again.
+        """
+        touched: Set[str] = set()
+        # Thresholds whose liquidity-filtered topology changed
+        stale_thresholds: Set[float] = set()
+        
+        for pair in delta.get("removed", []):
+            base_token = pair.get("base_token")
+            quote_token = pair.get("quote_token")
+            dex = pair.get("dex")
+            if not all([base_token, quote_token, dex]):
+                logger.warning(f"Skipping removed pair with missing data: {pair}")
+                continue
+            self.cycle_engine.remove_pair(base_token, quote_token, dex)
+            touched.update((base_token, quote_token))
+            stale_thresholds.update(self._components)
+        
+        for pair in delta.get("added", []) + delta.get("repriced", []):
+            base_token = pair.get("base_token")
+            quote_token = pair.get("quote_token")
+            dex = pair.get("dex")
+            price = pair.get("price")
+            liquidity = pair.get("liquidity")
+            
+            if not all([base_token, quote_token, dex, price is not None, liquidity is not None]):
+                logger.warning(f"Skipping pair with missing data: {pair}")
+                continue
+            
+            store = self.cycle_engine.store
+            previous = store.find_edge(base_token, quote_token, dex)
+            for threshold in self._components:
+                if previous is None or (
+                    self._edge_usable(
+                        store.log_rate[previous] > -math.inf,
+                        store.fee[previous],
+                        store.liquidity[previous],
+                        threshold,
+                    )
+                    != self._edge_usable(price > 0, pair.get("fee", 0.0), liquidity, threshold)
+                ):
+                    stale_thresholds.add(threshold)
+            
+            self.cycle_engine.update_pair(
                 base_token,
                 quote_token,
-                dex=dex,
-                price=price,
-                liquidity=liquidity,
-                direction="forward",
+                dex,
+                price,
+                liquidity,
+                fee=pair.get("fee", 0.0),
             )
+            touched.update((base_token, quote_token))
+        
+        for threshold in stale_thresholds:
+            del self._components[threshold]
+        
+        if not touched:
+            return set()
+        
+        searched: Set[str] = set()
+        for min_liquidity, cycles in list(self._cycle_cache.items()):
+            components = self._component_index(min_liquidity)
+            affected = set(touched)
+            for token in touched:
+                affected.update(components.get(token, ()))
             
-            # Add backward edge (quote -> base)
-            inverse_price = 1.0 / price if price != 0 else 0.0
-            self.graph.add_edge(
-                quote_token,
-                base_token,
-                dex=dex,
-                price=inverse_price,
-                liquidity=liquidity,
-                direction="backward",
+            kept = [
+                cycle for cycle in cycles
+                if affected.isdisjoint(cycle["tokens"])
+            ]
+            refreshed = self.cycle_engine.find_cycles(
+                min_liquidity=min_liquidity, tokens=affected
             )
+            merged = kept + refreshed
+            merged.sort(key=lambda cycle: cycle["log_weight"])
+            self._cycle_cache[min_liquidity] = merged
+            searched.update(affected)
         
-        logger.info(
-            f"Updated graph with {self.graph.number_of_nodes()} nodes and "
-            f"{self.graph.number_of_edges()} edges"
+        logger.debug(
+            f"Applied pool delta touching {len(touched)} tokens; "
+            f"re-searched {len(searched)} tokens"
         )
+        return searched
+    
+    def _component_index(self, min_liquidity: float) -> Dict[str, Set[str]]:
+        """Map each token to its strongly connected component, cached per threshold."""
+        components = self._components.get(min_liquidity)
+        if components is None:
+            components = {}
+            for component in self.cycle_engine.strongly_connected_components(min_liquidity):
+                for token in component:
+                    components[token] = component
+            self._components[min_liquidity] = components
+        return components
+    
+    @staticmethod
+    def _edge_usable(priced: bool, fee: float, liquidity: float, min_liquidity: float) -> bool:
+        """Whether a pool's edges survive the liquidity filter."""
+        return bool(priced and fee < 1.0 and liquidity >= min_liquidity)
+    
+    def find_cycles(self, min_liquidity: float = 0.0) -> List[Dict[str, Any]]:
+        """Find profitable cycles for all tokens in a single search.
+        
+        Results are cached until the next graph update.
+        
+        Args:
+            min_liquidity: Minimum liquidity required for each edge.
+            
+        Returns:
+            Cycles ranked from most to least profitable.
+        """
+        cycles = self._cycle_cache.get(min_liquidity)
+        if cycles is None:
+            cycles = self.cycle_engine.find_cycles(min_liquidity=min_liquidity)
+            self._cycle_cache[min_liquidity] = cycles
+        return cycles
     
     def find_arbitrage_paths(
         self, start_token: str, min_liquidity: float = 0.0
@@ -76,45 +200,17 @@ class PathFinder:
             min_liquidity: Minimum liquidity required for each edge.
             
         Returns:
-            List of paths, where each path is a list of edges.
+            List of profitable paths, most profitable first, where each path
+            is a list of edges.
         """
-        if start_token not in self.graph:
+        if start_token not in self.cycle_engine:
             logger.warning(f"Start token {start_token} not in graph")
             return []
         
-        # Filter edges by minimum liquidity
-        if min_liquidity > 0:
-            filtered_graph = nx.DiGraph()
-            for u, v, data in self.graph.edges(data=True):
-                if data.get("liquidity", 0) >= min_liquidity:
-                    filtered_graph.add_edge(u, v, **data)
-            graph = filtered_graph
-        else:
-            graph = self.graph
-        
-        # Find simple cycles starting and ending with start_token
         arbitrage_paths = []
-        
-        # Use NetworkX's simple_cycles to find all cycles
-        for cycle in nx.simple_cycles(graph):
-            # Check if the cycle starts and ends with start_token
-            if cycle[0] == start_token and len(cycle) <= self.max_path_length + 1:
-                # Convert cycle to path (list of edges)
-                path = []
-                for i in range(len(cycle)):
-                    u = cycle[i]
-                    v = cycle[(i + 1) % len(cycle)]
-                    edge_data = graph.get_edge_data(u, v)
-                    if edge_data:
-                        path.append({
-                            "from_token": u,
-                            "to_token": v,
-                            "dex": edge_data.get("dex"),
-                            "price": edge_data.get("price"),
-                            "liquidity": edge_data.get("liquidity"),
-                            "direction": edge_data.get("direction"),
-                        })
-                
+        for cycle in self.find_cycles(min_liquidity):
+            path = rotate_path(cycle["path"], start_token)
+            if path is not None:
                 arbitrage_paths.append(path)
         
         logger.debug(f"Found {len(arbitrage_paths)} arbitrage paths for {start_token}")
@@ -125,18 +221,18 @@ class PathFinder:
     ) -> Dict[str, List[List[Dict[str, Any]]]]:
         """Find arbitrage paths for all tokens.
         
+        Each cycle is reported once, under the first token of its path.
+        
         Args:
             min_liquidity: Minimum liquidity required for each edge.
             
         Returns:
             Dictionary mapping tokens to lists of arbitrage paths.
         """
-        all_paths = {}
+        all_paths: Dict[str, List[List[Dict[str, Any]]]] = {}
         
-        for token in self.graph.nodes():
-            paths = self.find_arbitrage_paths(token, min_liquidity)
-            if paths:
-                all_paths[token] = paths
+        for cycle in self.find_cycles(min_liquidity):
+            all_paths.setdefault(cycle["tokens"][0], []).append(cycle["path"])
         
         return all_paths
     
@@ -145,6 +241,10 @@ class PathFinder:
     ) -> Dict[str, Any]:
         """Calculate metrics for a path.
         
+        Paths produced by this finder carry edge ids into the graph store, so
+        their metrics are computed from the current edge arrays in one
+        gather; other paths fall back to the prices stored on each edge.
+        
         Args:
             path: The path to calculate metrics for.
             input_amount: The input amount.
@@ -161,24 +261,32 @@ class PathFinder:
                 "tokens": [],
             }
         
-        # Calculate output amount
-        output_amount = input_amount
-        for edge in path:
-            price = edge.get("price", 0.0)
-            output_amount *= price
+        edge_ids = self._path_edge_ids(path)
+        if edge_ids is not None:
+            store = self.cycle_engine.store
+            output_amount = input_amount * math.exp(store.log_rate[edge_ids].sum())
+            min_liquidity = float(store.liquidity[edge_ids].min())
+            dexes = [store.dex_names[dex_id] for dex_id in np.unique(store.dex_id[edge_ids])]
+            tokens = [store.token_names[token_id] for token_id in store.src[edge_ids]]
+        else:
+            # Calculate output amount
+            output_amount = input_amount
+            for edge in path:
+                price = edge.get("price", 0.0)
+                output_amount *= price
+            
+            # Get minimum liquidity
+            min_liquidity = min(edge.get("liquidity", 0.0) for edge in path)
+            
+            # Get unique DEXes
+            dexes = list({edge.get("dex") for edge in path})
+            
+            # Get tokens in path
+            tokens = [edge.get("from_token") for edge in path]
         
         # Calculate profit percentage
         profit_percentage = ((output_amount / input_amount) - 1.0) * 100.0
         
-        # Get minimum liquidity
-        min_liquidity = min(edge.get("liquidity", 0.0) for edge in path)
-        
-        # Get unique DEXes
-        dexes = list({edge.get("dex") for edge in path})
-        
-        # Get tokens in path
-        tokens = [edge.get("from_token") for edge in path]
-        
         return {
             "output_amount": output_amount,
             "profit_percentage": profit_percentage,
@@ -186,3 +294,20 @@ class PathFinder:
             "dexes": dexes,
             "tokens": tokens,
         }
+    
+    def _path_edge_ids(self, path: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Edge ids for a path if every edge still maps to the same active store edge."""
+        store = self.cycle_engine.store
+        edge_ids = [edge.get("edge_id") for edge in path]
+        if any(edge_id is None or edge_id >= len(store.src) for edge_id in edge_ids):
+            return None
+        edge_ids = np.array(edge_ids)
+        expected_src = [store.token_ids.get(edge.get("from_token"), -1) for edge in path]
+        expected_dst = [store.token_ids.get(edge.get("to_token"), -1) for edge in path]
+        if not (
+            store.active[edge_ids].all()
+            and np.array_equal(store.src[edge_ids], expected_src)
+            and np.array_equal(store.dst[edge_ids], expected_dst)
+        ):
+            return None
+        return edge_ids
@@ -1,10 +1,18 @@
 """Simple path finder for arbitrage opportunities without networkx dependency."""
 
 import logging
+import math
 from typing import Dict, List, Optional, Set, Tuple, Any
 
+import numpy as np
+
+from .graph_store import ArrayGraphStore, FORWARD, BACKWARD
+
 logger = logging.getLogger(__name__)
 
+# Simple slippage simulation (reduce by 0.1% per trade)
+SLIPPAGE_FACTOR = 0.999
+
 
 class SimplePathFinder:
     """Simple path finder for arbitrage opportunities."""
@@ -16,8 +24,7 @@ class SimplePathFinder:
             max_path_length: Maximum number of hops in a path.
         """
         self.max_path_length = max_path_length
-        self.pairs = {}
-        self.tokens = set()
+        self.store = ArrayGraphStore()
     
     def update_graph(self, market_data: Dict[str, Any]) -> None:
         """Update the graph with market data.
@@ -25,9 +32,7 @@ class SimplePathFinder:
         Args:
             market_data: Market data containing pairs information.
         """
-        # Clear existing data
-        self.pairs.clear()
-        self.tokens.clear()
+        edges = []
         
         # Process pairs
         for pair in market_data.get("pairs", []):
@@ -41,33 +46,15 @@ class SimplePathFinder:
                 logger.warning(f"Skipping pair with missing data: {pair}")
                 continue
             
-            # Add tokens
-            self.tokens.add(base_token)
-            self.tokens.add(quote_token)
+            # Store pair and its reverse
+            reverse_price = 1.0 / price if price > 0 else 0
+            edges.append((base_token, quote_token, dex, price, liquidity, 0.0, FORWARD))
+            edges.append((quote_token, base_token, dex, reverse_price, liquidity, 0.0, BACKWARD))
             
-            # Store pair information
-            pair_key = f"{base_token}-{quote_token}-{dex}"
-            self.pairs[pair_key] = {
-                'base_token': base_token,
-                'quote_token': quote_token,
-                'dex': dex,
-                'price': price,
-                'liquidity': liquidity,
-                'reverse_price': 1.0 / price if price > 0 else 0
-            }
+        # Replace existing data
+        self.store.load(edges)
             
-            # Also store reverse pair
-            reverse_key = f"{quote_token}-{base_token}-{dex}"
-            self.pairs[reverse_key] = {
-                'base_token': quote_token,
-                'quote_token': base_token,
-                'dex': dex,
-                'price': 1.0 / price if price > 0 else 0,
-                'liquidity': liquidity,
-                'reverse_price': price
-            }
-        
-        logger.info(f"Updated graph with {len(self.pairs)} pairs and {len(self.tokens)} tokens")
+        logger.info(f"Updated graph with {self.store.edge_count} pairs and {len(self.store.tokens)} tokens")
     
     def find_arbitrage_paths(self, start_token: str, min_profit_threshold: float = 0.01) -> List[Dict[str, Any]]:
         """Find arbitrage paths starting from a specific token.
@@ -79,7 +66,7 @@ class SimplePathFinder:
         Returns:
             List of arbitrage paths
         """
-        if start_token not in self.tokens:
+        if not self.store.has_token(start_token):
             logger.warning(f"Token {start_token} not found in market data")
             return []
         
@@ -100,109 +87,149 @@ class SimplePathFinder:
     def _find_simple_arbitrage(self, start_token: str, min_profit_threshold: float) -> List[Dict[str, Any]]:
         """Find simple arbitrage opportunities (A -> B -> A)."""
         paths = []
+        start = self.store.token_ids[start_token]
+        log_rate = self.store.log_rate
+        min_log_ratio = self._min_log_ratio(min_profit_threshold, 2)
         
-        # Get all tokens we can trade to from start_token
-        intermediate_tokens = self._get_tradeable_tokens(start_token)
-        
-        for intermediate_token in intermediate_tokens:
-            if intermediate_token == start_token:
+        for intermediate, forward in self._out_edges_by_token(start).items():
+            if intermediate == start:
                 continue
             
-            # Find path: start_token -> intermediate_token -> start_token
-            forward_pairs = self._get_pairs_for_trade(start_token, intermediate_token)
-            backward_pairs = self._get_pairs_for_trade(intermediate_token, start_token)
+            backward = self._edges_between(intermediate, start)
+            if not backward.size:
+                continue
             
-            for forward_pair in forward_pairs:
-                for backward_pair in backward_pairs:
-                    # Calculate profit
-                    profit_ratio = self._calculate_path_profit([forward_pair, backward_pair])
-                    
-                    if profit_ratio > (1.0 + min_profit_threshold):
-                        path = {
-                            'type': 'simple',
-                            'tokens': [start_token, intermediate_token, start_token],
-                            'pairs': [forward_pair, backward_pair],
-                            'dexs': [forward_pair['dex'], backward_pair['dex']],
-                            'profit_ratio': profit_ratio,
-                            'profit_percentage': (profit_ratio - 1.0) * 100,
-                            'path_length': 2
-                        }
-                        paths.append(path)
+            # Score every forward/backward combination at once
+            log_ratios = log_rate[forward][:, None] + log_rate[backward][None, :]
+            for i, j in zip(*np.nonzero(log_ratios > min_log_ratio)):
+                pairs = [self._pair_dict(forward[i]), self._pair_dict(backward[j])]
+                profit_ratio = self._calculate_path_profit(pairs)
+                if profit_ratio > (1.0 + min_profit_threshold):
+                    intermediate_token = self.store.token_names[intermediate]
+                    path = {
+                        'type': 'simple',
+                        'tokens': [start_token, intermediate_token, start_token],
+                        'pairs': pairs,
+                        'dexs': [pairs[0]['dex'], pairs[1]['dex']],
+                        'profit_ratio': profit_ratio,
+                        'profit_percentage': (profit_ratio - 1.0) * 100,
+                        'path_length': 2
+                    }
+                    paths.append(path)
         
         return paths
     
     def _find_triangular_arbitrage(self, start_token: str, min_profit_threshold: float) -> List[Dict[str, Any]]:
         """Find triangular arbitrage opportunities (A -> B -> C -> A)."""
         paths = []
+        start = self.store.token_ids[start_token]
+        log_rate = self.store.log_rate
+        min_log_ratio = self._min_log_ratio(min_profit_threshold, 3)
         
-        # Get all possible intermediate tokens
-        intermediate_tokens_1 = self._get_tradeable_tokens(start_token)
-        
-        for token_b in intermediate_tokens_1:
-            if token_b == start_token:
+        for token_b, edges_ab in self._out_edges_by_token(start).items():
+            if token_b == start:
                 continue
             
-            intermediate_tokens_2 = self._get_tradeable_tokens(token_b)
-            
-            for token_c in intermediate_tokens_2:
-                if token_c == start_token or token_c == token_b:
+            for token_c, edges_bc in self._out_edges_by_token(token_b).items():
+                if token_c == start or token_c == token_b:
                     continue
                 
                 # Check if we can trade back to start_token
-                if not self._can_trade(token_c, start_token):
+                edges_ca = self._edges_between(token_c, start)
+                if not edges_ca.size:
                     continue
                 
-                # Find pairs for each leg
-                pairs_ab = self._get_pairs_for_trade(start_token, token_b)
-                pairs_bc = self._get_pairs_for_trade(token_b, token_c)
-                pairs_ca = self._get_pairs_for_trade(token_c, start_token)
-                
-                for pair_ab in pairs_ab:
-                    for pair_bc in pairs_bc:
-                        for pair_ca in pairs_ca:
-                            # Calculate profit
-                            profit_ratio = self._calculate_path_profit([pair_ab, pair_bc, pair_ca])
-                            
-                            if profit_ratio > (1.0 + min_profit_threshold):
-                                path = {
-                                    'type': 'triangular',
-                                    'tokens': [start_token, token_b, token_c, start_token],
-                                    'pairs': [pair_ab, pair_bc, pair_ca],
-                                    'dexs': [pair_ab['dex'], pair_bc['dex'], pair_ca['dex']],
-                                    'profit_ratio': profit_ratio,
-                                    'profit_percentage': (profit_ratio - 1.0) * 100,
-                                    'path_length': 3
-                                }
-                                paths.append(path)
+                log_ratios = (
+                    log_rate[edges_ab][:, None, None]
+                    + log_rate[edges_bc][None, :, None]
+                    + log_rate[edges_ca][None, None, :]
+                )
+                for i, j, k in zip(*np.nonzero(log_ratios > min_log_ratio)):
+                    pairs = [
+                        self._pair_dict(edges_ab[i]),
+                        self._pair_dict(edges_bc[j]),
+                        self._pair_dict(edges_ca[k]),
+                    ]
+                    profit_ratio = self._calculate_path_profit(pairs)
+                    if profit_ratio > (1.0 + min_profit_threshold):
+                        path = {
+                            'type': 'triangular',
+                            'tokens': [
+                                start_token,
+                                self.store.token_names[token_b],
+                                self.store.token_names[token_c],
+                                start_token,
+                            ],
+                            'pairs': pairs,
+                            'dexs': [pair['dex'] for pair in pairs],
+                            'profit_ratio': profit_ratio,
+                            'profit_percentage': (profit_ratio - 1.0) * 100,
+                            'path_length': 3
+                        }
+                        paths.append(path)
         
         return paths
     
+    @staticmethod
+    def _min_log_ratio(min_profit_threshold: float, hops: int) -> float:
+        """Log price product a path needs before slippage to clear the threshold.
+        
+        Used as a slightly loose pre-filter; survivors are re-checked exactly.
+        """
+        required = (1.0 + min_profit_threshold) / (SLIPPAGE_FACTOR ** hops)
+        return math.log(required) - 1e-12 if required > 0 else -math.inf
+    
+    def _out_edges_by_token(self, token_id: int) -> Dict[int, np.ndarray]:
+        """Active out-edges of a token grouped by destination token id."""
+        offsets, edge_ids = self.store.csr()
+        out = edge_ids[offsets[token_id]:offsets[token_id + 1]]
+        if not out.size:
+            return {}
+        destinations = self.store.dst[out]
+        order = np.argsort(destinations, kind="stable")
+        out = out[order]
+        destinations = destinations[order]
+        unique, starts = np.unique(destinations, return_index=True)
+        groups = np.split(out, starts[1:])
+        return dict(zip(unique.tolist(), groups))
+    
+    def _edges_between(self, from_id: int, to_id: int) -> np.ndarray:
+        """Ids of all active edges trading from one token to another."""
+        offsets, edge_ids = self.store.csr()
+        out = edge_ids[offsets[from_id]:offsets[from_id + 1]]
+        return out[self.store.dst[out] == to_id]
+    
+    def _pair_dict(self, edge_id: int) -> Dict[str, Any]:
+        """Pair record for an edge in the format returned with each path."""
+        store = self.store
+        log_rate = store.log_rate[edge_id]
+        return {
+            'base_token': store.token_names[store.src[edge_id]],
+            'quote_token': store.token_names[store.dst[edge_id]],
+            'dex': store.dex_names[store.dex_id[edge_id]],
+            'price': math.exp(log_rate),
+            'liquidity': float(store.liquidity[edge_id]),
+            'reverse_price': math.exp(-log_rate) if log_rate > -math.inf else 0
+        }
+    
     def _get_tradeable_tokens(self, from_token: str) -> Set[str]:
         """Get all tokens that can be traded to from the given token."""
-        tradeable = set()
-        
-        for pair_key, pair_data in self.pairs.items():
-            if pair_data['base_token'] == from_token:
-                tradeable.add(pair_data['quote_token'])
-        
-        return tradeable
+        token_id = self.store.token_ids.get(from_token)
+        if token_id is None:
+            return set()
+        return {self.store.token_names[token] for token in self._out_edges_by_token(token_id)}
     
     def _can_trade(self, from_token: str, to_token: str) -> bool:
         """Check if we can trade from one token to another."""
-        for pair_data in self.pairs.values():
-            if pair_data['base_token'] == from_token and pair_data['quote_token'] == to_token:
-                return True
-        return False
+        return bool(self._get_pairs_for_trade(from_token, to_token))
     
     def _get_pairs_for_trade(self, from_token: str, to_token: str) -> List[Dict[str, Any]]:
         """Get all pairs that allow trading from one token to another."""
-        pairs = []
-        
-        for pair_data in self.pairs.values():
-            if pair_data['base_token'] == from_token and pair_data['quote_token'] == to_token:
-                pairs.append(pair_data)
-        
-        return pairs
+        from_id = self.store.token_ids.get(from_token)
+        to_id = self.store.token_ids.get(to_token)
+        if from_id is None or to_id is None:
+            return []
+        return [self._pair_dict(edge_id) for edge_id in self._edges_between(from_id, to_id)]
     
     def _calculate_path_profit(self, pairs: List[Dict[str, Any]]) -> float:
         """Calculate the profit ratio for a trading path."""
@@ -221,22 +248,20 @@ class SimplePathFinder:
             # Apply price (accounting for liquidity would be more complex)
             amount *= price
             
-            # Simple slippage simulation (reduce by 0.1% per trade)
-            amount *= 0.999
+            # Simple slippage simulation
+            amount *= SLIPPAGE_FACTOR
         
         return amount
     
     def get_all_tokens(self) -> Set[str]:
         """Get all available tokens."""
-        return self.tokens.copy()
+        return self.store.tokens
     
     def get_pair_count(self) -> int:
         """Get number of trading pairs."""
-        return len(self.pairs)
+        return self.store.edge_count
     
     def get_dex_list(self) -> Set[str]:
         """Get list of all DEXs."""
-        dexs = set()
-        for pair_data in self.pairs.values():
-            dexs.add(pair_data['dex'])
-        return dexs
+        dex_ids = np.unique(self.store.dex_id[self.store.active])
+        return {self.store.dex_names[dex_id] for dex_id in dex_ids}
@@ -0,0 +1,273 @@
+"""Block-driven scan scheduling: one scan per new head, per chain."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Typical block times in seconds; a chain's scan deadline is a fraction of its block time,
+# but never less than the scheduler's min_deadline
+BLOCK_TIMES = {
+    'ethereum': 12.0,
+    'arbitrum': 0.25,
+    'base': 2.0,
+    'optimism': 2.0,
+    'polygon': 2.0,
+    'bsc': 3.0,
+    'avalanche': 2.0,
+    'fantom': 1.0,
+}
+
+
+class _ChainSchedule:
+    """Head tracking and the in-flight scan for one chain."""
+
+    __slots__ = ("latest", "head_time", "scanned", "new_head", "scan_task", "scan_block", "source", "stats")
+
+    def __init__(self):
+        self.latest: Optional[int] = None
+        self.head_time = 0.0                 # monotonic time the latest head was seen
+        self.scanned: Optional[int] = None   # last block a scan was started for
+        self.new_head = asyncio.Event()
+        self.scan_task: Optional[asyncio.Task] = None
+        self.scan_block: Optional[int] = None
+        self.source = 'poll'
+        self.stats = {
+            'heads': 0,
+            'scans': 0,
+            'completed': 0,
+            'deadline_cancels': 0,
+            'superseded': 0,
+            'skipped_heads': 0,
+            'errors': 0,
+            'last_scan_ms': 0.0,
+            'avg_scan_ms': 0.0,
+            'last_head_to_scan_ms': 0.0,
+        }
+
+
+class BlockScanScheduler:
+    """Runs a scan for each chain right after each of its blocks.
+
+    Heads come from an eth_subscribe("newHeads") websocket when the chain has
+    a ws URL, falling back to polling eth_blockNumber. Every head wakes the
+    chain's scanner, which scans the latest block only: heads that arrive
+    while a scan or its result handler is running are coalesced. A scan
+    runs under a per-block deadline (deadline_fraction of the chain's block
+    time, at least min_deadline, measured from when the head was seen) and
+    is cancelled when the deadline passes, so scans never overlap. A newer
+    head also cancels it, unless the deadline is longer than a block: on
+    fast chains such as Arbitrum a scan may then span several heads, and
+    the next one starts on the latest of them.
+
+    on_result runs after a completed scan, outside the deadline, so work
+    such as trade execution is never cancelled by the scheduler.
+    """
+
+    def __init__(self, web3_connections: Dict[str, Any],
+                 scan: Callable[[str, int], Awaitable[Any]],
+                 on_result: Optional[Callable[[str, int, Any], Awaitable[None]]] = None,
+                 ws_urls: Optional[Dict[str, str]] = None,
+                 block_times: Optional[Dict[str, float]] = None,
+                 deadline_fraction: float = 0.8,
+                 min_deadline: float = 1.0,
+                 min_poll_interval: float = 0.25,
+                 ws_retry_seconds: float = 60.0):
+        """Initialize the scheduler.
+
+        Args:
+            web3_connections: chain -> sync Web3, used for head polling.
+            scan: Coroutine function scan(chain, block) returning a result.
+            on_result: Coroutine function on_result(chain, block, result).
+            ws_urls: chain -> websocket URL for newHeads subscriptions.
+            block_times: Per-chain block time overrides, in seconds.
+            deadline_fraction: Share of the block time a scan may take.
+            min_deadline: Shortest deadline any scan gets, in seconds.
+            min_poll_interval: Shortest interval between eth_blockNumber polls.
+            ws_retry_seconds: How long to poll before retrying a failed subscription.
+        """
+        self.web3_connections = web3_connections
+        self.scan = scan
+        self.on_result = on_result
+        self.ws_urls = {chain: url for chain, url in (ws_urls or {}).items() if url}
+        self.block_times = {**BLOCK_TIMES, **(block_times or {})}
+        self.deadline_fraction = deadline_fraction
+        self.min_deadline = min_deadline
+        self.min_poll_interval = min_poll_interval
+        self.ws_retry_seconds = ws_retry_seconds
+
+        self.running = False
+        self._chains: Dict[str, _ChainSchedule] = {}
+        self._tasks = []
+
+    def deadline(self, chain: str) -> float:
+        """Seconds a scan on this chain may take after its head is seen."""
+        return max(self.block_times.get(chain, 2.0) * self.deadline_fraction, self.min_deadline)
+
+    def supersedes(self, chain: str) -> bool:
+        """Whether a newer head cancels a scan still running on this chain."""
+        return self.deadline(chain) <= self.block_times.get(chain, 2.0)
+
+    async def run(self) -> None:
+        """Follow heads and scan every chain until stop() is called."""
+        self.running = True
+        for chain in self.web3_connections:
+            self._chains[chain] = _ChainSchedule()
+            self._tasks.append(asyncio.create_task(self._follow_heads(chain)))
+            self._tasks.append(asyncio.create_task(self._scan_loop(chain)))
+        logger.info(f"⛓️ Block-driven scanning on {', '.join(self.web3_connections)}")
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Cancel head followers, scanners and any in-flight scan."""
+        self.running = False
+        tasks, self._tasks = self._tasks, []
+        for state in self._chains.values():
+            if state.scan_task and not state.scan_task.done():
+                state.scan_task.cancel()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _on_head(self, chain: str, number: int) -> None:
+        """Record a new head and wake the chain's scanner."""
+        state = self._chains[chain]
+        if state.latest is not None and number <= state.latest:
+            return
+        state.latest = number
+        state.head_time = time.monotonic()
+        state.stats['heads'] += 1
+
+        # A scan of an older block is stale now, if a fresh one can finish within a block
+        if (state.scan_task and not state.scan_task.done() and state.scan_block < number
+                and self.supersedes(chain)):
+            state.scan_task.cancel()
+        state.new_head.set()
+
+    async def _follow_heads(self, chain: str) -> None:
+        """Subscribe to new heads, polling while no subscription is available."""
+        url = self.ws_urls.get(chain)
+        while self.running:
+            if url:
+                try:
+                    await self._subscribe_heads(chain, url)
+                except asyncio.CancelledError:
+                    raise
+                except ImportError:
+                    # WebSocketProvider and process_subscriptions need web3 >= 7
+                    logger.warning(f"⚠️ {chain}: web3 has no WebSocketProvider, polling for new heads")
+                    url = None
+                    continue
+                except Exception as e:
+                    logger.warning(f"⚠️ {chain}: newHeads subscription failed ({e}), polling")
+                try:
+                    await asyncio.wait_for(self._poll_heads(chain), self.ws_retry_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self._poll_heads(chain)
+
+    async def _subscribe_heads(self, chain: str, url: str) -> None:
+        from web3 import AsyncWeb3, WebSocketProvider
+
+        async with AsyncWeb3(WebSocketProvider(url)) as w3:
+            await w3.eth.subscribe('newHeads')
+            self._chains[chain].source = 'ws'
+            async for message in w3.socket.process_subscriptions():
+                number = message['result']['number']
+                self._on_head(chain, int(number, 16) if isinstance(number, str) else int(number))
+        self._chains[chain].source = 'poll'
+
+    async def _poll_heads(self, chain: str) -> None:
+        w3 = self.web3_connections[chain]
+        loop = asyncio.get_running_loop()
+        interval = max(self.min_poll_interval, self.block_times.get(chain, 2.0) / 2)
+        self._chains[chain].source = 'poll'
+        while self.running:
+            try:
+                number = await loop.run_in_executor(None, lambda: w3.eth.block_number)
+            except Exception as e:
+                logger.debug(f"{chain}: block number poll failed: {e}")
+            else:
+                self._on_head(chain, number)
+            await asyncio.sleep(interval)
+
+    async def _scan_loop(self, chain: str) -> None:
+        """Scan the latest head each time one arrives."""
+        state = self._chains[chain]
+        stats = state.stats
+        while self.running:
+            await state.new_head.wait()
+            state.new_head.clear()
+
+            block = state.latest
+            if state.scanned is not None and block - state.scanned > 1:
+                stats['skipped_heads'] += block - state.scanned - 1
+            state.scanned = block
+
+            remaining = self.deadline(chain) - (time.monotonic() - state.head_time)
+            if remaining <= 0:
+                stats['deadline_cancels'] += 1
+                continue
+
+            stats['scans'] += 1
+            stats['last_head_to_scan_ms'] = (time.monotonic() - state.head_time) * 1000
+            started = time.perf_counter()
+            state.scan_block = block
+            state.scan_task = task = asyncio.create_task(self.scan(chain, block))
+            timed_out = False
+            try:
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                timed_out = not done
+            finally:
+                if not task.done():
+                    task.cancel()
+                    # Let the scan unwind before another one starts
+                    await asyncio.wait({task})
+
+            if timed_out:
+                stats['deadline_cancels'] += 1
+                logger.debug(f"{chain}: scan of block {block} cancelled at its {self.deadline(chain):.2f}s deadline")
+                continue
+            if task.cancelled():
+                # A newer head arrived mid-scan
+                stats['superseded'] += 1
+                continue
+            if task.exception() is not None:
+                stats['errors'] += 1
+                logger.warning(f"⚠️ {chain}: scan of block {block} failed: {task.exception()}")
+                continue
+
+            scan_ms = (time.perf_counter() - started) * 1000
+            stats['completed'] += 1
+            stats['last_scan_ms'] = scan_ms
+            stats['avg_scan_ms'] += (scan_ms - stats['avg_scan_ms']) / stats['completed']
+
+            if self.on_result is not None:
+                try:
+                    await self.on_result(chain, block, task.result())
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    stats['errors'] += 1
+                    logger.error(f"{chain}: handling scan of block {block} failed: {e}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-chain head and scan counters."""
+        return {
+            chain: {
+                **state.stats,
+                'latest_block': state.latest,
+                'head_source': state.source,
+                'deadline_seconds': self.deadline(chain),
+            }
+            for chain, state in self._chains.items()
+        }
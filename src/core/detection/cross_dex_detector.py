@@ -12,7 +12,10 @@ import uuid
 from decimal import Decimal
 from typing import Dict, List, Any, Optional, Set, Tuple, cast # Import Any
 
+from ...dex.amm_math import AmmPool
 from ...dex.base_dex import BaseDEX
+from ...dex.pool_index import PoolIndex
+from .quote_cache import QuoteCache
 from ...interfaces import OpportunityDetector, MarketDataProvider
 from ...models import (
     ArbitrageOpportunity,
@@ -32,16 +35,25 @@ class CrossDexDetector(OpportunityDetector):
     across different DEXs and calculates potential arbitrage profits.
     """
 
-    def __init__(self, dexes: List[BaseDEX], config: Dict[str, Any] = None):
+    def __init__(
+        self,
+        dexes: List[BaseDEX],
+        config: Dict[str, Any] = None,
+        pool_index: Optional[PoolIndex] = None,
+    ):
         """
         Initialize the cross-DEX detector.
 
         Args:
             dexes: List of DEXs to monitor
             config: Configuration dictionary
+            pool_index: Factory pool index; when set, pairs for DEXs that only
+                expose get_supported_tokens are looked up in it instead of
+                being probed with get_pool_address
         """
         self.dexes = dexes
         self.config = config or {}
+        self.pool_index = pool_index
 
         # Configuration
         self.min_profit_percentage = Decimal(
@@ -60,13 +72,11 @@ class CrossDexDetector(OpportunityDetector):
             self.config.get("confidence_threshold", "0.7")
         )  # 70% confidence
 
-        # Cache for token pairs with timestamps
-        self._token_pair_cache: Dict[str, Tuple[List[Any], float]] = {} # Use Any
-        self._price_cache: Dict[str, Tuple[Decimal, float]] = {}
+        # Token pairs and quotes with per-entry expiry; read without locks,
+        # and concurrent misses for one key share a single fetch
         self._cache_ttl = float(self.config.get("cache_ttl_seconds", 5.0))
-
-        # Locks
-        self._cache_lock = asyncio.Lock()
+        self._token_pair_cache = QuoteCache(self._cache_ttl)
+        self._price_cache = QuoteCache(self._cache_ttl)
 
         logger.info(f"CrossDexDetector initialized with {len(dexes)} DEXs")
 
@@ -174,64 +184,65 @@ class CrossDexDetector(OpportunityDetector):
         Returns:
             List of token pairs from the DEX
         """
-        cache_key = (
-            f"{dex.id}_{hash(frozenset(token_filter)) if token_filter else 'all'}"
-        )
-
-        # Check cache
-        async with self._cache_lock:
-            cached = self._token_pair_cache.get(cache_key)
-            current_time = time.time()
-
-            if cached and (current_time - cached[1] < self._cache_ttl):
-                return cached[0]
+        cache_key = (dex.id, frozenset(token_filter) if token_filter else None)
 
-        # Get token pairs from DEX
         try:
-            # Ensure DEX is price source
-            if not isinstance(dex, BaseDEX):
-                logger.warning(f"DEX {dex.id} is not a BaseDEX, skipping")
-                return []
-
-            # Get all pairs from DEX
-            # Try different methods to get token pairs
-            if hasattr(dex, 'get_token_pairs'):
-                # Use get_token_pairs if available
-                token_pairs = await dex.get_token_pairs(
-                    max_pairs=self.max_pairs_per_dex
-                )
-            elif hasattr(dex, 'get_supported_tokens'):
-                # If get_token_pairs is not available, try to build pairs from supported tokens
-                logger.info(f"Using get_supported_tokens for {dex.id} instead of get_token_pairs")
-                token_pairs = await self._build_token_pairs_from_supported_tokens(dex)
-            elif hasattr(dex, 'get_pools'):
-                # If get_pools is available, try to use that
-                logger.info(f"Using get_pools for {dex.id} instead of get_token_pairs")
-                token_pairs = await self._build_token_pairs_from_pools(dex)
-            else:
-                # No suitable method found
-                logger.warning(f"DEX {dex.id} does not have get_token_pairs or alternative methods.")
-                return []
+            return await self._token_pair_cache.get_or_fetch(
+                cache_key, lambda: self._load_token_pairs(dex, token_filter)
+            )
+        except Exception as e:
+            logger.error(f"Error getting token pairs from {dex.id}: {e}")
+            return []
 
-            # Filter by tokens if specified
-            if token_filter:
-                token_pairs = [
-                    pair
-                    for pair in token_pairs
-                    if pair.token0_address in token_filter
-                    or pair.token1_address in token_filter
-                ]
+    async def _load_token_pairs(
+        self, dex: BaseDEX, token_filter: Optional[Set[str]] = None
+    ) -> List[Any]: # Use Any
+        """
+        Load token pairs from a single DEX, bypassing the cache.
 
-            # Update cache
-            async with self._cache_lock:
-                self._token_pair_cache[cache_key] = (token_pairs, time.time())
+        Args:
+            dex: DEX to get token pairs from
+            token_filter: Optional set of token addresses to filter by
 
-            return token_pairs
+        Returns:
+            List of token pairs from the DEX
+        """
+        # Ensure DEX is price source
+        if not isinstance(dex, BaseDEX):
+            logger.warning(f"DEX {dex.id} is not a BaseDEX, skipping")
+            return []
 
-        except Exception as e:
-            logger.error(f"Error getting token pairs from {dex.id}: {e}")
+        # Get all pairs from DEX
+        # Try different methods to get token pairs
+        if hasattr(dex, 'get_token_pairs'):
+            # Use get_token_pairs if available
+            token_pairs = await dex.get_token_pairs(
+                max_pairs=self.max_pairs_per_dex
+            )
+        elif hasattr(dex, 'get_supported_tokens'):
+            # If get_token_pairs is not available, try to build pairs from supported tokens
+            logger.info(f"Using get_supported_tokens for {dex.id} instead of get_token_pairs")
+            token_pairs = await self._build_token_pairs_from_supported_tokens(dex)
+        elif hasattr(dex, 'get_pools'):
+            # If get_pools is available, try to use that
+            logger.info(f"Using get_pools for {dex.id} instead of get_token_pairs")
+            token_pairs = await self._build_token_pairs_from_pools(dex)
+        else:
+            # No suitable method found
+            logger.warning(f"DEX {dex.id} does not have get_token_pairs or alternative methods.")
             return []
 
+        # Filter by tokens if specified
+        if token_filter:
+            token_pairs = [
+                pair
+                for pair in token_pairs
+                if pair.token0_address in token_filter
+                or pair.token1_address in token_filter
+            ]
+
+        return token_pairs
+
     def _group_token_pairs(
         self, token_pairs_by_dex: Dict[BaseDEX, List[Any]]
     ) -> Dict[str, Dict[BaseDEX, Any]]: # Use Any
@@ -453,6 +464,29 @@ class CrossDexDetector(OpportunityDetector):
                 logger.warning(f"No supported tokens found for {dex.id}")
                 return []
 
+            # Indexed pools need no per-pair lookups; only reserves are read
+            if self.pool_index is not None and self.pool_index.covers(dex.id):
+                pools = self.pool_index.pools_among(supported_tokens, dex=dex.id)[
+                    : self.max_pairs_per_dex
+                ]
+                reserves = await asyncio.gather(
+                    *(self._get_pool_reserves(dex, pool.address) for pool in pools)
+                )
+                return [
+                    TokenPair(
+                        token0_address=pool.token0,
+                        token1_address=pool.token1,
+                        pool_address=pool.address,
+                        reserve0=reserve0,
+                        reserve1=reserve1,
+                        fee=Decimal(pool.fee) / Decimal("1000000"),
+                        dex_id=dex.id,
+                        token0_decimals=pool.token0_decimals or 18,
+                        token1_decimals=pool.token1_decimals or 18,
+                    )
+                    for pool, (reserve0, reserve1) in zip(pools, reserves)
+                ]
+
             # Create pairs from supported tokens
             pairs = []
             for i, token0 in enumerate(supported_tokens):
@@ -536,6 +570,35 @@ class CrossDexDetector(OpportunityDetector):
             logger.error(f"Error building token pairs from supported tokens for {dex.id}: {e}")
             return []
 
+    async def _get_pool_reserves(
+        self, dex: BaseDEX, pool_address: str
+    ) -> Tuple[Decimal, Decimal]:
+        """
+        Get reserves for a pool, or zeros if the DEX cannot provide them.
+
+        Args:
+            dex: DEX the pool belongs to
+            pool_address: Pool address
+
+        Returns:
+            Tuple of (reserve0, reserve1)
+        """
+        try:
+            if hasattr(dex, 'get_reserves'):
+                reserves = await dex.get_reserves(pool_address)
+                if isinstance(reserves, tuple) and len(reserves) == 2:
+                    return reserves
+            elif hasattr(dex, 'get_pool_info'):
+                pool_info = await dex.get_pool_info(pool_address)
+                if pool_info and 'reserve0' in pool_info and 'reserve1' in pool_info:
+                    return (
+                        Decimal(str(pool_info['reserve0'])),
+                        Decimal(str(pool_info['reserve1'])),
+                    )
+        except Exception as e:
+            logger.debug(f"Error getting reserves for {pool_address}: {e}")
+        return Decimal(0), Decimal(0)
+
     async def _build_token_pairs_from_pools(self, dex: BaseDEX) -> List[Any]:
         """
         Build token pairs from pools.
@@ -637,67 +700,80 @@ class CrossDexDetector(OpportunityDetector):
         """
         token0_address = token_pair.token0_address
         token1_address = token_pair.token1_address
-        cache_key_0 = f"{dex.id}_{token0_address}_{token1_address}"
-        cache_key_1 = f"{dex.id}_{token1_address}_{token0_address}"
-        current_time = time.time()
-
-        # Check cache first
-        async with self._cache_lock:
-            cached_0 = self._price_cache.get(cache_key_0)
-            if cached_0 and (current_time - cached_0[1] < self._cache_ttl):
-                token0_price = cached_0[0]
-            else:
-                token0_price = None
-
-            cached_1 = self._price_cache.get(cache_key_1)
-            if cached_1 and (current_time - cached_1[1] < self._cache_ttl):
-                token1_price = cached_1[0]
-            else:
-                token1_price = None
-
-        # Fetch prices if not cached or expired
-        if token0_price is None or token1_price is None:
-            try:
-                # Get decimals (assuming BaseDEX provides this or we can fetch it)
-                # Fallback to 18 if method doesn't exist
-                decimals0 = getattr(token_pair, 'token0_decimals', 18)
-                decimals1 = getattr(token_pair, 'token1_decimals', 18)
-                if not isinstance(decimals0, int): # Fetch if not available on pair object
-                     decimals0 = await dex.get_token_decimals(token0_address)
-                if not isinstance(decimals1, int):
-                     decimals1 = await dex.get_token_decimals(token1_address)
-
-                # --- Calculate price of token0 in terms of token1 ---
-                # Get how much token1 we get for 1 unit of token0
-                amount_in_0 = Decimal(10**decimals0) # 1 unit of token0 in wei
-                path_0_to_1 = [token0_address, token1_address]
-                amounts_out_0 = await dex.get_amounts_out(amount_in_0 / Decimal(10**decimals0), path_0_to_1) # Pass human-readable amount
-                if len(amounts_out_0) > 1:
-                    token0_price = amounts_out_0[1] # Amount of token1 received for 1 token0
-                    async with self._cache_lock:
-                        self._price_cache[cache_key_0] = (token0_price, current_time)
-                else:
-                    token0_price = Decimal("0") # Failed quote
-
-                # --- Calculate price of token1 in terms of token0 ---
-                # Get how much token0 we get for 1 unit of token1
-                amount_in_1 = Decimal(10**decimals1) # 1 unit of token1 in wei
-                path_1_to_0 = [token1_address, token0_address]
-                amounts_out_1 = await dex.get_amounts_out(amount_in_1 / Decimal(10**decimals1), path_1_to_0) # Pass human-readable amount
-                if len(amounts_out_1) > 1:
-                    token1_price = amounts_out_1[1] # Amount of token0 received for 1 token1
-                    async with self._cache_lock:
-                        self._price_cache[cache_key_1] = (token1_price, current_time)
-                else:
-                    token1_price = Decimal("0") # Failed quote
 
-            except Exception as e:
-                logger.error(f"Error getting prices via get_amounts_out for {dex.id}: {e}")
-                token0_price = token0_price if token0_price is not None else Decimal("0")
-                token1_price = token1_price if token1_price is not None else Decimal("0")
+        # Pairs with known reserves are quoted locally, without RPC
+        local_prices = self._quote_from_reserves(token_pair)
+        if local_prices is not None:
+            return local_prices
+
+        # Both directions at once; a failed quote is not cached and reads as 0
+        quotes = await asyncio.gather(
+            self._price_cache.get_or_fetch(
+                (dex.id, token0_address, token1_address),
+                lambda: self._quote_one_unit(dex, token0_address, token1_address),
+            ),
+            self._price_cache.get_or_fetch(
+                (dex.id, token1_address, token0_address),
+                lambda: self._quote_one_unit(dex, token1_address, token0_address),
+            ),
+            return_exceptions=True,
+        )
+        for quote in quotes:
+            if isinstance(quote, Exception):
+                logger.error(f"Error getting prices via get_amounts_out for {dex.id}: {quote}")
+        token0_price, token1_price = (
+            Decimal("0") if isinstance(quote, Exception) else quote for quote in quotes
+        )
 
         return token0_price, token1_price
 
+    def _quote_from_reserves(self, token_pair: Any) -> Optional[Tuple[Decimal, Decimal]]:
+        """
+        Price a pair from its cached reserves with constant-product math.
+
+        Reserves are taken to be in the tokens' smallest units, as
+        getReserves returns them.
+
+        Args:
+            token_pair: Object with reserve0, reserve1, fee and decimals
+
+        Returns:
+            (token0_price, token1_price) for one whole token in, or None
+            when the pair has no reserves
+        """
+        reserve0 = int(getattr(token_pair, 'reserve0', 0) or 0)
+        reserve1 = int(getattr(token_pair, 'reserve1', 0) or 0)
+        if reserve0 <= 0 or reserve1 <= 0:
+            return None
+
+        decimals0 = getattr(token_pair, 'token0_decimals', 18)
+        decimals1 = getattr(token_pair, 'token1_decimals', 18)
+        pool = AmmPool(
+            reserve0=reserve0,
+            reserve1=reserve1,
+            fee_bps=int(Decimal(str(getattr(token_pair, 'fee', "0.003"))) * 10000),
+            stable=bool(getattr(token_pair, 'stable', False)),
+            decimals0=decimals0,
+            decimals1=decimals1,
+        )
+        token0_price = Decimal(pool.get_amount_out(10**decimals0, True)) / Decimal(10**decimals1)
+        token1_price = Decimal(pool.get_amount_out(10**decimals1, False)) / Decimal(10**decimals0)
+        return token0_price, token1_price
+
+    async def _quote_one_unit(
+        self, dex: BaseDEX, token_in: str, token_out: str
+    ) -> Decimal:
+        """
+        Amount of token_out received for one whole token_in.
+
+        Raises:
+            ValueError: If the DEX returned no output amount
+        """
+        amounts_out = await dex.get_amounts_out(Decimal("1"), [token_in, token_out]) # Pass human-readable amount
+        if len(amounts_out) > 1:
+            return amounts_out[1]
+        raise ValueError(f"no quote for {token_in} -> {token_out}")
+
     async def _create_opportunity(
         self,
         dex_buy: BaseDEX,
@@ -940,7 +1016,8 @@ class CrossDexDetector(OpportunityDetector):
 
 
 async def create_cross_dex_detector(
-    dexes: List[BaseDEX], config: Dict[str, Any] = None # Use BaseDEX
+    dexes: List[BaseDEX], config: Dict[str, Any] = None, # Use BaseDEX
+    pool_index: Optional[PoolIndex] = None,
 ) -> CrossDexDetector:
     """
     Factory function to create a cross-DEX detector.
@@ -948,8 +1025,9 @@ async def create_cross_dex_detector(
     Args:
         dexes: List of DEXs to monitor
         config: Configuration dictionary
+        pool_index: Optional factory pool index for pair enumeration
 
     Returns:
         Initialized cross-DEX detector
     """
-    return CrossDexDetector(dexes=dexes, config=config)
+    return CrossDexDetector(dexes=dexes, config=config, pool_index=pool_index)
@@ -0,0 +1,120 @@
+"""Lock-free TTL cache with single-flight fetches for the detection event loop."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    """TTL cache owned by one event loop.
+
+    Reads and writes are plain dict operations: the detector only touches
+    the cache from its event loop, so no coroutine can interleave with
+    another inside get() or set() and no lock is needed. Each entry carries
+    its own expiry. On a miss, get_or_fetch() starts one fetch per key and
+    every concurrent caller for that key awaits the same result. A failed
+    fetch is not cached; its exception goes to all of those callers.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        """Initialize the cache.
+
+        Args:
+            ttl: Default seconds an entry stays fresh.
+            max_entries: Size above which expired entries are purged, then
+                the oldest dropped until the cache is 90% full.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}   # key -> (value, expires at)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'fetch_errors': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The fresh value for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value that expires after ttl seconds (default: the cache's)."""
+        self._entries.pop(key, None)
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        if len(self._entries) > self.max_entries:
+            self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key so the next read fetches it."""
+        self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                           ttl: Optional[float] = None) -> Any:
+        """Return the cached value for key, fetching it once on a miss.
+
+        Args:
+            key: Cache key.
+            fetch: Coroutine function producing the value.
+            ttl: Expiry for the fetched value (default: the cache's).
+
+        Returns:
+            The cached or fetched value. Raises whatever fetch raised.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.stats['hits'] += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats['coalesced'] += 1
+            # Shielded so a cancelled waiter does not cancel the shared fetch
+            return await asyncio.shield(pending)
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome retrieved even when no other caller waited on it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.stats['fetch_errors'] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if value is not None:
+            self.set(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def _evict(self) -> None:
+        """Purge expired entries, then the oldest ones if still near max_entries."""
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        excess = len(self._entries) - int(self.max_entries * 0.9)
+        if excess > 0:
+            for key in list(self._entries)[:excess]:
+                del self._entries[key]
@@ -75,11 +75,13 @@ class SimpleCrossDexDetector:
                 ('UNI', 'USDC')
             ]
 
+            # Get prices for every pair from all DEXs in one batched sweep
+            all_prices = await self.dex_manager.get_cross_dex_prices_batch(trading_pairs)
+
             # Check each trading pair across all connected DEXs
             for base_token, quote_token in trading_pairs:
                 try:
-                    # Get prices from all DEXs for this pair
-                    prices = await self.dex_manager.get_cross_dex_prices(base_token, quote_token)
+                    prices = all_prices[(base_token, quote_token)]
 
                     # Analyze price differences for arbitrage opportunities
                     pair_opportunities = self._analyze_price_spreads(base_token, quote_token, prices)
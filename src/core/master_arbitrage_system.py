@@ -5,14 +5,20 @@ Complete integrated arbitrage system with real execution capabilities.
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import signal
 import os
+import time
 from dataclasses import dataclass
 
+from src.utils.trade_log import get_trade_log, start_trade_logging
+
 logger = logging.getLogger(__name__)
+# Per-opportunity lines: sampled, lazily formatted, written off the event loop
+scan_log = get_trade_log('scan')
+filter_log = get_trade_log('filter')
 
 # 🎨 FLOW VISUALIZATION INTEGRATION
 try:
@@ -65,6 +71,9 @@ class MasterArbitrageSystem:
         from src.config.trading_config import CONFIG
         self.execution_settings = {
             'scan_interval_seconds': config.get('scan_interval_seconds', int(os.getenv('SCAN_INTERVAL', '15'))),  # Faster scanning
+            'scan_trigger': config.get('scan_trigger', os.getenv('SCAN_TRIGGER', 'block')),  # 'block' or 'interval'
+            'scan_deadline_fraction': float(config.get('scan_deadline_fraction', os.getenv('SCAN_DEADLINE_FRACTION', '0.8'))),
+            'scan_min_deadline': float(config.get('scan_min_deadline', os.getenv('SCAN_MIN_DEADLINE', '1.0'))),
             'min_profit_usd': CONFIG.MIN_PROFIT_USD,  # 🎯 $0.25 minimum from centralized config
             'max_trade_size_usd': int(os.getenv('MAX_TRADE_SIZE_USD', '500')),  # Bigger trades for profitability!
             'min_profit_percentage': CONFIG.MIN_PROFIT_PERCENTAGE,  # 0.1% minimum from config
@@ -72,7 +81,13 @@ class MasterArbitrageSystem:
             'enable_cross_chain': False,        # Disable cross-chain (focus on same-chain first)
             'enable_same_chain': True,          # Enable same-chain arbitrage (PRIORITY)
             'preferred_bridges': os.getenv('PREFERRED_BRIDGES', 'across,stargate,synapse').split(','),
-            'max_execution_time_seconds': int(os.getenv('EXECUTION_TIMEOUT', '300'))
+            'max_execution_time_seconds': int(os.getenv('EXECUTION_TIMEOUT', '300')),
+            'opportunity_max_age_seconds': float(config.get('opportunity_max_age_seconds', os.getenv('OPPORTUNITY_MAX_AGE', '4'))),
+            'pipeline_queue_size': int(config.get('pipeline_queue_size', 4)),
+            'detection_mode': config.get('detection_mode', os.getenv('DETECTION_MODE', 'in_process')),  # or 'sharded'
+            'shard_scan_interval_seconds': float(config.get('shard_scan_interval_seconds', 1.0)),
+            'shard_autoscale': config.get('shard_autoscale', os.getenv('SHARD_AUTOSCALE', 'true').lower() == 'true'),
+            'trade_log_path': config.get('trade_log_path', os.getenv('TRADE_LOG_PATH'))  # JSONL of scan/filter/execution events
         }
 
         # L2-Optimized gas settings
@@ -133,6 +148,16 @@ class MasterArbitrageSystem:
         # Active executions
         self.active_executions = {}
 
+        # Per-chain new-head scanning, the scan → filter → execute stages and
+        # (in sharded detection mode) the per-chain scanner processes and the
+        # controller that adds or removes them, created when the main loop starts
+        self.block_scheduler = None
+        self.pipeline = None
+        self.shard_supervisor = None
+        self.scaling_controller = None
+        # Background writer for scan/filter/execution records
+        self.trade_logging = None
+
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -206,7 +231,8 @@ class MasterArbitrageSystem:
             logger.info("=" * 60)
             logger.info(f"💰 Mode: {self.execution_mode.upper()}")
             logger.info(f"🎯 Min Profit: ${self.execution_settings['min_profit_usd']}")
-            logger.info(f"📊 Scan Interval: {self.execution_settings['scan_interval_seconds']}s")
+            logger.info(f"📊 Scan Trigger: {self.execution_settings['scan_trigger']} "
+                        f"(interval fallback {self.execution_settings['scan_interval_seconds']}s)")
             logger.info(f"🌉 Bridges: {', '.join(self.execution_settings['preferred_bridges'])}")
             logger.info("=" * 60)
 
@@ -224,6 +250,7 @@ class MasterArbitrageSystem:
             # Start system
             self.running = True
             self.performance_stats['start_time'] = datetime.now()
+            self.trade_logging = start_trade_logging(self.execution_settings['trade_log_path'])
 
             # Start background tasks
             tasks = [
@@ -249,74 +276,96 @@ class MasterArbitrageSystem:
             return False
 
     async def _main_arbitrage_loop(self, wallet_private_key: str = None):
-        """Main arbitrage detection and execution loop."""
+        """Main arbitrage detection and execution loop.
+
+        Scans only feed the pipeline; filtering and execution run in its
+        stages, so the next scan starts while a trade is still confirming.
+        """
         logger.info("🔄 Starting main arbitrage loop...")
 
+        from src.core.opportunity_pipeline import OpportunityPipeline
+
+        async def execute(opportunities: List[Dict[str, Any]]):
+            if not self._check_emergency_shutdown():
+                await self._execute_opportunities(opportunities, wallet_private_key)
+
+        queue_size = self.execution_settings['pipeline_queue_size']
+        self.pipeline = OpportunityPipeline(
+            self._select_viable_opportunities,
+            execute,
+            max_age_seconds=self.execution_settings['opportunity_max_age_seconds'],
+            scan_queue_size=queue_size,
+            execute_queue_size=max(1, queue_size // 2)
+        )
+        self.pipeline.start()
+        if self.execution_settings['detection_mode'] == 'sharded':
+            self._start_detection_shards()
+            if self.execution_settings['shard_autoscale']:
+                await self._start_shard_scaling()
+        try:
+            if self.execution_settings['scan_trigger'] == 'block':
+                web3_connections = getattr(self.executor, 'web3_connections', None) or {}
+                if web3_connections:
+                    await self._block_driven_loop(web3_connections)
+                    return
+                logger.warning("⚠️ No chain connections for block-driven scanning, using the scan interval")
+            await self._interval_scan_loop()
+        finally:
+            await self.pipeline.stop()
+            if self.scaling_controller:
+                await self.scaling_controller.stop_scaling_controller()
+            if self.shard_supervisor:
+                await asyncio.get_running_loop().run_in_executor(None, self.shard_supervisor.stop)
+
+    def _start_detection_shards(self):
+        """Move quoting and spread/triangle search into one process per chain."""
+        from src.core.sharded_detection import ShardedDetectionSupervisor
+
+        if self.executor and getattr(self.executor, 'web3_connections', None):
+            chains = list(self.executor.web3_connections)
+        else:
+            chains = list(self.config.get('networks', ['arbitrum', 'base', 'optimism']))
+        self.shard_supervisor = ShardedDetectionSupervisor(
+            chains,
+            tokens=self.price_feeds.priority_tokens,
+            dexes=list(self.price_feeds.enabled_dexes),
+            config=self.config,
+            scan_interval=self.execution_settings['shard_scan_interval_seconds'],
+            min_profit_percentage=self.execution_settings['min_profit_percentage'],
+            max_age_seconds=self.execution_settings['opportunity_max_age_seconds']
+        )
+        self.shard_supervisor.start()
+
+    async def _start_shard_scaling(self):
+        """Add a detection process when the busiest shard runs hot, remove one when all idle."""
+        from src.resource_management.scaling_controller import ScalingController
+
+        self.scaling_controller = ScalingController()
+        self.scaling_controller.register_detection_shards(self.shard_supervisor)
+        await self.scaling_controller.start_scaling_controller()
+
+    async def _interval_scan_loop(self):
+        """Scan every scan_interval_seconds until the system stops."""
         while self.running:
             try:
-                # 🛡️ AUTO-SHUTDOWN CHECK: Check if emergency shutdown was triggered
-                if self.executor and hasattr(self.executor, 'is_emergency_shutdown') and self.executor.is_emergency_shutdown():
-                    logger.error("🛑 EMERGENCY SHUTDOWN DETECTED!")
-                    logger.error("   💥 Auto-shutdown triggered due to excessive failed transactions")
-                    logger.error("   🛡️ Stopping arbitrage system to protect capital")
-                    self.running = False
+                if self._check_emergency_shutdown():
                     break
 
                 cycle_start = datetime.now()
+                scan_started = time.monotonic()
                 self.performance_stats['total_scans'] += 1
 
                 logger.info(f"⏰ Scan #{self.performance_stats['total_scans']} - {cycle_start.strftime('%H:%M:%S')}")
 
-                # 1. Scan for opportunities
+                # 1. Scan for opportunities; filtering and execution happen in the pipeline
                 opportunities = await self._scan_for_opportunities()
-
-                if opportunities:
-                    self.performance_stats['opportunities_found'] += len(opportunities)
-                    logger.info(f"   🎯 Found {len(opportunities)} opportunities")
-
-                    # 💰 SHOW TRADE AMOUNT: Display the dollar amount that will be used
-                    if hasattr(self, 'executor') and self.executor:
-                        try:
-                            # Get wallet value and calculate trade amount using centralized config
-                            from config.trading_config import CONFIG
-                            wallet_value = getattr(self.executor, 'total_wallet_value_usd', 458.31)  # Your current wallet value
-                            trade_amount_usd = wallet_value * CONFIG.MAX_TRADE_PERCENTAGE
-
-                            logger.info(f"   💰 Trade amount: ${trade_amount_usd:.2f} ({CONFIG.MAX_TRADE_PERCENTAGE*100:.0f}% of ${wallet_value:.2f} wallet)")
-                        except Exception as e:
-                            logger.info(f"   💰 Trade amount: ~$344 (75% of wallet)")  # Fallback estimate
-
-                    # 🎨 ADD OPPORTUNITIES TO FLOW VISUALIZATION
-                    if flow_canvas:
-                        for opp in opportunities:
-                            flow_canvas.add_arbitrage_flow({
-                                'id': opp.get('opportunity_id', f"opp_{int(datetime.now().timestamp())}"),
-                                'token': opp.get('token', 'UNKNOWN'),
-                                'buy_dex': opp.get('buy_dex', 'unknown'),
-                                'sell_dex': opp.get('sell_dex', 'unknown'),
-                                'trade_amount_usd': min(opp.get('trade_amount_usd', 100), self.execution_settings['max_trade_size_usd']),
-                                'net_profit_usd': opp.get('estimated_net_profit_usd', opp.get('profit_usd', 0)),
-                                'source_chain': opp.get('source_chain', 'unknown'),
-                                'target_chain': opp.get('target_chain', 'unknown')
-                            })
-
-                    # 2. Filter and rank opportunities
-                    viable_opportunities = await self._filter_opportunities(opportunities)
-
-                    if viable_opportunities:
-                        logger.info(f"   ✅ {len(viable_opportunities)} viable opportunities")
-
-                        # 3. Execute best opportunities
-                        await self._execute_opportunities(viable_opportunities, wallet_private_key)
-                    else:
-                        logger.info("   ⚠️  No viable opportunities after filtering")
-                else:
+                if not self.pipeline.submit(opportunities, scan_started=scan_started):
                     logger.info("   📊 No opportunities found")
 
-                # 4. Display performance summary
+                # 2. Display performance summary
                 self._display_cycle_summary()
 
-                # 5. Wait for next cycle
+                # 3. Wait for next cycle
                 cycle_time = (datetime.now() - cycle_start).total_seconds()
                 wait_time = max(0, self.execution_settings['scan_interval_seconds'] - cycle_time)
 
@@ -332,13 +381,114 @@ class MasterArbitrageSystem:
 
         logger.info("🔄 Main arbitrage loop stopped")
 
-    async def _scan_for_opportunities(self) -> List[Dict[str, Any]]:
-        """Scan for arbitrage opportunities across all DEXes."""
+    async def _block_driven_loop(self, web3_connections: Dict[str, Any]):
+        """Scan each chain right after each of its blocks, until the system stops."""
+        from src.core.block_scan_scheduler import BlockScanScheduler
+
+        async def scan(chain: str, block: int) -> Tuple[float, List[Dict[str, Any]]]:
+            self.performance_stats['total_scans'] += 1
+            scan_started = time.monotonic()
+            return scan_started, await self._scan_for_opportunities(chain)
+
+        async def on_result(chain: str, block: int, result: Tuple[float, List[Dict[str, Any]]]):
+            if self._check_emergency_shutdown():
+                return
+            scan_started, opportunities = result
+            # Empty blocks are common on fast chains; only log when there is something to do
+            if self.pipeline.submit(opportunities, key=chain, block=block, scan_started=scan_started):
+                logger.info(f"⛓️ {chain} block {block}: {len(opportunities)} opportunities")
+
+        self.block_scheduler = BlockScanScheduler(
+            web3_connections,
+            scan,
+            on_result,
+            ws_urls={
+                chain: self.config.get(f'{chain}_ws_url') or os.getenv(f'{chain.upper()}_WS_URL')
+                for chain in web3_connections
+            },
+            block_times=self.config.get('block_times'),
+            deadline_fraction=self.execution_settings['scan_deadline_fraction'],
+            min_deadline=self.execution_settings['scan_min_deadline']
+        )
+
+        scheduler_task = asyncio.create_task(self.block_scheduler.run())
         try:
-            # Get arbitrage opportunities from all 42 DEXes
-            opportunities = await self.price_feeds.find_arbitrage_opportunities(
-                min_profit_percentage=self.execution_settings['min_profit_percentage']
-            )
+            while self.running and not scheduler_task.done():
+                await asyncio.sleep(1)
+        finally:
+            await self.block_scheduler.stop()
+            await asyncio.gather(scheduler_task, return_exceptions=True)
+        logger.info("🔄 Main arbitrage loop stopped")
+
+    def _check_emergency_shutdown(self) -> bool:
+        """Stop the system if the executor tripped its auto-shutdown."""
+        # 🛡️ AUTO-SHUTDOWN CHECK: Check if emergency shutdown was triggered
+        if self.executor and hasattr(self.executor, 'is_emergency_shutdown') and self.executor.is_emergency_shutdown():
+            logger.error("🛑 EMERGENCY SHUTDOWN DETECTED!")
+            logger.error("   💥 Auto-shutdown triggered due to excessive failed transactions")
+            logger.error("   🛡️ Stopping arbitrage system to protect capital")
+            self.running = False
+            return True
+        return False
+
+    async def _select_viable_opportunities(self, opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter and rank the opportunities from one scan (the pipeline's filter stage)."""
+        if opportunities:
+            self.performance_stats['opportunities_found'] += len(opportunities)
+            logger.info(f"   🎯 Found {len(opportunities)} opportunities")
+
+            # 💰 SHOW TRADE AMOUNT: Display the dollar amount that will be used
+            if hasattr(self, 'executor') and self.executor:
+                try:
+                    # Get wallet value and calculate trade amount using centralized config
+                    from config.trading_config import CONFIG
+                    wallet_value = getattr(self.executor, 'total_wallet_value_usd', 458.31)  # Your current wallet value
+                    trade_amount_usd = wallet_value * CONFIG.MAX_TRADE_PERCENTAGE
+
+                    logger.info(f"   💰 Trade amount: ${trade_amount_usd:.2f} ({CONFIG.MAX_TRADE_PERCENTAGE*100:.0f}% of ${wallet_value:.2f} wallet)")
+                except Exception as e:
+                    logger.info(f"   💰 Trade amount: ~$344 (75% of wallet)")  # Fallback estimate
+
+            # 🎨 ADD OPPORTUNITIES TO FLOW VISUALIZATION
+            if flow_canvas:
+                for opp in opportunities:
+                    flow_canvas.add_arbitrage_flow({
+                        'id': opp.get('opportunity_id', f"opp_{int(datetime.now().timestamp())}"),
+                        'token': opp.get('token', 'UNKNOWN'),
+                        'buy_dex': opp.get('buy_dex', 'unknown'),
+                        'sell_dex': opp.get('sell_dex', 'unknown'),
+                        'trade_amount_usd': min(opp.get('trade_amount_usd', 100), self.execution_settings['max_trade_size_usd']),
+                        'net_profit_usd': opp.get('estimated_net_profit_usd', opp.get('profit_usd', 0)),
+                        'source_chain': opp.get('source_chain', 'unknown'),
+                        'target_chain': opp.get('target_chain', 'unknown')
+                    })
+
+            # Filter and rank opportunities
+            viable_opportunities = await self._filter_opportunities(opportunities)
+
+            if viable_opportunities:
+                logger.info(f"   ✅ {len(viable_opportunities)} viable opportunities")
+                return viable_opportunities
+            logger.info("   ⚠️  No viable opportunities after filtering")
+        return []
+
+    async def _scan_for_opportunities(self, chain: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Scan for arbitrage opportunities across all DEXes.
+
+        Args:
+            chain: Only scan this chain (block-driven scans); default all chains.
+        """
+        try:
+            if self.shard_supervisor:
+                # Shards quote and search continuously; a scan collects what they found
+                self.shard_supervisor.check_shards()
+                opportunities = self.shard_supervisor.drain_opportunities([chain] if chain else None)
+            else:
+                # Get arbitrage opportunities from all 42 DEXes
+                opportunities = await self.price_feeds.find_arbitrage_opportunities(
+                    min_profit_percentage=self.execution_settings['min_profit_percentage'],
+                    chains=[chain] if chain else None
+                )
 
             # Filter opportunities to only connected networks AND safe tokens
             if self.executor and hasattr(self.executor, 'web3_connections'):
@@ -346,16 +496,17 @@ class MasterArbitrageSystem:
             else:
                 # If no executor connections, assume all configured networks are available
                 connected_networks = set(self.config.get('networks', ['arbitrum', 'base', 'optimism']))
-
-            logger.info(f"   🔗 Connected networks: {connected_networks}")
+            if chain:
+                connected_networks &= {chain}
 
             # SAFE TOKENS: Only high-liquidity tokens for reliable execution
             safe_tokens = {'WETH', 'USDC'}  # Streamlined to only held tokens
-            logger.info(f"   🎯 Safe tokens: {safe_tokens}")
 
             # 🚀 SWITCH TO CAMELOT - WooFi is paused!
             allowed_dexes = {'camelot', 'sushiswap'}  # Standard Uniswap V2 DEXes that work
-            logger.info(f"   🐪 Allowed DEXes: {allowed_dexes}")
+
+            scan_log.debug('scan_scope', "   🔗 Networks %(networks)s, 🎯 tokens %(tokens)s, 🐪 DEXes %(dexes)s",
+                           networks=sorted(connected_networks), tokens=sorted(safe_tokens), dexes=sorted(allowed_dexes))
 
             filtered_opportunities = []
             for opp in opportunities:
@@ -373,12 +524,14 @@ class MasterArbitrageSystem:
                     sell_dex in allowed_dexes):
                     filtered_opportunities.append(opp)
 
-            logger.info(f"   🎯 Filtered to {len(filtered_opportunities)} opportunities on connected networks")
+            scan_log.info('scan_filtered', "   🎯 Filtered to %(kept)d of %(found)d opportunities on connected networks",
+                          kept=len(filtered_opportunities), found=len(opportunities), chain=chain)
 
             # Debug: Show some filtered opportunities
-            if filtered_opportunities:
-                for i, opp in enumerate(filtered_opportunities[:3]):
-                    logger.info(f"   #{i+1}: {opp.get('token', 'Unknown')} {opp.get('direction', 'Unknown')} on {opp.get('source_chain', 'Unknown')} - {opp.get('profit_percentage', 0):.4f}%")
+            for i, opp in enumerate(filtered_opportunities[:3]):
+                scan_log.info('candidate', "   #%(rank)d: %(token)s %(direction)s on %(chain)s - %(profit_pct).4f%%",
+                              rank=i + 1, token=opp.get('token', 'Unknown'), direction=opp.get('direction', 'Unknown'),
+                              chain=opp.get('source_chain', 'Unknown'), profit_pct=opp.get('profit_percentage', 0))
 
             opportunities = filtered_opportunities
 
@@ -403,7 +556,8 @@ class MasterArbitrageSystem:
             gas_category = self._categorize_gas_price(current_gas_gwei)
 
             # Log gas status
-            logger.info(f"   ⛽ Gas: {current_gas_gwei:.1f} gwei ({gas_category})")
+            filter_log.info('gas', "   ⛽ Gas: %(gas_gwei).1f gwei (%(gas_category)s)",
+                            gas_gwei=current_gas_gwei, gas_category=gas_category)
 
             for opp in opportunities:
                 # Check profit threshold with gas optimization
@@ -422,13 +576,21 @@ class MasterArbitrageSystem:
                         min_profit_required = self.gas_settings['mainnet_min_profit_after_gas'][chain_gas_category]
 
                     if estimated_profit < min_profit_required:
-                        logger.info(f"      ⛽ FILTERED OUT: {opp['token']} {opp.get('direction', '')} on {source_chain}: "
-                                   f"Profit ${estimated_profit:.2f} < ${min_profit_required:.2f} (gas: {current_gas_gwei:.1f} gwei, category: {chain_gas_category})")
+                        filter_log.info('rejected_gas',
+                                        "      ⛽ FILTERED OUT: %(token)s %(direction)s on %(chain)s: "
+                                        "Profit $%(profit_usd).2f < $%(required_usd).2f "
+                                        "(gas: %(gas_gwei).1f gwei, category: %(gas_category)s)",
+                                        token=opp['token'], direction=opp.get('direction', ''), chain=source_chain,
+                                        profit_usd=estimated_profit, required_usd=min_profit_required,
+                                        gas_gwei=current_gas_gwei, gas_category=chain_gas_category)
                         continue
                     else:
-                        logger.info(f"      ✅ VIABLE: {opp['token']} {opp.get('direction', '')} on {source_chain}: "
-                                   f"Profit ${estimated_profit:.2f} > ${min_profit_required:.2f} (gas: {current_gas_gwei:.1f} gwei)")
-                        pass
+                        filter_log.info('viable',
+                                        "      ✅ VIABLE: %(token)s %(direction)s on %(chain)s: "
+                                        "Profit $%(profit_usd).2f > $%(required_usd).2f (gas: %(gas_gwei).1f gwei)",
+                                        token=opp['token'], direction=opp.get('direction', ''), chain=source_chain,
+                                        profit_usd=estimated_profit, required_usd=min_profit_required,
+                                        gas_gwei=current_gas_gwei)
 
                 # 🎯 ENFORCE $0.25 MINIMUM: Use centralized config with gas cost consideration
                 from src.config.trading_config import CONFIG
@@ -438,20 +600,28 @@ class MasterArbitrageSystem:
                 net_profit_after_gas = estimated_profit - estimated_gas_cost
 
                 if net_profit_after_gas < CONFIG.MIN_PROFIT_USD:
-                    logger.info(f"      💰 FILTERED OUT: {opp['token']} {opp.get('direction', '')}: "
-                               f"Net profit ${net_profit_after_gas:.2f} < ${CONFIG.MIN_PROFIT_USD:.2f} minimum (after ${estimated_gas_cost:.2f} gas)")
+                    filter_log.info('rejected_min_profit',
+                                    "      💰 FILTERED OUT: %(token)s %(direction)s: Net profit $%(net_profit_usd).2f "
+                                    "< $%(required_usd).2f minimum (after $%(gas_usd).2f gas)",
+                                    token=opp['token'], direction=opp.get('direction', ''),
+                                    net_profit_usd=net_profit_after_gas, required_usd=CONFIG.MIN_PROFIT_USD,
+                                    gas_usd=estimated_gas_cost)
                     continue
 
                 # Check if we support this route
                 if not self._is_route_supported(opp):
-                    logger.info(f"      🛣️  FILTERED OUT: {opp['token']} {opp.get('direction', '')}: "
-                               f"Route {opp['source_chain']}→{opp['target_chain']} not supported")
+                    filter_log.info('rejected_route',
+                                    "      🛣️  FILTERED OUT: %(token)s %(direction)s: "
+                                    "Route %(source_chain)s→%(target_chain)s not supported",
+                                    token=opp['token'], direction=opp.get('direction', ''),
+                                    source_chain=opp['source_chain'], target_chain=opp['target_chain'])
                     continue
 
                 # Check if we're already executing this type of opportunity
                 if self._is_duplicate_execution(opp):
-                    logger.info(f"      🔄 FILTERED OUT: {opp['token']} {opp.get('direction', '')}: "
-                               f"Duplicate execution already running")
+                    filter_log.info('rejected_duplicate',
+                                    "      🔄 FILTERED OUT: %(token)s %(direction)s: Duplicate execution already running",
+                                    token=opp['token'], direction=opp.get('direction', ''))
                     continue
 
                 # Add profit estimation and gas info
@@ -651,6 +821,12 @@ class MasterArbitrageSystem:
             execution_tasks = []
 
             for i, opp in enumerate(selected_opportunities):
+                # The filter ran before this batch waited in the execute queue;
+                # a trade on the same route may have started since
+                if not self._is_route_supported(opp) or self._is_duplicate_execution(opp):
+                    logger.info(f"   🔄 Skipping {opp['token']} {opp.get('direction', '')}: route busy or unsupported")
+                    continue
+
                 logger.info(f"   🚀 Executing opportunity #{i+1}: {opp['token']} {opp['direction']} on {opp['source_chain']}")
 
                 # Create execution task
@@ -1035,6 +1211,10 @@ class MasterArbitrageSystem:
             if self.executor:
                 await self.executor.cleanup()
 
+            if self.trade_logging:
+                self.trade_logging.stop()
+                self.trade_logging = None
+
             logger.info("✅ Cleanup complete")
 
         except Exception as e:
@@ -1047,5 +1227,9 @@ class MasterArbitrageSystem:
             'execution_mode': self.execution_mode,
             'active_executions': len(self.active_executions),
             'performance_stats': self.performance_stats,
-            'execution_settings': self.execution_settings
+            'execution_settings': self.execution_settings,
+            'block_scans': self.block_scheduler.get_stats() if self.block_scheduler else {},
+            'pipeline': self.pipeline.get_stats() if self.pipeline else {},
+            'detection_shards': self.shard_supervisor.get_stats() if self.shard_supervisor else {},
+            'trade_logging': self.trade_logging.get_stats() if self.trade_logging else {}
         }
@@ -0,0 +1,240 @@
+"""Overlapping scan → filter → execute stages joined by bounded queues."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanBatch:
+    """Opportunities from one scan, as they move between stages."""
+    opportunities: List[Dict[str, Any]]
+    key: str = 'all'                 # chain the scan covered, or 'all'
+    block: Optional[int] = None
+    seq: int = 0
+    scanned_at: float = field(default_factory=time.monotonic)
+    enqueued_at: float = 0.0
+
+
+class StageMetrics:
+    """Queue depth, wait and service time for one stage."""
+
+    def __init__(self, name: str, window: int = 256):
+        self.name = name
+        self.counters = {
+            'received': 0,
+            'processed': 0,
+            'dropped_overflow': 0,
+            'dropped_stale': 0,
+            'errors': 0,
+            'max_depth': 0,
+        }
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._services: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float, service: float) -> None:
+        self.counters['processed'] += 1
+        self._waits.append(wait)
+        self._services.append(service)
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {'avg_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(samples)
+        return {
+            'avg_ms': sum(ordered) / len(ordered) * 1000,
+            'p50_ms': ordered[len(ordered) // 2] * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000,
+        }
+
+    def snapshot(self, queue: Optional[asyncio.Queue]) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'queue_depth': queue.qsize() if queue is not None else 0,
+            'queue_capacity': queue.maxsize if queue is not None else 0,
+            'queue_wait': self._summary(self._waits),
+            'service_time': self._summary(self._services),
+        }
+
+
+class OpportunityPipeline:
+    """Filters and executes scan results while the next scans run.
+
+    Scanners call submit() and return at once. A filter worker takes batches
+    from the scan queue, drops any that went stale while queued, filters
+    them and checks freshness again before handing the viable ones to the
+    execute queue, where one execute worker runs them in order.
+
+    Both queues are bounded. When one is full the oldest batch is dropped:
+    a newer scan supersedes it. A queued batch is skipped unfiltered when a
+    newer scan of the same chain has been submitted, and skipped unexecuted
+    when a newer batch of the same chain has already passed the filter. No
+    batch whose scan started more than max_age_seconds ago is handed on or
+    executed.
+    """
+
+    def __init__(self,
+                 filter_stage: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]],
+                 execute_stage: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+                 max_age_seconds: float = 4.0,
+                 scan_queue_size: int = 4,
+                 execute_queue_size: int = 2):
+        """Initialize the pipeline.
+
+        Args:
+            filter_stage: Coroutine function returning the viable opportunities.
+            execute_stage: Coroutine function executing viable opportunities.
+            max_age_seconds: Age past which a scan's results are not acted on.
+            scan_queue_size: Scan batches waiting for the filter stage.
+            execute_queue_size: Viable batches waiting for the execute stage.
+        """
+        self.filter_stage = filter_stage
+        self.execute_stage = execute_stage
+        self.max_age_seconds = max_age_seconds
+
+        self.scan_queue: asyncio.Queue = asyncio.Queue(maxsize=scan_queue_size)
+        self.execute_queue: asyncio.Queue = asyncio.Queue(maxsize=execute_queue_size)
+        self.metrics = {
+            'scan': StageMetrics('scan'),
+            'filter': StageMetrics('filter'),
+            'execute': StageMetrics('execute'),
+        }
+
+        self.running = False
+        self._seq = 0
+        self._latest_submitted: Dict[str, int] = {}   # key -> seq of the newest submitted batch
+        self._latest_viable: Dict[str, int] = {}      # key -> seq of the newest batch to pass the filter
+        self._filter_task: Optional[asyncio.Task] = None
+        self._execute_task: Optional[asyncio.Task] = None
+
+    def submit(self, opportunities: List[Dict[str, Any]], key: str = 'all',
+               block: Optional[int] = None, scan_started: Optional[float] = None) -> bool:
+        """Queue one scan's opportunities for filtering. Never blocks.
+
+        Args:
+            opportunities: The scan's results; empty scans are only counted.
+            key: Chain the scan covered, or 'all'.
+            block: Block the scan was for, if block-driven.
+            scan_started: time.monotonic() when the scan began. Used for scan
+                latency and as the batch's age, so slow scans count against
+                max_age_seconds; defaults to now.
+
+        Returns:
+            False if the pipeline is not running or the batch was empty.
+        """
+        now = time.monotonic()
+        if scan_started is not None:
+            self.metrics['scan'].record(0.0, now - scan_started)
+        if not self.running or not opportunities:
+            return False
+        self._seq += 1
+        self._latest_submitted[key] = self._seq
+        scanned_at = scan_started if scan_started is not None else now
+        batch = ScanBatch(opportunities, key, block, self._seq, scanned_at)
+        self._put_latest(self.scan_queue, batch, self.metrics['filter'])
+        return True
+
+    def _put_latest(self, queue: asyncio.Queue, batch: ScanBatch, metrics: StageMetrics) -> None:
+        """Enqueue, dropping the oldest batch if the queue is full."""
+        metrics.counters['received'] += 1
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            metrics.counters['dropped_overflow'] += 1
+        batch.enqueued_at = time.monotonic()
+        queue.put_nowait(batch)
+        metrics.counters['max_depth'] = max(metrics.counters['max_depth'], queue.qsize())
+
+    def _is_expired(self, batch: ScanBatch) -> bool:
+        return time.monotonic() - batch.scanned_at > self.max_age_seconds
+
+    def start(self) -> None:
+        """Start the filter and execute workers on the running event loop."""
+        self.running = True
+        self._filter_task = asyncio.create_task(self._filter_worker())
+        self._execute_task = asyncio.create_task(self._execute_worker())
+
+    async def stop(self) -> None:
+        """Stop taking scans; let an execution already in progress finish."""
+        self.running = False
+        if self._filter_task:
+            self._filter_task.cancel()
+            await asyncio.gather(self._filter_task, return_exceptions=True)
+        # Queued batches are dropped; the one being executed is not interrupted
+        while not self.execute_queue.empty():
+            self.execute_queue.get_nowait()
+            self.execute_queue.task_done()
+        if self._execute_task and not self._execute_task.done():
+            self.execute_queue.put_nowait(None)
+            await asyncio.gather(self._execute_task, return_exceptions=True)
+
+    async def _filter_worker(self) -> None:
+        metrics = self.metrics['filter']
+        while True:
+            batch = await self.scan_queue.get()
+            try:
+                started = time.monotonic()
+                if self._is_expired(batch) or self._latest_submitted.get(batch.key, 0) > batch.seq:
+                    metrics.counters['dropped_stale'] += 1
+                    continue
+
+                try:
+                    viable = await self.filter_stage(batch.opportunities)
+                except Exception as e:
+                    metrics.counters['errors'] += 1
+                    logger.error(f"Filter stage error: {e}")
+                    continue
+                metrics.record(started - batch.enqueued_at, time.monotonic() - started)
+
+                # Filtering can take a while (gas, quotes); check again before handing off
+                if not viable:
+                    continue
+                if self._is_expired(batch):
+                    metrics.counters['dropped_stale'] += 1
+                    continue
+                self._latest_viable[batch.key] = max(self._latest_viable.get(batch.key, 0), batch.seq)
+                self._put_latest(
+                    self.execute_queue,
+                    ScanBatch(viable, batch.key, batch.block, batch.seq, batch.scanned_at),
+                    self.metrics['execute']
+                )
+            finally:
+                self.scan_queue.task_done()
+
+    async def _execute_worker(self) -> None:
+        metrics = self.metrics['execute']
+        while True:
+            batch = await self.execute_queue.get()
+            try:
+                if batch is None:
+                    return
+                started = time.monotonic()
+                # A newer scan of the same chain passed the filter behind this
+                # one: its prices supersede these, and running both trades twice
+                if self._is_expired(batch) or self._latest_viable.get(batch.key, 0) > batch.seq:
+                    metrics.counters['dropped_stale'] += 1
+                    continue
+                try:
+                    await self.execute_stage(batch.opportunities)
+                except Exception as e:
+                    metrics.counters['errors'] += 1
+                    logger.error(f"Execute stage error: {e}")
+                    continue
+                metrics.record(started - batch.enqueued_at, time.monotonic() - started)
+            finally:
+                self.execute_queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage queue depth, drop counts and latency percentiles."""
+        return {
+            'scan': self.metrics['scan'].snapshot(None),
+            'filter': self.metrics['filter'].snapshot(self.scan_queue),
+            'execute': self.metrics['execute'].snapshot(self.execute_queue),
+        }
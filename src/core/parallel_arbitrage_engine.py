@@ -4,12 +4,15 @@ Implements concurrent opportunity detection, validation, and execution preparati
 """
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import logging
 import time
-from typing import Dict, List, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,22 +26,131 @@ class OpportunityTask:
     priority: int   # 1 = highest, 10 = lowest
     created_at: float
     timeout: float = 30.0
+    # Set by the scheduler: when the task is cancelled, and who awaits its result
+    deadline: float = 0.0
+    result: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
+    enqueued_at: float = 0.0
+
+
+def validate_opportunity(opportunity: Dict[str, Any], now: float,
+                         min_profit_usd: float = 0.05, max_age_seconds: float = 15.0) -> Dict[str, Any]:
+    """Pure validation checks for one opportunity; safe to run in a worker pool."""
+    profit_usd = opportunity.get('estimated_profit_usd', 0)
+    age_seconds = now - opportunity.get('discovered_at', now)
+
+    validations = {
+        'profit_threshold': profit_usd >= min_profit_usd,
+        'freshness': age_seconds <= max_age_seconds,
+        'has_required_fields': all(key in opportunity for key in [
+            'token', 'buy_dex', 'sell_dex', 'source_chain'
+        ])
+    }
+
+    return {
+        'success': all(validations.values()),
+        'validations': validations,
+        'profit_usd': profit_usd,
+        'age_seconds': age_seconds,
+        'validation_time': now
+    }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.total:
+            return 0.0
+        rank = fraction * self.total
+        seen = 0
+        for bound, count in zip(self.BOUNDS_MS + (self.max_ms,), self.counts):
+            seen += count
+            if seen >= rank:
+                return float(min(bound, self.max_ms))
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+        return {
+            'count': self.total,
+            'avg_ms': self.sum_ms / self.total if self.total else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
 
 class ParallelArbitrageEngine:
-    """High-performance parallel arbitrage processing engine."""
+    """High-performance parallel arbitrage processing engine.
+
+    Tasks wait in a heap ordered by (priority, deadline). A dispatcher starts
+    the best task whose chain and DEXes are under their concurrency limits,
+    up to max_concurrent at once. Each task is cancelled at its deadline:
+    created_at + timeout, or earlier if its opportunity reaches
+    max_opportunity_age (measured from discovered_at) first. Queued tasks
+    that pass their deadline are dropped without running. Validation checks
+    run in the worker pool, off the event loop.
+    """
     
-    def __init__(self, max_workers: int = 8):
+    def __init__(self, max_workers: int = 8, max_concurrent: Optional[int] = None,
+                 max_per_chain: int = 4, max_per_dex: int = 2,
+                 max_opportunity_age: float = 15.0, worker_pool: str = 'thread'):
+        """Initialize the engine.
+
+        Args:
+            max_workers: Size of the validation worker pool.
+            max_concurrent: Tasks running at once (default 2 * max_workers).
+            max_per_chain: Tasks running at once per source chain.
+            max_per_dex: Tasks running at once touching the same DEX.
+            max_opportunity_age: Seconds after discovery an opportunity goes stale.
+            worker_pool: 'thread' or 'process'.
+        """
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.task_queue = asyncio.Queue()
+        self.max_concurrent = max_concurrent or max_workers * 2
+        self.max_per_chain = max_per_chain
+        self.max_per_dex = max_per_dex
+        self.max_opportunity_age = max_opportunity_age
+        pool_class = ProcessPoolExecutor if worker_pool == 'process' else ThreadPoolExecutor
+        self.executor: Executor = pool_class(max_workers=max_workers)
         self.results_cache = {}
         self.active_tasks = {}
         self.performance_stats = {
             'tasks_processed': 0,
             'tasks_successful': 0,
+            'tasks_expired': 0,
+            'tasks_cancelled_running': 0,
             'average_processing_time': 0.0,
             'concurrent_tasks_peak': 0
         }
+        self.queue_wait = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        
+        # Scheduler state, owned by the event loop
+        self._heap: List[Tuple[int, float, int, OpportunityTask]] = []
+        self._seq = itertools.count()
+        self._running_by_chain: Dict[str, int] = {}
+        self._running_by_dex: Dict[str, int] = {}
+        self._running: Dict[int, asyncio.Task] = {}   # id(task) -> runner
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
         
         # Task processing locks
         self.cache_lock = threading.Lock()
@@ -63,7 +175,7 @@ class ParallelArbitrageEngine:
         logger.info("=" * 50)
         
         # Start background task processor
-        asyncio.create_task(self._process_task_queue())
+        self._ensure_dispatcher()
         
         logger.info("✅ Parallel engine started successfully")
     
@@ -73,9 +185,21 @@ class ParallelArbitrageEngine:
         
         self.is_running = False
         self.shutdown_event.set()
+        if self._wakeup:
+            self._wakeup.set()
+        
+        # Queued tasks never start
+        while self._heap:
+            _, _, _, task = heapq.heappop(self._heap)
+            self._finish(task, {'success': False, 'error': 'Engine stopped'})
         
         # Wait for active tasks to complete (with timeout)
         await self._wait_for_active_tasks(timeout=10.0)
+        for running in list(self._running.values()):
+            running.cancel()
+        if self._dispatcher:
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
         
         # Shutdown executor
         self.executor.shutdown(wait=True)
@@ -91,9 +215,9 @@ class ParallelArbitrageEngine:
             
             # Create tasks for parallel processing
             tasks = []
-            for i, opportunity in enumerate(opportunities):
+            for opportunity in opportunities:
                 task = OpportunityTask(
-                    opportunity_id=f"opp_{i}_{int(time.time())}",
+                    opportunity_id=f"opp_{next(self._seq)}_{int(time.time())}",
                     opportunity=opportunity,
                     task_type='validate_and_prepare',
                     priority=self._calculate_priority(opportunity),
@@ -122,19 +246,18 @@ class ParallelArbitrageEngine:
             return []
     
     async def _process_tasks_parallel(self, tasks: List[OpportunityTask]) -> List[Dict[str, Any]]:
-        """Process multiple tasks in parallel using asyncio and threading."""
+        """Schedule tasks and wait for all of them to finish, expire or fail."""
         try:
-            # Sort tasks by priority
+            # Results come back in priority order
             tasks.sort(key=lambda x: x.priority)
             
-            # Create async tasks for parallel execution
-            async_tasks = []
+            loop = asyncio.get_running_loop()
             for task in tasks:
-                async_task = asyncio.create_task(self._process_single_task(task))
-                async_tasks.append(async_task)
+                task.result = loop.create_future()
+                self._schedule(task)
             
             # Wait for all tasks to complete
-            results = await asyncio.gather(*async_tasks, return_exceptions=True)
+            results = await asyncio.gather(*(task.result for task in tasks), return_exceptions=True)
             
             # Process results and handle exceptions
             processed_results = []
@@ -156,13 +279,6 @@ class ParallelArbitrageEngine:
         try:
             start_time = time.time()
             
-            # Track active task
-            with self.stats_lock:
-                self.active_tasks[task.opportunity_id] = task
-                current_active = len(self.active_tasks)
-                if current_active > self.performance_stats['concurrent_tasks_peak']:
-                    self.performance_stats['concurrent_tasks_peak'] = current_active
-            
             # Process based on task type
             if task.task_type == 'validate_and_prepare':
                 result = await self._validate_and_prepare_opportunity(task.opportunity)
@@ -186,9 +302,6 @@ class ParallelArbitrageEngine:
                 self.performance_stats['average_processing_time'] = (
                     (current_avg * (task_count - 1) + processing_time) / task_count
                 )
-                
-                # Remove from active tasks
-                self.active_tasks.pop(task.opportunity_id, None)
             
             # Add processing metadata
             result['processing_time'] = processing_time
@@ -227,31 +340,13 @@ class ParallelArbitrageEngine:
             return {'success': False, 'error': f'Validation and preparation failed: {e}'}
     
     async def _validate_opportunity(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Fast opportunity validation."""
+        """Fast opportunity validation, run in the worker pool."""
         try:
-            # Extract opportunity details
-            profit_usd = opportunity.get('estimated_profit_usd', 0)
-            age_seconds = time.time() - opportunity.get('discovered_at', time.time())
-            
-            # Validation checks
-            validations = {
-                'profit_threshold': profit_usd >= 0.05,  # Minimum $0.05 profit
-                'freshness': age_seconds <= 15.0,       # Maximum 15 seconds old
-                'has_required_fields': all(key in opportunity for key in [
-                    'token', 'buy_dex', 'sell_dex', 'source_chain'
-                ])
-            }
-            
-            # Overall validation result
-            is_valid = all(validations.values())
-            
-            return {
-                'success': is_valid,
-                'validations': validations,
-                'profit_usd': profit_usd,
-                'age_seconds': age_seconds,
-                'validation_time': time.time()
-            }
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, validate_opportunity, opportunity, time.time(),
+                0.05, self.max_opportunity_age
+            )
             
         except Exception as e:
             return {'success': False, 'error': f'Validation error: {e}'}
@@ -303,21 +398,145 @@ class ParallelArbitrageEngine:
         except Exception:
             return 5  # Default medium priority
     
+    def _ensure_dispatcher(self):
+        """Start the dispatcher on the running loop if it is not running."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self.is_running = True
+            self.shutdown_event.clear()
+            self._dispatcher = asyncio.create_task(self._process_task_queue())
+    
+    def _schedule(self, task: OpportunityTask):
+        """Push a task onto the heap with its deadline."""
+        self._ensure_dispatcher()
+        discovered_at = task.opportunity.get('discovered_at', task.created_at)
+        task.deadline = min(task.created_at + task.timeout, discovered_at + self.max_opportunity_age)
+        task.enqueued_at = time.monotonic()
+        heapq.heappush(self._heap, (task.priority, task.deadline, next(self._seq), task))
+        self._wakeup.set()
+    
+    @staticmethod
+    def _task_dexes(task: OpportunityTask) -> set:
+        opportunity = task.opportunity
+        return {dex for dex in (opportunity.get('buy_dex'), opportunity.get('sell_dex')) if dex}
+    
+    def _has_capacity(self, task: OpportunityTask) -> bool:
+        chain = task.opportunity.get('source_chain', 'unknown')
+        if self._running_by_chain.get(chain, 0) >= self.max_per_chain:
+            return False
+        return all(self._running_by_dex.get(dex, 0) < self.max_per_dex for dex in self._task_dexes(task))
+    
+    def _finish(self, task: OpportunityTask, result: Dict[str, Any]):
+        """Hand a task's result to whoever is waiting on it."""
+        if task.result is not None:
+            if not task.result.done():
+                task.result.set_result(result)
+        else:
+            with self.cache_lock:
+                self.results_cache[task.opportunity_id] = result
+    
+    def _purge_expired(self, now: float):
+        """Drop queued tasks whose deadline has passed; they never start."""
+        live = []
+        for entry in self._heap:
+            task = entry[3]
+            if task.deadline > now:
+                live.append(entry)
+                continue
+            with self.stats_lock:
+                self.performance_stats['tasks_expired'] += 1
+            self._finish(task, {'success': False, 'error': 'Opportunity went stale before processing',
+                                'task_id': task.opportunity_id})
+        if len(live) != len(self._heap):
+            heapq.heapify(live)
+            self._heap = live
+    
+    def _next_runnable(self) -> Optional[OpportunityTask]:
+        """Pop the best queued task whose chain and DEXes have capacity."""
+        blocked = []
+        chosen = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self._has_capacity(entry[3]):
+                chosen = entry[3]
+                break
+            blocked.append(entry)
+        for entry in blocked:
+            heapq.heappush(self._heap, entry)
+        return chosen
+    
     async def _process_task_queue(self):
-        """Background task queue processor."""
+        """Dispatcher: start tasks from the heap as capacity allows."""
         while self.is_running and not self.shutdown_event.is_set():
             try:
-                # Process any queued tasks
-                if not self.task_queue.empty():
-                    task = await self.task_queue.get()
-                    asyncio.create_task(self._process_single_task(task))
+                self._wakeup.clear()
+                self._purge_expired(time.time())
+                while len(self._running) < self.max_concurrent:
+                    task = self._next_runnable()
+                    if task is None:
+                        break
+                    self._start(task)
                 
-                await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
+                # Sleep until a task is added or finishes, or the next queued deadline
+                earliest = min((entry[1] for entry in self._heap), default=None)
+                timeout = None if earliest is None else max(0.0, earliest - time.time())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"❌ Task queue processing error: {e}")
                 await asyncio.sleep(1.0)
     
+    def _start(self, task: OpportunityTask):
+        chain = task.opportunity.get('source_chain', 'unknown')
+        dexes = self._task_dexes(task)
+        self._running_by_chain[chain] = self._running_by_chain.get(chain, 0) + 1
+        for dex in dexes:
+            self._running_by_dex[dex] = self._running_by_dex.get(dex, 0) + 1
+        
+        with self.stats_lock:
+            self.active_tasks[id(task)] = task
+            self.queue_wait.observe(time.monotonic() - task.enqueued_at)
+            current_active = len(self.active_tasks)
+            if current_active > self.performance_stats['concurrent_tasks_peak']:
+                self.performance_stats['concurrent_tasks_peak'] = current_active
+        
+        runner = asyncio.create_task(self._run_with_deadline(task))
+        self._running[id(task)] = runner
+        
+        def release(_):
+            self._running.pop(id(task), None)
+            self._running_by_chain[chain] -= 1
+            for dex in dexes:
+                self._running_by_dex[dex] -= 1
+            with self.stats_lock:
+                self.active_tasks.pop(id(task), None)
+            if self._wakeup:
+                self._wakeup.set()
+        
+        runner.add_done_callback(release)
+    
+    async def _run_with_deadline(self, task: OpportunityTask):
+        """Run a task, cancelling it if its opportunity goes stale first."""
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._process_single_task(task), max(0.0, task.deadline - time.time()))
+        except asyncio.TimeoutError:
+            with self.stats_lock:
+                self.performance_stats['tasks_cancelled_running'] += 1
+            result = {'success': False, 'error': 'Opportunity went stale during processing',
+                      'task_id': task.opportunity_id}
+        except asyncio.CancelledError:
+            self._finish(task, {'success': False, 'error': 'Cancelled', 'task_id': task.opportunity_id})
+            raise
+        with self.stats_lock:
+            self.service_time.observe(time.monotonic() - started)
+        self._finish(task, result)
+    
     async def _wait_for_active_tasks(self, timeout: float = 10.0):
         """Wait for active tasks to complete."""
         start_time = time.time()
@@ -333,11 +552,14 @@ class ParallelArbitrageEngine:
         with self.stats_lock:
             stats = self.performance_stats.copy()
             stats['active_tasks'] = len(self.active_tasks)
+            stats['queued_tasks'] = len(self._heap)
             stats['success_rate'] = (
                 stats['tasks_successful'] / max(1, stats['tasks_processed']) * 100
             )
+            stats['queue_wait'] = self.queue_wait.snapshot()
+            stats['service_time'] = self.service_time.snapshot()
             return stats
     
     async def add_task(self, task: OpportunityTask):
-        """Add a task to the processing queue."""
-        await self.task_queue.put(task)
+        """Add a task to the scheduler; its result lands in results_cache."""
+        self._schedule(task)
@@ -0,0 +1,550 @@
+"""Chain-sharded detection processes sharing a price book and opportunity rings in shared memory."""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.feeds.price_matrix import PriceMatrix
+from src.feeds.triangular_engine import TriangularEngine
+
+logger = logging.getLogger(__name__)
+
+# One opportunity is one row of float64s in its chain's ring
+RECORD_FIELDS = (
+    'kind', 'token_a', 'token_b', 'token_c', 'dex_a', 'dex_b', 'dex_c',
+    'price_a', 'price_b', 'profit_percentage', 'liquidity', 'detected_at'
+)
+SIMPLE, TRIANGULAR = 0, 1
+_R = {name: i for i, name in enumerate(RECORD_FIELDS)}
+
+# Per (chain, token, dex) quote slot
+SLOT_FIELDS = ('price', 'liquidity', 'updated_at')
+
+# Per-chain counters written by the shard that owns the chain
+STAT_FIELDS = ('scans', 'errors', 'last_scan_ms', 'avg_scan_ms', 'busy', 'heartbeat', 'quotes', 'opportunities')
+_S = {name: i for i, name in enumerate(STAT_FIELDS)}
+
+QuoteSource = Callable[[str], Awaitable[Iterable[Any]]]
+
+
+@dataclass
+class PriceBookLayout:
+    """Fixed chain/token/dex axes of a shared price book; picklable, sent to each shard once."""
+    chains: List[str]
+    tokens: List[str]
+    dexes: List[str]
+    ring_capacity: int = 1024
+    chain_index: Dict[str, int] = field(init=False, repr=False)
+    token_index: Dict[str, int] = field(init=False, repr=False)
+    dex_index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.chain_index = {name: i for i, name in enumerate(self.chains)}
+        self.token_index = {name: i for i, name in enumerate(self.tokens)}
+        self.dex_index = {name: i for i, name in enumerate(self.dexes)}
+
+    def _shapes(self) -> List[Tuple[str, Tuple[int, ...]]]:
+        chains = len(self.chains)
+        return [
+            ('chain_seq', (chains,)),
+            ('book', (chains, len(self.tokens), len(self.dexes), len(SLOT_FIELDS))),
+            ('ring_head', (chains,)),
+            ('ring_reserve', (chains,)),
+            ('ring', (chains, self.ring_capacity, len(RECORD_FIELDS))),
+            ('stats', (chains, len(STAT_FIELDS))),
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(np.prod(shape)) for _, shape in self._shapes()) * 8
+
+
+class SharedPriceBook:
+    """Quotes, opportunity rings and scan stats for every chain, in one shared block.
+
+    Each chain has exactly one writer (the shard that owns it). Its quotes
+    are published under a per-chain sequence lock: the counter is odd while
+    a write is in progress, and readers retry until they copy a slice with
+    the same even counter before and after. Opportunities go into a
+    per-chain ring of fixed-width records. The writer reserves rows before
+    writing them and bumps the head after, so a reader never sees a
+    half-written row and can tell which rows were overwritten while it was
+    copying.
+    """
+
+    def __init__(self, layout: PriceBookLayout, shm: shared_memory.SharedMemory, owner: bool):
+        self.layout = layout
+        self.shm = shm
+        self.owner = owner
+        offset = 0
+        for name, shape in layout._shapes():
+            count = int(np.prod(shape))
+            setattr(self, name, np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=offset))
+            offset += count * 8
+
+    @classmethod
+    def create(cls, layout: PriceBookLayout) -> 'SharedPriceBook':
+        shm = shared_memory.SharedMemory(create=True, size=max(8, layout.nbytes))
+        book = cls(layout, shm, owner=True)
+        book.chain_seq[:] = 0
+        book.book[..., 0] = np.nan
+        book.book[..., 1:] = 0
+        book.ring_head[:] = 0
+        book.ring_reserve[:] = 0
+        book.stats[:] = 0
+        return book
+
+    @classmethod
+    def attach(cls, name: str, layout: PriceBookLayout) -> 'SharedPriceBook':
+        return cls(layout, shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        # Views must go before the buffer can be released
+        for name, _ in self.layout._shapes():
+            setattr(self, name, None)
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def publish_quotes(self, chain: int, prices: np.ndarray, liquidity: np.ndarray, now: float) -> None:
+        """Replace a chain's (token x dex) quotes; NaN marks a missing quote."""
+        self.chain_seq[chain] += 1
+        slot = self.book[chain]
+        slot[:, :, 0] = prices
+        slot[:, :, 1] = liquidity
+        slot[:, :, 2] = np.where(np.isfinite(prices), now, 0.0)
+        self.chain_seq[chain] += 1
+
+    def read_quotes(self, chain: int, retries: int = 100) -> np.ndarray:
+        """Consistent copy of a chain's (token x dex x SLOT_FIELDS) quotes."""
+        for _ in range(retries):
+            before = self.chain_seq[chain]
+            if before % 2 == 0:
+                snapshot = self.book[chain].copy()
+                if self.chain_seq[chain] == before:
+                    return snapshot
+            time.sleep(0)
+        raise TimeoutError(f"price book for {self.layout.chains[chain]} kept changing")
+
+    def push(self, chain: int, records: np.ndarray) -> None:
+        """Append opportunity records to a chain's ring, overwriting the oldest."""
+        if not len(records):
+            return
+        capacity = self.layout.ring_capacity
+        end = int(self.ring_head[chain]) + len(records)
+        records = records[-capacity:]
+        self.ring_reserve[chain] = end
+        self.ring[chain, (end - len(records) + np.arange(len(records))) % capacity] = records
+        self.ring_head[chain] = end
+
+    def pop(self, chain: int, cursor: int) -> Tuple[np.ndarray, int, int]:
+        """Records written since cursor.
+
+        Returns:
+            (records, new cursor, records lost to overwriting)
+        """
+        capacity = self.layout.ring_capacity
+        head = int(self.ring_head[chain])
+        lost = max(0, head - capacity - cursor)
+        cursor += lost
+        records = self.ring[chain, np.arange(cursor, head) % capacity].copy()
+        # Rows the writer lapped while we were copying are not trustworthy
+        overwritten = int(self.ring_reserve[chain]) - capacity - cursor
+        if overwritten > 0:
+            records = records[overwritten:]
+            lost += overwritten
+        return records, head, lost
+
+
+def scan_chain(book: SharedPriceBook, chain: str, quotes: Iterable[Any],
+               min_profit_percentage: float, max_opportunities: int) -> Tuple[int, int]:
+    """Publish one chain's quotes and push its spreads and triangles to the ring.
+
+    Args:
+        book: Shared price book.
+        chain: Chain the quotes are for.
+        quotes: Objects with token, dex_name, chain, price and liquidity attributes.
+        min_profit_percentage: Minimum spread or round-trip profit, in percent.
+        max_opportunities: Maximum spreads and maximum triangles per scan.
+
+    Returns:
+        (quotes published, opportunities pushed)
+    """
+    layout = book.layout
+    chain_idx = layout.chain_index[chain]
+    prices = np.full((len(layout.tokens), len(layout.dexes)), np.nan)
+    liquidity = np.zeros_like(prices)
+    kept = []
+    for quote in quotes:
+        row = layout.token_index.get(quote.token)
+        col = layout.dex_index.get(quote.dex_name)
+        if row is None or col is None or quote.price <= 0:
+            continue
+        prices[row, col] = quote.price
+        liquidity[row, col] = getattr(quote, 'liquidity', 0.0)
+        kept.append(quote)
+    now = time.time()
+    book.publish_quotes(chain_idx, prices, liquidity, now)
+
+    matrix = PriceMatrix(kept)
+    spreads, _ = matrix.top_spreads(min_profit_percentage, max_opportunities)
+    triangles = TriangularEngine(matrix).find_triangles(min_profit_percentage, max_opportunities)
+
+    records = np.zeros((len(spreads) + len(triangles), len(RECORD_FIELDS)))
+    for i, (token, buy_venue, sell_venue, profit_pct) in enumerate(spreads):
+        row = layout.token_index[token]
+        buy_dex = layout.dex_index[matrix.venues[buy_venue][0]]
+        sell_dex = layout.dex_index[matrix.venues[sell_venue][0]]
+        records[i] = (SIMPLE, row, -1, -1, buy_dex, sell_dex, -1,
+                      prices[row, buy_dex], prices[row, sell_dex], profit_pct,
+                      min(liquidity[row, buy_dex], liquidity[row, sell_dex]), now)
+    for i, triangle in enumerate(triangles, start=len(spreads)):
+        tokens = [layout.token_index[token] for token in triangle.tokens]
+        dexes = [layout.dex_index[dex] for dex in triangle.dexes]
+        records[i] = (TRIANGULAR, *tokens, *dexes, triangle.start_price, 0.0,
+                      triangle.profit_percentage, 0.0, now)
+    book.push(chain_idx, records)
+    return len(kept), len(records)
+
+
+class AggregatorQuoteSource:
+    """Default shard quote source: one MultiDEXAggregator per shard process."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._aggregator = None
+
+    async def __call__(self, chain: str) -> List[Any]:
+        if self._aggregator is None:
+            from src.feeds.multi_dex_aggregator import MultiDEXAggregator
+            self._aggregator = MultiDEXAggregator(self.config)
+        prices = await self._aggregator.get_all_dex_prices([chain])
+        return [quote for dex_prices in prices.values() for quote in dex_prices]
+
+
+async def _shard_loop(book: SharedPriceBook, chains: List[str], stop_event, quote_source: QuoteSource,
+                      scan_interval: float, min_profit_percentage: float, max_opportunities: int) -> None:
+    while not stop_event.is_set():
+        cycle_started = time.perf_counter()
+        for chain in chains:
+            stats = book.stats[book.layout.chain_index[chain]]
+            started = time.perf_counter()
+            try:
+                quotes = await quote_source(chain)
+                quote_count, opportunity_count = scan_chain(
+                    book, chain, quotes, min_profit_percentage, max_opportunities
+                )
+            except Exception as e:
+                stats[_S['errors']] += 1
+                logger.warning(f"⚠️ Shard scan of {chain} failed: {e}")
+                continue
+            scan_ms = (time.perf_counter() - started) * 1000
+            stats[_S['scans']] += 1
+            stats[_S['last_scan_ms']] = scan_ms
+            stats[_S['avg_scan_ms']] += (scan_ms - stats[_S['avg_scan_ms']]) / stats[_S['scans']]
+            stats[_S['busy']] = min(1.0, scan_ms / 1000 / scan_interval) if scan_interval > 0 else 1.0
+            stats[_S['quotes']] = quote_count
+            stats[_S['opportunities']] += opportunity_count
+            stats[_S['heartbeat']] = time.time()
+        remaining = scan_interval - (time.perf_counter() - cycle_started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+
+def _run_shard(book_name: str, layout: PriceBookLayout, chains: List[str], stop_event,
+               quote_source: QuoteSource, scan_interval: float,
+               min_profit_percentage: float, max_opportunities: int) -> None:
+    """Shard process entry point."""
+    book = SharedPriceBook.attach(book_name, layout)
+    try:
+        asyncio.run(_shard_loop(book, chains, stop_event, quote_source, scan_interval,
+                                min_profit_percentage, max_opportunities))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        book.close()
+
+
+class ShardedDetectionSupervisor:
+    """Runs detection in one process per chain (or per group of chains).
+
+    Shards quote their chains, publish the quotes into a shared price book
+    and run the spread and triangle searches, pushing hits into per-chain
+    rings of fixed-width records. The coordinator (the process owning the
+    supervisor) drains the rings into opportunity dicts, so only numbers
+    cross process boundaries. scale_to() re-splits the chains across more
+    or fewer processes; with one chain per process, detection uses one
+    core per chain. Rescaling runs off the event loop, so the process list
+    is guarded by a lock; check_shards() skips a round while a rescale
+    holds it.
+    """
+
+    def __init__(self, chains: List[str], tokens: List[str], dexes: List[str],
+                 quote_source: Optional[QuoteSource] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 scan_interval: float = 1.0,
+                 min_profit_percentage: float = 0.01,
+                 max_opportunities: int = 200,
+                 max_age_seconds: float = 5.0,
+                 ring_capacity: int = 1024,
+                 shard_count: Optional[int] = None):
+        """Initialize the supervisor.
+
+        Args:
+            chains: Chains to scan; each is owned by exactly one shard.
+            tokens: Token symbols in the price book.
+            dexes: DEX names in the price book.
+            quote_source: Picklable async callable chain -> quotes
+                (default: an AggregatorQuoteSource built from config).
+            config: Config for the default quote source.
+            scan_interval: Seconds between a shard's scans of its chains.
+            min_profit_percentage: Minimum spread or round-trip profit, in percent.
+            max_opportunities: Maximum spreads and triangles per chain scan.
+            max_age_seconds: Ring records older than this are discarded when drained.
+            ring_capacity: Records kept per chain before the oldest are overwritten.
+            shard_count: Initial number of shard processes (default one per chain).
+        """
+        self.layout = PriceBookLayout(list(chains), list(tokens), list(dexes), ring_capacity)
+        self.quote_source = quote_source or AggregatorQuoteSource(config or {})
+        self.scan_interval = scan_interval
+        self.min_profit_percentage = min_profit_percentage
+        self.max_opportunities = max_opportunities
+        self.max_age_seconds = max_age_seconds
+        self.target_shards = self._clamp(shard_count or len(self.layout.chains))
+
+        self._context = multiprocessing.get_context('spawn')
+        self.book: Optional[SharedPriceBook] = None
+        self.processes: List[Any] = []
+        self.assignments: List[List[str]] = []
+        self._stop_event = None
+        self._cursors = [0] * len(self.layout.chains)
+        self._lock = threading.RLock()  # processes and assignments
+
+        self.stats = {
+            'drained': 0,
+            'lost_to_overwrite': 0,
+            'dropped_stale': 0,
+            'rebalances': 0,
+            'restarts': 0,
+        }
+
+    def _clamp(self, count: int) -> int:
+        return max(1, min(len(self.layout.chains), int(count)))
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.processes)
+
+    @property
+    def running(self) -> bool:
+        return self.book is not None
+
+    def start(self) -> None:
+        """Create the shared block and spawn the shard processes."""
+        if self.running:
+            return
+        self.book = SharedPriceBook.create(self.layout)
+        self._cursors = [0] * len(self.layout.chains)
+        self._spawn(self.target_shards)
+        logger.info(f"🧩 Sharded detection: {self.shard_count} processes for {len(self.layout.chains)} chains")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop every shard and release the shared block."""
+        with self._lock:
+            if not self.running:
+                return
+            self._stop_shards(timeout)
+            self.book.close()
+            self.book = None
+
+    def _spawn(self, count: int) -> None:
+        chains = self.layout.chains
+        self.assignments = [chains[i::count] for i in range(count)]
+        self._stop_event = self._context.Event()
+        self.processes = [self._start_process(assigned) for assigned in self.assignments]
+
+    def _start_process(self, chains: List[str]):
+        process = self._context.Process(
+            target=_run_shard,
+            args=(self.book.name, self.layout, chains, self._stop_event, self.quote_source,
+                  self.scan_interval, self.min_profit_percentage, self.max_opportunities),
+            name=f"detect-{'+'.join(chains)}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def _stop_shards(self, timeout: float) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        self.processes = []
+
+    def scale_to(self, count: int) -> bool:
+        """Re-split the chains across count processes.
+
+        Returns:
+            True if the number of shard processes changed.
+        """
+        count = self._clamp(count)
+        with self._lock:
+            self.target_shards = count
+            if not self.running or count == self.shard_count:
+                return False
+            # Each chain must have a single writer, so the old shards stop first
+            self._stop_shards(timeout=max(1.0, self.scan_interval * 2))
+            self._spawn(count)
+            self.stats['rebalances'] += 1
+        logger.info(f"🧩 Sharded detection rescaled to {count} processes")
+        return True
+
+    def scale_out(self) -> bool:
+        return self.scale_to(self.shard_count + 1)
+
+    def scale_in(self) -> bool:
+        return self.scale_to(self.shard_count - 1)
+
+    def check_shards(self) -> int:
+        """Restart shard processes that died.
+
+        Returns:
+            Number of shards restarted; 0 while a rescale is in progress.
+        """
+        # Called on the event loop: never wait for a rescale's process joins
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            restarted = 0
+            for i, process in enumerate(self.processes):
+                if not process.is_alive():
+                    logger.warning(f"⚠️ Detection shard {process.name} exited ({process.exitcode}), restarting")
+                    self.processes[i] = self._start_process(self.assignments[i])
+                    restarted += 1
+            self.stats['restarts'] += restarted
+            return restarted
+        finally:
+            self._lock.release()
+
+    def utilization(self) -> float:
+        """Busiest shard's share of its scan interval spent scanning, in percent."""
+        if not self.running or not self.assignments:
+            return 0.0
+        busy = self.book.stats[:, _S['busy']]
+        return max(
+            sum(busy[self.layout.chain_index[chain]] for chain in assigned) for assigned in self.assignments
+        ) * 100.0
+
+    def read_quotes(self, chain: str) -> Dict[str, Dict[str, float]]:
+        """Latest quotes for a chain as token -> dex -> price."""
+        snapshot = self.book.read_quotes(self.layout.chain_index[chain])
+        quotes: Dict[str, Dict[str, float]] = {}
+        for row, col in zip(*np.nonzero(np.isfinite(snapshot[:, :, 0]))):
+            quotes.setdefault(self.layout.tokens[row], {})[self.layout.dexes[col]] = float(snapshot[row, col, 0])
+        return quotes
+
+    def drain_opportunities(self, chains: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Opportunities pushed since the last drain, most profitable first.
+
+        Args:
+            chains: Only drain these chains (default all).
+        """
+        if not self.running:
+            return []
+        oldest = time.time() - self.max_age_seconds
+        opportunities = []
+        for chain in chains or self.layout.chains:
+            chain_idx = self.layout.chain_index.get(chain)
+            if chain_idx is None:
+                continue
+            records, self._cursors[chain_idx], lost = self.book.pop(chain_idx, self._cursors[chain_idx])
+            self.stats['lost_to_overwrite'] += lost
+            fresh = records[records[:, _R['detected_at']] >= oldest]
+            self.stats['dropped_stale'] += len(records) - len(fresh)
+            opportunities.extend(self._to_opportunity(chain, record) for record in fresh)
+        self.stats['drained'] += len(opportunities)
+        opportunities.sort(key=lambda opp: opp['profit_percentage'], reverse=True)
+        return opportunities
+
+    def _to_opportunity(self, chain: str, record: np.ndarray) -> Dict[str, Any]:
+        """Turn a ring record into the dict shape MultiDEXAggregator produces."""
+        tokens, dexes = self.layout.tokens, self.layout.dexes
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record[_R['detected_at']]))
+        profit_pct = float(record[_R['profit_percentage']])
+        if int(record[_R['kind']]) == TRIANGULAR:
+            path_tokens = [tokens[int(record[_R[key]])] for key in ('token_a', 'token_b', 'token_c')]
+            path_dexes = [dexes[int(record[_R[key]])] for key in ('dex_a', 'dex_b', 'dex_c')]
+            start_price = float(record[_R['price_a']])
+            return {
+                'type': 'triangular_arbitrage',
+                'token': path_tokens[0],
+                'tokens': path_tokens,
+                'path': '→'.join(path_tokens + path_tokens[:1]),
+                'dexes': path_dexes,
+                'chains': [chain] * 3,
+                'source_chain': chain,
+                'target_chain': chain,
+                'profit_percentage': profit_pct,
+                'estimated_profit_usd': profit_pct / 100 * start_price,
+                'direction': '→'.join(path_dexes),
+                'timestamp': timestamp,
+                'discovered_at': float(record[_R['detected_at']]),
+                'source': 'sharded_detection'
+            }
+        token = tokens[int(record[_R['token_a']])]
+        buy_dex = dexes[int(record[_R['dex_a']])]
+        sell_dex = dexes[int(record[_R['dex_b']])]
+        buy_price = float(record[_R['price_a']])
+        sell_price = float(record[_R['price_b']])
+        return {
+            'type': 'simple_arbitrage',
+            'token': token,
+            'buy_dex': buy_dex,
+            'sell_dex': sell_dex,
+            'source_chain': chain,
+            'target_chain': chain,
+            'buy_chain': chain,
+            'sell_chain': chain,
+            'buy_price': buy_price,
+            'sell_price': sell_price,
+            'source_price': buy_price,
+            'target_price': sell_price,
+            'profit_percentage': profit_pct,
+            'liquidity': float(record[_R['liquidity']]),
+            'direction': f"{buy_dex}→{sell_dex}",
+            'timestamp': timestamp,
+            'discovered_at': float(record[_R['detected_at']]),
+            'source': 'sharded_detection'
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Supervisor counters plus per-chain shard scan stats."""
+        chains = {}
+        if self.running:
+            for chain, row in zip(self.layout.chains, self.book.stats):
+                chains[chain] = {name: float(row[i]) for i, name in enumerate(STAT_FIELDS)}
+        return {
+            **self.stats,
+            'shards': self.shard_count,
+            'assignments': [list(assigned) for assigned in self.assignments],
+            'utilization_pct': self.utilization(),
+            'chains': chains,
+        }
@@ -13,14 +13,15 @@ Comprehensive data flow management system that ensures:
 """
 
 import asyncio
+import itertools
 import logging
 import json
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Callable, Set, Union, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import uuid
 from pathlib import Path
 from collections import deque, defaultdict
 import weakref
@@ -68,22 +69,62 @@ class DataState(Enum):
     EXPIRED = "expired"
 
 
-@dataclass
+_NO_METADATA = MappingProxyType({})
+
+
 class DataPacket:
-    """Represents a data packet flowing through the system."""
-    packet_id: str
-    flow_type: DataFlowType
-    source_component: str
-    target_components: List[str]
-    data: Any
-    priority: DataPriority
-    timestamp: datetime
-    expiry_time: Optional[datetime] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    processing_history: List[str] = field(default_factory=list)
-    state: DataState = DataState.PENDING
-    retry_count: int = 0
-    max_retries: int = 3
+    """Represents a data packet flowing through the system.
+
+    The data and metadata are shared by reference with every target, so
+    treat them as read-only. A transformation that changes the data gets its
+    own packet from derive(). Ids are per-coordinator integers, and times are
+    time.monotonic() seconds.
+    """
+
+    __slots__ = ("packet_id", "flow_type", "source_component", "target_components", "data",
+                 "priority", "timestamp", "expiry_time", "metadata", "history", "state",
+                 "retry_count", "max_retries", "pending", "valid", "members")
+
+    def __init__(self, packet_id: int, flow_type: DataFlowType, source_component: str,
+                 target_components: Tuple[str, ...], data: Any, priority: DataPriority,
+                 timestamp: float, expiry_time: Optional[float] = None,
+                 metadata: Optional[Dict[str, Any]] = None, state: DataState = DataState.PENDING,
+                 retry_count: int = 0, max_retries: int = 3):
+        self.packet_id = packet_id
+        self.flow_type = flow_type
+        self.source_component = source_component
+        self.target_components = target_components
+        self.data = data
+        self.priority = priority
+        self.timestamp = timestamp
+        self.expiry_time = expiry_time
+        self.metadata = _NO_METADATA if metadata is None else metadata
+        self.history: Optional[List[str]] = None
+        self.state = state
+        self.retry_count = retry_count
+        self.max_retries = max_retries
+        self.pending = 0  # deliveries queued or batched but not yet processed
+        self.valid: Optional[bool] = None  # validation rules' verdict, once run
+        self.members: Optional[Tuple[int, ...]] = None  # ids of the packets a batch carries
+
+    @property
+    def processing_history(self) -> List[str]:
+        """Events recorded for this packet (the list is created on first use)."""
+        if self.history is None:
+            self.history = []
+        return self.history
+
+    @property
+    def is_batch(self) -> bool:
+        return self.members is not None
+
+    def derive(self, data: Any, target_component: str) -> 'DataPacket':
+        """Copy on write: the same packet for one target, carrying changed data."""
+        packet = DataPacket(self.packet_id, self.flow_type, self.source_component, (target_component,),
+                            data, self.priority, self.timestamp, self.expiry_time, self.metadata,
+                            self.state, self.retry_count, self.max_retries)
+        packet.history = [f"transformed_for_{target_component}"]
+        return packet
 
 
 @dataclass
@@ -95,15 +136,74 @@ class DataFlow:
     flow_type: DataFlowType
     direction: FlowDirection
     priority: DataPriority
+    # With batch_size > 1 or a rate limit, packets are held until batch_size
+    # of them or batch_timeout seconds, and the target's transformation and
+    # handler receive the batch as a list
     batch_size: int = 1
     batch_timeout: float = 1.0
     transformation_function: Optional[Callable] = None
     validation_function: Optional[Callable] = None
     enabled: bool = True
-    flow_rate_limit: Optional[float] = None  # packets per second
+    flow_rate_limit: Optional[float] = None  # packets per second, checked per batch
     last_activity: Optional[datetime] = None
 
 
+class _RouteTarget:
+    """A target component's queue, backpressure limit and transformation, resolved once."""
+
+    __slots__ = ("component", "queue", "backpressure_size", "transform", "transform_async")
+
+    def __init__(self, component: str, queue: asyncio.Queue, backpressure_size: float,
+                 transform: Optional[Callable]):
+        self.component = component
+        self.queue = queue
+        self.backpressure_size = backpressure_size
+        self.transform = transform
+        self.transform_async = transform is not None and asyncio.iscoroutinefunction(transform)
+
+
+class _FlowBatcher:
+    """A batching flow's buffered packets and its token bucket."""
+
+    __slots__ = ("flow", "target", "packets", "capacity", "tokens", "bucket_size", "refilled", "stats")
+
+    def __init__(self, flow: DataFlow, target: _RouteTarget, capacity: int):
+        self.flow = flow
+        self.target = target
+        self.packets: deque = deque()
+        self.capacity = capacity
+        # A full batch must always fit in the bucket
+        self.bucket_size = max(flow.flow_rate_limit or 0.0, float(flow.batch_size))
+        self.tokens = self.bucket_size
+        self.refilled = time.monotonic()
+        self.stats = {
+            "batches": 0,
+            "packets": 0,
+            "dropped_overflow": 0,
+            "dropped_invalid": 0,
+            "throttled": 0,
+            "backpressured": 0,
+        }
+
+    def due(self, now: float) -> bool:
+        """Whether the buffer has a full batch or its oldest packet has waited batch_timeout."""
+        packets = self.packets
+        return bool(packets) and (len(packets) >= self.flow.batch_size
+                                  or now - packets[0].timestamp >= self.flow.batch_timeout)
+
+    def take_tokens(self, count: int, now: float) -> bool:
+        """Token bucket at the batch boundary: spend count tokens if the flow's rate allows."""
+        rate = self.flow.flow_rate_limit
+        if not rate:
+            return True
+        self.tokens = min(self.bucket_size, self.tokens + (now - self.refilled) * rate)
+        self.refilled = now
+        if self.tokens < count:
+            return False
+        self.tokens -= count
+        return True
+
+
 @dataclass
 class ComponentDataInterface:
     """Data interface configuration for a component."""
@@ -138,17 +238,28 @@ class DataFlowCoordinator:
         # Core data structures
         self.data_flows: Dict[str, DataFlow] = {}
         self.component_interfaces: Dict[str, ComponentDataInterface] = {}
-        self.active_packets: Dict[str, DataPacket] = {}
+        # Packets with deliveries still queued, by id
+        self.active_packets: Dict[int, DataPacket] = {}
+        self._packet_ids = itertools.count(1)
+        # Offset from time.monotonic() to wall-clock time, for reporting
+        self._wall_offset = time.time() - time.monotonic()
         
         # Flow management
         self.flow_queues: Dict[str, asyncio.Queue] = {}
-        self.batch_buffers: Dict[str, List[DataPacket]] = defaultdict(list)
+        self.flow_batchers: Dict[str, _FlowBatcher] = {}
         self.flow_statistics: Dict[str, Dict[str, Any]] = defaultdict(dict)
         
         # Routing and transformation
         self.routing_table: Dict[Tuple[str, DataFlowType], List[str]] = {}
         self.transformation_pipeline: Dict[str, List[Callable]] = {}
         self.validation_rules: Dict[DataFlowType, List[Callable]] = defaultdict(list)
+        # Compiled from the above by _compile_routes()
+        self._routes: Dict[Tuple[str, DataFlowType],
+                           Tuple[Tuple[str, ...], Tuple[_RouteTarget, ...], Tuple[_FlowBatcher, ...]]] = {}
+        self._route_targets: Dict[Tuple[str, DataFlowType], _RouteTarget] = {}
+        self._validators: Dict[DataFlowType, Tuple[Tuple[Callable, bool], ...]] = {}
+        self._stats_refs: Dict[Tuple[str, DataFlowType], Dict[str, Any]] = {}
+        self._batchers_by_route: Dict[Tuple[str, DataFlowType, str], _FlowBatcher] = {}
         
         # Flow control
         self.flow_controllers: Dict[str, 'FlowController'] = {}
@@ -156,12 +267,16 @@ class DataFlowCoordinator:
         
         # Event handling
         self.event_subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self.data_lineage: Dict[str, List[str]] = {}
+        self.data_lineage: Dict[int, List[str]] = {}
+        self.delivery_outcomes: Dict[str, int] = defaultdict(int)
         
         # Configuration
         self.max_packet_age = self.config.get('max_packet_age', 300)  # 5 minutes
         self.cleanup_interval = self.config.get('cleanup_interval', 60)  # 1 minute
         self.stats_interval = self.config.get('stats_interval', 30)  # 30 seconds
+        self.track_lineage = self.config.get('track_lineage', True)
+        self.max_lineage_entries = self.config.get('max_lineage_entries', 10000)
+        self.batch_tick = self.config.get('batch_tick', 0.01)  # how often batch timeouts are checked
         
         # State management
         self.running = False
@@ -175,6 +290,7 @@ class DataFlowCoordinator:
         self._initialize_component_interfaces()
         self._initialize_data_flows()
         self._initialize_routing_table()
+        self._compile_routes()
     
     def _initialize_component_interfaces(self):
         """Initialize data interfaces for all MayArbi components."""
@@ -323,6 +439,79 @@ class DataFlowCoordinator:
                 self.routing_table[route_key].extend(targets)
             else:
                 self.routing_table[route_key].append(flow.target_component)
+
+    def _compile_routes(self):
+        """Resolve the routing table, transformations and validators for send_data().
+
+        Called at start-up and whenever a transformation or validation rule is
+        registered, so routing a packet is a dict lookup and a loop.
+        Misrouted flows are reported on the first compile only.
+        """
+        warn = not self._routes
+        self._route_targets = {}
+        for comp_name, interface in self.component_interfaces.items():
+            queue = self.flow_queues[comp_name]
+            backpressure_size = queue.maxsize * interface.backpressure_threshold
+            for flow_type in interface.input_flows:
+                self._route_targets[(comp_name, flow_type)] = _RouteTarget(
+                    comp_name, queue, backpressure_size, interface.transformation_rules.get(flow_type)
+                )
+
+        # Batching flows keep their buffers across recompiles
+        previous = self.flow_batchers
+        self.flow_batchers = {}
+        for flow in self.data_flows.values():
+            target = self._route_targets.get((flow.target_component, flow.flow_type))
+            if target is None or (flow.batch_size <= 1 and not flow.flow_rate_limit):
+                continue
+            batcher = _FlowBatcher(flow, target, self.component_interfaces[flow.target_component].buffer_size)
+            if flow.flow_id in previous:
+                batcher.packets = previous[flow.flow_id].packets
+                batcher.stats = previous[flow.flow_id].stats
+            self.flow_batchers[flow.flow_id] = batcher
+        self._batchers_by_route = {
+            (batcher.flow.source_component, batcher.flow.flow_type, batcher.flow.target_component): batcher
+            for batcher in self.flow_batchers.values()
+        }
+
+        self._routes = {}
+        for (source_component, flow_type), target_components in self.routing_table.items():
+            names = tuple(target_components)
+            targets = self._resolve_targets(flow_type, names, warn)
+            self._routes[(source_component, flow_type)] = (names, *self._split_batched(source_component, flow_type, targets))
+
+        self._validators = {
+            flow_type: tuple((rule, asyncio.iscoroutinefunction(rule)) for rule in rules)
+            for flow_type, rules in self.validation_rules.items()
+        }
+
+    def _split_batched(self, source_component: str, flow_type: DataFlowType,
+                       targets: Tuple[_RouteTarget, ...]) -> Tuple[Tuple[_RouteTarget, ...], Tuple[_FlowBatcher, ...]]:
+        """Separate targets delivered packet by packet from the batching flows."""
+        immediate, batched = [], []
+        for target in targets:
+            batcher = self._batchers_by_route.get((source_component, flow_type, target.component))
+            if batcher is None:
+                immediate.append(target)
+            else:
+                batched.append(batcher)
+        return tuple(immediate), tuple(batched)
+
+    def _resolve_targets(self, flow_type: DataFlowType, target_components,
+                         warn: bool = True) -> Tuple[_RouteTarget, ...]:
+        """Route targets for the named components, skipping ones that cannot take the flow."""
+        targets = []
+        for target_component in target_components:
+            target = self._route_targets.get((target_component, flow_type))
+            if target is not None:
+                targets.append(target)
+            elif not warn:
+                continue
+            elif target_component not in self.component_interfaces:
+                logger.warning(f"Unknown target component: {target_component}")
+            else:
+                logger.warning(f"{target_component} does not accept {flow_type.value}")
+        return tuple(targets)
     
     async def start_coordinator(self):
         """Start the data flow coordinator."""
@@ -373,9 +562,13 @@ class DataFlowCoordinator:
                        data: Any,
                        priority: DataPriority = DataPriority.NORMAL,
                        target_components: List[str] = None,
-                       metadata: Dict[str, Any] = None) -> str:
+                       metadata: Dict[str, Any] = None) -> int:
         """
         Send data through the coordination system.
+
+        The data and metadata are not copied; every target receives the same
+        objects, so neither should be modified after sending. Flows that batch
+        hold the packet in their buffer until the batch is dispatched.
         
         Args:
             source_component: Component sending the data
@@ -386,134 +579,114 @@ class DataFlowCoordinator:
             metadata: Additional metadata
             
         Returns:
-            Packet ID for tracking
+            Packet ID for tracking (0 if sending failed)
         """
         try:
-            # Generate packet ID
-            packet_id = f"{source_component}_{flow_type.value}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+            packet_id = next(self._packet_ids)
             
             # Determine target components
             if target_components is None:
-                route_key = (source_component, flow_type)
-                target_components = self.routing_table.get(route_key, [])
+                target_components, targets, batchers = self._routes.get((source_component, flow_type), ((), (), ()))
+            else:
+                target_components = tuple(target_components)
+                targets, batchers = self._split_batched(
+                    source_component, flow_type, self._resolve_targets(flow_type, target_components)
+                )
             
-            if not target_components:
+            if not targets and not batchers:
                 logger.warning(f"No target components found for {source_component} -> {flow_type.value}")
                 return packet_id
             
             # Create data packet
-            packet = DataPacket(
-                packet_id=packet_id,
-                flow_type=flow_type,
-                source_component=source_component,
-                target_components=target_components,
-                data=data,
-                priority=priority,
-                timestamp=datetime.now(),
-                expiry_time=datetime.now() + timedelta(seconds=self.max_packet_age),
-                metadata=metadata or {}
-            )
+            now = time.monotonic()
+            packet = DataPacket(packet_id, flow_type, source_component, target_components, data,
+                                priority, now, now + self.max_packet_age, metadata)
             
-            # Store packet
+            # Track the packet until every target has processed it
             self.active_packets[packet_id] = packet
             
             # Route packet to target components
-            await self._route_packet(packet)
+            if targets:
+                await self._route_packet(packet, targets)
+            for batcher in batchers:
+                if self._add_to_batch(batcher, packet):
+                    await self._flush_batch(batcher, now)
+            if not packet.pending:
+                self.active_packets.pop(packet_id, None)
             
             # Update statistics
             self._update_flow_statistics(source_component, flow_type, "sent")
             
-            logger.debug(f"📤 Data sent: {packet_id} from {source_component} to {target_components}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📤 Data sent: {packet_id} from {source_component} to {list(target_components)}")
             
             return packet_id
             
         except Exception as e:
             logger.error(f"Error sending data from {source_component}: {e}")
-            return ""
-
-    async def _route_packet(self, packet: DataPacket):
-        """Route a data packet to its target components."""
-        for target_component in packet.target_components:
-            try:
-                # Check if target component exists
-                if target_component not in self.component_interfaces:
-                    logger.warning(f"Unknown target component: {target_component}")
-                    continue
+            return 0
 
-                # Check if target accepts this flow type
-                interface = self.component_interfaces[target_component]
-                if packet.flow_type not in interface.input_flows:
-                    logger.warning(f"{target_component} does not accept {packet.flow_type.value}")
-                    continue
+    async def _route_packet(self, packet: DataPacket, targets: Optional[Tuple[_RouteTarget, ...]] = None):
+        """Route a data packet to its target components.
 
+        Targets without a transformation share the packet and one validation
+        of it; only a transformation that changes the data makes a new packet.
+        """
+        if targets is None:
+            targets = self._resolve_targets(packet.flow_type, packet.target_components)
+        for target in targets:
+            target_component = target.component
+            try:
                 # Check backpressure
-                queue = self.flow_queues[target_component]
-                if queue.qsize() / queue.maxsize > interface.backpressure_threshold:
+                queue = target.queue
+                if queue.qsize() > target.backpressure_size:
                     logger.warning(f"Backpressure detected for {target_component}")
                     await self._handle_backpressure(target_component, packet)
                     continue
 
                 # Apply transformations if needed
-                transformed_packet = await self._apply_transformations(packet, target_component)
+                if target.transform is None:
+                    delivered = packet
+                else:
+                    delivered = await self._apply_transformations(packet, target)
 
                 # Validate data
-                if not await self._validate_packet(transformed_packet):
+                if not await self._validate_packet(delivered):
                     logger.error(f"Packet validation failed for {target_component}")
                     continue
 
                 # Queue packet for processing
-                await queue.put(transformed_packet)
-
-                # Update packet history
-                packet.processing_history.append(f"routed_to_{target_component}")
+                try:
+                    queue.put_nowait(delivered)
+                except asyncio.QueueFull:
+                    await self._handle_backpressure(target_component, packet)
+                    continue
+                packet.pending += 1
 
-                logger.debug(f"📨 Packet routed: {packet.packet_id} -> {target_component}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📨 Packet routed: {packet.packet_id} -> {target_component}")
 
             except Exception as e:
                 logger.error(f"Error routing packet {packet.packet_id} to {target_component}: {e}")
 
-    async def _apply_transformations(self, packet: DataPacket, target_component: str) -> DataPacket:
-        """Apply data transformations for the target component."""
+    async def _apply_transformations(self, packet: DataPacket, target: _RouteTarget) -> DataPacket:
+        """Apply the target's transformation, copying the packet only if the data changed."""
         try:
-            interface = self.component_interfaces[target_component]
-
-            # Check if transformation is needed
-            if packet.flow_type in interface.transformation_rules:
-                transform_func = interface.transformation_rules[packet.flow_type]
-
-                # Apply transformation
-                transformed_data = await self._execute_transformation(transform_func, packet.data)
-
-                # Create new packet with transformed data
-                transformed_packet = DataPacket(
-                    packet_id=f"{packet.packet_id}_transformed",
-                    flow_type=packet.flow_type,
-                    source_component=packet.source_component,
-                    target_components=[target_component],
-                    data=transformed_data,
-                    priority=packet.priority,
-                    timestamp=packet.timestamp,
-                    expiry_time=packet.expiry_time,
-                    metadata=packet.metadata.copy(),
-                    processing_history=packet.processing_history.copy(),
-                    state=packet.state,
-                    retry_count=packet.retry_count,
-                    max_retries=packet.max_retries
-                )
-
-                transformed_packet.processing_history.append(f"transformed_for_{target_component}")
-                return transformed_packet
-
-            return packet
+            transformed_data = await self._execute_transformation(
+                target.transform, packet.data, target.transform_async
+            )
+            if transformed_data is packet.data:
+                return packet
+            return packet.derive(transformed_data, target.component)
 
         except Exception as e:
-            logger.error(f"Error applying transformations for {target_component}: {e}")
+            logger.error(f"Error applying transformations for {target.component}: {e}")
             return packet
 
-    async def _execute_transformation(self, transform_func: Callable, data: Any) -> Any:
+    async def _execute_transformation(self, transform_func: Callable, data: Any, is_async: bool) -> Any:
         """Execute a data transformation function."""
         try:
-            if asyncio.iscoroutinefunction(transform_func):
+            if is_async:
                 return await transform_func(data)
             else:
                 return transform_func(data)
@@ -522,36 +695,45 @@ class DataFlowCoordinator:
             return data
 
     async def _validate_packet(self, packet: DataPacket) -> bool:
-        """Validate a data packet."""
+        """Validate a data packet.
+
+        Expiry is checked on every call; the validation rules run once per
+        packet however many targets or batches it goes to.
+        """
         try:
             # Check packet expiry
-            if packet.expiry_time and datetime.now() > packet.expiry_time:
+            if packet.expiry_time and time.monotonic() > packet.expiry_time:
                 logger.warning(f"Packet expired: {packet.packet_id}")
                 packet.state = DataState.EXPIRED
                 return False
 
+            if packet.valid is not None:
+                return packet.valid
+
             # Check data validity
             if packet.data is None:
                 logger.warning(f"Packet has no data: {packet.packet_id}")
+                packet.valid = False
                 return False
 
             # Apply flow-specific validation rules
-            validation_rules = self.validation_rules.get(packet.flow_type, [])
-            for rule in validation_rules:
-                if not await self._execute_validation_rule(rule, packet.data):
+            for rule, is_async in self._validators.get(packet.flow_type, ()):
+                if not await self._execute_validation_rule(rule, packet.data, is_async):
                     logger.warning(f"Validation rule failed for {packet.packet_id}")
+                    packet.valid = False
                     return False
 
+            packet.valid = True
             return True
 
         except Exception as e:
             logger.error(f"Error validating packet {packet.packet_id}: {e}")
             return False
 
-    async def _execute_validation_rule(self, rule: Callable, data: Any) -> bool:
+    async def _execute_validation_rule(self, rule: Callable, data: Any, is_async: bool) -> bool:
         """Execute a validation rule."""
         try:
-            if asyncio.iscoroutinefunction(rule):
+            if is_async:
                 return await rule(data)
             else:
                 return rule(data)
@@ -577,9 +759,9 @@ class DataFlowCoordinator:
 
                 logger.info(f"Retrying packet {packet.packet_id} in {delay}s (attempt {packet.retry_count})")
 
-                # Schedule retry
+                # Schedule retry to this component only; the others already have it
                 await asyncio.sleep(delay)
-                await self._route_packet(packet)
+                await self._route_packet(packet, self._resolve_targets(packet.flow_type, (component,)))
             else:
                 logger.error(f"Max retries exceeded for packet: {packet.packet_id}")
                 packet.state = DataState.FAILED
@@ -619,38 +801,56 @@ class DataFlowCoordinator:
         """Process a single packet for a target component."""
         try:
             packet.state = DataState.PROCESSING
-            packet.processing_history.append(f"processing_by_{target_component}")
 
             # Get component interface
             interface = self.component_interfaces[target_component]
 
             # Check if component has a handler for this flow type
-            if packet.flow_type in interface.data_handlers:
-                handler = interface.data_handlers[packet.flow_type]
-
+            handler = interface.data_handlers.get(packet.flow_type)
+            if handler is not None:
                 # Execute handler
                 result = await self._execute_data_handler(handler, packet.data, packet.metadata)
 
                 if result:
                     packet.state = DataState.COMPLETED
-                    logger.debug(f"✅ Packet processed: {packet.packet_id} by {target_component}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"✅ Packet processed: {packet.packet_id} by {target_component}")
                 else:
                     packet.state = DataState.FAILED
                     logger.warning(f"❌ Packet processing failed: {packet.packet_id} by {target_component}")
             else:
                 # No specific handler, just mark as completed
                 packet.state = DataState.COMPLETED
-                logger.debug(f"📝 Packet received: {packet.packet_id} by {target_component}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📝 Packet received: {packet.packet_id} by {target_component}")
 
             # Update statistics
-            self._update_flow_statistics(target_component, packet.flow_type, "processed")
+            self._update_flow_statistics(target_component, packet.flow_type, "processed",
+                                         len(packet.members) if packet.is_batch else 1)
+            self.delivery_outcomes[packet.state.value] += 1
 
             # Update data lineage
-            self._update_data_lineage(packet)
+            self._update_data_lineage(packet, target_component)
 
         except Exception as e:
             logger.error(f"Error processing packet {packet.packet_id} for {target_component}: {e}")
             packet.state = DataState.FAILED
+            self.delivery_outcomes[packet.state.value] += 1
+
+        finally:
+            if packet.is_batch:
+                for packet_id in packet.members:
+                    self._release_packet(packet_id)
+            else:
+                self._release_packet(packet.packet_id)
+
+    def _release_packet(self, packet_id: int):
+        """Stop tracking a packet once its last queued delivery has been processed."""
+        origin = self.active_packets.get(packet_id)
+        if origin is not None:
+            origin.pending -= 1
+            if origin.pending <= 0:
+                del self.active_packets[packet_id]
 
     async def _execute_data_handler(self, handler: Callable, data: Any, metadata: Dict[str, Any]) -> bool:
         """Execute a data handler function."""
@@ -663,104 +863,146 @@ class DataFlowCoordinator:
             logger.error(f"Data handler failed: {e}")
             return False
 
-    def _update_data_lineage(self, packet: DataPacket):
-        """Update data lineage tracking."""
-        lineage_key = packet.packet_id
-        if lineage_key not in self.data_lineage:
-            self.data_lineage[lineage_key] = []
-
-        self.data_lineage[lineage_key].extend(packet.processing_history)
+    def _update_data_lineage(self, packet: DataPacket, target_component: str):
+        """Update data lineage tracking, keeping at most max_lineage_entries packets.
 
-    def _update_flow_statistics(self, component: str, flow_type: DataFlowType, action: str):
+        A batch is recorded against each of the packets it carried.
+        """
+        if not self.track_lineage:
+            return
+        if packet.is_batch:
+            packet_ids = packet.members
+            event = f"batch_{packet.packet_id}_processed_by_{target_component}"
+        else:
+            packet_ids = (packet.packet_id,)
+            event = f"processed_by_{target_component}"
+
+        for packet_id in packet_ids:
+            lineage = self.data_lineage.get(packet_id)
+            if lineage is None:
+                if len(self.data_lineage) >= self.max_lineage_entries:
+                    # Ids increase, so the first key is the oldest packet
+                    del self.data_lineage[next(iter(self.data_lineage))]
+                lineage = self.data_lineage[packet_id] = []
+
+            if packet.history:
+                lineage.extend(packet.history)
+            lineage.append(event)
+
+    def _update_flow_statistics(self, component: str, flow_type: DataFlowType, action: str, count: int = 1):
         """Update flow statistics."""
-        stats_key = f"{component}_{flow_type.value}"
-
-        if stats_key not in self.flow_statistics:
-            self.flow_statistics[stats_key] = {
-                "sent": 0,
-                "processed": 0,
-                "failed": 0,
-                "last_activity": None
-            }
+        stats = self._stats_refs.get((component, flow_type))
+        if stats is None:
+            stats = self.flow_statistics[f"{component}_{flow_type.value}"]
+            for key in ("sent", "processed", "failed"):
+                stats.setdefault(key, 0)
+            stats.setdefault("last_activity", None)
+            self._stats_refs[(component, flow_type)] = stats
 
-        self.flow_statistics[stats_key][action] = self.flow_statistics[stats_key].get(action, 0) + 1
-        self.flow_statistics[stats_key]["last_activity"] = datetime.now()
+        stats[action] = stats.get(action, 0) + count
+        stats["last_activity"] = time.time()
 
     async def _batch_processor(self):
-        """Process batched data flows."""
+        """Dispatch batches whose timeout has passed or that were held back by rate or backpressure."""
         logger.info("🔄 Starting batch processor")
 
         while self.running:
             try:
-                # Process batches for each flow
-                for flow in self.data_flows.values():
-                    if flow.batch_size > 1:
-                        await self._process_batch_flow(flow)
-
-                await asyncio.sleep(0.5)  # Check batches every 500ms
+                await self._flush_due_batches()
+                await asyncio.sleep(self.batch_tick)
 
             except Exception as e:
                 logger.error(f"Error in batch processor: {e}")
                 await asyncio.sleep(1)
 
-    async def _process_batch_flow(self, flow: DataFlow):
-        """Process a batch flow."""
+    async def _flush_due_batches(self) -> int:
+        """Dispatch every batch that is due; returns the number dispatched."""
+        dispatched = 0
+        now = time.monotonic()
+        for batcher in self.flow_batchers.values():
+            while batcher.due(now) and await self._flush_batch(batcher, now):
+                dispatched += 1
+        return dispatched
+
+    def _add_to_batch(self, batcher: _FlowBatcher, packet: DataPacket) -> bool:
+        """Buffer a packet for a batching flow; True once a full batch is ready."""
+        packets = batcher.packets
+        if len(packets) >= batcher.capacity:
+            # Keep the newest data: drop the oldest buffered packet
+            self._release_packet(packets.popleft().packet_id)
+            batcher.stats["dropped_overflow"] += 1
+        packets.append(packet)
+        packet.pending += 1
+        return len(packets) >= batcher.flow.batch_size
+
+    async def _flush_batch(self, batcher: _FlowBatcher, now: float) -> bool:
+        """Validate, transform and queue one batch for the flow's target.
+
+        The batch waits in the buffer (returning False) while the target is
+        backpressured or the flow's token bucket cannot cover it.
+        """
+        flow, target, packets = batcher.flow, batcher.target, batcher.packets
         try:
-            batch_key = f"{flow.source_component}_{flow.target_component}_{flow.flow_type.value}"
-            batch = self.batch_buffers[batch_key]
-
-            # Check if batch should be processed
-            should_process = False
-
-            # Check batch size
-            if len(batch) >= flow.batch_size:
-                should_process = True
-                reason = f"batch_size_reached_{len(batch)}"
-
-            # Check batch timeout
-            elif batch and (datetime.now() - batch[0].timestamp).total_seconds() >= flow.batch_timeout:
-                should_process = True
-                reason = f"batch_timeout_{flow.batch_timeout}s"
-
-            if should_process and batch:
-                logger.debug(f"📦 Processing batch: {batch_key} ({reason})")
-
-                # Create batch packet
-                batch_packet = self._create_batch_packet(batch, flow)
-
-                # Route batch packet
-                await self._route_packet(batch_packet)
+            if target.queue.qsize() > target.backpressure_size:
+                batcher.stats["backpressured"] += 1
+                return False
+            count = min(len(packets), flow.batch_size)
+            if not batcher.take_tokens(count, now):
+                batcher.stats["throttled"] += 1
+                return False
 
-                # Clear batch
-                self.batch_buffers[batch_key] = []
+            batch = []
+            for _ in range(count):
+                packet = packets.popleft()
+                # Packets fanned out to several flows were already validated by the first
+                if packet.valid and (not packet.expiry_time or now <= packet.expiry_time):
+                    batch.append(packet)
+                elif await self._validate_packet(packet):
+                    batch.append(packet)
+                else:
+                    batcher.stats["dropped_invalid"] += 1
+                    self._release_packet(packet.packet_id)
+            if not batch:
+                return True
+
+            batch_packet = self._create_batch_packet(batch, flow)
+            if target.transform is not None:
+                batch_packet.data = await self._execute_transformation(
+                    target.transform, batch_packet.data, target.transform_async
+                )
+                batch_packet.processing_history.append(f"transformed_for_{target.component}")
+            target.queue.put_nowait(batch_packet)
+
+            batcher.stats["batches"] += 1
+            batcher.stats["packets"] += len(batch)
+            flow.last_activity = datetime.now()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📦 Batch dispatched: {flow.flow_id} ({len(batch)} packets)")
+            return True
 
         except Exception as e:
             logger.error(f"Error processing batch flow {flow.flow_id}: {e}")
+            return False
 
     def _create_batch_packet(self, packets: List[DataPacket], flow: DataFlow) -> DataPacket:
-        """Create a batch packet from individual packets."""
-        batch_data = [packet.data for packet in packets]
-        batch_metadata = {
-            "batch_size": len(packets),
-            "batch_flow": flow.flow_id,
-            "individual_packets": [packet.packet_id for packet in packets]
-        }
-
-        # Use the first packet as template
-        template = packets[0]
-
+        """Create a batch packet whose data is the list of the packets' data."""
         batch_packet = DataPacket(
-            packet_id=f"batch_{flow.flow_id}_{int(time.time())}",
-            flow_type=template.flow_type,
-            source_component=template.source_component,
-            target_components=[flow.target_component],
-            data=batch_data,
-            priority=max(packet.priority for packet in packets),
-            timestamp=datetime.now(),
-            expiry_time=min(packet.expiry_time for packet in packets if packet.expiry_time),
-            metadata=batch_metadata
+            packet_id=next(self._packet_ids),
+            flow_type=flow.flow_type,
+            source_component=flow.source_component,
+            target_components=(flow.target_component,),
+            data=[packet.data for packet in packets],
+            priority=max((packet.priority for packet in packets), key=lambda priority: priority.value),
+            timestamp=packets[0].timestamp,
+            expiry_time=min((packet.expiry_time for packet in packets if packet.expiry_time), default=None),
+            metadata={
+                "batch_size": len(packets),
+                "batch_flow": flow.flow_id,
+                "individual_packets": [packet.packet_id for packet in packets]
+            }
         )
-
+        batch_packet.members = tuple(packet.packet_id for packet in packets)
+        batch_packet.valid = True
         return batch_packet
 
     async def _flow_monitor(self):
@@ -796,11 +1038,6 @@ class DataFlowCoordinator:
                     if time_since_activity > 300:  # 5 minutes
                         logger.warning(f"⚠️ Flow inactive: {flow.flow_id} ({time_since_activity:.0f}s)")
 
-                # Check flow rate limits
-                if flow.flow_rate_limit:
-                    # Implementation for rate limiting would go here
-                    pass
-
             except Exception as e:
                 logger.error(f"Error checking flow health for {flow.flow_id}: {e}")
 
@@ -841,34 +1078,22 @@ class DataFlowCoordinator:
 
         while self.running:
             try:
-                current_time = datetime.now()
-
-                # Clean up expired packets
-                expired_packets = []
-                for packet_id, packet in self.active_packets.items():
-                    if packet.expiry_time and current_time > packet.expiry_time:
-                        expired_packets.append(packet_id)
-                    elif packet.state in [DataState.COMPLETED, DataState.FAILED]:
-                        # Clean up completed/failed packets after some time
-                        age = (current_time - packet.timestamp).total_seconds()
-                        if age > 3600:  # 1 hour
-                            expired_packets.append(packet_id)
+                current_time = time.monotonic()
+
+                # Processed packets untrack themselves; drop any whose
+                # deliveries were never processed before they expired
+                expired_packets = [
+                    packet_id for packet_id, packet in self.active_packets.items()
+                    if packet.expiry_time and current_time > packet.expiry_time
+                ]
 
                 for packet_id in expired_packets:
-                    del self.active_packets[packet_id]
+                    self.active_packets.pop(packet_id).state = DataState.EXPIRED
 
                 if expired_packets:
                     logger.debug(f"🧹 Cleaned up {len(expired_packets)} expired packets")
 
-                # Clean up old lineage data
-                old_lineage_keys = []
-                for lineage_key in self.data_lineage.keys():
-                    # Keep lineage for 24 hours
-                    if lineage_key not in self.active_packets:
-                        old_lineage_keys.append(lineage_key)
-
-                for key in old_lineage_keys[:100]:  # Limit cleanup per cycle
-                    del self.data_lineage[key]
+                # Lineage is bounded by max_lineage_entries as it is recorded
 
                 await asyncio.sleep(self.cleanup_interval)
 
@@ -920,12 +1145,14 @@ class DataFlowCoordinator:
             return {
                 "total_active_packets": len(self.active_packets),
                 "packet_states": dict(packet_states),
+                "delivery_outcomes": dict(self.delivery_outcomes),
                 "total_flows": total_flows,
                 "active_flows": active_flows,
                 "avg_queue_utilization": avg_queue_utilization,
                 "total_components": len(self.component_interfaces),
                 "data_lineage_entries": len(self.data_lineage),
-                "batch_buffers": {k: len(v) for k, v in self.batch_buffers.items()},
+                "batch_buffers": {flow_id: len(batcher.packets) for flow_id, batcher in self.flow_batchers.items()},
+                "batching": {flow_id: dict(batcher.stats) for flow_id, batcher in self.flow_batchers.items()},
                 "timestamp": datetime.now().isoformat()
             }
 
@@ -946,6 +1173,7 @@ class DataFlowCoordinator:
         """Register a data transformation rule for a component and flow type."""
         if component in self.component_interfaces:
             self.component_interfaces[component].transformation_rules[flow_type] = transform_func
+            self._compile_routes()
             logger.info(f"🔄 Registered transformation rule: {component} -> {flow_type.value}")
         else:
             logger.warning(f"Unknown component: {component}")
@@ -953,6 +1181,7 @@ class DataFlowCoordinator:
     def register_validation_rule(self, flow_type: DataFlowType, validation_func: Callable):
         """Register a validation rule for a flow type."""
         self.validation_rules[flow_type].append(validation_func)
+        self._compile_routes()
         logger.info(f"✅ Registered validation rule for {flow_type.value}")
 
     def get_flow_statistics(self) -> Dict[str, Any]:
@@ -980,7 +1209,7 @@ class DataFlowCoordinator:
             "transformation_rules": list(interface.transformation_rules.keys())
         }
 
-    def get_packet_lineage(self, packet_id: str) -> List[str]:
+    def get_packet_lineage(self, packet_id: int) -> List[str]:
         """Get the processing lineage for a packet."""
         return self.data_lineage.get(packet_id, [])
 
@@ -1001,11 +1230,11 @@ class DataFlowCoordinator:
                 "packet_id": packet.packet_id,
                 "flow_type": packet.flow_type.value,
                 "source_component": packet.source_component,
-                "target_components": packet.target_components,
+                "target_components": list(packet.target_components),
                 "priority": packet.priority.value,
                 "state": packet.state.value,
-                "timestamp": packet.timestamp.isoformat(),
-                "processing_history": packet.processing_history,
+                "timestamp": datetime.fromtimestamp(packet.timestamp + self._wall_offset).isoformat(),
+                "processing_history": list(packet.history or ()),
                 "retry_count": packet.retry_count
             })
 
@@ -1015,7 +1244,7 @@ class DataFlowCoordinator:
         """Save coordinator state to file."""
         try:
             state = {
-                "flow_statistics": {k: {**v, "last_activity": v["last_activity"].isoformat() if v["last_activity"] else None}
+                "flow_statistics": {k: {**v, "last_activity": datetime.fromtimestamp(v["last_activity"]).isoformat() if v["last_activity"] else None}
                                    for k, v in self.flow_statistics.items()},
                 "data_flows": {},
                 "component_interfaces": {},
@@ -1070,10 +1299,11 @@ class DataFlowCoordinator:
                 state = json.load(f)
 
             # Load flow statistics
+            self._stats_refs.clear()
             for stats_key, stats in state.get("flow_statistics", {}).items():
                 self.flow_statistics[stats_key] = stats.copy()
                 if stats.get("last_activity"):
-                    self.flow_statistics[stats_key]["last_activity"] = datetime.fromisoformat(stats["last_activity"])
+                    self.flow_statistics[stats_key]["last_activity"] = datetime.fromisoformat(stats["last_activity"]).timestamp()
 
             logger.debug(f"Data flow coordinator state loaded from {self.state_file}")
 
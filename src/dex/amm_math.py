@@ -0,0 +1,177 @@
+"""Local swap math for constant-product and Solidly stable pools.
+
+Everything works on integer token units and rounds the way the pool
+contracts do, so a quote from cached reserves matches what getAmountOut
+would return on-chain for the same reserves.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+FEE_DENOMINATOR = 10000
+_ONE = 10**18
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int = 30) -> int:
+    """Uniswap V2 getAmountOut with the fee in basis points (30 = 0.3%)."""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (FEE_DENOMINATOR - fee_bps)
+    return amount_in_with_fee * reserve_out // (reserve_in * FEE_DENOMINATOR + amount_in_with_fee)
+
+
+def get_amount_in(amount_out: int, reserve_in: int, reserve_out: int, fee_bps: int = 30) -> int:
+    """Uniswap V2 getAmountIn: input needed for amount_out. Raises ValueError if unreachable."""
+    if amount_out <= 0:
+        return 0
+    if reserve_in <= 0 or amount_out >= reserve_out:
+        raise ValueError("insufficient liquidity")
+    numerator = reserve_in * amount_out * FEE_DENOMINATOR
+    denominator = (reserve_out - amount_out) * (FEE_DENOMINATOR - fee_bps)
+    return numerator // denominator + 1
+
+
+def _stable_k(x: int, y: int) -> int:
+    """x^3*y + y^3*x on 1e18-normalized balances."""
+    a = x * y // _ONE
+    b = x * x // _ONE + y * y // _ONE
+    return a * b // _ONE
+
+
+def _f(x0: int, y: int) -> int:
+    return x0 * (y * y // _ONE * y // _ONE) // _ONE + (x0 * x0 // _ONE * x0 // _ONE) * y // _ONE
+
+
+def _d(x0: int, y: int) -> int:
+    return 3 * x0 * (y * y // _ONE) // _ONE + (x0 * x0 // _ONE * x0 // _ONE)
+
+
+def _get_y(x0: int, xy: int, y: int) -> int:
+    """Newton's method for y with f(x0, y) = xy, as in the Velodrome V2 pair."""
+    for _ in range(255):
+        k = _f(x0, y)
+        if k < xy:
+            dy = (xy - k) * _ONE // _d(x0, y)
+            if dy == 0:
+                if k == xy:
+                    return y
+                if _stable_k(x0, y + 1) > xy:
+                    return y + 1
+                dy = 1
+            y += dy
+        else:
+            dy = (k - xy) * _ONE // _d(x0, y)
+            if dy == 0:
+                if k == xy or _f(x0, y - 1) < xy:
+                    return y
+                dy = 1
+            y -= dy
+    raise ValueError("stable swap did not converge")
+
+
+def get_amount_out_stable(amount_in: int, reserve_in: int, reserve_out: int,
+                          decimals_in: int, decimals_out: int, fee_bps: int = 5) -> int:
+    """Solidly stable-pool getAmountOut (Velodrome, Aerodrome, Ramses, Thena).
+
+    The fee is taken from the input first, then the x^3*y + y^3*x invariant
+    is solved on balances normalized to 18 decimals.
+    """
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in -= amount_in * fee_bps // FEE_DENOMINATOR
+    unit_in, unit_out = 10**decimals_in, 10**decimals_out
+    x = reserve_in * _ONE // unit_in
+    y = reserve_out * _ONE // unit_out
+    xy = _stable_k(x, y)
+    x0 = amount_in * _ONE // unit_in + x
+    out = y - _get_y(x0, xy, y)
+    return max(out, 0) * unit_out // _ONE
+
+
+@dataclass(frozen=True)
+class AmmPool:
+    """Cached state of one V2-style pool, in raw token units."""
+    reserve0: int
+    reserve1: int
+    fee_bps: int = 30
+    stable: bool = False
+    decimals0: int = 18
+    decimals1: int = 18
+
+    def get_amount_out(self, amount_in: int, zero_for_one: bool) -> int:
+        """Output for amount_in of token0 (zero_for_one) or token1."""
+        if zero_for_one:
+            reserve_in, reserve_out = self.reserve0, self.reserve1
+            decimals_in, decimals_out = self.decimals0, self.decimals1
+        else:
+            reserve_in, reserve_out = self.reserve1, self.reserve0
+            decimals_in, decimals_out = self.decimals1, self.decimals0
+        if self.stable:
+            return get_amount_out_stable(amount_in, reserve_in, reserve_out, decimals_in, decimals_out, self.fee_bps)
+        return get_amount_out(amount_in, reserve_in, reserve_out, self.fee_bps)
+
+    def reserves(self, zero_for_one: bool) -> Tuple[int, int]:
+        """(reserve in, reserve out) for a swap direction."""
+        return (self.reserve0, self.reserve1) if zero_for_one else (self.reserve1, self.reserve0)
+
+
+def optimal_arbitrage_input(buy: AmmPool, buy_zero_for_one: bool,
+                            sell: AmmPool, sell_zero_for_one: bool) -> Tuple[int, int]:
+    """Best input for swapping through buy and then back through sell.
+
+    The first leg swaps token X for token Y on buy; the second swaps Y back
+    to X on sell. For two constant-product pools the optimum is closed form:
+    composing the legs gives out(x) = N*x / (D + M*x), and out'(x) = 1 at
+    x* = (sqrt(N*D) - D) / M. Pools with a stable curve are solved by
+    integer ternary search on the exact profit, which is concave in x.
+
+    Returns:
+        (amount in, profit) in raw units of X; (0, 0) if no input profits.
+    """
+    def profit(amount_in: int) -> int:
+        return sell.get_amount_out(buy.get_amount_out(amount_in, buy_zero_for_one), sell_zero_for_one) - amount_in
+
+    a_in, a_out = buy.reserves(buy_zero_for_one)
+    b_in, b_out = sell.reserves(sell_zero_for_one)
+    if min(a_in, a_out, b_in, b_out) <= 0:
+        return 0, 0
+
+    if not buy.stable and not sell.stable:
+        gamma_a = FEE_DENOMINATOR - buy.fee_bps
+        gamma_b = FEE_DENOMINATOR - sell.fee_bps
+        n = gamma_a * gamma_b * a_out * b_out
+        d = FEE_DENOMINATOR * FEE_DENOMINATOR * a_in * b_in
+        if n <= d:
+            return 0, 0
+        m = gamma_a * (FEE_DENOMINATOR * b_in + gamma_b * a_out)
+        guess = (math.isqrt(n * d) - d) // m
+        # Integer rounding in the pools can move the optimum by a unit
+        return _best_near(profit, guess)
+
+    return _ternary_max(profit, 1, a_in)
+
+
+def _best_near(profit: Callable[[int], int], guess: int) -> Tuple[int, int]:
+    best = (0, 0)
+    for amount_in in (guess - 1, guess, guess + 1):
+        if amount_in > 0:
+            value = profit(amount_in)
+            if value > best[1]:
+                best = (amount_in, value)
+    return best
+
+
+def _ternary_max(profit: Callable[[int], int], low: int, high: int) -> Tuple[int, int]:
+    while high - low > 2:
+        third = (high - low) // 3
+        if profit(low + third) < profit(high - third):
+            low = low + third + 1
+        else:
+            high = high - third
+    best = (0, 0)
+    for amount_in in range(low, high + 1):
+        value = profit(amount_in)
+        if value > best[1]:
+            best = (amount_in, value)
+    return best
@@ -7,9 +7,11 @@ for price data, liquidity information, and trade execution.
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from .amm_math import AmmPool, optimal_arbitrage_input
+
 from .uniswap_v3_adapter import UniswapV3Adapter
 from .sushiswap_adapter import SushiSwapAdapter
 from .real_price_adapter import CoinGeckoAdapter
@@ -197,6 +199,23 @@ class DEXManager:
 
         return prices
 
+    async def get_cross_dex_prices_batch(self, token_pairs: List[tuple]) -> Dict[tuple, Dict[str, Optional[float]]]:
+        """Get prices for many token pairs across all DEXs at once.
+
+        All lookups are issued concurrently, so subgraph-backed adapters
+        coalesce them into one request per subgraph.
+
+        Args:
+            token_pairs: List of (base_token, quote_token) tuples
+
+        Returns:
+            Dictionary mapping each token pair to its DEX name -> price map
+        """
+        results = await asyncio.gather(
+            *(self.get_cross_dex_prices(base_token, quote_token) for base_token, quote_token in token_pairs)
+        )
+        return dict(zip(token_pairs, results))
+
     async def find_arbitrage_opportunities(self, min_profit_percentage: float = 0.5) -> List[Dict[str, Any]]:
         """Find arbitrage opportunities across connected DEXs.
 
@@ -217,18 +236,19 @@ class DEXManager:
 
             logger.info(f"Found {len(common_pairs)} common pairs across DEXs")
 
-            # Check each common pair for arbitrage opportunities
-            for base_token, quote_token in common_pairs:
-                try:
-                    opportunity = await self._check_arbitrage_opportunity(
-                        base_token, quote_token, all_pairs, min_profit_percentage
-                    )
-                    if opportunity:
-                        opportunities.append(opportunity)
-
-                except Exception as e:
-                    logger.error(f"Error checking arbitrage for {base_token}/{quote_token}: {e}")
+            # Check all common pairs concurrently so price lookups are batched
+            results = await asyncio.gather(
+                *(self._check_arbitrage_opportunity(base_token, quote_token, all_pairs, min_profit_percentage)
+                  for base_token, quote_token in common_pairs),
+                return_exceptions=True
+            )
+
+            for (base_token, quote_token), opportunity in zip(common_pairs, results):
+                if isinstance(opportunity, Exception):
+                    logger.error(f"Error checking arbitrage for {base_token}/{quote_token}: {opportunity}")
                     continue
+                if opportunity:
+                    opportunities.append(opportunity)
 
             # Sort by profit potential
             opportunities.sort(key=lambda x: x.get('profit_percentage', 0), reverse=True)
@@ -290,13 +310,39 @@ class DEXManager:
             if profit_percentage < min_profit_percentage:
                 return None
 
-            # Get liquidity information
-            buy_liquidity = await self.dexs[min_price_dex].get_liquidity(base_token, quote_token)
-            sell_liquidity = await self.dexs[max_price_dex].get_liquidity(base_token, quote_token)
+            buy_pool = self._find_pool(all_pairs.get(min_price_dex, []), base_token, quote_token)
+            sell_pool = self._find_pool(all_pairs.get(max_price_dex, []), base_token, quote_token)
+            quote_price_usd = None
+            trade_size_quote = profit_quote = None
+
+            if buy_pool and sell_pool:
+                # Size from cached reserves: buy base with quote, sell it back for quote
+                buy_amm, buy_base_is_token0, buy_liquidity = buy_pool
+                sell_amm, sell_base_is_token0, sell_liquidity = sell_pool
+                amount_in, profit = optimal_arbitrage_input(
+                    buy_amm, not buy_base_is_token0, sell_amm, sell_base_is_token0
+                )
+                if profit <= 0:
+                    return None  # Fees and price impact eat the spread at every size
+                quote_price_usd = await self._quote_token_usd(base_token, quote_token, min_price)
+
+            if quote_price_usd:
+                # The optimum is in quote token units; valued in USD at the quote token's price
+                trade_size_quote = amount_in / self.AMM_UNIT
+                profit_quote = profit / self.AMM_UNIT
+                max_trade_size_usd = trade_size_quote * quote_price_usd
+                estimated_profit_usd = profit_quote * quote_price_usd
+                sizing = 'amm'
+            else:
+                # No reserves, or no USD price for the quote token: get liquidity information
+                buy_liquidity = await self.dexs[min_price_dex].get_liquidity(base_token, quote_token)
+                sell_liquidity = await self.dexs[max_price_dex].get_liquidity(base_token, quote_token)
 
-            # Estimate trade size based on liquidity
-            min_liquidity = min(buy_liquidity or 0, sell_liquidity or 0)
-            max_trade_size_usd = min_liquidity * 0.01 if min_liquidity > 0 else 1000  # 1% of liquidity or $1000
+                # Estimate trade size based on liquidity
+                min_liquidity = min(buy_liquidity or 0, sell_liquidity or 0)
+                max_trade_size_usd = min_liquidity * 0.01 if min_liquidity > 0 else 1000  # 1% of liquidity or $1000
+                estimated_profit_usd = (max_price - min_price) * (max_trade_size_usd / min_price)
+                sizing = 'liquidity_heuristic'
 
             opportunity = {
                 'id': f"arb_{base_token}_{quote_token}_{datetime.now().timestamp()}",
@@ -307,8 +353,11 @@ class DEXManager:
                 'buy_price': min_price,
                 'sell_price': max_price,
                 'profit_percentage': profit_percentage,
-                'estimated_profit_usd': (max_price - min_price) * (max_trade_size_usd / min_price),
+                'estimated_profit_usd': estimated_profit_usd,
                 'max_trade_size_usd': max_trade_size_usd,
+                'sizing': sizing,
+                'trade_size_quote': trade_size_quote,
+                'estimated_profit_quote': profit_quote,
                 'buy_liquidity': buy_liquidity,
                 'sell_liquidity': sell_liquidity,
                 'all_prices': valid_prices,
@@ -322,6 +371,65 @@ class DEXManager:
             logger.error(f"Error checking arbitrage opportunity for {base_token}/{quote_token}: {e}")
             return None
 
+    # Pair dicts carry reserves in whole tokens; scaled to integers for the pool math
+    AMM_UNIT = 10**18
+
+    # Quote tokens valued at $1 when sizing in USD
+    STABLECOINS = {'USDC', 'USDC.e', 'USDT', 'DAI'}
+
+    async def _quote_token_usd(self, base_token: str, quote_token: str, price: float) -> Optional[float]:
+        """USD value of one quote token.
+
+        Args:
+            base_token: Base token symbol
+            quote_token: Quote token symbol
+            price: Quote tokens per base token
+
+        Returns:
+            The USD price, or None if neither token is a stablecoin and no
+            reference price is available
+        """
+        if quote_token in self.STABLECOINS:
+            return 1.0
+        if base_token in self.STABLECOINS:
+            return 1.0 / price
+        if 'coingecko' in self.connected_dexs:
+            try:
+                return await self.dexs['coingecko'].get_price(quote_token, 'USDC')
+            except Exception as e:
+                logger.debug(f"No USD reference price for {quote_token}: {e}")
+        return None
+
+    def _find_pool(self, pairs: List[Dict[str, Any]], base_token: str,
+                   quote_token: str) -> Optional[Tuple[AmmPool, bool, Optional[float]]]:
+        """Build a local pool model for a token pair from a DEX's pair data.
+
+        Args:
+            pairs: Pair dicts from the DEX's get_pairs()
+            base_token: Base token symbol
+            quote_token: Quote token symbol
+
+        Returns:
+            (pool, whether base_token is token0, pair liquidity), or None if
+            the pair is missing or has no reserves
+        """
+        for pair in pairs:
+            tokens = (pair.get('base_token'), pair.get('quote_token'))
+            if tokens not in ((base_token, quote_token), (quote_token, base_token)):
+                continue
+            reserve0 = pair.get('reserve0') or 0
+            reserve1 = pair.get('reserve1') or 0
+            if reserve0 <= 0 or reserve1 <= 0:
+                return None
+            pool = AmmPool(
+                reserve0=int(reserve0 * self.AMM_UNIT),
+                reserve1=int(reserve1 * self.AMM_UNIT),
+                fee_bps=int(pair.get('fee_bps', 30)),
+                stable=bool(pair.get('stable', False)),
+            )
+            return pool, tokens[0] == base_token, pair.get('liquidity')
+        return None
+
     async def get_quote(self, dex_name: str, base_token: str, quote_token: str, amount: float) -> Optional[Dict[str, Any]]:
         """Get a quote from a specific DEX.
 
@@ -0,0 +1,351 @@
+"""Persistent index of factory-created pools, backfilled once and tailed by block."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from src.utils.log_decoding import hex_str
+from src.utils.multicall_balance_checker import DECIMALS_SELECTOR, MULTICALL3_ABI, MULTICALL3_ADDRESS
+
+logger = logging.getLogger(__name__)
+
+# PairCreated(address indexed token0, address indexed token1, address pair, uint256)
+PAIR_CREATED_TOPIC = '0x0d3648bd0f6ba80134a33ba9275ac585d9d315f0ad8355cddefde31afa28d0e9'
+# PoolCreated(address indexed token0, address indexed token1, uint24 indexed fee, int24 tickSpacing, address pool)
+POOL_CREATED_TOPIC = '0x783cca1c0412dd0d695e784568c96da2e9c22ff989357a2e8b1d9b2b4e6b7118'
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = Path('data') / 'pool_index'
+
+
+def _word_address(word: bytes) -> str:
+    return Web3.to_checksum_address(word[-20:])
+
+
+@dataclass(frozen=True)
+class FactorySource:
+    """A pool factory to index."""
+    dex: str
+    address: str
+    kind: str = 'v2'            # 'v2' emits PairCreated, 'v3' emits PoolCreated
+    start_block: int = 0        # factory deployment block; backfill starts here
+    fee: int = 3000             # V2 swap fee in hundredths of a bip; V3 fees come from the log
+
+
+@dataclass(frozen=True)
+class IndexedPool:
+    """A pool as created by its factory."""
+    dex: str
+    address: str
+    token0: str
+    token1: str
+    fee: int                    # hundredths of a bip, 3000 = 0.30%
+    token0_decimals: Optional[int]
+    token1_decimals: Optional[int]
+    created_block: int
+
+
+class PoolIndex:
+    """Every pool created by a set of factories, answerable without RPC.
+
+    sync() reads PairCreated/PoolCreated logs for all factories with one
+    eth_getLogs per block range, halving the range when the node refuses
+    it. Decimals for newly seen tokens are read in one aggregate3 call.
+    The index and each factory's last scanned block are written to a JSON
+    file, so a restart only scans the blocks mined since the last save.
+
+    Lookups (pools_for, pools_among, pool) are dictionary reads.
+    """
+
+    def __init__(self, w3: Web3, chain: str, factories: Iterable[FactorySource],
+                 path: Optional[Path] = None,
+                 max_block_range: int = 50000,
+                 poll_interval: float = 15.0,
+                 checkpoint_every: int = 50,
+                 multicall_address: str = MULTICALL3_ADDRESS):
+        """Initialize the index.
+
+        Args:
+            w3: Web3 connection for the chain.
+            chain: Chain name, used for the default file name.
+            factories: Factories whose pools are indexed.
+            path: Index file; defaults to data/pool_index/<chain>.json.
+            max_block_range: Largest block range per eth_getLogs request.
+            poll_interval: Seconds between syncs once started.
+            checkpoint_every: Requests between saves during a long backfill.
+            multicall_address: Multicall3 address used for decimals reads.
+        """
+        self.w3 = w3
+        self.chain = chain
+        self.factories = {Web3.to_checksum_address(f.address): f for f in factories}
+        self.path = Path(path) if path is not None else DEFAULT_INDEX_DIR / f'{chain}.json'
+        self.max_block_range = max_block_range
+        self.poll_interval = poll_interval
+        self.checkpoint_every = checkpoint_every
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+
+        self._block_range = max_block_range
+        self._cursors: Dict[str, int] = {}                       # factory -> last block scanned
+        self._pools: Dict[str, IndexedPool] = {}                 # lowercase pool address -> pool
+        self._by_pair: Dict[Tuple[str, str], List[str]] = {}     # sorted lowercase tokens -> pools
+        self._by_token: Dict[str, Set[str]] = {}                 # lowercase token -> pools
+        self._decimals: Dict[str, Optional[int]] = {}            # lowercase token -> decimals
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'requests': 0,
+            'range_splits': 0,
+            'pools_added': 0,
+            'decimals_read': 0,
+        }
+
+    # ------------------------------------------------------------------ lookups
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def covers(self, dex: str) -> bool:
+        """Whether any indexed factory belongs to dex."""
+        return any(source.dex == dex for source in self.factories.values())
+
+    def pool(self, address: str) -> Optional[IndexedPool]:
+        """The indexed pool at an address, or None."""
+        return self._pools.get(address.lower())
+
+    def pools_for(self, token_a: str, token_b: str, dex: Optional[str] = None) -> List[IndexedPool]:
+        """Every indexed pool for a token pair, in either order."""
+        a, b = token_a.lower(), token_b.lower()
+        with self._lock:
+            addresses = list(self._by_pair.get((a, b) if a < b else (b, a), ()))
+        pools = [self._pools[address] for address in addresses]
+        return [pool for pool in pools if dex is None or pool.dex == dex]
+
+    def pools_among(self, tokens: Iterable[str], dex: Optional[str] = None) -> List[IndexedPool]:
+        """Every indexed pool whose two tokens are both in tokens."""
+        wanted = {token.lower() for token in tokens}
+        found: Set[str] = set()
+        with self._lock:
+            for token in wanted:
+                for address in self._by_token.get(token, ()):
+                    pool = self._pools[address]
+                    if pool.token0.lower() in wanted and pool.token1.lower() in wanted:
+                        found.add(address)
+        pools = sorted((self._pools[address] for address in found), key=lambda p: p.created_block)
+        return [pool for pool in pools if dex is None or pool.dex == dex]
+
+    def pools(self, dex: Optional[str] = None) -> List[IndexedPool]:
+        """Every indexed pool, optionally for one DEX."""
+        with self._lock:
+            pools = list(self._pools.values())
+        return [pool for pool in pools if dex is None or pool.dex == dex]
+
+    # -------------------------------------------------------------- persistence
+
+    def load(self) -> bool:
+        """Read the index file if it exists. Returns True if one was loaded."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Pool index {self.path} unreadable, rebuilding: {e}")
+            return False
+
+        if data.get('version') != INDEX_VERSION:
+            logger.info(f"📚 Pool index {self.path} has an old format, rebuilding")
+            return False
+
+        with self._lock:
+            self._cursors = {
+                Web3.to_checksum_address(factory): block for factory, block in data.get('cursors', {}).items()
+            }
+            self._decimals = dict(data.get('decimals', {}))
+            for entry in data.get('pools', []):
+                self._add(IndexedPool(**entry))
+        logger.info(f"📚 {self.chain}: loaded {len(self._pools)} pools from {self.path}")
+        return True
+
+    def save(self) -> None:
+        """Write the index file atomically."""
+        with self._lock:
+            data = {
+                'version': INDEX_VERSION,
+                'chain': self.chain,
+                'cursors': dict(self._cursors),
+                'decimals': dict(self._decimals),
+                'pools': [asdict(pool) for pool in self._pools.values()],
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps(data, separators=(',', ':')))
+        os.replace(tmp, self.path)
+
+    # --------------------------------------------------------------------- sync
+
+    def sync(self) -> int:
+        """Index every pool created since each factory's cursor. Blocking.
+
+        Returns:
+            Number of pools added.
+        """
+        latest = self.w3.eth.block_number
+        pending = {
+            factory: self._cursors.get(factory, source.start_block - 1) + 1
+            for factory, source in self.factories.items()
+        }
+        pending = {factory: start for factory, start in pending.items() if start <= latest}
+        if not pending:
+            return 0
+
+        added = 0
+        requests = 0
+        start = min(pending.values())
+        while start <= latest:
+            end = min(latest, start + self._block_range - 1)
+            factories = [factory for factory, first in pending.items() if first <= end]
+            try:
+                logs = self.w3.eth.get_logs({
+                    'fromBlock': start,
+                    'toBlock': end,
+                    'address': factories,
+                    'topics': [[PAIR_CREATED_TOPIC, POOL_CREATED_TOPIC]],
+                })
+            except Exception as e:
+                if end == start:
+                    raise
+                self._block_range = max(1, (end - start + 1) // 2)
+                self.stats['range_splits'] += 1
+                logger.debug(f"📚 {self.chain}: getLogs {start}-{end} refused ({e}), trying {self._block_range} blocks")
+                continue
+            self.stats['requests'] += 1
+            requests += 1
+
+            added += self._index_logs(logs, pending)
+            with self._lock:
+                for factory in factories:
+                    self._cursors[factory] = end
+            start = end + 1
+            self._block_range = min(self.max_block_range, self._block_range * 2)
+
+            if requests % self.checkpoint_every == 0:
+                self.save()
+
+        self.save()
+        if added:
+            logger.info(f"📚 {self.chain}: indexed {added} new pools ({len(self._pools)} total)")
+        return added
+
+    async def start(self) -> None:
+        """Load the index file, catch up, then tail new blocks in the background."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.load)
+        await loop.run_in_executor(None, self.sync)
+        self._task = asyncio.ensure_future(self._follow())
+
+    async def stop(self) -> None:
+        """Stop tailing new blocks."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> int:
+        """Run sync() off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.sync)
+
+    async def _follow(self) -> None:
+        """Sync every poll_interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Pool index sync failed on {self.chain}: {e}")
+
+    # ---------------------------------------------------------------- internals
+
+    def _index_logs(self, logs: List[Dict[str, Any]], pending: Dict[str, int]) -> int:
+        """Decode creation logs into pools and add the new ones."""
+        created = []
+        for log in logs:
+            factory = Web3.to_checksum_address(log['address'])
+            source = self.factories.get(factory)
+            topics = log.get('topics') or []
+            if source is None or len(topics) < 3 or log['blockNumber'] < pending.get(factory, 0):
+                continue
+
+            topic0 = hex_str(topics[0])
+            data = bytes(HexBytes(log['data']))
+            if topic0 == PAIR_CREATED_TOPIC and len(data) >= 32:
+                address, fee = _word_address(data[:32]), source.fee
+            elif topic0 == POOL_CREATED_TOPIC and len(topics) >= 4 and len(data) >= 64:
+                address, fee = _word_address(data[32:64]), int.from_bytes(HexBytes(topics[3]), 'big')
+            else:
+                continue
+            if address.lower() in self._pools:
+                continue
+            token0 = _word_address(bytes(HexBytes(topics[1])))
+            token1 = _word_address(bytes(HexBytes(topics[2])))
+            created.append((source.dex, address, token0, token1, fee, log['blockNumber']))
+
+        if not created:
+            return 0
+
+        self._read_decimals({token.lower() for entry in created for token in entry[2:4]})
+        with self._lock:
+            for dex, address, token0, token1, fee, block in created:
+                self._add(IndexedPool(
+                    dex=dex, address=address, token0=token0, token1=token1, fee=fee,
+                    token0_decimals=self._decimals.get(token0.lower()),
+                    token1_decimals=self._decimals.get(token1.lower()),
+                    created_block=block,
+                ))
+        self.stats['pools_added'] += len(created)
+        return len(created)
+
+    def _read_decimals(self, tokens: Set[str]) -> None:
+        """Read decimals() for tokens not seen before; failures are stored as None."""
+        missing = [token for token in tokens if token not in self._decimals]
+        if not missing:
+            return
+
+        calls = [(Web3.to_checksum_address(token), True, DECIMALS_SELECTOR) for token in missing]
+        try:
+            multicall = self.w3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+            results = []
+            for offset in range(0, len(calls), 500):
+                results.extend(multicall.functions.aggregate3(calls[offset:offset + 500]).call())
+        except Exception as e:
+            logger.debug(f"Multicall3 unavailable on {self.chain} ({e}), reading decimals one by one")
+            results = []
+            for target, _, call_data in calls:
+                try:
+                    results.append((True, bytes(self.w3.eth.call({'to': target, 'data': call_data}))))
+                except Exception:
+                    results.append((False, b''))
+
+        with self._lock:
+            for token, (success, return_data) in zip(missing, results):
+                decimals = int.from_bytes(return_data[:32], 'big') if success and len(return_data) >= 32 else None
+                self._decimals[token] = decimals if decimals is None or decimals <= 255 else None
+        self.stats['decimals_read'] += len(missing)
+
+    def _add(self, pool: IndexedPool) -> None:
+        """Insert a pool into every lookup table. Caller holds the lock."""
+        address = pool.address.lower()
+        if address in self._pools:
+            return
+        a, b = pool.token0.lower(), pool.token1.lower()
+        self._pools[address] = pool
+        self._by_pair.setdefault((a, b) if a < b else (b, a), []).append(address)
+        self._by_token.setdefault(a, set()).add(address)
+        self._by_token.setdefault(b, set()).add(address)
@@ -0,0 +1,196 @@
+"""Batched GraphQL client shared by the subgraph-backed DEX adapters."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    # Use mock for testing
+    from mock_aiohttp import ClientSession
+    aiohttp = type('MockAiohttp', (), {'ClientSession': ClientSession})()
+
+logger = logging.getLogger(__name__)
+
+# One client per subgraph endpoint, shared by every adapter that queries it.
+# Its session, lock and pending batch belong to the event loop that last used it.
+_clients: Dict[str, "SubgraphClient"] = {}
+
+
+def get_subgraph_client(url: str, min_interval: float = 0.0) -> "SubgraphClient":
+    """Return the shared client for a subgraph endpoint.
+
+    Args:
+        url: Subgraph endpoint URL.
+        min_interval: Minimum seconds between requests to this endpoint;
+            the strictest value requested by any adapter is kept.
+    """
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = SubgraphClient(url)
+    client.min_interval = max(client.min_interval, min_interval)
+    return client
+
+
+class SubgraphClient:
+    """Coalesces concurrent subgraph lookups into aliased GraphQL documents.
+
+    Every fetch() queues one top-level selection and waits. The first
+    selection in a batch arms a short timer; when it fires (or the batch
+    is full) all queued selections are sent as a single document with one
+    alias each, and each caller receives the rows under its alias. If the
+    endpoint rejects the whole document (GraphQL errors and no data), each
+    selection is re-sent on its own so one bad lookup fails only its caller.
+
+    The HTTP session and lock are created on the loop that uses them and
+    replaced when a different loop starts using the client. Adapters close
+    the session from disconnect(); the next fetch opens a new one.
+    """
+
+    def __init__(self, url: str, batch_window: float = 0.005, max_batch_size: int = 50):
+        """Initialize the client.
+
+        Args:
+            url: Subgraph endpoint URL.
+            batch_window: Seconds to wait for more selections before sending.
+            max_batch_size: Selections per document before sending early.
+        """
+        self.url = url
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.min_interval = 0.0
+        self.session = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._last_request_time = 0.0
+
+        self.stats = {
+            'selections': 0,
+            'requests': 0,
+            'failed_requests': 0,
+            'split_batches': 0,
+        }
+
+    async def fetch(self, entity: str, arguments: str, fields: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one entity collection as part of the next batch.
+
+        Args:
+            entity: Top-level collection, e.g. "pairs" or "pools".
+            arguments: GraphQL arguments without the parentheses.
+            fields: Selection set without the braces.
+
+        Returns:
+            The rows returned for this selection, or None if the request failed.
+        """
+        loop = self._bind()
+        future = loop.create_future()
+        self._pending.append((f"{entity}({arguments}) {{ {fields} }}", future))
+        self.stats['selections'] += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await future
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """Make the running loop the owner of the session, lock and batch."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            if self._loop is not None:
+                # Bound to the old loop; its session can only be closed there
+                if self.session and not getattr(self.session, 'closed', False):
+                    logger.debug(f"Dropping subgraph session for {self.url} from a previous event loop")
+                self.session = None
+                self._pending = []
+                self._flush_handle = None
+                self._last_request_time = 0.0
+            self._send_lock = asyncio.Lock()
+            self._loop = loop
+        return loop
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            batch, self._pending = self._pending, []
+            asyncio.ensure_future(self._send(batch))
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Send one aliased document and fan the results out."""
+        document = "{\n" + "\n".join(
+            f"  q{index}: {selection}" for index, (selection, _) in enumerate(batch)
+        ) + "\n}"
+        data, errors = await self._post(document)
+
+        if data is None and errors and len(batch) > 1:
+            # The endpoint rejected the document as a whole; find the bad selection by sending each alone
+            self.stats['split_batches'] += 1
+            await asyncio.gather(*(self._send([item]) for item in batch))
+            return
+
+        if data is None:
+            self.stats['failed_requests'] += 1
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(data.get(f"q{index}") if data else None)
+
+    async def _post(self, document: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[Any]]]:
+        """POST one document, rate limited per endpoint.
+
+        Returns:
+            (data, errors) from the response; (None, None) if the request failed.
+        """
+        data = errors = None
+
+        try:
+            async with self._send_lock:
+                # Rate limiting per endpoint rather than per pair
+                loop = asyncio.get_running_loop()
+                wait = self._last_request_time + self.min_interval - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_request_time = loop.time()
+
+                if not self.session or getattr(self.session, 'closed', False):
+                    self.session = aiohttp.ClientSession()
+
+                self.stats['requests'] += 1
+                async with self.session.post(
+                    self.url,
+                    json={'query': document},
+                    headers={'Content-Type': 'application/json'}
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        data = result.get('data')
+                        errors = result.get('errors')
+                        if errors:
+                            logger.warning(f"Subgraph errors from {self.url}: {errors}")
+                    else:
+                        logger.warning(f"Subgraph query failed: HTTP {response.status} ({self.url})")
+
+        except Exception as e:
+            logger.error(f"Error querying subgraph {self.url}: {e}")
+
+        return data, errors
+
+    async def close(self) -> None:
+        """Close the HTTP session once in-flight requests are done.
+
+        Safe to call from every adapter sharing the endpoint; a later fetch
+        opens a new session.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            self.session = None  # Belongs to another loop, if any
+            return
+        async with self._send_lock:
+            if self.session:
+                await self.session.close()
+                self.session = None
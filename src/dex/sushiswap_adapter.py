@@ -19,6 +19,7 @@ import json
 from decimal import Decimal
 
 from .base_dex import BaseDEX
+from .subgraph_client import get_subgraph_client
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +59,9 @@ class SushiSwapAdapter(BaseDEX):
         # HTTP session
         self.session = None
 
+        # Pair lookups are coalesced with other callers' into one request
+        self.subgraph = get_subgraph_client(self.subgraph_url, self.rate_limit_delay)
+
         logger.info(f"SushiSwap adapter initialized for {self.name}")
 
     async def connect(self) -> bool:
@@ -242,36 +246,35 @@ class SushiSwapAdapter(BaseDEX):
                 return cached_data
 
         try:
-            query = f"""
-            {{
-                pairs(
-                    where: {{
-                        or: [
-                            {{ token0_: {{ symbol: "{token0}" }}, token1_: {{ symbol: "{token1}" }} }},
-                            {{ token0_: {{ symbol: "{token1}" }}, token1_: {{ symbol: "{token0}" }} }}
-                        ]
-                    }},
-                    orderBy: reserveUSD,
-                    orderDirection: desc,
-                    first: 1
-                ) {{
-                    id
-                    token0 {{ symbol, decimals }}
-                    token1 {{ symbol, decimals }}
-                    reserve0
-                    reserve1
-                    reserveUSD
-                    token0Price
-                    token1Price
-                }}
-            }}
-            """
-
-            result = await self._query_subgraph(query)
-            if not result or not result.get('pairs'):
+            # Batched with other pair lookups into one subgraph request
+            pairs = await self.subgraph.fetch(
+                'pairs',
+                f"""
+                where: {{
+                    or: [
+                        {{ token0_: {{ symbol: "{token0}" }}, token1_: {{ symbol: "{token1}" }} }},
+                        {{ token0_: {{ symbol: "{token1}" }}, token1_: {{ symbol: "{token0}" }} }}
+                    ]
+                }},
+                orderBy: reserveUSD,
+                orderDirection: desc,
+                first: 1
+                """,
+                """
+                id
+                token0 { symbol, decimals }
+                token1 { symbol, decimals }
+                reserve0
+                reserve1
+                reserveUSD
+                token0Price
+                token1Price
+                """
+            )
+            if not pairs:
                 return None
 
-            pair = result['pairs'][0]
+            pair = pairs[0]
 
             # Determine price direction
             price = float(pair['token0Price'])
@@ -331,6 +334,7 @@ class SushiSwapAdapter(BaseDEX):
         if self.session:
             await self.session.close()
             self.session = None
+        await self.subgraph.close()
 
         self.connected = False
         logger.info("Disconnected from SushiSwap")
@@ -11,6 +11,7 @@ import aiohttp
 import json
 
 from .base_dex import BaseDEX
+from .subgraph_client import get_subgraph_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +29,11 @@ class TraderJoeAdapter(BaseDEX):
         # Fallback to public endpoint
         self.subgraph_url_fallback = "https://api.thegraph.com/subgraphs/name/traderjoe-xyz/exchange"
         
-        # Rate limiting
+        # Rate limiting (applied per subgraph request, not per pair)
         self.rate_limit_delay = 1.0  # 1 second between requests
-        self.last_request_time = 0
+
+        # Pair lookups are coalesced with other adapters' into one request
+        self.subgraph = get_subgraph_client(self.subgraph_url, self.rate_limit_delay)
 
         # Cache
         self.token_cache = {}
@@ -109,25 +112,34 @@ class TraderJoeAdapter(BaseDEX):
             # Create pairs from common Arbitrum tokens including JOE
             common_tokens = ['ETH', 'WETH', 'USDC', 'USDT', 'DAI', 'WBTC', 'ARB', 'JOE']
 
-            for i, base_token in enumerate(common_tokens):
-                for quote_token in common_tokens[i+1:]:
-                    try:
-                        price = await self.get_price(base_token, quote_token)
-                        if price and price > 0:
-                            pair = {
-                                'base_token': base_token,
-                                'quote_token': quote_token,
-                                'dex': self.name,
-                                'price': price,
-                                'liquidity': 800000,  # Higher liquidity than Camelot
-                                'volume_24h_usd': 5000000,  # ~$5M daily volume
-                                'last_updated': datetime.now().isoformat()
-                            }
-                            pairs.append(pair)
-
-                    except Exception as e:
-                        logger.warning(f"Error getting price for {base_token}/{quote_token}: {e}")
-                        continue
+            token_pairs = [
+                (base_token, quote_token)
+                for i, base_token in enumerate(common_tokens)
+                for quote_token in common_tokens[i+1:]
+            ]
+
+            # Look up every pair concurrently so the queries share one subgraph request
+            prices = await asyncio.gather(
+                *(self.get_price(base_token, quote_token) for base_token, quote_token in token_pairs),
+                return_exceptions=True
+            )
+
+            for (base_token, quote_token), price in zip(token_pairs, prices):
+                if isinstance(price, Exception):
+                    logger.warning(f"Error getting price for {base_token}/{quote_token}: {price}")
+                    continue
+
+                if price and price > 0:
+                    pair = {
+                        'base_token': base_token,
+                        'quote_token': quote_token,
+                        'dex': self.name,
+                        'price': price,
+                        'liquidity': 800000,  # Higher liquidity than Camelot
+                        'volume_24h_usd': 5000000,  # ~$5M daily volume
+                        'last_updated': datetime.now().isoformat()
+                    }
+                    pairs.append(pair)
 
             logger.info(f"Fetched {len(pairs)} pairs from Trader Joe")
             return pairs
@@ -157,69 +169,51 @@ class TraderJoeAdapter(BaseDEX):
             if base_address == quote_address:
                 return 1.0
 
-            # Rate limiting
-            now = datetime.now().timestamp()
-            if now - self.last_request_time < self.rate_limit_delay:
-                await asyncio.sleep(self.rate_limit_delay)
-
-            self.last_request_time = now
-
-            # Query Trader Joe subgraph for pair data
-            query = f"""
-            {{
-                pairs(
-                    where: {{
-                        or: [
-                            {{ token0: "{base_address.lower()}", token1: "{quote_address.lower()}" }},
-                            {{ token0: "{quote_address.lower()}", token1: "{base_address.lower()}" }}
-                        ]
-                    }},
-                    orderBy: reserveUSD,
-                    orderDirection: desc,
-                    first: 1
-                ) {{
-                    id
-                    token0 {{ id, symbol, decimals }}
-                    token1 {{ id, symbol, decimals }}
-                    reserve0
-                    reserve1
-                    reserveUSD
-                    volumeUSD
-                }}
-            }}
-            """
+            # Query Trader Joe subgraph for pair data, batched with other lookups
+            pairs = await self.subgraph.fetch(
+                'pairs',
+                f"""
+                where: {{
+                    or: [
+                        {{ token0: "{base_address.lower()}", token1: "{quote_address.lower()}" }},
+                        {{ token0: "{quote_address.lower()}", token1: "{base_address.lower()}" }}
+                    ]
+                }},
+                orderBy: reserveUSD,
+                orderDirection: desc,
+                first: 1
+                """,
+                """
+                id
+                token0 { id, symbol, decimals }
+                token1 { id, symbol, decimals }
+                reserve0
+                reserve1
+                reserveUSD
+                volumeUSD
+                """
+            )
+
+            if pairs:
+                pair = pairs[0]
+
+                reserve0 = float(pair['reserve0'])
+                reserve1 = float(pair['reserve1'])
+
+                if reserve0 > 0 and reserve1 > 0:
+                    # Determine which token is which
+                    token0_address = pair['token0']['id'].lower()
+
+                    if token0_address == base_address.lower():
+                        price = reserve1 / reserve0
+                    else:
+                        price = reserve0 / reserve1
+
+                    # Cache the result
+                    self.price_cache[cache_key] = (price, datetime.now())
+                    return price
 
-            async with self.session.post(
-                self.subgraph_url,
-                json={'query': query}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if 'data' in data and 'pairs' in data['data'] and data['data']['pairs']:
-                        pair = data['data']['pairs'][0]
-                        
-                        reserve0 = float(pair['reserve0'])
-                        reserve1 = float(pair['reserve1'])
-                        
-                        if reserve0 > 0 and reserve1 > 0:
-                            # Determine which token is which
-                            token0_address = pair['token0']['id'].lower()
-                            
-                            if token0_address == base_address.lower():
-                                price = reserve1 / reserve0
-                            else:
-                                price = reserve0 / reserve1
-                            
-                            # Cache the result
-                            self.price_cache[cache_key] = (price, datetime.now())
-                            return price
-
-                    return None
-
-                else:
-                    logger.warning(f"Trader Joe query failed: HTTP {response.status}")
-                    return None
+            return None
 
         except Exception as e:
             logger.error(f"Error getting Trader Joe price for {base_token}/{quote_token}: {e}")
@@ -259,6 +253,7 @@ class TraderJoeAdapter(BaseDEX):
         if self.session:
             await self.session.close()
             self.session = None
+        await self.subgraph.close()
 
         self.connected = False
         logger.info("Disconnected from Trader Joe")
@@ -7,6 +7,7 @@ Uses The Graph API for efficient data fetching and Web3 for transactions.
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 try:
@@ -19,6 +20,8 @@ import json
 from decimal import Decimal
 
 from .base_dex import BaseDEX
+from .subgraph_client import get_subgraph_client
+from .v3_pool_state import V3PoolState
 
 logger = logging.getLogger(__name__)
 
@@ -65,9 +68,16 @@ class UniswapV3Adapter(BaseDEX):
         self.pool_cache = {}
         self.cache_ttl = 60  # 1 minute cache
 
+        # Tick-level pool mirrors by pool id: (state, last loaded or updated)
+        self.pool_states: Dict[str, Tuple[V3PoolState, float]] = {}
+        self.pool_state_ttl = config.get('pool_state_ttl', 300)
+
         # Session for HTTP requests
         self.session = None
 
+        # Pool lookups are coalesced with other callers' into one request
+        self.subgraph = get_subgraph_client(self.subgraph_url, self.rate_limit_delay)
+
         logger.info(f"Uniswap V3 adapter initialized for {self.name}")
 
     async def connect(self) -> bool:
@@ -250,18 +260,27 @@ class UniswapV3Adapter(BaseDEX):
             if not pool_data:
                 return None
 
-            # Simple price calculation (real implementation would use Uniswap math)
             price = pool_data['price']
-            expected_output = amount * price
+            state = await self.get_pool_state(pool_data)
+
+            if state is not None and price > 0:
+                # Exact swap through the mirrored ticks
+                amount_in = int(Decimal(str(amount)) * 10 ** pool_data['base_decimals'])
+                amount_out = state.quote_exact_input(amount_in, pool_data['zero_for_one'])
+                expected_output = float(Decimal(amount_out) / 10 ** pool_data['quote_decimals'])
+                slippage_estimate = max((1 - expected_output / (amount * price)) * 100, 0.0) if amount > 0 else 0.0
+            else:
+                # Spot price only when the tick mirror is unavailable
+                expected_output = amount * price
 
-            # Estimate slippage based on trade size vs liquidity
-            liquidity = pool_data.get('tvl_usd', 0)
-            trade_size_usd = amount * price  # Assuming base token ~= $1 for simplicity
+                # Estimate slippage based on trade size vs liquidity
+                liquidity = pool_data.get('tvl_usd', 0)
+                trade_size_usd = amount * price  # Assuming base token ~= $1 for simplicity
 
-            if liquidity > 0:
-                slippage_estimate = min(trade_size_usd / liquidity * 100, 5.0)  # Cap at 5%
-            else:
-                slippage_estimate = 5.0
+                if liquidity > 0:
+                    slippage_estimate = min(trade_size_usd / liquidity * 100, 5.0)  # Cap at 5%
+                else:
+                    slippage_estimate = 5.0
 
             return {
                 'base_token': base_token,
@@ -291,36 +310,35 @@ class UniswapV3Adapter(BaseDEX):
                 return cached_data
 
         try:
-            # Query for pools with these tokens
-            query = f"""
-            {{
-                pools(
-                    where: {{
-                        or: [
-                            {{ token0_: {{ symbol: "{token0}" }}, token1_: {{ symbol: "{token1}" }} }},
-                            {{ token0_: {{ symbol: "{token1}" }}, token1_: {{ symbol: "{token0}" }} }}
-                        ]
-                    }},
-                    orderBy: totalValueLockedUSD,
-                    orderDirection: desc,
-                    first: 1
-                ) {{
-                    id
-                    token0 {{ symbol, decimals }}
-                    token1 {{ symbol, decimals }}
-                    sqrtPrice
-                    liquidity
-                    totalValueLockedUSD
-                    feeTier
-                }}
-            }}
-            """
-
-            result = await self._query_subgraph(query)
-            if not result or not result.get('pools'):
+            # Query for pools with these tokens, batched with other pair lookups
+            pools = await self.subgraph.fetch(
+                'pools',
+                f"""
+                where: {{
+                    or: [
+                        {{ token0_: {{ symbol: "{token0}" }}, token1_: {{ symbol: "{token1}" }} }},
+                        {{ token0_: {{ symbol: "{token1}" }}, token1_: {{ symbol: "{token0}" }} }}
+                    ]
+                }},
+                orderBy: totalValueLockedUSD,
+                orderDirection: desc,
+                first: 1
+                """,
+                """
+                id
+                token0 { symbol, decimals }
+                token1 { symbol, decimals }
+                sqrtPrice
+                tick
+                liquidity
+                totalValueLockedUSD
+                feeTier
+                """
+            )
+            if not pools:
                 return None
 
-            pool = result['pools'][0]
+            pool = pools[0]
 
             # Calculate price
             sqrt_price = int(pool['sqrtPrice'])
@@ -331,15 +349,23 @@ class UniswapV3Adapter(BaseDEX):
             )
 
             # Adjust price direction if tokens are swapped
-            if pool['token0']['symbol'] != token0:
+            zero_for_one = pool['token0']['symbol'] == token0
+            if not zero_for_one:
                 price = 1 / price if price > 0 else 0
+            base, quote = (pool['token0'], pool['token1']) if zero_for_one else (pool['token1'], pool['token0'])
 
             pool_data = {
                 'pool_id': pool['id'],
                 'price': float(price),
                 'tvl_usd': float(pool['totalValueLockedUSD']),
                 'fee_tier': int(pool['feeTier']),
-                'liquidity': float(pool['liquidity']) if pool['liquidity'] else 0
+                'liquidity': float(pool['liquidity']) if pool['liquidity'] else 0,
+                'sqrt_price_x96': sqrt_price,
+                'tick': int(pool['tick']) if pool.get('tick') is not None else None,
+                'raw_liquidity': int(pool['liquidity'] or 0),
+                'zero_for_one': zero_for_one,
+                'base_decimals': int(base['decimals']),
+                'quote_decimals': int(quote['decimals'])
             }
 
             # Cache the result
@@ -351,6 +377,79 @@ class UniswapV3Adapter(BaseDEX):
             logger.error(f"Error getting pool data for {token0}/{token1}: {e}")
             return None
 
+    async def get_pool_state(self, pool_data: Dict[str, Any]) -> Optional[V3PoolState]:
+        """Tick-level mirror for a pool from _get_pool_data, loading it if needed.
+
+        A mirror fed by apply_pool_log() stays current; one that has not seen
+        a log for pool_state_ttl seconds is reloaded from the subgraph.
+
+        Returns:
+            The pool's V3PoolState, or None if its ticks could not be loaded.
+        """
+        pool_id = pool_data['pool_id'].lower()
+        cached = self.pool_states.get(pool_id)
+        if cached and time.monotonic() - cached[1] < self.pool_state_ttl:
+            return cached[0]
+
+        ticks = await self._fetch_initialized_ticks(pool_id)
+        if ticks is None:
+            return cached[0] if cached else None
+
+        try:
+            state = V3PoolState.from_ticks(
+                sqrt_price_x96=pool_data['sqrt_price_x96'],
+                liquidity=pool_data['raw_liquidity'],
+                fee=pool_data['fee_tier'],
+                ticks=ticks,
+                tick=pool_data.get('tick'),
+                address=pool_id
+            )
+        except ValueError as e:
+            logger.warning(f"Cannot mirror pool {pool_id}: {e}")
+            return None
+
+        self.pool_states[pool_id] = (state, time.monotonic())
+        return state
+
+    def apply_pool_log(self, log: Dict[str, Any]) -> bool:
+        """Apply a Swap, Mint or Burn log to the mirror of the pool that emitted it.
+
+        Returns:
+            True if a mirrored pool was updated.
+        """
+        address = log.get('address')
+        cached = self.pool_states.get(address.lower()) if address else None
+        if not cached or not cached[0].apply_log(log):
+            return False
+        self.pool_states[address.lower()] = (cached[0], time.monotonic())
+        return True
+
+    async def _fetch_initialized_ticks(self, pool_id: str) -> Optional[List[Tuple[int, int, int]]]:
+        """All initialized ticks of a pool as (tick, liquidityGross, liquidityNet)."""
+        ticks: List[Tuple[int, int, int]] = []
+        last_tick = -887273
+        while True:
+            rows = await self.subgraph.fetch(
+                'ticks',
+                f"""
+                where: {{ pool: "{pool_id}", liquidityGross_gt: "0", tickIdx_gt: "{last_tick}" }},
+                orderBy: tickIdx,
+                orderDirection: asc,
+                first: 1000
+                """,
+                """
+                tickIdx
+                liquidityGross
+                liquidityNet
+                """
+            )
+            if rows is None:
+                return None
+            ticks.extend((int(row['tickIdx']), int(row['liquidityGross']), int(row['liquidityNet'])) for row in rows)
+            if len(rows) < 1000:
+                return ticks
+            last_tick = ticks[-1][0]
+
     async def _query_subgraph(self, query: str) -> Optional[Dict[str, Any]]:
         """Query The Graph subgraph."""
         try:
@@ -404,6 +503,7 @@ class UniswapV3Adapter(BaseDEX):
         if self.session:
             await self.session.close()
             self.session = None
+        await self.subgraph.close()
 
         self.connected = False
         logger.info("Disconnected from Uniswap V3")
@@ -0,0 +1,367 @@
+"""Local mirror of Uniswap V3 pool state with exact-input swap simulation.
+
+The math is a straight port of the V3 core libraries (TickMath,
+SqrtPriceMath, SwapMath and the TickBitmap word walk) on Python integers,
+rounding exactly as the contracts do. A V3PoolState loaded with a pool's
+initialized ticks and kept current from its Swap/Mint/Burn logs quotes any
+input size across tick boundaries without calling the Quoter.
+"""
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from web3 import Web3
+
+from src.utils.log_decoding import hex_str
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+_MAX_UINT256 = (1 << 256) - 1
+_FEE_PIPS = 10**6
+
+# Tick spacing the V3 factory enables for each fee tier
+TICK_SPACINGS = {100: 1, 500: 10, 3000: 60, 10000: 200}
+
+SWAP_TOPIC = "0x" + Web3.keccak(text="Swap(address,address,int256,int256,uint160,uint128,int24)").hex().removeprefix("0x")
+MINT_TOPIC = "0x" + Web3.keccak(text="Mint(address,address,int24,int24,uint128,uint256,uint256)").hex().removeprefix("0x")
+BURN_TOPIC = "0x" + Web3.keccak(text="Burn(address,int24,int24,uint128,uint256,uint256)").hex().removeprefix("0x")
+
+# (bit of |tick|, Q128 factor) from TickMath.getSqrtRatioAtTick
+_TICK_FACTORS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+
+def _div_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _mul_div(a: int, b: int, denominator: int) -> int:
+    return a * b // denominator
+
+
+def _mul_div_up(a: int, b: int, denominator: int) -> int:
+    return _div_up(a * b, denominator)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """sqrt(1.0001^tick) as a Q64.96, rounded up like TickMath."""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"tick {tick} out of range")
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 1 << 128
+    for bit, factor in _TICK_FACTORS:
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+    if tick > 0:
+        ratio = _MAX_UINT256 // ratio
+    # Q128.128 to Q64.96, rounding up so the result is never below the tick
+    return (ratio >> 32) + (1 if ratio & 0xffffffff else 0)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Greatest tick whose sqrt ratio is <= sqrt_price_x96."""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError("sqrt price out of range")
+    # log_1.0001(price) from the float value, then settled exactly
+    estimate = 2 * math.log(sqrt_price_x96 / Q96) / math.log(1.0001)
+    tick = max(MIN_TICK, min(MAX_TICK - 1, math.floor(estimate)))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_amount0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token0 moved between two sqrt prices at constant liquidity."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_b - sqrt_a
+    if round_up:
+        return _div_up(_mul_div_up(numerator1, numerator2, sqrt_b), sqrt_a)
+    return _mul_div(numerator1, numerator2, sqrt_b) // sqrt_a
+
+
+def get_amount1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token1 moved between two sqrt prices at constant liquidity."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return _mul_div_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return _mul_div(liquidity, sqrt_b - sqrt_a, Q96)
+
+
+def _next_sqrt_price_from_amount0(sqrt_price: int, liquidity: int, amount: int) -> int:
+    """SqrtPriceMath.getNextSqrtPriceFromAmount0RoundingUp for an added amount."""
+    if amount == 0:
+        return sqrt_price
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price
+    # The contract takes the precise path only while the product fits in 256 bits
+    if product <= _MAX_UINT256 and numerator1 + product <= _MAX_UINT256:
+        return _mul_div_up(numerator1, sqrt_price, numerator1 + product)
+    return _div_up(numerator1, numerator1 // sqrt_price + amount)
+
+
+def _next_sqrt_price_from_amount1(sqrt_price: int, liquidity: int, amount: int) -> int:
+    """SqrtPriceMath.getNextSqrtPriceFromAmount1RoundingDown for an added amount."""
+    return sqrt_price + (amount << 96) // liquidity
+
+
+def compute_swap_step(sqrt_price: int, sqrt_target: int, liquidity: int,
+                      amount_remaining: int, fee_pips: int) -> Tuple[int, int, int, int]:
+    """SwapMath.computeSwapStep for an exact-input swap.
+
+    Returns:
+        (next sqrt price, amount in, amount out, fee amount)
+    """
+    zero_for_one = sqrt_price >= sqrt_target
+    remaining_less_fee = _mul_div(amount_remaining, _FEE_PIPS - fee_pips, _FEE_PIPS)
+    if zero_for_one:
+        amount_in = get_amount0_delta(sqrt_target, sqrt_price, liquidity, True)
+    else:
+        amount_in = get_amount1_delta(sqrt_price, sqrt_target, liquidity, True)
+
+    if remaining_less_fee >= amount_in:
+        sqrt_next = sqrt_target
+    elif zero_for_one:
+        sqrt_next = _next_sqrt_price_from_amount0(sqrt_price, liquidity, remaining_less_fee)
+    else:
+        sqrt_next = _next_sqrt_price_from_amount1(sqrt_price, liquidity, remaining_less_fee)
+
+    reached = sqrt_next == sqrt_target
+    if zero_for_one:
+        if not reached:
+            amount_in = get_amount0_delta(sqrt_next, sqrt_price, liquidity, True)
+        amount_out = get_amount1_delta(sqrt_next, sqrt_price, liquidity, False)
+    else:
+        if not reached:
+            amount_in = get_amount1_delta(sqrt_price, sqrt_next, liquidity, True)
+        amount_out = get_amount0_delta(sqrt_price, sqrt_next, liquidity, False)
+
+    if not reached:
+        # The remainder is all taken as fee when the step ends inside the range
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = _mul_div_up(amount_in, fee_pips, _FEE_PIPS - fee_pips)
+    return sqrt_next, amount_in, amount_out, fee_amount
+
+
+def _word(data: bytes, index: int, signed: bool = False) -> int:
+    return int.from_bytes(data[32 * index:32 * (index + 1)], "big", signed=signed)
+
+
+def _topic_int(topic: Any) -> int:
+    return int.from_bytes(_as_bytes(topic), "big", signed=True)
+
+
+def _as_bytes(value: Any) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x"))
+    return bytes(value)
+
+
+@dataclass
+class V3PoolState:
+    """Mirror of one V3 pool: slot0 price and tick, active liquidity and ticks.
+
+    Ticks are held as tick -> [liquidityGross, liquidityNet] for the
+    initialized ones, plus a sorted index for the word walk. Amounts are raw
+    token units; fee is in pips (3000 = 0.3%).
+    """
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int = 3000
+    tick_spacing: int = 60
+    ticks: Dict[int, List[int]] = field(default_factory=dict)
+    address: Optional[str] = None
+    # (block, log index) of the last applied log; older logs are ignored
+    position: Tuple[int, int] = (-1, -1)
+
+    def __post_init__(self):
+        self._sorted = sorted(self.ticks)
+
+    @classmethod
+    def from_ticks(cls, sqrt_price_x96: int, liquidity: int, fee: int,
+                   ticks: Iterable[Tuple[int, int, int]], tick: Optional[int] = None,
+                   tick_spacing: Optional[int] = None, address: Optional[str] = None) -> "V3PoolState":
+        """Build a mirror from slot0, liquidity and (tick, gross, net) rows."""
+        return cls(
+            sqrt_price_x96=sqrt_price_x96,
+            tick=get_tick_at_sqrt_ratio(sqrt_price_x96) if tick is None else tick,
+            liquidity=liquidity,
+            fee=fee,
+            tick_spacing=tick_spacing or TICK_SPACINGS.get(fee, 60),
+            ticks={index: [gross, net] for index, gross, net in ticks if gross > 0},
+            address=address,
+        )
+
+    def _update_tick(self, tick: int, liquidity_delta: int, upper: bool) -> None:
+        info = self.ticks.get(tick)
+        if info is None:
+            info = self.ticks[tick] = [0, 0]
+            bisect.insort(self._sorted, tick)
+        info[0] += liquidity_delta
+        info[1] += -liquidity_delta if upper else liquidity_delta
+        if info[0] <= 0:
+            del self.ticks[tick]
+            self._sorted.pop(bisect.bisect_left(self._sorted, tick))
+
+    def apply_swap(self, sqrt_price_x96: int, liquidity: int, tick: int) -> None:
+        """Take the post-swap price, liquidity and tick from a Swap log."""
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.liquidity = liquidity
+        self.tick = tick
+
+    def apply_mint(self, tick_lower: int, tick_upper: int, amount: int) -> None:
+        """Add a position's liquidity to its range, as Pool.mint does."""
+        self._modify_position(tick_lower, tick_upper, amount)
+
+    def apply_burn(self, tick_lower: int, tick_upper: int, amount: int) -> None:
+        """Remove a position's liquidity from its range, as Pool.burn does."""
+        self._modify_position(tick_lower, tick_upper, -amount)
+
+    def _modify_position(self, tick_lower: int, tick_upper: int, liquidity_delta: int) -> None:
+        if liquidity_delta == 0:
+            return
+        self._update_tick(tick_lower, liquidity_delta, upper=False)
+        self._update_tick(tick_upper, liquidity_delta, upper=True)
+        if tick_lower <= self.tick < tick_upper:
+            self.liquidity += liquidity_delta
+
+    def apply_log(self, log: Dict[str, Any]) -> bool:
+        """Apply a raw Swap, Mint or Burn log from eth_getLogs.
+
+        Logs at or before the last applied (block, log index) are skipped, so
+        overlapping scans can be fed in without double counting.
+
+        Returns:
+            True if the log changed the mirror.
+        """
+        topics = log.get("topics") or []
+        if not topics:
+            return False
+        position = (int(log.get("blockNumber", 0)), int(log.get("logIndex", 0)))
+        if position <= self.position:
+            return False
+
+        topic0 = hex_str(topics[0])
+        data = _as_bytes(log.get("data", b""))
+        if topic0 == SWAP_TOPIC:
+            self.apply_swap(_word(data, 2), _word(data, 3), _word(data, 4, signed=True))
+        elif topic0 == MINT_TOPIC:
+            # Mint data: sender, amount, amount0, amount1
+            self.apply_mint(_topic_int(topics[2]), _topic_int(topics[3]), _word(data, 1))
+        elif topic0 == BURN_TOPIC:
+            # Burn data: amount, amount0, amount1
+            self.apply_burn(_topic_int(topics[2]), _topic_int(topics[3]), _word(data, 0))
+        else:
+            return False
+        self.position = position
+        return True
+
+    def _next_initialized_tick(self, tick: int, lte: bool) -> Tuple[int, bool]:
+        """TickBitmap.nextInitializedTickWithinOneWord over the sorted tick index."""
+        spacing = self.tick_spacing
+        compressed = tick // spacing
+        if lte:
+            word_start = compressed - compressed % 256
+            i = bisect.bisect_right(self._sorted, compressed * spacing) - 1
+            if i >= 0 and self._sorted[i] >= word_start * spacing:
+                return self._sorted[i], True
+            return word_start * spacing, False
+        compressed += 1
+        word_end = compressed + 255 - compressed % 256
+        i = bisect.bisect_left(self._sorted, compressed * spacing)
+        if i < len(self._sorted) and self._sorted[i] <= word_end * spacing:
+            return self._sorted[i], True
+        return word_end * spacing, False
+
+    def quote_exact_input(self, amount_in: int, zero_for_one: bool,
+                          sqrt_price_limit_x96: Optional[int] = None) -> int:
+        """Output of an exactInput swap against the mirrored state.
+
+        Walks the same steps as Pool.swap, crossing initialized ticks and
+        stopping at the price limit. The mirror itself is not changed.
+
+        Args:
+            amount_in: Raw input amount of token0 (zero_for_one) or token1.
+            zero_for_one: Swap direction.
+            sqrt_price_limit_x96: Price limit; defaults to the pool bounds.
+
+        Returns:
+            Raw output amount.
+        """
+        return self.simulate_exact_input(amount_in, zero_for_one, sqrt_price_limit_x96)[1]
+
+    def simulate_exact_input(self, amount_in: int, zero_for_one: bool,
+                             sqrt_price_limit_x96: Optional[int] = None) -> Tuple[int, int, int, int]:
+        """Like quote_exact_input, returning the full result.
+
+        Returns:
+            (amount in consumed, amount out, final sqrt price, ticks crossed)
+        """
+        if amount_in <= 0 or self.liquidity < 0:
+            return 0, 0, self.sqrt_price_x96, 0
+        if sqrt_price_limit_x96 is None:
+            sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+
+        remaining = amount_in
+        amount_out = 0
+        sqrt_price, tick, liquidity = self.sqrt_price_x96, self.tick, self.liquidity
+        crossed = 0
+
+        while remaining != 0 and sqrt_price != sqrt_price_limit_x96:
+            sqrt_start = sqrt_price
+            tick_next, initialized = self._next_initialized_tick(tick, zero_for_one)
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_next = get_sqrt_ratio_at_tick(tick_next)
+
+            if zero_for_one:
+                sqrt_target = max(sqrt_next, sqrt_price_limit_x96)
+            else:
+                sqrt_target = min(sqrt_next, sqrt_price_limit_x96)
+
+            sqrt_price, step_in, step_out, fee_amount = compute_swap_step(
+                sqrt_price, sqrt_target, liquidity, remaining, self.fee
+            )
+            remaining -= step_in + fee_amount
+            amount_out += step_out
+
+            if sqrt_price == sqrt_next:
+                if initialized:
+                    net = self.ticks[tick_next][1]
+                    liquidity += -net if zero_for_one else net
+                    crossed += 1
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price != sqrt_start:
+                tick = get_tick_at_sqrt_ratio(sqrt_price)
+
+        return amount_in - remaining, amount_out, sqrt_price, crossed
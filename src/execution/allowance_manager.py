@@ -0,0 +1,171 @@
+"""In-memory ERC20 allowance state for the trading wallet."""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from src.utils.log_decoding import TRANSFER_TOPIC, hex_str, topic_address
+from src.utils.multicall_balance_checker import MULTICALL3_ABI, MULTICALL3_ADDRESS
+
+logger = logging.getLogger(__name__)
+
+MAX_UINT256 = 2**256 - 1
+
+# Allowances this large are never spent down in practice; tokens such as
+# WETH9 and OpenZeppelin ERC20 do not even decrement a max approval
+UNLIMITED_ALLOWANCE = 2**255
+
+ALLOWANCE_SELECTOR = bytes.fromhex('dd62ed3e')
+APPROVAL_TOPIC = '0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925'
+
+
+class AllowanceManager:
+    """Tracks the wallet's allowance for every (chain, token, spender) locally.
+
+    Allowances are read once, at startup in bulk through Multicall3 or on
+    first use, and then kept current from our own activity: an approval is
+    recorded as soon as it is broadcast, and Approval/Transfer logs in the
+    receipts of our transactions update or spend down the cached value. A
+    trade whose allowance is covered by the cache makes no allowance RPC.
+
+    An approval is assumed to succeed once sent, because a swap signed
+    after it gets the next nonce and is mined behind it. approval_failed()
+    drops the entry if the approval reverts, so the next trade re-reads it.
+    Methods are thread-safe.
+    """
+
+    def __init__(self, owner: str):
+        """Initialize the manager.
+
+        Args:
+            owner: The wallet whose allowances are tracked.
+        """
+        self.owner = owner.lower()
+        self._allowances: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'approvals_sent': 0,
+            'approvals_failed': 0,
+        }
+
+    @staticmethod
+    def _key(chain: str, token: str, spender: str) -> Tuple[str, str, str]:
+        return (chain, token.lower(), spender.lower())
+
+    def get(self, chain: str, token: str, spender: str) -> Optional[int]:
+        """Cached allowance, or None if it has never been read."""
+        return self._allowances.get(self._key(chain, token, spender))
+
+    def covers(self, chain: str, token: str, spender: str, amount: int) -> bool:
+        """Whether the cached allowance is known to cover amount."""
+        allowance = self.get(chain, token, spender)
+        if allowance is not None and allowance >= amount:
+            self.stats['hits'] += 1
+            return True
+        self.stats['misses'] += 1
+        return False
+
+    def set(self, chain: str, token: str, spender: str, value: int) -> None:
+        """Record an allowance read from the chain."""
+        with self._lock:
+            self._allowances[self._key(chain, token, spender)] = value
+
+    def missing(self, chain: str, pairs: Iterable[Tuple[str, str]],
+                amount: int = UNLIMITED_ALLOWANCE) -> List[Tuple[str, str]]:
+        """(token, spender) pairs whose cached allowance is below amount or unknown."""
+        return [
+            (token, spender) for token, spender in pairs
+            if (self.get(chain, token, spender) or 0) < amount
+        ]
+
+    def approval_sent(self, chain: str, token: str, spender: str, value: int) -> None:
+        """Record an approval that has been broadcast but not yet mined."""
+        self.set(chain, token, spender, value)
+        self.stats['approvals_sent'] += 1
+
+    def approval_failed(self, chain: str, token: str, spender: str) -> None:
+        """Forget an allowance whose approval reverted or was dropped."""
+        with self._lock:
+            self._allowances.pop(self._key(chain, token, spender), None)
+        self.stats['approvals_failed'] += 1
+        logger.warning(f"🔐 {chain}: approval of {token} for {spender} failed, allowance will be re-read")
+
+    def apply_receipt(self, chain: str, receipt: Dict[str, Any]) -> None:
+        """Update allowances from the logs of one of our mined transactions.
+
+        Approval logs with the wallet as owner set the allowance. Transfer
+        logs moving the wallet's tokens in a transaction sent to a tracked
+        spender spend its allowance down, unless the allowance is unlimited.
+        """
+        if receipt.get('status', 1) != 1:
+            return
+
+        spender = (receipt.get('to') or '').lower()
+        with self._lock:
+            for log in receipt.get('logs', []):
+                topics = log.get('topics') or []
+                if len(topics) < 3:
+                    continue
+                topic0 = hex_str(topics[0])
+                if topic0 != APPROVAL_TOPIC and topic0 != TRANSFER_TOPIC:
+                    continue
+                if topic_address(topics[1]) != self.owner:
+                    continue
+
+                token = log['address'].lower()
+                value = int.from_bytes(HexBytes(log['data'])[:32], 'big')
+
+                if topic0 == APPROVAL_TOPIC:
+                    self._allowances[(chain, token, topic_address(topics[2]))] = value
+                    continue
+
+                key = (chain, token, spender)
+                allowance = self._allowances.get(key)
+                if allowance is not None and allowance < UNLIMITED_ALLOWANCE:
+                    self._allowances[key] = max(allowance - value, 0)
+
+    def read_allowances(self, w3: Web3, chain: str, pairs: List[Tuple[str, str]],
+                        multicall_address: str = MULTICALL3_ADDRESS,
+                        max_calls_per_batch: int = 500) -> Dict[Tuple[str, str], int]:
+        """Read and cache allowances for many (token, spender) pairs.
+
+        Pairs are read in aggregate3 batches, falling back to one eth_call
+        per pair if Multicall3 is unavailable. Blocking; run it off the
+        event loop.
+
+        Returns:
+            Allowance per pair; pairs whose read failed are left out.
+        """
+        owner_word = bytes(12) + bytes.fromhex(self.owner[2:])
+        calls = [
+            (Web3.to_checksum_address(token), True,
+             ALLOWANCE_SELECTOR + owner_word + bytes(12) + bytes.fromhex(spender.lower()[2:]))
+            for token, spender in pairs
+        ]
+
+        try:
+            multicall = w3.eth.contract(address=Web3.to_checksum_address(multicall_address), abi=MULTICALL3_ABI)
+            results = []
+            for offset in range(0, len(calls), max_calls_per_batch):
+                results.extend(multicall.functions.aggregate3(calls[offset:offset + max_calls_per_batch]).call())
+        except Exception as e:
+            logger.warning(f"⚠️ Multicall3 unavailable on {chain} ({e}), reading allowances one by one")
+            results = []
+            for target, _, call_data in calls:
+                try:
+                    results.append((True, bytes(w3.eth.call({'to': target, 'data': call_data}))))
+                except Exception:
+                    results.append((False, b''))
+
+        allowances = {}
+        for pair, (success, return_data) in zip(pairs, results):
+            if success and len(return_data) >= 32:
+                allowances[pair] = int.from_bytes(return_data[:32], 'big')
+                self.set(chain, pair[0], pair[1], allowances[pair])
+        return allowances
@@ -0,0 +1,203 @@
+"""Per-chain local nonce allocation for a single signing account."""
+
+import heapq
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+# Send errors meaning our view of the account's nonce has drifted from the node's
+NONCE_DRIFT_ERRORS = (
+    'nonce too low',
+    'nonce too high',
+    'already known',
+    'known transaction',
+    'replacement transaction underpriced',
+    'invalid nonce',
+)
+
+
+class _ChainNonces:
+    """Allocation state for one chain."""
+
+    __slots__ = ("lock", "synced", "next_nonce", "released", "outstanding")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.synced = False
+        self.next_nonce = 0
+        self.released: List[int] = []   # min-heap of reserved nonces handed back unused
+        self.outstanding: Set[int] = set()  # reserved, not yet broadcast or released
+
+
+class NonceManager:
+    """Hands out nonces locally so transactions can be signed back-to-back.
+
+    The node's pending transaction count is read once per chain. After
+    that, every reserve() is a local counter increment, so an approval and
+    the swap that needs it can be signed and broadcast without an RPC round
+    trip in between. A nonce that never reaches the network is handed back
+    with release() and reused by the next reservation, so no gap is left.
+    The node is consulted again only when a send fails with a nonce error.
+
+    submit() handles a whole send. A nonce taken with reserve() must end in
+    exactly one of mark_sent(), release() or handle_send_error(). Methods
+    are thread-safe.
+    """
+
+    def __init__(self, fetch_pending_nonce: Callable[[str], int]):
+        """Initialize the manager.
+
+        Args:
+            fetch_pending_nonce: Returns the account's pending transaction
+                count on a chain; called only to sync.
+        """
+        self.fetch_pending_nonce = fetch_pending_nonce
+        self._chains: Dict[str, _ChainNonces] = {}
+        self._chains_lock = threading.Lock()
+
+        self.stats = {
+            'reserved': 0,
+            'released': 0,
+            'syncs': 0,
+        }
+
+    def _state(self, chain: str) -> _ChainNonces:
+        state = self._chains.get(chain)
+        if state is None:
+            with self._chains_lock:
+                state = self._chains.setdefault(chain, _ChainNonces())
+        return state
+
+    def is_synced(self, chain: str) -> bool:
+        """Whether reserve() on this chain can answer without an RPC call."""
+        state = self._chains.get(chain)
+        return state is not None and state.synced
+
+    def sync(self, chain: str) -> int:
+        """Resynchronize a chain with the node's pending nonce.
+
+        Nonces the node has already seen are dropped from the local state.
+        Nonces between the node's count and our counter that are neither
+        outstanding nor known to be pending on the node are treated as gaps
+        and queued for reuse.
+
+        Returns:
+            The node's pending transaction count.
+        """
+        state = self._state(chain)
+        with state.lock:
+            pending = self.fetch_pending_nonce(chain)
+            self.stats['syncs'] += 1
+
+            if not state.synced:
+                state.next_nonce = pending
+            else:
+                state.outstanding = {nonce for nonce in state.outstanding if nonce >= pending}
+                state.next_nonce = max([pending] + [nonce + 1 for nonce in state.outstanding])
+                state.released = [
+                    nonce for nonce in range(pending, state.next_nonce)
+                    if nonce not in state.outstanding
+                ]
+                heapq.heapify(state.released)
+                if state.released:
+                    logger.warning(f"🔢 {chain}: nonce gap {state.released} after resync, reusing")
+
+            state.synced = True
+            logger.info(f"🔢 {chain}: nonces synced, pending={pending}, next={state.next_nonce}")
+            return pending
+
+    def reserve(self, chain: str) -> int:
+        """Reserve the next nonce on a chain.
+
+        Released nonces are reused lowest-first before the counter advances.
+        """
+        state = self._state(chain)
+        if not state.synced:
+            self.sync(chain)
+        with state.lock:
+            if state.released:
+                nonce = heapq.heappop(state.released)
+            else:
+                nonce = state.next_nonce
+                state.next_nonce += 1
+            state.outstanding.add(nonce)
+            self.stats['reserved'] += 1
+            return nonce
+
+    def mark_sent(self, chain: str, nonce: int) -> None:
+        """Record that the transaction using a nonce was accepted by the node."""
+        state = self._state(chain)
+        with state.lock:
+            state.outstanding.discard(nonce)
+
+    def release(self, chain: str, nonce: int) -> None:
+        """Hand back a nonce whose transaction was never broadcast."""
+        state = self._state(chain)
+        with state.lock:
+            if nonce not in state.outstanding:
+                return
+            state.outstanding.discard(nonce)
+            self.stats['released'] += 1
+            if nonce == state.next_nonce - 1:
+                state.next_nonce = nonce
+                # Fold any released nonces now at the top back into the counter
+                while state.released and max(state.released) == state.next_nonce - 1:
+                    state.released.remove(state.next_nonce - 1)
+                    state.next_nonce -= 1
+                heapq.heapify(state.released)
+            else:
+                heapq.heappush(state.released, nonce)
+
+    def replace(self, chain: str, nonce: int) -> int:
+        """Reserve an already-broadcast nonce again for a replacement transaction.
+
+        Use when re-signing a stuck transaction with a higher gas price or
+        cancelling it. The replacement must end in mark_sent() or
+        handle_send_error(); releasing it has no effect on the counter
+        because the original transaction still holds the nonce.
+
+        Raises:
+            ValueError: If the nonce was never handed out or is still free.
+        """
+        state = self._state(chain)
+        with state.lock:
+            if nonce >= state.next_nonce or nonce in state.released:
+                raise ValueError(f"Nonce {nonce} on {chain} has not been used")
+            return nonce
+
+    def submit(self, chain: str, sign_and_send: Callable[[int], Any]) -> Any:
+        """Reserve a nonce, run sign_and_send with it and settle the nonce.
+
+        Args:
+            chain: Chain name.
+            sign_and_send: Signs and broadcasts a transaction with the given
+                nonce, returning the transaction hash.
+
+        Returns:
+            Whatever sign_and_send returns. Its exceptions propagate after
+            the nonce is released or resynced.
+        """
+        nonce = self.reserve(chain)
+        try:
+            result = sign_and_send(nonce)
+        except Exception as error:
+            self.handle_send_error(chain, nonce, error)
+            raise
+        self.mark_sent(chain, nonce)
+        return result
+
+    def handle_send_error(self, chain: str, nonce: int, error: Exception) -> None:
+        """Settle a nonce after its transaction was rejected by the node.
+
+        Nonce errors trigger a resync; any other rejection means the nonce
+        was not consumed, so it is released.
+        """
+        message = str(error).lower()
+        if any(marker in message for marker in NONCE_DRIFT_ERRORS):
+            logger.warning(f"🔢 {chain}: nonce {nonce} rejected ({error}), resyncing")
+            self.mark_sent(chain, nonce)
+            self.sync(chain)
+        else:
+            self.release(chain, nonce)
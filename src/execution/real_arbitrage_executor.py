@@ -5,17 +5,23 @@ Executes actual arbitrage trades on your wallet using real DEX contracts.
 """
 
 import asyncio
+import functools
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
 from eth_account import Account
-import json
-from pathlib import Path
 
 # 🎯 CENTRALIZED CONFIGURATION - Single source of truth!
 from src.config.trading_config import CONFIG
+from src.execution.allowance_manager import MAX_UINT256, AllowanceManager
+from src.execution.nonce_manager import NonceManager
+from src.utils.abi_registry import get_abi_registry
+from src.utils.trade_log import get_trade_log
+from src.wallet.wallet_state import WalletStateService
 
 # Import emergency stop
 try:
@@ -26,6 +32,7 @@ except ImportError:
         return False
 
 logger = logging.getLogger(__name__)
+execution_log = get_trade_log('execution')
 
 class RealArbitrageExecutor:
     """Execute real arbitrage trades on blockchain."""
@@ -202,16 +209,25 @@ class RealArbitrageExecutor:
         self.wallet_account = None
         self.smart_wallet_manager = None  # Will be initialized after Web3 connections
 
-        # 🚀 SPEED OPTIMIZATION: Ultra-aggressive balance caching to eliminate 4+ second delays
-        self.balance_cache = {}
-        self.balance_cache_timestamp = 0
-        self.balance_cache_duration = 30.0  # Cache for 30 seconds (longer for speed)
-        self.force_balance_refresh = False  # Flag to force refresh when needed
-        self.last_multicall_result = None  # Store last multicall result for instant reuse
+        # 👛 WALLET STATE: Balances loaded once, then kept current from our receipts and each block's logs
+        self.wallet_state = None  # Started once Web3 connections are up
 
-        # 🔧 NONCE MANAGEMENT: Track nonces to prevent "nonce too low" errors
-        self.nonce_cache = {}  # {chain: nonce}
-        self.nonce_cache_timestamp = {}  # {chain: timestamp}
+        # 🔧 NONCE MANAGEMENT: Nonces are reserved locally; the node is only asked on first use or after a nonce error
+        self.nonce_manager = NonceManager(self._fetch_pending_nonce)
+
+        # 🔐 ALLOWANCE CACHE: Approvals warmed at startup; trades check allowances locally
+        self.allowance_manager = None  # Created once the wallet is known
+        self._approval_tasks = set()
+
+        # 📋 ABI REGISTRY: Every ABI parsed once at startup; router contracts cached per chain
+        self.abi_registry = get_abi_registry()
+
+        # ⚡ NON-BLOCKING RPC: Blocking web3 calls run here so trades never stall the event loop
+        self.rpc_executor = ThreadPoolExecutor(
+            max_workers=config.get('rpc_workers', 16),
+            thread_name_prefix='executor-rpc'
+        )
+        self.receipt_poll_interval = config.get('receipt_poll_interval', 0.1)
 
         # 🛡️ AUTO-SHUTDOWN PROTECTION: Track failed transactions
         self.failed_transaction_count = 0
@@ -256,6 +272,7 @@ class RealArbitrageExecutor:
             # Initialize wallet account
             self.wallet_account = Account.from_key(private_key)
             wallet_address = self.wallet_account.address
+            self.allowance_manager = AllowanceManager(wallet_address)
             logger.info(f"   💰 Wallet: {wallet_address}")
             
             # 🔄 INITIALIZE WEB3 CONNECTIONS WITH FALLBACK SUPPORT
@@ -287,6 +304,12 @@ class RealArbitrageExecutor:
                             balance_eth = w3.from_wei(balance_wei, 'ether')
                             logger.info(f"   💰 {network.upper()}: {balance_eth:.4f} ETH")
 
+                            # 🔢 Prime the local nonce counter so the first trade skips the lookup
+                            try:
+                                self.nonce_manager.sync(network)
+                            except Exception as nonce_error:
+                                logger.warning(f"   ⚠️  Nonce sync failed for {network}, will retry on first trade: {nonce_error}")
+
                             connected = True
                             break  # Success! Stop trying other RPCs
 
@@ -351,6 +374,19 @@ class RealArbitrageExecutor:
                 logger.warning(f"⚠️  Smart Wallet Manager initialization failed: {e}")
                 self.smart_wallet_manager = None
 
+            # 👛 Load balances once; from here on they follow blocks instead of being rescanned per trade
+            try:
+                self.wallet_state = WalletStateService(
+                    self.web3_connections, wallet_address, self.token_addresses,
+                    eth_price_source=self._quote_eth_price,
+                    poll_interval=self.config.get('wallet_poll_interval', 1.0)
+                )
+                await self.wallet_state.start()
+                logger.info(f"👛 Wallet state service following {len(self.web3_connections)} chains")
+            except Exception as e:
+                logger.warning(f"⚠️  Wallet state service failed to start, balances will be read per trade: {e}")
+                self.wallet_state = None
+
             # 🔥 Initialize flashloan integration
             try:
                 from src.flashloan.flashloan_integration import FlashloanIntegration
@@ -360,6 +396,13 @@ class RealArbitrageExecutor:
                 logger.warning(f"⚠️  Flashloan integration initialization failed: {e}")
                 self.flashloan_integration = None
 
+            # 🔐 Approve every configured (token, router) now so trades never wait on one
+            if self.config.get('prewarm_approvals', True):
+                try:
+                    await self.warm_token_approvals()
+                except Exception as e:
+                    logger.warning(f"⚠️  Approval warm-up failed, trades will approve on demand: {e}")
+
             logger.info(f"✅ Connected to {len(self.web3_connections)} networks")
             return True
             
@@ -468,60 +511,36 @@ class RealArbitrageExecutor:
                 return {'success': False, 'error': f'Token {token} not supported on {chain}'}
             
             # 🎯 SMART WALLET BALANCER: Calculate trade amount based on TOTAL available capital!
-            wallet_balance = w3.eth.get_balance(self.wallet_account.address)
-
-            # 🚀 SPEED OPTIMIZATION: Check cached balance first to avoid 4+ second delays
-            total_wallet_value_usd = 0
-
-            # 🚀 ULTRA-FAST PATH: Try cached balance first (MUCH faster!)
-            if self._should_use_cached_balance():
-                total_wallet_value_usd = self._get_cached_wallet_value()
-                if total_wallet_value_usd > 0:
-                    logger.info(f"🚀 SPEED BOOST: Using cached wallet value ${total_wallet_value_usd:.2f} (avoiding 4+ second balance scan)")
-                    # 🎯 STORE FOR SAFETY CHECK: Save total wallet value for safety validation
-                    self.total_wallet_value_usd = total_wallet_value_usd
-                    # Skip slow path entirely!
-                    total_wallet_value_usd = total_wallet_value_usd
-                else:
-                    logger.info(f"🚀 SPEED BOOST: Cache available but empty, will refresh")
-
-            # Only do slow balance checking if cache is stale or empty AND we don't have a value
-            if total_wallet_value_usd == 0 and self.smart_wallet_manager:
-                try:
-                    logger.info(f"🐌 SLOW PATH: Getting fresh balance data (this takes 4+ seconds)")
-                    smart_status = await self.smart_wallet_manager.get_smart_balance_status(chain)
-                    total_wallet_value_usd = smart_status.get('total_wallet_value_usd', 0)
-                    logger.info(f"🎯 SMART BALANCER: Fresh wallet value: ${total_wallet_value_usd:.2f}")
-
-                    # 🎯 STORE FOR SAFETY CHECK: Save total wallet value for safety validation
-                    self.total_wallet_value_usd = total_wallet_value_usd
-
-                    # 🚀 SPEED OPTIMIZATION: Cache the wallet value to avoid repeated smart balancer calls
-                    # Also cache individual ETH balances for consistent balance checking
-                    eth_balances = {}
-                    if hasattr(smart_status, 'get') and 'current_balances' in smart_status:
-                        for token, balance_usd in smart_status['current_balances'].items():
-                            if token == 'ETH':
-                                eth_balances[chain] = balance_usd / 3000.0  # Convert USD to ETH
-
-                    self._update_balance_cache(total_wallet_value_usd, eth_balances)
+            # 👛 Balances come from the wallet state snapshot: no balance scan before the trade
+            snapshot = self.wallet_state.snapshot(chain) if self.wallet_state else None
+            eth_price_usd = self._eth_price_usd()
+            if snapshot is not None:
+                wallet_balance = w3.to_wei(snapshot.eth_balance, 'ether')
+                total_wallet_value_usd = snapshot.total_value_usd
+                logger.info(f"👛 Wallet snapshot (block {snapshot.block}): ${total_wallet_value_usd:.2f}, ETH ${eth_price_usd:.2f}")
+            else:
+                wallet_balance = await self._run_blocking(w3.eth.get_balance, self.wallet_account.address)
+                total_wallet_value_usd = 0
+                if self.smart_wallet_manager:
+                    try:
+                        logger.info(f"🐌 SLOW PATH: No wallet snapshot for {chain}, scanning balances")
+                        smart_status = await self.smart_wallet_manager.get_smart_balance_status(chain)
+                        total_wallet_value_usd = smart_status.get('total_wallet_value_usd', 0)
+                    except Exception as e:
+                        logger.warning(f"Could not get smart balance status: {e}")
 
-                except Exception as e:
-                    logger.warning(f"Could not get smart balance status: {e}")
-                    # Try to use any cached value as fallback
-                    total_wallet_value_usd = self._get_cached_wallet_value()
-                    if total_wallet_value_usd > 0:
-                        logger.info(f"🚀 FALLBACK: Using stale cached value ${total_wallet_value_usd:.2f}")
+            # 🎯 STORE FOR SAFETY CHECK: Save total wallet value for safety validation
+            if total_wallet_value_usd > 0:
+                self.total_wallet_value_usd = total_wallet_value_usd
 
             # 🔧 SMART BALANCER CAPACITY CHECK: Calculate based on what can actually be converted
             if total_wallet_value_usd > 0 and self.smart_wallet_manager:
                 # First check what the smart balancer can actually convert
-                current_balance_wei = w3.eth.get_balance(self.wallet_account.address)
-                current_balance_eth = float(w3.from_wei(current_balance_wei, 'ether'))
+                current_balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
 
                 # Calculate theoretical max trade
                 theoretical_max_usd = total_wallet_value_usd * CONFIG.MAX_TRADE_PERCENTAGE
-                theoretical_max_eth = theoretical_max_usd / 3000.0
+                theoretical_max_eth = theoretical_max_usd / eth_price_usd
 
                 # Check if we need smart balancer conversion
                 eth_needed_with_gas = theoretical_max_eth + 0.005  # +0.005 ETH for gas
@@ -536,10 +555,11 @@ class RealArbitrageExecutor:
                     # Need smart balancer - check capacity first
                     logger.info(f"🔍 SMART BALANCER CAPACITY CHECK: Need {eth_needed_with_gas:.6f} ETH, have {current_balance_eth:.6f}")
 
-                    # Get smart balancer status to check conversion capacity
                     try:
-                        smart_status = await self.smart_wallet_manager.get_smart_balance_status(chain)
-                        balances = smart_status.get('current_balances', {})
+                        if snapshot is not None:
+                            balances = snapshot.balances_usd
+                        else:
+                            balances = smart_status.get('token_balances', {})
 
                         # Calculate maximum convertible amount
                         convertible_usd = 0
@@ -550,13 +570,13 @@ class RealArbitrageExecutor:
                                 convertible_usd += available
 
                         # Add current ETH value
-                        current_eth_usd = current_balance_eth * 3000.0
+                        current_eth_usd = current_balance_eth * eth_price_usd
                         total_convertible = convertible_usd + current_eth_usd
 
                         # Use 90% of convertible amount for safety (slippage buffer)
                         safe_convertible_usd = total_convertible * 0.90
                         max_trade_usd = min(theoretical_max_usd, safe_convertible_usd)
-                        max_trade_eth = max_trade_usd / 3000.0
+                        max_trade_eth = max_trade_usd / eth_price_usd
                         max_safe_wei = w3.to_wei(max_trade_eth, 'ether')
 
                         logger.info(f"🔧 CAPACITY-LIMITED TRADE: ${max_trade_usd:.2f} (limited by convertible capacity ${safe_convertible_usd:.2f})")
@@ -564,8 +584,8 @@ class RealArbitrageExecutor:
                     except Exception as e:
                         logger.warning(f"Could not check smart balancer capacity: {e}")
                         # Fallback to conservative amount
-                        max_trade_usd = min(theoretical_max_usd, current_balance_eth * 3000.0 * 0.8)  # 80% of current ETH
-                        max_trade_eth = max_trade_usd / 3000.0
+                        max_trade_usd = min(theoretical_max_usd, current_balance_eth * eth_price_usd * 0.8)  # 80% of current ETH
+                        max_trade_eth = max_trade_usd / eth_price_usd
                         max_safe_wei = w3.to_wei(max_trade_eth, 'ether')
                         logger.info(f"⚠️  CONSERVATIVE FALLBACK: ${max_trade_usd:.2f} (80% of current ETH)")
             else:
@@ -580,32 +600,29 @@ class RealArbitrageExecutor:
             trade_amount_wei = min(max_safe_wei, max_config_wei)
             trade_amount_eth = float(w3.from_wei(trade_amount_wei, 'ether'))
 
-            # 🔍 DEBUG: Log the enhanced trade amount calculation
-            logger.info(f"   🔍 ENHANCED TRADE AMOUNT DEBUG:")
-            logger.info(f"      💰 Current ETH balance: {w3.from_wei(wallet_balance, 'ether')} ETH")
-            if total_wallet_value_usd > 0:
-                logger.info(f"      🎯 Total wallet value: ${total_wallet_value_usd:.2f}")
-                logger.info(f"      🚀 50% for trading: ${total_wallet_value_usd * 0.50:.2f}")
-                logger.info(f"      📊 Enhanced trade amount: {w3.from_wei(max_safe_wei, 'ether')} ETH")
-            else:
-                logger.info(f"      📊 Fallback 50% of ETH: {w3.from_wei(max_safe_wei, 'ether')} ETH")
-            logger.info(f"      🎯 Config limit: {w3.from_wei(max_config_wei, 'ether')} ETH")
-            logger.info(f"      ⚖️  Final trade amount: {trade_amount_eth} ETH (${trade_amount_eth * 3000:.2f})")
-
             # 🎯 SMART WALLET BALANCER: No artificial minimum - let the smart balancer handle it!
             # The smart balancer will convert tokens to ETH if needed for larger trades
             min_trade_wei = w3.to_wei(0.0001, 'ether')  # Tiny minimum just to prevent zero trades
-            logger.info(f"      🔻 Minimum required: {w3.from_wei(min_trade_wei, 'ether')} ETH (smart balancer will handle larger amounts)")
-            logger.info(f"      ❓ Is {trade_amount_wei} < {min_trade_wei}? {trade_amount_wei < min_trade_wei}")
+
+            # 🔍 DEBUG: One structured record for the enhanced trade amount calculation
+            execution_log.debug('trade_amount',
+                                "   🔍 Trade amount: balance %(balance_eth).6f ETH, wallet $%(wallet_usd).2f, "
+                                "sized %(sized_eth).6f ETH, config limit %(limit_eth).6f ETH, "
+                                "final %(trade_eth).6f ETH ($%(trade_usd).2f), minimum %(min_eth).6f ETH",
+                                chain=chain, balance_eth=float(w3.from_wei(wallet_balance, 'ether')),
+                                wallet_usd=total_wallet_value_usd,
+                                sized_eth=float(w3.from_wei(max_safe_wei, 'ether')),
+                                limit_eth=float(w3.from_wei(max_config_wei, 'ether')),
+                                trade_eth=trade_amount_eth, trade_usd=trade_amount_eth * eth_price_usd,
+                                min_eth=float(w3.from_wei(min_trade_wei, 'ether')))
 
             if trade_amount_wei < min_trade_wei:
                 logger.info(f"      ⬆️  BOOSTING to minimum: {w3.from_wei(min_trade_wei, 'ether')} ETH")
                 trade_amount_wei = min_trade_wei
                 trade_amount_eth = float(w3.from_wei(trade_amount_wei, 'ether'))  # Use calculated amount!
 
-            # 🚀 CRITICAL SPEED OPTIMIZATION: Get ETH balance ONCE and cache it
-            current_balance_wei = w3.eth.get_balance(self.wallet_account.address)
-            current_balance_eth = float(w3.from_wei(current_balance_wei, 'ether'))
+            # 🚀 CRITICAL SPEED OPTIMIZATION: ETH balance from the snapshot read above
+            current_balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
 
             # 🚀 SPEED CHECK: Skip smart balancer entirely if we have enough ETH
             eth_needed_with_gas = trade_amount_eth + 0.005  # +0.005 ETH for gas
@@ -629,7 +646,7 @@ class RealArbitrageExecutor:
                     logger.info(f"   💰 Converted: ${balance_result['converted_amount_usd']:.2f}")
                     logger.info(f"   📊 New ETH balance: {balance_result['new_eth_balance']:.6f} ETH")
                     # Update current balance after conversion
-                    current_balance_wei = w3.eth.get_balance(self.wallet_account.address)
+                    current_balance_wei = await self._wallet_eth_wei(w3, chain)
                     current_balance_eth = float(w3.from_wei(current_balance_wei, 'ether'))
                 elif balance_result.get('conversion_needed') == False:
                     logger.info(f"   ✅ Sufficient ETH available, no conversion needed")
@@ -641,14 +658,16 @@ class RealArbitrageExecutor:
             # 🎯 SMART WALLET BALANCER: Only check if we have enough after potential conversion
             if current_balance_eth < trade_amount_eth:
                 # 📊 DETAILED BALANCE DIAGNOSTIC
-                current_balance_usd = current_balance_eth * 3000.0
+                current_balance_usd = current_balance_eth * eth_price_usd
 
-                logger.info(f"   📊 BALANCE DIAGNOSTIC:")
-                logger.info(f"      💰 Current balance: {current_balance_eth:.6f} ETH (${current_balance_usd:.2f})")
-                logger.info(f"      🎯 Required amount: {trade_amount_eth:.6f} ETH (${trade_amount_eth * 3000:.2f})")
-                logger.info(f"      📉 Short by: {(trade_amount_eth - current_balance_eth):.6f} ETH (${(trade_amount_eth - current_balance_eth) * 3000:.2f})")
-                logger.info(f"      🎯 Smart Balancer should have handled this - checking if conversion failed")
-                logger.info(f"      🔧 Opportunity: {opportunity.get('token', 'Unknown')} {opportunity.get('direction', '')}")
+                execution_log.info('insufficient_balance',
+                                   "   📊 BALANCE DIAGNOSTIC: have %(balance_eth).6f ETH ($%(balance_usd).2f), "
+                                   "need %(trade_eth).6f ETH ($%(trade_usd).2f), short %(short_eth).6f ETH "
+                                   "for %(token)s %(direction)s - smart balancer did not cover it",
+                                   chain=chain, balance_eth=current_balance_eth, balance_usd=current_balance_usd,
+                                   trade_eth=trade_amount_eth, trade_usd=trade_amount_eth * eth_price_usd,
+                                   short_eth=trade_amount_eth - current_balance_eth,
+                                   token=opportunity.get('token', 'Unknown'), direction=opportunity.get('direction', ''))
 
                 return {'success': False, 'error': f'Insufficient balance after smart balancer: need {trade_amount_eth:.6f} ETH, have {current_balance_eth:.6f} ETH'}
             
@@ -679,7 +698,7 @@ class RealArbitrageExecutor:
             profit_wei = final_eth - trade_amount_wei
             # 🔧 FIXED: Convert Decimal to float to avoid Decimal * float errors
             profit_eth = float(w3.from_wei(profit_wei, 'ether'))
-            profit_usd = profit_eth * 3000.0  # Conservative ETH estimate
+            profit_usd = profit_eth * eth_price_usd
             
             logger.info(f"   💰 PROFIT: {profit_eth:.6f} ETH (${profit_usd:.2f})")
 
@@ -724,7 +743,7 @@ class RealArbitrageExecutor:
             gas_limit = fixed_gas_limit
 
             # 🚀 SPEED: Use higher gas price for priority inclusion
-            network_gas_price = w3.eth.gas_price
+            network_gas_price = await self._run_blocking(lambda: w3.eth.gas_price)
             min_gas_price = w3.to_wei(min_gas_gwei, 'gwei')
             fast_gas_price = int(max(network_gas_price, min_gas_price) * gas_multiplier)
 
@@ -753,36 +772,14 @@ class RealArbitrageExecutor:
             # Get WETH contract address
             weth_address = self.token_addresses[chain]['WETH']
 
-            # WETH contract ABI (minimal - just deposit and withdraw)
-            weth_abi = [
-                {
-                    "constant": False,
-                    "inputs": [],
-                    "name": "deposit",
-                    "outputs": [],
-                    "payable": True,
-                    "stateMutability": "payable",
-                    "type": "function"
-                },
-                {
-                    "constant": False,
-                    "inputs": [{"name": "wad", "type": "uint256"}],
-                    "name": "withdraw",
-                    "outputs": [],
-                    "payable": False,
-                    "stateMutability": "nonpayable",
-                    "type": "function"
-                }
-            ]
+            # Cached WETH contract instance
+            weth_contract = self.abi_registry.contract(w3, chain, weth_address, 'weth')
 
-            # Create WETH contract instance
-            weth_contract = w3.eth.contract(
-                address=w3.to_checksum_address(weth_address),
-                abi=weth_abi
+            # 🚀 SPEED: Fetch gas price and chain id concurrently
+            network_gas_price, chain_id = await asyncio.gather(
+                self._run_blocking(lambda: w3.eth.gas_price),
+                self._run_blocking(lambda: w3.eth.chain_id)
             )
-
-            # 🚀 SPEED: Use higher gas price for priority inclusion
-            network_gas_price = w3.eth.gas_price
             min_gas_price = w3.to_wei(min_gas_gwei, 'gwei')
             fast_gas_price = int(max(network_gas_price, min_gas_price) * gas_multiplier)
 
@@ -796,7 +793,7 @@ class RealArbitrageExecutor:
                     'value': amount,
                     'gas': 150000,  # Fixed gas limit for WETH deposit
                     'gasPrice': fast_gas_price,  # 🚀 SPEED: Higher gas price
-                    'nonce': self._get_next_nonce(chain)  # 🔧 FIXED: Use managed nonce
+                    'chainId': chain_id
                 })
 
             elif input_token == 'WETH' and output_token == 'ETH':
@@ -807,19 +804,17 @@ class RealArbitrageExecutor:
                     'from': self.wallet_account.address,
                     'gas': 150000,  # Fixed gas limit for WETH withdrawal
                     'gasPrice': fast_gas_price,  # 🚀 SPEED: Higher gas price
-                    'nonce': self._get_next_nonce(chain)  # 🔧 FIXED: Use managed nonce
+                    'chainId': chain_id
                 })
             else:
                 return {'success': False, 'error': f'Invalid WETH conversion: {input_token} → {output_token}'}
 
             # Sign and send transaction
-            signed_txn = w3.eth.account.sign_transaction(transaction, private_key=self.wallet_account.key)
-
             logger.info(f"   📡 Sending FAST WETH conversion...")
             logger.info(f"   ⛽ Gas: {w3.from_wei(fast_gas_price, 'gwei'):.1f} gwei ({gas_multiplier}x speed)")
 
             try:
-                tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                tx_hash = await self._send_transaction(w3, chain, transaction)
                 tx_hash_hex = tx_hash.hex()
                 logger.info(f"   ✅ FAST WETH conversion sent: {tx_hash_hex}")
 
@@ -832,7 +827,8 @@ class RealArbitrageExecutor:
             logger.info(f"   🔗 Arbiscan: https://arbiscan.io/tx/{tx_hash_hex}")
 
             try:
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)  # 🚀 SPEED: Shorter timeout
+                receipt = await self._wait_for_receipt(w3, tx_hash, timeout=30)  # 🚀 SPEED: Shorter timeout
+                self._record_receipt(chain, receipt, transaction)
 
                 if receipt.status == 1:
                     logger.info(f"   ✅ FAST WETH CONVERSION CONFIRMED: {tx_hash_hex}")
@@ -846,7 +842,7 @@ class RealArbitrageExecutor:
                         'transaction_hash': tx_hash_hex,
                         'gas_used': receipt.gasUsed,
                         'gas_cost_eth': gas_cost_eth,
-                        'gas_cost_usd': gas_cost_eth * 3000.0,  # Convert to USD
+                        'gas_cost_usd': gas_cost_eth * self._eth_price_usd(),  # Convert to USD
                         'conversion_type': f'{input_token} → {output_token}',
                         'amount_converted': float(w3.from_wei(amount, 'ether')),
                         'output_amount': amount,  # 🔧 FIXED: Add output_amount for arbitrage executor
@@ -899,7 +895,7 @@ class RealArbitrageExecutor:
             # 🛡️ SAFETY CHECK #1: Basic transaction validation
             # 🔧 CRITICAL FIX: Only validate ETH amounts, not token amounts
             if input_token == 'ETH':
-                safety_check = self._validate_transaction_safety(w3, chain, dex, amount)
+                safety_check = await self._run_blocking(self._validate_transaction_safety, w3, chain, dex, amount)
                 if not safety_check['valid']:
                     logger.error(f"   🚨 SAFETY CHECK FAILED: {safety_check['error']}")
                     return {'success': False, 'error': f"Safety check failed: {safety_check['error']}"}
@@ -914,7 +910,7 @@ class RealArbitrageExecutor:
 
             # Validate router contract exists and check what functions it has
             try:
-                code = w3.eth.get_code(router_address)
+                code = await self._run_blocking(w3.eth.get_code, router_address)
                 if code == b'':
                     return {'success': False, 'error': f'Router contract {router_address} does not exist on {chain}'}
 
@@ -946,22 +942,17 @@ class RealArbitrageExecutor:
             # Build the actual swap transaction
             logger.info(f"   📝 Building transaction for {w3.from_wei(amount, 'ether'):.6f} ETH")
 
-            # Get DEX-specific ABI
-            router_abi = self._get_dex_abi(dex)
-
-            if not router_abi:
-                return {'success': False, 'error': f'No ABI available for DEX {dex}'}
-
             # Create contract instance
             logger.info(f"   🔍 DEBUG CONTRACT ADDRESSES:")
             logger.info(f"      🏪 Router address: {router_address}")
             logger.info(f"      🌐 WETH address: {self.token_addresses[chain]['WETH']}")
             logger.info(f"      💰 Output token: {output_token_address}")
 
-            router_contract = w3.eth.contract(address=router_address, abi=router_abi)
+            router_contract = self.abi_registry.router_contract(w3, chain, router_address, dex)
 
             # Set up transaction parameters
-            deadline = int(w3.eth.get_block('latest')['timestamp']) + 300  # 5 minutes
+            latest_block = await self._run_blocking(w3.eth.get_block, 'latest')
+            deadline = int(latest_block['timestamp']) + 300  # 5 minutes
             slippage_tolerance = CONFIG.MAX_SLIPPAGE_PERCENTAGE / 100.0  # 🎯 CENTRALIZED CONFIG (convert % to decimal)
 
             # 🔧 FIXED: Initialize expected_output_tokens to avoid variable scope errors
@@ -972,28 +963,8 @@ class RealArbitrageExecutor:
                 weth_address = self.token_addresses[chain]['WETH']
                 path = [weth_address, output_token_address]  # WETH → Token (SushiSwap compatible!)
 
-                # 🚀 ULTRA-FAST BALANCE CHECK: Use cached balance for consistency
-                # Check if we have cached balance first (MUCH faster and consistent)
-                if self._should_use_cached_balance():
-                    cached_eth_balance = self._get_cached_eth_balance(chain)
-                    if cached_eth_balance > 0:
-                        wallet_balance = w3.to_wei(cached_eth_balance, 'ether')
-                        logger.info(f"   🚀 SPEED BOOST: Using cached ETH balance: {cached_eth_balance:.6f} ETH")
-                    else:
-                        # Fallback to fresh balance check
-                        wallet_balance = w3.eth.get_balance(self.wallet_account.address)
-                        balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
-                        logger.info(f"   💰 Fresh ETH balance check: {balance_eth:.6f} ETH")
-                        # Cache this fresh balance for next time
-                        self._update_eth_balance_cache(chain, balance_eth)
-                else:
-                    # Cache expired, get fresh balance and update cache
-                    wallet_balance = w3.eth.get_balance(self.wallet_account.address)
-                    balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
-                    logger.info(f"   💰 Fresh ETH balance (cache expired): {balance_eth:.6f} ETH")
-                    # Update cache for next time
-                    self._update_eth_balance_cache(chain, balance_eth)
-                    logger.info(f"   💰 Fresh ETH balance (cache expired): {float(w3.from_wei(wallet_balance, 'ether')):.6f} ETH")
+                # 👛 Balance from the wallet state snapshot, falling back to one RPC read
+                wallet_balance = await self._wallet_eth_wei(w3, chain)
                 if amount > wallet_balance:
                     return {'success': False, 'error': f'Insufficient ETH balance: need {w3.from_wei(amount, "ether"):.6f} ETH, have {w3.from_wei(wallet_balance, "ether"):.6f} ETH'}
 
@@ -1006,8 +977,8 @@ class RealArbitrageExecutor:
                     expected_output_tokens = amount_eth * 2500.0  # Conservative ETH price
                     min_amount_out = int(expected_output_tokens * (1 - slippage_tolerance) * 10**6)  # 6 decimals
                 elif output_token == 'DAI':
-                    # DAI: 1 ETH ≈ 3000 DAI (18 decimals)
-                    expected_output_tokens = amount_eth * 3000.0
+                    # DAI: 1 ETH ≈ ETH price in DAI (18 decimals)
+                    expected_output_tokens = amount_eth * self._eth_price_usd()
                     min_amount_out = int(expected_output_tokens * (1 - slippage_tolerance) * 10**18)  # 18 decimals
                 elif output_token == 'WETH':
                     # WETH: 1:1 with ETH (18 decimals)
@@ -1038,9 +1009,9 @@ class RealArbitrageExecutor:
                 # 🚀 TOKEN → ETH SWAP: Implement the missing functionality!
                 logger.info(f"   🔄 TOKEN → ETH SWAP: {input_token} → ETH on {dex}")
 
-                # Check token approval first
+                # Check token approval first - 🚀 PIPELINED: the swap goes out right behind the approval
                 approval_result = await self._ensure_token_approval(
-                    w3, chain, input_token_address, router_address, amount
+                    w3, chain, input_token_address, router_address, amount, wait_for_receipt=False
                 )
 
                 if not approval_result['success']:
@@ -1053,7 +1024,7 @@ class RealArbitrageExecutor:
 
                 # Conservative ETH price estimate
                 if input_token in ['USDC', 'USDC.e', 'USDT', 'DAI']:
-                    expected_eth = amount_tokens / 3000.0  # $3000 per ETH
+                    expected_eth = amount_tokens / self._eth_price_usd()
                 else:
                     expected_eth = amount_tokens * 0.0003  # Conservative for other tokens
 
@@ -1074,10 +1045,6 @@ class RealArbitrageExecutor:
                 # Extract the actual transaction
                 transaction = transaction['transaction']
 
-            # Sign the transaction
-            logger.info(f"   ✍️  Signing transaction...")
-            signed_txn = w3.eth.account.sign_transaction(transaction, private_key=self.wallet_account.key)
-
             # Validate transaction before sending
             logger.info(f"   🔍 Validating transaction...")
             logger.info(f"      Router: {router_address}")
@@ -1090,18 +1057,18 @@ class RealArbitrageExecutor:
             # Send the transaction
             logger.info(f"   📡 Sending transaction to blockchain...")
             logger.info(f"   🔍 DEBUG TRANSACTION SENDING:")
-            logger.info(f"      📝 Raw transaction length: {len(signed_txn.raw_transaction)} bytes")
             logger.info(f"      🌐 Web3 provider: {w3.provider}")
-            logger.info(f"      🔗 Network ID: {w3.eth.chain_id}")
+            logger.info(f"      🔗 Network ID: {transaction.get('chainId')}")
 
             try:
-                tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                logger.info(f"   ✍️  Signing transaction...")
+                tx_hash = await self._send_transaction(w3, chain, transaction)
                 tx_hash_hex = tx_hash.hex()
                 logger.info(f"   ✅ Transaction sent successfully: {tx_hash_hex}")
 
                 # Verify transaction exists immediately
                 try:
-                    tx_details = w3.eth.get_transaction(tx_hash)
+                    tx_details = await self._run_blocking(w3.eth.get_transaction, tx_hash)
                     logger.info(f"   ✅ Transaction verified in mempool: {tx_details.get('hash', 'N/A')}")
                 except Exception as verify_error:
                     logger.error(f"   ⚠️  Transaction not found in mempool: {verify_error}")
@@ -1115,7 +1082,8 @@ class RealArbitrageExecutor:
 
             # Wait for transaction receipt with better error handling
             try:
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+                receipt = await self._wait_for_receipt(w3, tx_hash, timeout=60)
+                self._record_receipt(chain, receipt, transaction)
 
                 if receipt.status == 1:
                     logger.info(f"   ✅ REAL SWAP CONFIRMED: {tx_hash_hex}")
@@ -1126,10 +1094,10 @@ class RealArbitrageExecutor:
                     gas_cost_wei = gas_used * gas_price
                     # 🔧 FIXED: Convert Decimal to float to avoid Decimal * float errors
                     gas_cost_eth = float(w3.from_wei(gas_cost_wei, 'ether'))
-                    gas_cost_usd = gas_cost_eth * 3000.0
+                    gas_cost_usd = gas_cost_eth * self._eth_price_usd()
 
                     # Get output amount from logs (simplified)
-                    output_amount = amount * 3000 * 0.997  # Estimate for now
+                    output_amount = amount * self._eth_price_usd() * 0.997  # Estimate for now
 
                     return {
                         'success': True,
@@ -1145,7 +1113,7 @@ class RealArbitrageExecutor:
 
                     # Try to get revert reason
                     try:
-                        w3.eth.call(transaction, receipt.blockNumber)
+                        await self._run_blocking(w3.eth.call, transaction, receipt.blockNumber)
                     except Exception as revert_error:
                         logger.error(f"   💥 Revert reason: {revert_error}")
 
@@ -1173,7 +1141,7 @@ class RealArbitrageExecutor:
                 amount_usd = 50.0  # Conservative estimate for token swaps
             else:
                 # This is ETH amount
-                amount_usd = amount_eth * 3000.0  # Conservative ETH price
+                amount_usd = amount_eth * self._eth_price_usd()
 
             # Hard limits based on your capital - 🎯 CENTRALIZED CONFIG
             if amount_usd > CONFIG.MAX_TRADE_USD:
@@ -1217,6 +1185,8 @@ class RealArbitrageExecutor:
 
             # 🚨 SAFETY CHECK #3: Gas price emergency brake
             try:
+                # Blocking RPC: safe only because _execute_dex_swap, the one
+                # caller, runs this whole method through _run_blocking
                 gas_price_wei = w3.eth.gas_price
                 gas_price_gwei = w3.from_wei(gas_price_wei, 'gwei')
 
@@ -1233,23 +1203,14 @@ class RealArbitrageExecutor:
 
             # 🚨 SAFETY CHECK #4: Wallet balance validation (ENHANCED FOR TOTAL WALLET VALUE)
             try:
-                # 🚀 CRITICAL FIX: Use cached balance for consistency with trade calculations
-                if self._should_use_cached_balance():
-                    cached_eth_balance = self._get_cached_eth_balance(chain)
-                    if cached_eth_balance > 0:
-                        wallet_balance = w3.to_wei(cached_eth_balance, 'ether')
-                        balance_eth = cached_eth_balance
-                        logger.info(f"   🚀 USING CACHED BALANCE for consistency")
-                    else:
-                        # Fallback to fresh balance check
-                        wallet_balance = w3.eth.get_balance(self.wallet_account.address)
-                        balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
-                        logger.info(f"   ⚠️  FALLBACK: Cached balance not available")
+                # 👛 Same wallet state snapshot the trade was sized from
+                snapshot = self.wallet_state.snapshot(chain) if self.wallet_state else None
+                if snapshot is not None:
+                    wallet_balance = w3.to_wei(snapshot.eth_balance, 'ether')
                 else:
-                    # Cache expired, get fresh balance
                     wallet_balance = w3.eth.get_balance(self.wallet_account.address)
-                    balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
-                    logger.info(f"   ⚠️  FRESH BALANCE: Cache expired")
+                balance_eth = float(w3.from_wei(wallet_balance, 'ether'))
+                eth_price_usd = self._eth_price_usd()
 
                 # 🔍 DEBUG: Log the exact balance being checked
                 logger.info(f"   🔍 DEBUG BALANCE CHECK:")
@@ -1261,8 +1222,9 @@ class RealArbitrageExecutor:
 
                 # 🎯 ENHANCED SAFETY: Use total wallet value instead of just ETH balance
                 # Get total wallet value from smart balancer if available
-                total_wallet_value_usd = getattr(self, 'total_wallet_value_usd', balance_eth * 3000.0)
-                total_wallet_value_eth = total_wallet_value_usd / 3000.0
+                total_wallet_value_usd = snapshot.total_value_usd if snapshot is not None else \
+                    getattr(self, 'total_wallet_value_usd', balance_eth * eth_price_usd)
+                total_wallet_value_eth = total_wallet_value_usd / eth_price_usd
                 total_wallet_value_wei = w3.to_wei(total_wallet_value_eth, 'ether')
 
                 # 🔧 CENTRALIZED CONFIG: Use configured trade percentage instead of hardcoded 50%
@@ -1274,16 +1236,16 @@ class RealArbitrageExecutor:
                 if amount > (max_safe_amount + tolerance_wei):
                     # 📊 DETAILED WALLET SAFETY DIAGNOSTIC (ENHANCED FOR TOTAL WALLET VALUE)
                     amount_eth = float(w3.from_wei(amount, 'ether'))
-                    amount_usd = amount_eth * 3000.0
+                    amount_usd = amount_eth * eth_price_usd
                     max_safe_eth = float(w3.from_wei(max_safe_amount, 'ether'))
-                    max_safe_usd = max_safe_eth * 3000.0
+                    max_safe_usd = max_safe_eth * eth_price_usd
 
                     logger.info(f"   📊 ENHANCED WALLET SAFETY DIAGNOSTIC:")
-                    logger.info(f"      💰 ETH balance: {balance_eth:.6f} ETH (${balance_eth * 3000:.2f})")
+                    logger.info(f"      💰 ETH balance: {balance_eth:.6f} ETH (${balance_eth * eth_price_usd:.2f})")
                     logger.info(f"      🎯 Total wallet value: ${total_wallet_value_usd:.2f}")
                     logger.info(f"      🎯 Requested amount: {amount_eth:.6f} ETH (${amount_usd:.2f})")
                     logger.info(f"      🛡️  Safety limit ({CONFIG.MAX_TRADE_PERCENTAGE*100:.0f}% of total): {max_safe_eth:.6f} ETH (${max_safe_usd:.2f})")
-                    logger.info(f"      📉 Over limit by: {(amount_eth - max_safe_eth):.6f} ETH (${(amount_eth - max_safe_eth) * 3000:.2f})")
+                    logger.info(f"      📉 Over limit by: {(amount_eth - max_safe_eth):.6f} ETH (${(amount_eth - max_safe_eth) * eth_price_usd:.2f})")
 
                     return {'valid': False, 'error': f'Trade amount exceeds {CONFIG.MAX_TRADE_PERCENTAGE*100:.0f}% of total wallet value (safety limit)'}
 
@@ -1314,33 +1276,16 @@ class RealArbitrageExecutor:
             # Get WETH contract address
             weth_address = self.token_addresses[chain]['WETH']
 
-            # WETH contract ABI (minimal - just deposit and withdraw)
-            weth_abi = [
-                {
-                    "constant": False,
-                    "inputs": [],
-                    "name": "deposit",
-                    "outputs": [],
-                    "payable": True,
-                    "stateMutability": "payable",
-                    "type": "function"
-                },
-                {
-                    "constant": False,
-                    "inputs": [{"name": "wad", "type": "uint256"}],
-                    "name": "withdraw",
-                    "outputs": [],
-                    "payable": False,
-                    "stateMutability": "nonpayable",
-                    "type": "function"
-                }
-            ]
+            # Cached WETH contract instance
+            weth_contract = self.abi_registry.contract(w3, chain, weth_address, 'weth')
 
-            # Create WETH contract instance
-            weth_contract = w3.eth.contract(
-                address=w3.to_checksum_address(weth_address),
-                abi=weth_abi
+            # Gas price and chain id off the event loop; build_transaction would
+            # otherwise fetch the chain id itself
+            network_gas_price, chain_id = await asyncio.gather(
+                self._run_blocking(lambda: w3.eth.gas_price),
+                self._run_blocking(lambda: w3.eth.chain_id)
             )
+            gas_price = max(network_gas_price, w3.to_wei(0.1, 'gwei'))
 
             # Build transaction based on conversion direction
             if input_token == 'ETH' and output_token == 'WETH':
@@ -1351,8 +1296,8 @@ class RealArbitrageExecutor:
                     'from': self.wallet_account.address,
                     'value': amount,
                     'gas': 150000,  # 🔧 FIXED: Increased gas limit for WETH deposit (was 50k, now 150k)
-                    'gasPrice': max(w3.eth.gas_price, w3.to_wei(0.1, 'gwei')),
-                    'nonce': self._get_next_nonce(chain)  # 🔧 FIXED: Use managed nonce
+                    'gasPrice': gas_price,
+                    'chainId': chain_id
                 })
 
             elif input_token == 'WETH' and output_token == 'ETH':
@@ -1362,29 +1307,26 @@ class RealArbitrageExecutor:
                 transaction = weth_contract.functions.withdraw(amount).build_transaction({
                     'from': self.wallet_account.address,
                     'gas': 150000,  # 🔧 FIXED: Increased gas limit for WETH withdrawal (was 50k, now 150k)
-                    'gasPrice': max(w3.eth.gas_price, w3.to_wei(0.1, 'gwei')),
-                    'nonce': self._get_next_nonce(chain)  # 🔧 FIXED: Use managed nonce
+                    'gasPrice': gas_price,
+                    'chainId': chain_id
                 })
             else:
                 return {'success': False, 'error': f'Invalid WETH conversion: {input_token} → {output_token}'}
 
             # Sign and send transaction
-            signed_txn = w3.eth.account.sign_transaction(transaction, private_key=self.wallet_account.key)
-
             logger.info(f"   📡 Sending WETH conversion transaction...")
             logger.info(f"   🔍 DEBUG WETH TRANSACTION SENDING:")
-            logger.info(f"      📝 Raw transaction length: {len(signed_txn.raw_transaction)} bytes")
             logger.info(f"      🌐 Web3 provider: {w3.provider}")
-            logger.info(f"      🔗 Network ID: {w3.eth.chain_id}")
+            logger.info(f"      🔗 Network ID: {chain_id}")
 
             try:
-                tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                tx_hash = await self._send_transaction(w3, chain, transaction)
                 tx_hash_hex = tx_hash.hex()
                 logger.info(f"   ✅ WETH conversion sent: {tx_hash_hex}")
 
                 # Verify transaction exists immediately
                 try:
-                    tx_details = w3.eth.get_transaction(tx_hash)
+                    tx_details = await self._run_blocking(w3.eth.get_transaction, tx_hash)
                     logger.info(f"   ✅ WETH transaction verified in mempool: {tx_details.get('hash', 'N/A')}")
                 except Exception as verify_error:
                     logger.error(f"   ⚠️  WETH transaction not found in mempool: {verify_error}")
@@ -1398,7 +1340,8 @@ class RealArbitrageExecutor:
             logger.info(f"   🔗 Arbiscan: https://arbiscan.io/tx/{tx_hash_hex}")
 
             try:
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+                receipt = await self._wait_for_receipt(w3, tx_hash, timeout=60)
+                self._record_receipt(chain, receipt, transaction)
 
                 if receipt.status == 1:
                     logger.info(f"   ✅ WETH CONVERSION CONFIRMED: {tx_hash_hex}")
@@ -1412,7 +1355,7 @@ class RealArbitrageExecutor:
                         'transaction_hash': tx_hash_hex,
                         'gas_used': receipt.gasUsed,
                         'gas_cost_eth': gas_cost_eth,
-                        'gas_cost_usd': gas_cost_eth * 3000.0,  # Convert to USD
+                        'gas_cost_usd': gas_cost_eth * self._eth_price_usd(),  # Convert to USD
                         'conversion_type': f'{input_token} → {output_token}',
                         'amount_converted': float(w3.from_wei(amount, 'ether')),
                         'output_amount': amount,  # 🔧 FIXED: Add output_amount for arbitrage executor
@@ -1429,7 +1372,7 @@ class RealArbitrageExecutor:
 
                 # Try to get transaction details for debugging
                 try:
-                    tx_details = w3.eth.get_transaction(tx_hash)
+                    tx_details = await self._run_blocking(w3.eth.get_transaction, tx_hash)
                     logger.error(f"   📊 Transaction details: {tx_details}")
                 except Exception as tx_error:
                     logger.error(f"   ❌ Could not get transaction details: {tx_error}")
@@ -1445,36 +1388,32 @@ class RealArbitrageExecutor:
         return {'success': False, 'error': 'Cross-chain arbitrage not implemented yet'}
 
     async def _ensure_token_approval(self, w3: Web3, chain: str, token_address: str,
-                                   router_address: str, amount: int) -> Dict[str, Any]:
-        """Ensure token is approved for trading on the router."""
+                                   router_address: str, amount: int,
+                                   wait_for_receipt: bool = True) -> Dict[str, Any]:
+        """Ensure token is approved for trading on the router.
+
+        Allowances come from the allowance manager, so a pair warmed at
+        startup costs no RPC call here. With wait_for_receipt=False an
+        approval is only broadcast and confirmed in the background. A
+        transaction sent next from this wallet gets the following nonce, so
+        the node orders it after the approval without waiting on a receipt.
+        """
         try:
-            logger.info(f"   🔐 Checking token approval for {token_address}")
+            router_address = w3.to_checksum_address(router_address)
 
-            # ERC20 ABI for approval functions
-            erc20_abi = [
-                {
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}, {"name": "_spender", "type": "address"}],
-                    "name": "allowance",
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "type": "function"
-                },
-                {
-                    "constant": False,
-                    "inputs": [{"name": "_spender", "type": "address"}, {"name": "_value", "type": "uint256"}],
-                    "name": "approve",
-                    "outputs": [{"name": "", "type": "bool"}],
-                    "type": "function"
-                }
-            ]
+            if self.allowance_manager.covers(chain, token_address, router_address, amount):
+                return {'success': True}
 
-            token_contract = w3.eth.contract(address=w3.to_checksum_address(token_address), abi=erc20_abi)
+            logger.info(f"   🔐 Checking token approval for {token_address}")
 
-            # Check current allowance
-            current_allowance = token_contract.functions.allowance(
-                self.wallet_account.address,
-                w3.to_checksum_address(router_address)
-            ).call()
+            current_allowance = self.allowance_manager.get(chain, token_address, router_address)
+            if current_allowance is None:
+                # Not warmed at startup: read it once, then it stays cached
+                token_contract = self.abi_registry.contract(w3, chain, token_address, 'erc20_approval')
+                current_allowance = await self._run_blocking(
+                    token_contract.functions.allowance(self.wallet_account.address, router_address).call
+                )
+                self.allowance_manager.set(chain, token_address, router_address, current_allowance)
 
             logger.info(f"   💰 Current allowance: {current_allowance}")
             logger.info(f"   🎯 Required amount: {amount}")
@@ -1484,30 +1423,21 @@ class RealArbitrageExecutor:
                 return {'success': True}
 
             # Need to approve - use MAX approval for efficiency
-            max_approval = 2**256 - 1  # Maximum uint256
             logger.info(f"   🔓 Approving MAX amount for future trades...")
-
-            # Build approval transaction
-            approval_tx = token_contract.functions.approve(
-                w3.to_checksum_address(router_address),
-                max_approval
-            ).build_transaction({
-                'from': self.wallet_account.address,
-                'gas': 100000,  # Standard approval gas
-                'gasPrice': w3.eth.gas_price,
-                'nonce': self._get_fresh_nonce(chain)  # 🔧 CRITICAL: Always use fresh nonce for approvals
-            })
-
-            # Sign and send approval - 🔧 CONSISTENCY FIX: Use same signing method as other transactions
-            signed_approval = w3.eth.account.sign_transaction(approval_tx, private_key=self.wallet_account.key)
-            approval_hash = w3.eth.send_raw_transaction(signed_approval.raw_transaction)
+            approval_hash = await self._send_approval(w3, chain, token_address, router_address)
 
             logger.info(f"   📝 Approval transaction sent: {approval_hash.hex()}")
 
-            # Wait for approval confirmation
-            approval_receipt = w3.eth.wait_for_transaction_receipt(approval_hash, timeout=30)
+            if not wait_for_receipt:
+                task = asyncio.ensure_future(
+                    self._confirm_approval(w3, chain, token_address, router_address, approval_hash)
+                )
+                self._approval_tasks.add(task)
+                task.add_done_callback(self._approval_tasks.discard)
+                return {'success': True, 'approval_tx_hash': approval_hash.hex(), 'pending': True}
 
-            if approval_receipt.status == 1:
+            # Wait for approval confirmation
+            if await self._confirm_approval(w3, chain, token_address, router_address, approval_hash):
                 logger.info(f"   ✅ Token approval successful!")
                 return {'success': True}
             else:
@@ -1517,6 +1447,100 @@ class RealArbitrageExecutor:
             logger.error(f"   ❌ Token approval error: {e}")
             return {'success': False, 'error': f'Token approval failed: {e}'}
 
+    async def _send_approval(self, w3: Web3, chain: str, token_address: str, router_address: str):
+        """Broadcast a MAX approval and record it with the allowance manager.
+
+        Returns:
+            The approval transaction hash.
+        """
+        gas_price, chain_id = await asyncio.gather(
+            self._run_blocking(lambda: w3.eth.gas_price),
+            self._run_blocking(lambda: w3.eth.chain_id)
+        )
+        approval_tx = {
+            'from': self.wallet_account.address,
+            'to': w3.to_checksum_address(token_address),
+            'value': 0,
+            'gas': 100000,  # Standard approval gas
+            'gasPrice': gas_price,
+            'chainId': chain_id,
+            'data': self.abi_registry.encode_call(
+                'erc20_approval', 'approve', [router_address, MAX_UINT256]
+            )
+        }
+
+        # 🔧 CONSISTENCY FIX: Use same signing method as other transactions
+        approval_hash = await self._send_transaction(w3, chain, approval_tx)
+        self.allowance_manager.approval_sent(chain, token_address, router_address, MAX_UINT256)
+        return approval_hash
+
+    async def _confirm_approval(self, w3: Web3, chain: str, token_address: str,
+                                router_address: str, approval_hash, timeout: float = 60) -> bool:
+        """Wait for an approval to be mined and settle the cached allowance."""
+        try:
+            receipt = await self._wait_for_receipt(w3, approval_hash, timeout=timeout)
+        except Exception as e:
+            logger.error(f"   ❌ Approval {approval_hash.hex()} not confirmed: {e}")
+            self.allowance_manager.approval_failed(chain, token_address, router_address)
+            return False
+
+        self._record_receipt(chain, receipt)
+        if receipt.status != 1:
+            self.allowance_manager.approval_failed(chain, token_address, router_address)
+            return False
+        return True
+
+    def _approval_pairs(self, chain: str) -> List[Tuple[str, str]]:
+        """Every (token, router) pair a trade on a chain may need approved.
+
+        Tokens default to all configured ERC20s; config 'approval_tokens'
+        narrows them to a list of symbols.
+        """
+        chain_tokens = self.token_addresses.get(chain, {})
+        symbols = self.config.get('approval_tokens') or [symbol for symbol in chain_tokens if symbol != 'ETH']
+        tokens = [chain_tokens[symbol] for symbol in symbols if symbol in chain_tokens]
+        routers = list(dict.fromkeys(self.dex_routers.get(chain, {}).values()))
+        return [(token, router) for token in tokens for router in routers]
+
+    async def warm_token_approvals(self, chains: Optional[List[str]] = None) -> Dict[str, int]:
+        """Read every configured allowance and approve the missing ones.
+
+        Allowances are read in bulk through Multicall3. Missing approvals are
+        broadcast back-to-back with local nonces and confirmed together, so
+        a chain pays one confirmation wait however many pairs it approves.
+
+        Args:
+            chains: Chains to warm; defaults to every connected chain.
+
+        Returns:
+            Number of approvals sent per chain.
+        """
+        async def warm_chain(chain: str) -> int:
+            w3 = self.web3_connections[chain]
+            pairs = self._approval_pairs(chain)
+            await self._run_blocking(self.allowance_manager.read_allowances, w3, chain, pairs)
+
+            missing = self.allowance_manager.missing(chain, pairs)
+            sent = []
+            for token_address, router_address in missing:
+                try:
+                    sent.append((token_address, router_address,
+                                 await self._send_approval(w3, chain, token_address, router_address)))
+                except Exception as e:
+                    logger.warning(f"   ⚠️  {chain}: approval of {token_address} for {router_address} failed: {e}")
+
+            confirmed = await asyncio.gather(*(
+                self._confirm_approval(w3, chain, token_address, router_address, tx_hash)
+                for token_address, router_address, tx_hash in sent
+            ))
+            logger.info(f"🔐 {chain}: {len(pairs)} allowances checked, "
+                        f"{sum(confirmed)}/{len(missing)} approvals confirmed")
+            return len(sent)
+
+        chains = [chain for chain in (chains or list(self.web3_connections)) if chain in self.web3_connections]
+        counts = await asyncio.gather(*(warm_chain(chain) for chain in chains))
+        return dict(zip(chains, counts))
+
     async def _build_token_to_eth_transaction(self, w3: Web3, dex: str, router_contract,
                                             token_address: str, amount: int, min_amount_out: int,
                                             deadline: int) -> Dict[str, Any]:
@@ -1531,21 +1555,32 @@ class RealArbitrageExecutor:
             path = [w3.to_checksum_address(token_address), w3.to_checksum_address(weth_address)]
 
             # Base transaction parameters
+            gas_price, chain_id = await asyncio.gather(
+                self._run_blocking(lambda: w3.eth.gas_price),
+                self._run_blocking(lambda: w3.eth.chain_id)
+            )
             base_tx_params = {
                 'from': self.wallet_account.address,
                 'gas': 300000,  # Higher gas for token swaps
-                'gasPrice': w3.eth.gas_price,
-                'nonce': self._get_next_nonce('arbitrum')
+                'gasPrice': gas_price,
+                'chainId': chain_id
             }
 
             # Use standard Uniswap V2 swapExactTokensForETH for most DEXes
-            transaction = router_contract.functions.swapExactTokensForETH(
-                amount,                           # amountIn
-                min_amount_out,                  # amountOutMin
-                path,                            # path
-                self.wallet_account.address,     # to
-                deadline                         # deadline
-            ).build_transaction(base_tx_params)
+            transaction = {
+                **base_tx_params,
+                'to': router_contract.address,
+                'value': 0,
+                'data': self.abi_registry.encode_call(
+                    self.abi_registry.abi_name_for_dex(dex), 'swapExactTokensForETH', [
+                        amount,                           # amountIn
+                        min_amount_out,                  # amountOutMin
+                        path,                            # path
+                        self.wallet_account.address,     # to
+                        deadline                         # deadline
+                    ]
+                )
+            }
 
             logger.info(f"   ✅ Token → ETH transaction built successfully")
             return {'success': True, 'transaction': transaction}
@@ -1562,7 +1597,12 @@ class RealArbitrageExecutor:
             logger.info(f"   🔧 Building {dex}-specific transaction...")
 
             # Get transaction base parameters with minimum gas price
-            network_gas_price = w3.eth.gas_price
+            # Chain id is filled in up front so build_transaction makes no RPC calls;
+            # the nonce is reserved when the transaction is sent
+            network_gas_price, chain_id = await asyncio.gather(
+                self._run_blocking(lambda: w3.eth.gas_price),
+                self._run_blocking(lambda: w3.eth.chain_id)
+            )
             min_gas_price = w3.to_wei(0.1, 'gwei')  # Minimum 0.1 gwei for Arbitrum
             gas_price = max(network_gas_price, min_gas_price)
 
@@ -1570,7 +1610,7 @@ class RealArbitrageExecutor:
                 'from': self.wallet_account.address,
                 'gas': 500000,  # Increased for complex DEXes
                 'gasPrice': gas_price,  # Use minimum gas price to ensure processing
-                'nonce': w3.eth.get_transaction_count(self.wallet_account.address)
+                'chainId': chain_id
             }
 
             # Route to DEX-specific function based on DEX type
@@ -1598,7 +1638,8 @@ class RealArbitrageExecutor:
                 # Default to Uniswap V2 style for other DEXes
                 return await self._build_uniswap_v2_transaction(
                     router_contract, input_token_address, output_token_address,
-                    amount, min_amount_out, deadline, base_tx_params
+                    amount, min_amount_out, deadline, base_tx_params,
+                    abi_name=self.abi_registry.abi_name_for_dex(dex)
                 )
 
         except Exception as e:
@@ -1683,7 +1724,8 @@ class RealArbitrageExecutor:
             # For now, fall back to V2 style until we implement the complex struct
             return await self._build_uniswap_v2_transaction(
                 router_contract, input_token_address, output_token_address,
-                amount, min_amount_out, deadline, base_tx_params
+                amount, min_amount_out, deadline, base_tx_params,
+                abi_name=self.abi_registry.abi_name_for_dex('zyberswap')
             )
 
         except Exception as e:
@@ -1691,8 +1733,13 @@ class RealArbitrageExecutor:
 
     async def _build_uniswap_v2_transaction(self, router_contract, input_token_address: str,
                                           output_token_address: str, amount: int, min_amount_out: int,
-                                          deadline: int, base_tx_params: Dict) -> Dict[str, Any]:
-        """Build standard Uniswap V2 style transaction."""
+                                          deadline: int, base_tx_params: Dict,
+                                          abi_name: str = 'uniswap_v2_router') -> Dict[str, Any]:
+        """Build standard Uniswap V2 style transaction.
+
+        Calldata is encoded from the ABI registry's precomputed selectors;
+        abi_name is the router's registered ABI.
+        """
         try:
             logger.info(f"   🦄 Building Uniswap V2 style swap...")
 
@@ -1706,17 +1753,20 @@ class RealArbitrageExecutor:
             else:
                 path = [input_token_address, output_token_address]  # Token → Token
 
+            swap_args = [
+                min_amount_out,   # amountOutMin
+                path,             # path (array of addresses)
+                self.wallet_account.address,  # to
+                deadline          # deadline
+            ]
+            base_transaction = {**base_tx_params, 'to': router_contract.address, 'value': amount}
+
             # Try standard swapExactETHForTokens first
             try:
-                transaction = router_contract.functions.swapExactETHForTokens(
-                    min_amount_out,   # amountOutMin
-                    path,             # path (array of addresses)
-                    self.wallet_account.address,  # to
-                    deadline          # deadline
-                ).build_transaction({
-                    **base_tx_params,
-                    'value': amount
-                })
+                transaction = {
+                    **base_transaction,
+                    'data': self.abi_registry.encode_call(abi_name, 'swapExactETHForTokens', swap_args)
+                }
 
                 logger.info(f"   ✅ Uniswap V2 transaction built successfully")
                 return {'success': True, 'transaction': transaction}
@@ -1725,15 +1775,12 @@ class RealArbitrageExecutor:
                 logger.info(f"   🔧 Standard function failed, trying fee-on-transfer version: {e}")
 
                 # Try fee-on-transfer version
-                transaction = router_contract.functions.swapExactETHForTokensSupportingFeeOnTransferTokens(
-                    min_amount_out,   # amountOutMin
-                    path,             # path (array of addresses)
-                    self.wallet_account.address,  # to
-                    deadline          # deadline
-                ).build_transaction({
-                    **base_tx_params,
-                    'value': amount
-                })
+                transaction = {
+                    **base_transaction,
+                    'data': self.abi_registry.encode_call(
+                        abi_name, 'swapExactETHForTokensSupportingFeeOnTransferTokens', swap_args
+                    )
+                }
 
                 logger.info(f"   ✅ Uniswap V2 fee-on-transfer transaction built successfully")
                 return {'success': True, 'transaction': transaction}
@@ -1745,35 +1792,19 @@ class RealArbitrageExecutor:
         """Cleanup executor resources."""
         try:
             logger.info("🧹 Cleaning up executor...")
+            if self.wallet_state:
+                await self.wallet_state.stop()
             self.web3_connections.clear()
             self.wallet_account = None
+            self.rpc_executor.shutdown(wait=False)
             logger.info("✅ Executor cleanup complete")
         except Exception as e:
             logger.error(f"Executor cleanup error: {e}")
     
     def load_dex_abi(self, dex_name):
         """Load the correct ABI for a specific DEX"""
-        dex_abi_mapping = {
-            'zyberswap': 'uniswap_v3_router',
-            'camelot': 'uniswap_v2_router', 
-            'sushiswap': 'uniswap_v2_router',
-            'ramses': 'uniswap_v2_router',
-            'solidly': 'uniswap_v2_router',
-            'woofi': 'woofi_router',
-            'dodo': 'dodo_fee_route_proxy',
-            'balancer': 'balancer_vault',
-        }
-        
-        abi_type = dex_abi_mapping.get(dex_name, 'uniswap_v2_router')
-        abi_path = Path(__file__).parent.parent / "abis" / f"{abi_type}_abi.json"
-        
-        try:
-            with open(abi_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.warning(f"Failed to load ABI for {dex_name}: {e}")
-            return None
-    
+        return self.abi_registry.dex_abi(dex_name)
+
     def get_swap_function_for_dex(self, dex_name):
         """Get the correct swap function name for a DEX"""
         function_mapping = {
@@ -1801,152 +1832,85 @@ class RealArbitrageExecutor:
         
         return balances
 
-    def _get_dex_abi(self, dex: str) -> List[Dict]:
-        """🚀 FIXED: Load actual DEX-specific ABI files instead of hardcoded ones!"""
-        try:
-            # Load the ABI mapping to get the correct ABI file for each DEX
-            abi_mapping_path = Path(__file__).parent.parent / "abis" / "dex_abi_mapping.json"
-            with open(abi_mapping_path, 'r') as f:
-                abi_mapping = json.load(f)
-
-            # Get the ABI type for this DEX
-            abi_type = abi_mapping.get(dex, 'uniswap_v2_router')  # Default fallback
-
-            # Load the actual ABI file
-            abi_path = Path(__file__).parent.parent / "abis" / f"{abi_type}_abi.json"
-
-            logger.info(f"   📋 Loading ABI for {dex}: {abi_type}")
-
-            with open(abi_path, 'r') as f:
-                abi = json.load(f)
-                logger.info(f"   ✅ Loaded {len(abi)} functions from {abi_type}_abi.json")
-                return abi
-
-        except Exception as e:
-            logger.warning(f"   ⚠️  Failed to load ABI for {dex}: {e}")
-            logger.warning(f"   🔄 Falling back to Uniswap V2 ABI")
-
-            # Fallback to basic Uniswap V2 ABI
-            return [
-                {
-                    "inputs": [
-                        {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-                        {"internalType": "address[]", "name": "path", "type": "address[]"},
-                        {"internalType": "address", "name": "to", "type": "address"},
-                        {"internalType": "uint256", "name": "deadline", "type": "uint256"}
-                    ],
-                    "name": "swapExactETHForTokens",
-                    "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-                    "stateMutability": "payable",
-                    "type": "function"
-                }
-            ]
-
-    def _should_use_cached_balance(self) -> bool:
-        """Check if we should use cached balance instead of querying blockchain."""
-        import time
-        current_time = time.time()
-        return (current_time - self.balance_cache_timestamp) < self.balance_cache_duration
-
-    def _get_cached_wallet_value(self) -> float:
-        """Get cached wallet value if available."""
-        return self.balance_cache.get('total_wallet_value_usd', 0.0)
-
-    def _get_cached_eth_balance(self, chain: str) -> float:
-        """Get cached ETH balance if available."""
-        return self.balance_cache.get(f'eth_balance_{chain}', 0.0)
-
-    def _update_balance_cache(self, total_wallet_value_usd: float, eth_balances: Dict[str, float] = None):
-        """Update the balance cache with new wallet value and ETH balances."""
-        import time
-        self.balance_cache['total_wallet_value_usd'] = total_wallet_value_usd
-
-        # Cache individual ETH balances for each chain
-        if eth_balances:
-            for chain, eth_balance in eth_balances.items():
-                self.balance_cache[f'eth_balance_{chain}'] = eth_balance
-
-        self.balance_cache_timestamp = time.time()
-        logger.info(f"🚀 BALANCE CACHE UPDATED: ${total_wallet_value_usd:.2f} (cached for {self.balance_cache_duration}s)")
-
-        if eth_balances:
-            for chain, balance in eth_balances.items():
-                logger.info(f"   💰 Cached {chain} ETH: {balance:.6f} ETH")
-
-    def _update_eth_balance_cache(self, chain: str, eth_balance: float):
-        """Update just the ETH balance cache for a specific chain."""
-        import time
-        self.balance_cache[f'eth_balance_{chain}'] = eth_balance
-        # Don't update the main timestamp, just this specific balance
-        logger.info(f"🚀 ETH BALANCE CACHED: {chain} = {eth_balance:.6f} ETH")
-
-    def _get_next_nonce(self, chain: str) -> int:
-        """Get the next nonce for a chain with robust error handling."""
-        import time
-        current_time = time.time()
-
-        try:
-            w3 = self.web3_connections[chain]
-
-            # 🔧 NONCE FIX: Always get fresh nonce from blockchain for critical transactions
-            # This prevents "nonce too low" errors from stale cache
-            fresh_nonce = w3.eth.get_transaction_count(self.wallet_account.address, 'pending')
+    def _eth_price_usd(self) -> float:
+        """ETH price used for USD sizing; tracked by the wallet state service."""
+        return self.wallet_state.eth_price_usd if self.wallet_state else 3000.0
 
-            # Check if this nonce is higher than our cached nonce (blockchain moved forward)
-            if chain in self.nonce_cache:
-                cached_nonce = self.nonce_cache[chain]
-                if fresh_nonce > cached_nonce:
-                    logger.info(f"   🔢 Blockchain nonce advanced: {cached_nonce} → {fresh_nonce}")
-                elif fresh_nonce < cached_nonce:
-                    logger.warning(f"   ⚠️ Blockchain nonce behind cache: {fresh_nonce} < {cached_nonce}, using cache")
-                    fresh_nonce = cached_nonce + 1
-
-            # Update cache with the nonce we're about to use
-            self.nonce_cache[chain] = fresh_nonce
-            self.nonce_cache_timestamp[chain] = current_time
-
-            logger.info(f"   🔢 Using nonce: {fresh_nonce} (fresh from blockchain)")
-            return fresh_nonce
-
-        except Exception as e:
-            logger.error(f"   ❌ Nonce fetch error: {e}")
-            # Fallback: use cached nonce + 1 if available
-            if chain in self.nonce_cache:
-                fallback_nonce = self.nonce_cache[chain] + 1
-                self.nonce_cache[chain] = fallback_nonce
-                logger.warning(f"   🔢 Using fallback nonce: {fallback_nonce}")
-                return fallback_nonce
-            else:
-                # Last resort: return 0 (will likely fail, but won't crash)
-                logger.error(f"   🚨 No nonce available for {chain}, using 0")
-                return 0
-
-    def _get_fresh_nonce(self, chain: str) -> int:
-        """Get a fresh nonce directly from blockchain, bypassing cache."""
-        try:
-            w3 = self.web3_connections[chain]
-
-            # 🔧 CRITICAL FIX: Always get the latest nonce for critical transactions
-            fresh_nonce = w3.eth.get_transaction_count(self.wallet_account.address, 'pending')
-
-            # Update cache with fresh nonce (increment for next use)
-            import time
-            self.nonce_cache[chain] = fresh_nonce
-            self.nonce_cache_timestamp[chain] = time.time()
-
-            logger.info(f"   🔢 FRESH nonce (bypassed cache): {fresh_nonce}")
-            return fresh_nonce
+    def _quote_eth_price(self) -> Optional[float]:
+        """USD price of 1 ETH from the SushiSwap WETH/USDC pool on Arbitrum. Blocking."""
+        w3 = self.web3_connections.get('arbitrum')
+        if w3 is None:
+            return None
+        tokens = self.token_addresses['arbitrum']
+        router = self.abi_registry.contract(w3, 'arbitrum', self.dex_routers['arbitrum']['sushiswap'], 'v2_quote')
+        amounts = router.functions.getAmountsOut(10**18, [tokens['WETH'], tokens['USDC']]).call()
+        return amounts[-1] / 10**6
+
+    async def _wallet_eth_wei(self, w3: Web3, chain: str) -> int:
+        """Native balance from the wallet snapshot, or one RPC read before it has loaded."""
+        snapshot = self.wallet_state.snapshot(chain) if self.wallet_state else None
+        if snapshot is not None:
+            return w3.to_wei(snapshot.eth_balance, 'ether')
+        return await self._run_blocking(w3.eth.get_balance, self.wallet_account.address)
+
+    def _record_receipt(self, chain: str, receipt, transaction: Optional[Dict[str, Any]] = None) -> None:
+        """Apply one of our mined transactions to the allowance and wallet state."""
+        self.allowance_manager.apply_receipt(chain, receipt)
+        if self.wallet_state:
+            self.wallet_state.apply_receipt(chain, receipt, transaction)
+
+    async def _run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking web3 call on the RPC executor.
+
+        Args:
+            func: Synchronous callable, e.g. w3.eth.get_balance.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            Whatever func returns; exceptions propagate to the caller.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.rpc_executor, functools.partial(func, *args, **kwargs))
+
+    async def _wait_for_receipt(self, w3: Web3, tx_hash, timeout: float) -> Any:
+        """Poll for a transaction receipt without holding an executor thread while waiting.
+
+        Raises:
+            TimeExhausted: If no receipt arrives within timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return await self._run_blocking(w3.eth.get_transaction_receipt, tx_hash)
+            except TransactionNotFound:
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeExhausted(f"Transaction {tx_hash.hex()} not mined after {timeout} seconds")
+            await asyncio.sleep(self.receipt_poll_interval)
+
+    def _fetch_pending_nonce(self, chain: str) -> int:
+        """Pending transaction count for the wallet; the nonce manager's only RPC call."""
+        w3 = self.web3_connections[chain]
+        return w3.eth.get_transaction_count(self.wallet_account.address, 'pending')
+
+    async def _send_transaction(self, w3: Web3, chain: str, transaction: Dict[str, Any]):
+        """Sign and broadcast a built transaction with a locally reserved nonce.
+
+        The nonce is reserved at the last moment and settled with the nonce
+        manager whatever the outcome, so consecutive transactions can be sent
+        back-to-back without a nonce lookup between them.
+
+        Returns:
+            The transaction hash. Signing and send errors propagate.
+        """
+        def sign_and_send(nonce: int):
+            transaction['nonce'] = nonce
+            logger.info(f"   🔢 Using nonce: {nonce}")
+            signed_txn = w3.eth.account.sign_transaction(transaction, private_key=self.wallet_account.key)
+            return w3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
-        except Exception as e:
-            logger.error(f"   ❌ Fresh nonce fetch error: {e}")
-            # Fallback to cached nonce if available
-            if chain in self.nonce_cache:
-                fallback_nonce = self.nonce_cache[chain] + 1
-                logger.warning(f"   🔢 Using fallback nonce: {fallback_nonce}")
-                return fallback_nonce
-            else:
-                logger.error(f"   🚨 No fallback nonce available for {chain}")
-                return 0
+        return await self._run_blocking(self.nonce_manager.submit, chain, sign_and_send)
 
     def _check_auto_shutdown(self, profit_usd: float) -> bool:
         """Check if auto-shutdown should be triggered based on failed transactions."""
@@ -10,9 +10,15 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
 import random
+import time
 from dataclasses import dataclass
 
+from .price_matrix import PriceMatrix
+from .triangular_engine import TriangularEngine
+from src.utils.trade_log import get_trade_log
+
 logger = logging.getLogger(__name__)
+scan_log = get_trade_log('scan')
 
 @dataclass
 class DEXPrice:
@@ -55,6 +61,23 @@ class MultiDEXAggregator:
             'avalanche': 'avalanche_rpc_url',
             'ethereum': 'ethereum_rpc_url'
         }
+
+        # Only the most profitable simple spreads are turned into opportunities
+        self.max_simple_opportunities = config.get('max_simple_opportunities', 200)
+        self.max_triangular_opportunities = config.get('max_triangular_opportunities', 200)
+
+        # Per-scan timing, in milliseconds
+        self.scan_stats = {
+            'scans': 0,
+            'last_fetch_ms': 0.0,
+            'last_matrix_ms': 0.0,
+            'last_triangular_ms': 0.0,
+            'last_total_ms': 0.0,
+            'avg_matrix_ms': 0.0,
+            'last_matrix_shape': (0, 0),
+            'last_spreads_passed': 0,
+            'last_spreads_emitted': 0,
+        }
         
         logger.info(f"🔥 Multi-DEX Aggregator initialized with {len(self.enabled_dexes)} DEXes")
 
@@ -99,15 +122,15 @@ class MultiDEXAggregator:
             'curve': {'enabled': True, 'ethereum_rpc_url': True},
         }
 
-    async def get_all_dex_prices(self) -> Dict[str, List[DEXPrice]]:
-        """Get prices from all enabled DEXes."""
+    async def get_all_dex_prices(self, chains: Optional[List[str]] = None) -> Dict[str, List[DEXPrice]]:
+        """Get prices from all enabled DEXes, optionally on the given chains only."""
         try:
             all_prices = {}
             
             # Create tasks for all DEXes
             tasks = []
             for dex_name, dex_config in self.enabled_dexes.items():
-                task = self._get_dex_prices(dex_name, dex_config)
+                task = self._get_dex_prices(dex_name, dex_config, chains)
                 tasks.append(task)
             
             # Execute all DEX queries concurrently
@@ -134,7 +157,8 @@ class MultiDEXAggregator:
             logger.error(f"Multi-DEX price fetch error: {e}")
             return {}
     
-    async def _get_dex_prices(self, dex_name: str, dex_config: Dict[str, Any]) -> List[DEXPrice]:
+    async def _get_dex_prices(self, dex_name: str, dex_config: Dict[str, Any],
+                              chains: Optional[List[str]] = None) -> List[DEXPrice]:
         """Get prices from a specific DEX."""
         try:
             prices = []
@@ -142,7 +166,7 @@ class MultiDEXAggregator:
             # Determine which chains this DEX supports
             supported_chains = []
             for chain, rpc_key in self.chain_mappings.items():
-                if rpc_key in dex_config:
+                if rpc_key in dex_config and (chains is None or chain in chains):
                     supported_chains.append(chain)
             
             if not supported_chains:
@@ -303,142 +327,144 @@ class MultiDEXAggregator:
             logger.error(f"Price fetch error for {token} on {dex_name}/{chain}: {e}")
             return 0
     
-    async def find_arbitrage_opportunities(self, min_profit_percentage: float = 0.01) -> List[Dict[str, Any]]:
-        """Find arbitrage opportunities across all DEXes."""
+    async def find_arbitrage_opportunities(self, min_profit_percentage: float = 0.01,
+                                           chains: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Find arbitrage opportunities across all DEXes.
+
+        Args:
+            min_profit_percentage: Minimum spread to report.
+            chains: Only price these chains (default: every configured chain).
+        """
         try:
             opportunities = []
+            scan_start = time.perf_counter()
             
             # Get all prices
-            all_prices = await self.get_all_dex_prices()
+            all_prices = await self.get_all_dex_prices(chains)
+            fetch_done = time.perf_counter()
             
             if not all_prices:
                 return []
             
-            # Group prices by token
-            token_prices = {}
-            for dex_name, dex_prices in all_prices.items():
-                for price_data in dex_prices:
-                    token = price_data.token
-                    if token not in token_prices:
-                        token_prices[token] = []
-                    token_prices[token].append(price_data)
-            
-            # Find simple arbitrage opportunities for each token
-            for token, prices in token_prices.items():
-                if len(prices) < 2:
-                    continue
-
-                # Sort by price
-                prices.sort(key=lambda x: x.price)
-
-                # Find profitable pairs
-                for i, low_price in enumerate(prices[:-1]):
-                    for high_price in prices[i+1:]:
-                        if low_price.price > 0 and high_price.price > 0:
-                            profit_pct = (high_price.price - low_price.price) / low_price.price * 100
-
-                            if profit_pct >= min_profit_percentage:
-                                opportunities.append({
-                                    'type': 'simple_arbitrage',
-                                    'token': token,
-                                    'buy_dex': low_price.dex_name,
-                                    'sell_dex': high_price.dex_name,
-                                    'source_chain': low_price.chain,  # Master system expects this
-                                    'target_chain': high_price.chain,  # Master system expects this
-                                    'buy_chain': low_price.chain,     # Keep for compatibility
-                                    'sell_chain': high_price.chain,   # Keep for compatibility
-                                    'buy_price': low_price.price,
-                                    'sell_price': high_price.price,
-                                    'source_price': low_price.price,  # Master system expects this
-                                    'target_price': high_price.price, # Master system expects this
-                                    'profit_percentage': profit_pct,
-                                    'direction': f"{low_price.dex_name}→{high_price.dex_name}",
-                                    'timestamp': datetime.now().isoformat(),
-                                    'source': 'multi_dex_aggregator'
-                                })
+            # Score every buy/sell venue pair for every token in one pass
+            matrix = PriceMatrix(
+                price_data for dex_prices in all_prices.values() for price_data in dex_prices
+            )
+            spreads, passed = matrix.top_spreads(min_profit_percentage, self.max_simple_opportunities)
+
+            timestamp = datetime.now().isoformat()
+            for token, buy_venue, sell_venue, profit_pct in spreads:
+                low_price = matrix.quote(token, buy_venue)
+                high_price = matrix.quote(token, sell_venue)
+                opportunities.append({
+                    'type': 'simple_arbitrage',
+                    'token': token,
+                    'buy_dex': low_price.dex_name,
+                    'sell_dex': high_price.dex_name,
+                    'source_chain': low_price.chain,  # Master system expects this
+                    'target_chain': high_price.chain,  # Master system expects this
+                    'buy_chain': low_price.chain,     # Keep for compatibility
+                    'sell_chain': high_price.chain,   # Keep for compatibility
+                    'buy_price': low_price.price,
+                    'sell_price': high_price.price,
+                    'source_price': low_price.price,  # Master system expects this
+                    'target_price': high_price.price, # Master system expects this
+                    'profit_percentage': profit_pct,
+                    'direction': f"{low_price.dex_name}→{high_price.dex_name}",
+                    'timestamp': timestamp,
+                    'source': 'multi_dex_aggregator'
+                })
+            matrix_done = time.perf_counter()
 
             # Find TRIANGULAR arbitrage opportunities (A→B→C→A)
-            triangular_opps = await self._find_triangular_arbitrage(all_prices, min_profit_percentage)
+            triangular_opps = await self._find_triangular_arbitrage(matrix, min_profit_percentage)
             opportunities.extend(triangular_opps)
             
             # Sort by profit potential
             opportunities.sort(key=lambda x: x['profit_percentage'], reverse=True)
 
+            self._record_scan_timing(
+                scan_start, fetch_done, matrix_done, time.perf_counter(),
+                matrix.shape, passed, len(spreads)
+            )
+
             # DEBUG: Show what we found
             if opportunities:
-                logger.info(f"🎯 Found {len(opportunities)} arbitrage opportunities!")
+                scan_log.info('opportunities_found', "🎯 Found %(count)d arbitrage opportunities!",
+                              count=len(opportunities))
                 for i, opp in enumerate(opportunities[:3]):  # Show top 3
-                    logger.info(f"   #{i+1}: {opp['token']} {opp['direction']} - {opp['profit_percentage']:.4f}% profit")
+                    scan_log.info('top_opportunity', "   #%(rank)d: %(token)s %(direction)s - %(profit_pct).4f%% profit",
+                                  rank=i + 1, token=opp['token'], direction=opp['direction'],
+                                  profit_pct=opp['profit_percentage'])
             else:
-                logger.info(f"❌ NO arbitrage opportunities found from {len(all_prices)} DEXes")
-                # DEBUG: Show some price examples
                 total_prices = sum(len(prices) for prices in all_prices.values())
-                logger.info(f"   📊 Total prices available: {total_prices}")
-                if all_prices:
-                    sample_dex = list(all_prices.keys())[0]
-                    sample_prices = all_prices[sample_dex][:3]
-                    for price in sample_prices:
-                        logger.info(f"   💰 Sample: {price.token} on {price.dex_name}/{price.chain} = ${price.price:.4f}")
+                scan_log.info('no_opportunities',
+                              "❌ NO arbitrage opportunities found from %(dexes)d DEXes (%(prices)d prices)",
+                              dexes=len(all_prices), prices=total_prices)
+                # DEBUG: Show some price examples
+                if all_prices and scan_log.isEnabledFor(logging.DEBUG):
+                    sample_dex = next(iter(all_prices))
+                    for price in all_prices[sample_dex][:3]:
+                        scan_log.debug('sample_price', "   💰 Sample: %(token)s on %(dex)s/%(chain)s = $%(price).4f",
+                                       token=price.token, dex=price.dex_name, chain=price.chain, price=price.price)
 
             return opportunities
             
         except Exception as e:
             logger.error(f"Arbitrage opportunity finding error: {e}")
             return []
+
+    def _record_scan_timing(self, scan_start: float, fetch_done: float, matrix_done: float,
+                            scan_done: float, matrix_shape: tuple, passed: int, emitted: int) -> None:
+        """Update per-scan timing stats from perf_counter checkpoints."""
+        stats = self.scan_stats
+        matrix_ms = (matrix_done - fetch_done) * 1000
+        stats['scans'] += 1
+        stats['last_fetch_ms'] = (fetch_done - scan_start) * 1000
+        stats['last_matrix_ms'] = matrix_ms
+        stats['last_triangular_ms'] = (scan_done - matrix_done) * 1000
+        stats['last_total_ms'] = (scan_done - scan_start) * 1000
+        stats['avg_matrix_ms'] += (matrix_ms - stats['avg_matrix_ms']) / stats['scans']
+        stats['last_matrix_shape'] = matrix_shape
+        stats['last_spreads_passed'] = passed
+        stats['last_spreads_emitted'] = emitted
+
+        logger.debug(
+            f"Scan timing: fetch {stats['last_fetch_ms']:.2f}ms, "
+            f"spread matrix {matrix_ms:.2f}ms ({matrix_shape[0]}x{matrix_shape[1]}, "
+            f"{passed} passed, {emitted} emitted), "
+            f"triangular {stats['last_triangular_ms']:.2f}ms"
+        )
     
-    async def _find_triangular_arbitrage(self, all_prices: Dict[str, List[DEXPrice]], min_profit_percentage: float) -> List[Dict[str, Any]]:
+    async def _find_triangular_arbitrage(self, matrix: PriceMatrix, min_profit_percentage: float) -> List[Dict[str, Any]]:
         """Find triangular arbitrage opportunities (A→B→C→A)."""
         try:
             triangular_opportunities = []
 
-            # Common triangular pairs
-            triangular_sets = [
-                ['ETH', 'USDC', 'WBTC'],    # ETH→USDC→WBTC→ETH
-                ['ETH', 'USDT', 'WBTC'],    # ETH→USDT→WBTC→ETH
-                ['USDC', 'USDT', 'ETH'],    # USDC→USDT→ETH→USDC
-                ['ETH', 'USDC', 'ARB'],     # ETH→USDC→ARB→ETH
-                ['ETH', 'USDC', 'OP'],      # ETH→USDC→OP→ETH
-                ['WBTC', 'USDC', 'ETH'],    # WBTC→USDC→ETH→WBTC
-                ['ETH', 'USDT', 'LINK'],    # ETH→USDT→LINK→ETH
-                ['USDC', 'WBTC', 'ARB'],    # USDC→WBTC→ARB→USDC
-            ]
-
-            # Check each triangular set
-            for token_set in triangular_sets:
-                token_a, token_b, token_c = token_set
-
-                # Get all prices for these tokens
-                prices_a = self._get_token_prices_from_all_dexes(all_prices, token_a)
-                prices_b = self._get_token_prices_from_all_dexes(all_prices, token_b)
-                prices_c = self._get_token_prices_from_all_dexes(all_prices, token_c)
-
-                if not (prices_a and prices_b and prices_c):
-                    continue
-
-                # Try all combinations of DEXes for the triangle
-                for price_a in prices_a:
-                    for price_b in prices_b:
-                        for price_c in prices_c:
-                            # Calculate triangular arbitrage profit
-                            profit_result = self._calculate_triangular_profit(
-                                price_a, price_b, price_c, token_a, token_b, token_c
-                            )
-
-                            if profit_result and profit_result['profit_percentage'] >= min_profit_percentage:
-                                triangular_opportunities.append({
-                                    'type': 'triangular_arbitrage',
-                                    'tokens': [token_a, token_b, token_c],
-                                    'path': f"{token_a}→{token_b}→{token_c}→{token_a}",
-                                    'dexes': [price_a.dex_name, price_b.dex_name, price_c.dex_name],
-                                    'chains': [price_a.chain, price_b.chain, price_c.chain],
-                                    'source_chain': price_a.chain,  # Start chain
-                                    'target_chain': price_a.chain,  # End chain (same as start)
-                                    'profit_percentage': profit_result['profit_percentage'],
-                                    'estimated_profit_usd': profit_result['estimated_profit_usd'],
-                                    'direction': f"{price_a.dex_name}→{price_b.dex_name}→{price_c.dex_name}",
-                                    'timestamp': datetime.now().isoformat(),
-                                    'source': 'triangular_arbitrage'
-                                })
+            # Triangles come from the pairs each DEX actually quotes on a chain
+            engine = TriangularEngine(matrix)
+            triangles = engine.find_triangles(min_profit_percentage, self.max_triangular_opportunities)
+
+            timestamp = datetime.now().isoformat()
+            for triangle in triangles:
+                token_a, token_b, token_c = triangle.tokens
+                dex_a, dex_b, dex_c = triangle.dexes
+                triangular_opportunities.append({
+                    'type': 'triangular_arbitrage',
+                    'token': token_a,  # Master system expects this
+                    'tokens': [token_a, token_b, token_c],
+                    'path': f"{token_a}→{token_b}→{token_c}→{token_a}",
+                    'dexes': [dex_a, dex_b, dex_c],
+                    'chains': [triangle.chain] * 3,
+                    'source_chain': triangle.chain,  # Start chain
+                    'target_chain': triangle.chain,  # End chain (same as start)
+                    'rates': list(triangle.rates),
+                    'profit_percentage': triangle.profit_percentage,
+                    'estimated_profit_usd': triangle.profit_percentage / 100 * triangle.start_price,
+                    'direction': f"{dex_a}→{dex_b}→{dex_c}",
+                    'timestamp': timestamp,
+                    'source': 'triangular_arbitrage'
+                })
 
             logger.info(f"🔺 Found {len(triangular_opportunities)} triangular arbitrage opportunities!")
             return triangular_opportunities
@@ -447,53 +473,6 @@ class MultiDEXAggregator:
             logger.error(f"Triangular arbitrage finding error: {e}")
             return []
 
-    def _get_token_prices_from_all_dexes(self, all_prices: Dict[str, List[DEXPrice]], token: str) -> List[DEXPrice]:
-        """Get all prices for a specific token across all DEXes."""
-        token_prices = []
-        for dex_prices in all_prices.values():
-            for price_data in dex_prices:
-                if price_data.token == token:
-                    token_prices.append(price_data)
-        return token_prices
-
-    def _calculate_triangular_profit(self, price_a: DEXPrice, price_b: DEXPrice, price_c: DEXPrice,
-                                   token_a: str, token_b: str, token_c: str) -> Dict[str, Any]:
-        """Calculate profit for triangular arbitrage A→B→C→A."""
-        try:
-            # Start with 1 unit of token A
-            start_amount = 1.0
-
-            # Step 1: A → B (sell A for B)
-            # If we have 1 ETH and ETH price is $2500, we get 2500 USDC
-            amount_b = start_amount * price_a.price
-
-            # Step 2: B → C (sell B for C)
-            # If we have 2500 USDC and USDC/WBTC rate gives us WBTC
-            # Price_b is USDC price, price_c is WBTC price
-            # We get: amount_b / price_c WBTC
-            amount_c = amount_b / price_c.price if price_c.price > 0 else 0
-
-            # Step 3: C → A (sell C for A)
-            # Convert WBTC back to ETH
-            final_amount_a = amount_c * (price_c.price / price_a.price) if price_a.price > 0 else 0
-
-            # Calculate profit
-            if final_amount_a > start_amount:
-                profit_percentage = ((final_amount_a - start_amount) / start_amount) * 100
-                estimated_profit_usd = (final_amount_a - start_amount) * price_a.price
-
-                return {
-                    'profit_percentage': profit_percentage,
-                    'estimated_profit_usd': estimated_profit_usd,
-                    'final_amount': final_amount_a
-                }
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Triangular profit calculation error: {e}")
-            return None
-
     def get_dex_stats(self) -> Dict[str, Any]:
         """Get DEX aggregator statistics."""
         return {
@@ -501,5 +480,6 @@ class MultiDEXAggregator:
             'enabled_dexes': len(self.enabled_dexes),
             'supported_chains': len(self.chain_mappings),
             'priority_tokens': len(self.priority_tokens),
-            'dex_list': list(self.enabled_dexes.keys())
+            'dex_list': list(self.enabled_dexes.keys()),
+            'scan_stats': dict(self.scan_stats)
         }
@@ -0,0 +1,102 @@
+"""In-memory price book keyed by (chain, token) with running best prices."""
+
+import logging
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBook:
+    """Latest quote per venue for one token on one chain.
+
+    The cheapest venue (best ask, where to buy) and the most expensive venue
+    (best bid, where to sell) are maintained as quotes arrive. An update
+    only rescans the venues when it worsens the quote currently holding
+    one of the two best slots.
+    """
+
+    __slots__ = ("quotes", "best_ask", "best_bid")
+
+    def __init__(self):
+        self.quotes: Dict[str, Any] = {}
+        self.best_ask: Optional[str] = None
+        self.best_bid: Optional[str] = None
+
+    def update(self, venue: str, quote: Any) -> None:
+        """Store a venue's latest quote and refresh the best prices.
+
+        Args:
+            venue: Venue (DEX) name.
+            quote: Object with a price attribute.
+        """
+        price = quote.price
+        ask_price = self.quotes[self.best_ask].price if self.best_ask is not None else None
+        bid_price = self.quotes[self.best_bid].price if self.best_bid is not None else None
+        self.quotes[venue] = quote
+
+        if ask_price is None or price <= ask_price:
+            self.best_ask = venue
+        elif venue == self.best_ask:
+            self.best_ask = min(self.quotes, key=lambda name: self.quotes[name].price)
+
+        if bid_price is None or price >= bid_price:
+            self.best_bid = venue
+        elif venue == self.best_bid:
+            self.best_bid = max(self.quotes, key=lambda name: self.quotes[name].price)
+
+    def remove(self, venue: str) -> None:
+        """Drop a venue's quote."""
+        if self.quotes.pop(venue, None) is None:
+            return
+        if not self.quotes:
+            self.best_ask = self.best_bid = None
+            return
+        if venue == self.best_ask:
+            self.best_ask = min(self.quotes, key=lambda name: self.quotes[name].price)
+        if venue == self.best_bid:
+            self.best_bid = max(self.quotes, key=lambda name: self.quotes[name].price)
+
+    def spread(self) -> Optional[Tuple[str, Any, str, Any]]:
+        """Best buy and sell quotes across different venues.
+
+        Returns:
+            (buy venue, buy quote, sell venue, sell quote), or None with
+            fewer than two venues.
+        """
+        if len(self.quotes) < 2 or self.best_ask == self.best_bid:
+            return None
+        return (
+            self.best_ask, self.quotes[self.best_ask],
+            self.best_bid, self.quotes[self.best_bid],
+        )
+
+
+class PriceBook:
+    """Token books keyed by (chain, token)."""
+
+    def __init__(self):
+        self.books: Dict[Tuple[str, str], TokenBook] = {}
+
+    def __len__(self) -> int:
+        """Total number of venue quotes held."""
+        return sum(len(book.quotes) for book in self.books.values())
+
+    def update(self, chain: str, token: str, venue: str, quote: Any) -> TokenBook:
+        """Store a quote and return the book it landed in."""
+        book = self.books.get((chain, token))
+        if book is None:
+            book = self.books[(chain, token)] = TokenBook()
+        book.update(venue, quote)
+        return book
+
+    def get(self, chain: str, token: str, venue: str) -> Optional[Any]:
+        """Latest quote for a token at a venue, or None."""
+        book = self.books.get((chain, token))
+        return book.quotes.get(venue) if book else None
+
+    def book(self, chain: str, token: str) -> Optional[TokenBook]:
+        """The book for a token on a chain, or None."""
+        return self.books.get((chain, token))
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[str, str], TokenBook]]:
+        return iter(self.books.items())
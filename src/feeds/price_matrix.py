@@ -0,0 +1,108 @@
+"""Token x venue price matrix for vectorized cross-DEX spread scans."""
+
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (token, buy venue index, sell venue index, profit percentage)
+Spread = Tuple[str, int, int, float]
+
+
+class PriceMatrix:
+    """Quotes laid out as a (token x venue) matrix.
+
+    A venue is a (dex_name, chain) pair. Missing quotes are NaN, so every
+    buy/sell combination for every token can be scored with one broadcast
+    instead of a nested loop per token.
+    """
+
+    def __init__(self, quotes: Iterable[Any]):
+        """Build the matrix.
+
+        Args:
+            quotes: Objects with token, dex_name, chain and price attributes
+                (e.g. DEXPrice). A later quote for the same token and venue
+                replaces an earlier one.
+        """
+        self.token_index: Dict[str, int] = {}
+        self.venue_index: Dict[Tuple[str, str], int] = {}
+        self.quotes: Dict[Tuple[int, int], Any] = {}
+
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        for quote in quotes:
+            if quote.price <= 0:
+                continue
+            row = self.token_index.setdefault(quote.token, len(self.token_index))
+            col = self.venue_index.setdefault((quote.dex_name, quote.chain), len(self.venue_index))
+            self.quotes[(row, col)] = quote
+            rows.append(row)
+            cols.append(col)
+            values.append(quote.price)
+
+        self.tokens = list(self.token_index)
+        self.venues = list(self.venue_index)
+        self.prices = np.full((len(self.tokens), len(self.venues)), np.nan)
+        self.prices[rows, cols] = values
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.prices.shape
+
+    def profit_matrix(self) -> np.ndarray:
+        """Profit percentage of buying at venue i and selling at venue j.
+
+        Returns:
+            (tokens x venues x venues) array, NaN where either quote is missing.
+        """
+        buy = self.prices[:, :, None]
+        sell = self.prices[:, None, :]
+        return (sell - buy) / buy * 100.0
+
+    def top_spreads(self, min_profit_percentage: float, top_k: int) -> Tuple[List[Spread], int]:
+        """Most profitable buy/sell venue combinations.
+
+        Each unordered venue pair is counted once in its profitable
+        direction; equal prices count once, buying at the lower venue index.
+
+        Args:
+            min_profit_percentage: Minimum spread, in percent.
+            top_k: Maximum number of spreads to return.
+
+        Returns:
+            (spreads sorted by profit descending, number that passed the mask)
+        """
+        if not self.prices.size or top_k <= 0:
+            return [], 0
+
+        profit = self.profit_matrix()
+        venue_count = len(self.venues)
+        lower = np.arange(venue_count)[:, None] < np.arange(venue_count)[None, :]
+        buy = self.prices[:, :, None]
+        sell = self.prices[:, None, :]
+        with np.errstate(invalid="ignore"):
+            mask = (profit >= min_profit_percentage) & ((sell > buy) | ((sell == buy) & lower))
+
+        flat = np.flatnonzero(mask)
+        survivors = flat.size
+        if survivors > top_k:
+            keep = np.argpartition(-profit.flat[flat], top_k - 1)[:top_k]
+            flat = flat[keep]
+        flat = flat[np.argsort(-profit.flat[flat], kind="stable")]
+
+        rows, buy_cols, sell_cols = np.unravel_index(flat, profit.shape)
+        spreads = [
+            (self.tokens[row], buy_col, sell_col, float(value))
+            for row, buy_col, sell_col, value in zip(
+                rows.tolist(), buy_cols.tolist(), sell_cols.tolist(), profit.flat[flat].tolist()
+            )
+        ]
+        return spreads, survivors
+
+    def quote(self, token: str, venue: int) -> Any:
+        """The original quote object for a token at a venue."""
+        return self.quotes[(self.token_index[token], venue)]
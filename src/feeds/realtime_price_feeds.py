@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import aiohttp
 
+from .price_book import PriceBook
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -31,7 +33,7 @@ class RealTimePriceFeeds:
     
     def __init__(self):
         self.active_feeds = {}
-        self.price_cache = {}
+        self.price_book = PriceBook()
         self.subscribers = []
         self.is_running = False
         
@@ -198,16 +200,11 @@ class RealTimePriceFeeds:
     async def _process_price_update(self, update: PriceUpdate):
         """Process a price update and detect arbitrage opportunities."""
         try:
-            # Update price cache
-            cache_key = f"{update.token}_{update.dex}_{update.chain}"
-            old_price = self.price_cache.get(cache_key, {}).get('price', 0)
+            # Update price book
+            previous = self.price_book.get(update.chain, update.token, update.dex)
+            old_price = previous.price if previous else 0
             
-            self.price_cache[cache_key] = {
-                'price': update.price,
-                'timestamp': update.timestamp,
-                'volume_24h': update.volume_24h,
-                'liquidity': update.liquidity
-            }
+            self.price_book.update(update.chain, update.token, update.dex, update)
             
             # Update stats
             self.stats['updates_received'] += 1
@@ -240,58 +237,39 @@ class RealTimePriceFeeds:
         try:
             opportunities = []
             
-            # Look for price differences across DEXes for the same token
-            token_prices = {}
-            for cache_key, price_data in self.price_cache.items():
-                parts = cache_key.split('_')
-                if len(parts) >= 3:
-                    token, dex, chain = parts[0], parts[1], parts[2]
-                    
-                    if token == update.token and chain == update.chain:
-                        token_prices[dex] = price_data['price']
+            # Compare the running best buy and sell prices for this token
+            book = self.price_book.book(update.chain, update.token)
+            spread = book.spread() if book else None
+            if spread is None:
+                return opportunities
             
-            # Find arbitrage opportunities
-            if len(token_prices) >= 2:
-                dex_prices = list(token_prices.items())
+            buy_dex, buy_quote, sell_dex, sell_quote = spread
+            buy_price, sell_price = buy_quote.price, sell_quote.price
+            
+            if buy_price > 0:
+                price_diff_pct = (sell_price - buy_price) / buy_price * 100
                 
-                for i in range(len(dex_prices)):
-                    for j in range(i + 1, len(dex_prices)):
-                        dex_a, price_a = dex_prices[i]
-                        dex_b, price_b = dex_prices[j]
-                        
-                        # Calculate price difference
-                        if price_a > 0 and price_b > 0:
-                            price_diff_pct = abs(price_a - price_b) / min(price_a, price_b) * 100
-                            
-                            if price_diff_pct > 0.1:  # Minimum 0.1% difference
-                                # Determine buy/sell DEXes
-                                if price_a < price_b:
-                                    buy_dex, sell_dex = dex_a, dex_b
-                                    buy_price, sell_price = price_a, price_b
-                                else:
-                                    buy_dex, sell_dex = dex_b, dex_a
-                                    buy_price, sell_price = price_b, price_a
-                                
-                                # Estimate profit
-                                estimated_profit_pct = (sell_price - buy_price) / buy_price * 100
-                                estimated_profit_usd = estimated_profit_pct * 100  # Assume $100 trade
-                                
-                                opportunity = {
-                                    'token': update.token,
-                                    'source_chain': update.chain,
-                                    'target_chain': update.chain,
-                                    'buy_dex': buy_dex,
-                                    'sell_dex': sell_dex,
-                                    'buy_price': buy_price,
-                                    'sell_price': sell_price,
-                                    'price_difference_pct': price_diff_pct,
-                                    'estimated_profit_pct': estimated_profit_pct,
-                                    'estimated_profit_usd': estimated_profit_usd,
-                                    'discovered_at': time.time(),
-                                    'source': 'realtime_feeds'
-                                }
-                                
-                                opportunities.append(opportunity)
+                if price_diff_pct > 0.1:  # Minimum 0.1% difference
+                    # Estimate profit
+                    estimated_profit_pct = price_diff_pct
+                    estimated_profit_usd = estimated_profit_pct * 100  # Assume $100 trade
+                    
+                    opportunity = {
+                        'token': update.token,
+                        'source_chain': update.chain,
+                        'target_chain': update.chain,
+                        'buy_dex': buy_dex,
+                        'sell_dex': sell_dex,
+                        'buy_price': buy_price,
+                        'sell_price': sell_price,
+                        'price_difference_pct': price_diff_pct,
+                        'estimated_profit_pct': estimated_profit_pct,
+                        'estimated_profit_usd': estimated_profit_usd,
+                        'discovered_at': time.time(),
+                        'source': 'realtime_feeds'
+                    }
+                    
+                    opportunities.append(opportunity)
             
             return opportunities
             
@@ -344,9 +322,8 @@ class RealTimePriceFeeds:
     
     def get_latest_price(self, token: str, dex: str, chain: str) -> Optional[float]:
         """Get the latest price for a token on a specific DEX."""
-        cache_key = f"{token}_{dex}_{chain}"
-        price_data = self.price_cache.get(cache_key)
-        return price_data['price'] if price_data else None
+        quote = self.price_book.get(chain, token, dex)
+        return quote.price if quote else None
     
     def get_stats(self) -> Dict[str, Any]:
         """Get feed performance statistics."""
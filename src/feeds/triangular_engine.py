@@ -0,0 +1,132 @@
+"""Triangular arbitrage search over per-venue pair quotes."""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .price_matrix import PriceMatrix
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Triangle:
+    """A profitable A→B→C→A route on one chain."""
+    chain: str
+    tokens: Tuple[str, str, str]
+    dexes: Tuple[str, str, str]
+    rates: Tuple[float, float, float]
+    profit_percentage: float
+    start_price: float
+
+
+@dataclass
+class _ChainIndex:
+    """Best pair quote per (token_in, token_out) on one chain."""
+    tokens: List[str]
+    dexes: List[str]
+    log_rate: np.ndarray    # [token_in, token_out] -> best log rate, -inf if no venue quotes both
+    venue: np.ndarray       # [token_in, token_out] -> column into dexes of the best rate
+    usd_price: np.ndarray   # [token, dex] -> quoted USD price, NaN if missing
+
+
+class TriangularEngine:
+    """Finds A→B→C→A routes from the pairs each venue actually quotes.
+
+    A venue quoting both A and B in USD implies the pair rate
+    price(A) / price(B). Pair quotes are indexed once per scan as the best
+    rate per (token_in, token_out) on each chain, and triangles are grown
+    from that pair graph. For each first leg A→B, the best possible second
+    and third legs bound the whole triangle, so first legs that cannot
+    clear the threshold are skipped before the closing legs are scored.
+    """
+
+    def __init__(self, matrix: PriceMatrix):
+        """Index pair quotes by chain.
+
+        Args:
+            matrix: Token x (dex, chain) price matrix for the current scan.
+        """
+        self.indexes: Dict[str, _ChainIndex] = {}
+
+        columns: Dict[str, List[int]] = {}
+        for column, (_, chain) in enumerate(matrix.venues):
+            columns.setdefault(chain, []).append(column)
+
+        for chain, chain_columns in columns.items():
+            prices = matrix.prices[:, chain_columns]
+            quoted = np.flatnonzero(np.isfinite(prices).sum(axis=1) > 0)
+            if quoted.size < 3:
+                continue
+            prices = prices[quoted]
+            log_price = np.log(prices)
+            # rate(in -> out) at a venue is price(in) / price(out)
+            pair_rates = log_price[:, None, :] - log_price[None, :, :]
+            pair_rates = np.where(np.isnan(pair_rates), -np.inf, pair_rates)
+            venue = pair_rates.argmax(axis=2)
+            log_rate = np.take_along_axis(pair_rates, venue[:, :, None], axis=2)[:, :, 0]
+            np.fill_diagonal(log_rate, -np.inf)
+            self.indexes[chain] = _ChainIndex(
+                tokens=[matrix.tokens[row] for row in quoted],
+                dexes=[matrix.venues[column][0] for column in chain_columns],
+                log_rate=log_rate,
+                venue=venue,
+                usd_price=prices,
+            )
+
+    def find_triangles(self, min_profit_percentage: float, top_k: int) -> List[Triangle]:
+        """Most profitable triangles across all chains.
+
+        Args:
+            min_profit_percentage: Minimum round-trip profit, in percent.
+            top_k: Maximum number of triangles to return.
+
+        Returns:
+            Triangles sorted by profit descending.
+        """
+        threshold = max(math.log1p(min_profit_percentage / 100.0), 1e-12)
+        candidates: List[Tuple[float, str, int, int, int]] = []
+
+        for chain, index in self.indexes.items():
+            log_rate = index.log_rate
+            best_out = log_rate.max(axis=1)
+            best_in = log_rate.max(axis=0)
+            token_count = len(index.tokens)
+
+            # Each triangle is visited once, from its lowest-index token
+            for a in range(token_count - 2):
+                later = np.arange(a + 1, token_count)
+                first = log_rate[a, later]
+                # Upper bound on any triangle that starts with leg a -> b
+                viable = later[first + best_out[later] + best_in[a] >= threshold]
+                if not viable.size:
+                    continue
+                scores = (
+                    log_rate[a, viable][:, None]
+                    + log_rate[np.ix_(viable, later)]
+                    + log_rate[later, a][None, :]
+                )
+                for row, column in zip(*np.nonzero(scores >= threshold)):
+                    b, c = int(viable[row]), int(later[column])
+                    if c != b:
+                        candidates.append((float(scores[row, column]), chain, a, b, c))
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return [self._describe(*candidate) for candidate in candidates[:top_k]]
+
+    def _describe(self, log_profit: float, chain: str, a: int, b: int, c: int) -> Triangle:
+        """Build the result for a triangle from its chain index positions."""
+        index = self.indexes[chain]
+        legs = ((a, b), (b, c), (c, a))
+        venues = [int(index.venue[leg]) for leg in legs]
+        return Triangle(
+            chain=chain,
+            tokens=(index.tokens[a], index.tokens[b], index.tokens[c]),
+            dexes=tuple(index.dexes[venue] for venue in venues),
+            rates=tuple(math.exp(index.log_rate[leg]) for leg in legs),
+            profit_percentage=math.expm1(log_profit) * 100.0,
+            start_price=float(index.usd_price[a, venues[0]]),
+        )
@@ -494,6 +494,45 @@ class ScalingController:
         except Exception as e:
             logger.error(f"Error initializing scaling rules: {e}")
 
+    def register_detection_shards(self, supervisor: Any, component: str = "detection_shards",
+                                  scale_out_utilization: float = 80.0,
+                                  scale_in_utilization: float = 30.0):
+        """Let SCALE_OUT/SCALE_IN decisions add or remove detection processes.
+
+        Args:
+            supervisor: Object with shard_count, utilization() (busiest shard,
+                percent) and scale_to(count), e.g. ShardedDetectionSupervisor.
+            component: Component name the policy and decisions are filed under.
+            scale_out_utilization: Utilization above which a process is added.
+            scale_in_utilization: Utilization below which a process is removed.
+        """
+        self.resource_managers[component] = supervisor
+        max_shards = len(getattr(getattr(supervisor, 'layout', None), 'chains', [])) or 16
+        policy = ComponentScalingPolicy(
+            component=component,
+            strategy=ScalingStrategy.REACTIVE,
+            target_cpu_utilization=(scale_out_utilization + scale_in_utilization) / 2
+        )
+        policy.scaling_rules = [ScalingRule(
+            rule_id=f"{component}_instances",
+            component=component,
+            trigger=ScalingTrigger.CPU_UTILIZATION,
+            resource_type=ResourceType.INSTANCES,
+            scale_up_threshold=scale_out_utilization,
+            scale_down_threshold=scale_in_utilization,
+            scale_up_action=ScalingAction.SCALE_OUT,
+            scale_down_action=ScalingAction.SCALE_IN,
+            scale_up_amount=1,
+            scale_down_amount=1,
+            min_value=1,
+            max_value=max_shards,
+            cooldown_minutes=2,
+            priority=9
+        )]
+        self.component_policies[component] = policy
+        self.component_metrics.setdefault(component, ScalingMetrics(component=component))
+        logger.info(f"🧩 {component}: scale-out now adds detection processes (1-{max_shards})")
+
     async def start_scaling_controller(self):
         """Start the scaling controller system."""
         if self.running:
@@ -807,6 +846,13 @@ class ScalingController:
                 new_target = target_value * change_amount
                 new_target = max(applicable_rule.min_value, min(applicable_rule.max_value, new_target))
                 change_percent = ((new_target - target_value) / target_value) * 100
+            elif action in [ScalingAction.SCALE_OUT, ScalingAction.SCALE_IN]:
+                # Instances move one step at a time
+                step = change_amount if action == ScalingAction.SCALE_OUT else -change_amount
+                new_target = max(applicable_rule.min_value, min(applicable_rule.max_value, target_value + step))
+                if new_target == target_value:
+                    return None
+                change_percent = ((new_target - target_value) / target_value) * 100
             else:
                 new_target = target_value
                 change_percent = 0.0
@@ -827,7 +873,7 @@ class ScalingController:
                 target_value=new_target,
                 change_amount=new_target - target_value,
                 change_percent=change_percent,
-                reason=f"{trigger.value} {current_value:.2f} vs threshold {applicable_rule.scale_up_threshold if action == ScalingAction.SCALE_UP else applicable_rule.scale_down_threshold}",
+                reason=f"{trigger.value} {current_value:.2f} vs threshold {applicable_rule.scale_up_threshold if action in (ScalingAction.SCALE_UP, ScalingAction.SCALE_OUT) else applicable_rule.scale_down_threshold}",
                 confidence=confidence,
                 expected_impact=f"{'Increase' if change_percent > 0 else 'Decrease'} {applicable_rule.resource_type.value} by {abs(change_percent):.1f}%"
             )
@@ -962,6 +1008,11 @@ class ScalingController:
             if not policy:
                 return None
 
+            # Registered managers report their own load
+            manager = self.resource_managers.get(component)
+            if manager is not None and trigger == ScalingTrigger.CPU_UTILIZATION and hasattr(manager, 'utilization'):
+                return manager.utilization()
+
             # Simulate getting current values
             if trigger == ScalingTrigger.CPU_UTILIZATION:
                 return policy.target_cpu_utilization + (time.time() % 20 - 10)
@@ -991,6 +1042,8 @@ class ScalingController:
                 return policy.current_network_allocation
             elif resource_type == ResourceType.STORAGE:
                 return policy.current_storage_allocation
+            elif resource_type == ResourceType.INSTANCES and component in self.resource_managers:
+                return float(self.resource_managers[component].shard_count)
             else:
                 return 1.0
 
@@ -1135,6 +1188,16 @@ class ScalingController:
                 old_value = policy.current_storage_allocation
                 policy.current_storage_allocation = decision.target_value
                 logger.info(f"Scaled {decision.component} Storage: {old_value:.2f} -> {decision.target_value:.2f}")
+            elif decision.resource_type == ResourceType.INSTANCES:
+                manager = self.resource_managers.get(decision.component)
+                if manager is None:
+                    return False
+                old_value = manager.shard_count
+                # Stopping and spawning processes blocks; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                if not await loop.run_in_executor(None, manager.scale_to, int(decision.target_value)):
+                    return False
+                logger.info(f"Scaled {decision.component} instances: {old_value} -> {manager.shard_count}")
 
             # Update decision status
             decision.executed = True
@@ -1146,9 +1209,9 @@ class ScalingController:
             if metrics:
                 metrics.total_scaling_decisions += 1
                 metrics.successful_scaling_decisions += 1
-                if decision.action == ScalingAction.SCALE_UP:
+                if decision.action in (ScalingAction.SCALE_UP, ScalingAction.SCALE_OUT):
                     metrics.scale_up_count += 1
-                elif decision.action == ScalingAction.SCALE_DOWN:
+                elif decision.action in (ScalingAction.SCALE_DOWN, ScalingAction.SCALE_IN):
                     metrics.scale_down_count += 1
 
             # Add to decision history
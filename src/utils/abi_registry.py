@@ -0,0 +1,221 @@
+"""Preloaded contract ABIs, selectors and cached Contract objects."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_abi import encode as abi_encode
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+
+DEFAULT_DEX_ABI = 'uniswap_v2_router'
+
+# Used when a DEX's ABI file is missing or unreadable
+FALLBACK_ROUTER_ABI = [
+    {
+        "inputs": [
+            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
+            {"internalType": "address[]", "name": "path", "type": "address[]"},
+            {"internalType": "address", "name": "to", "type": "address"},
+            {"internalType": "uint256", "name": "deadline", "type": "uint256"}
+        ],
+        "name": "swapExactETHForTokens",
+        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+# Token ABIs the executor builds transactions against
+ERC20_APPROVAL_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}, {"name": "_spender", "type": "address"}],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [{"name": "_spender", "type": "address"}, {"name": "_value", "type": "uint256"}],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    }
+]
+
+WETH_ABI = [
+    {
+        "constant": False,
+        "inputs": [],
+        "name": "deposit",
+        "outputs": [],
+        "payable": True,
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [{"name": "wad", "type": "uint256"}],
+        "name": "withdraw",
+        "outputs": [],
+        "payable": False,
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
+
+# Read-only Uniswap V2 router quote, used for on-chain price lookups
+V2_QUOTE_ABI = [
+    {
+        "inputs": [
+            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
+            {"internalType": "address[]", "name": "path", "type": "address[]"}
+        ],
+        "name": "getAmountsOut",
+        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+_registry: Optional["AbiRegistry"] = None
+
+
+def get_abi_registry() -> "AbiRegistry":
+    """Return the process-wide registry, loading src/abis on first use."""
+    global _registry
+    if _registry is None:
+        _registry = AbiRegistry()
+    return _registry
+
+
+def _canonical_type(param: Dict[str, Any]) -> str:
+    """ABI type string with tuples expanded, e.g. (address,bool)[]."""
+    kind = param['type']
+    if kind.startswith('tuple'):
+        return '(' + ','.join(_canonical_type(c) for c in param['components']) + ')' + kind[5:]
+    return kind
+
+
+def _signature(item: Dict[str, Any]) -> str:
+    """Canonical signature such as swap(uint256,address[])."""
+    return f"{item['name']}({','.join(_canonical_type(p) for p in item.get('inputs', []))})"
+
+
+class AbiRegistry:
+    """Every ABI under src/abis, parsed once, plus Contract objects per router.
+
+    ABIs are keyed by file name without the "_abi.json" suffix, e.g.
+    "uniswap_v2_router". Function selectors and event topics are computed at
+    load time. Contract objects are cached per (chain, address, ABI) and
+    rebuilt only if the chain's Web3 connection changes.
+    """
+
+    def __init__(self, abi_dir: Path = ABI_DIR):
+        """Load and index every ABI file.
+
+        Args:
+            abi_dir: Directory holding *_abi.json files and dex_abi_mapping.json.
+        """
+        self.abi_dir = Path(abi_dir)
+        self.abis: Dict[str, List[Dict[str, Any]]] = {}
+        self.dex_abis: Dict[str, str] = {}
+        self.selectors: Dict[str, Dict[str, str]] = {}   # abi name -> signature -> 0x selector
+        self.topics: Dict[str, Dict[str, str]] = {}      # abi name -> signature -> 0x topic
+        self.functions_by_selector: Dict[str, str] = {}  # 0x selector -> signature
+        self._encoders: Dict[Tuple[str, str], Tuple[bytes, List[str]]] = {}  # (abi, function) -> selector, input types
+        self._contracts: Dict[Tuple[str, str, str], Tuple[Web3, Any]] = {}
+
+        self.stats = {
+            'contracts_built': 0,
+            'contract_hits': 0,
+        }
+
+        for path in sorted(self.abi_dir.glob("*_abi.json")):
+            try:
+                self.register(path.name[:-len("_abi.json")], json.loads(path.read_text()))
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to load ABI {path.name}: {e}")
+
+        try:
+            self.dex_abis = json.loads((self.abi_dir / "dex_abi_mapping.json").read_text())
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to load DEX ABI mapping: {e}")
+
+        self.register('fallback_router', FALLBACK_ROUTER_ABI)
+        self.register('erc20_approval', ERC20_APPROVAL_ABI)
+        self.register('weth', WETH_ABI)
+        self.register('v2_quote', V2_QUOTE_ABI)
+
+        logger.info(f"📋 ABI registry loaded {len(self.abis)} ABIs, {len(self.functions_by_selector)} selectors")
+
+    def register(self, name: str, abi: List[Dict[str, Any]]) -> None:
+        """Add an ABI and index its selectors and topics."""
+        self.abis[name] = abi
+        selectors = self.selectors[name] = {}
+        topics = self.topics[name] = {}
+        for item in abi:
+            if item.get('type') == 'function':
+                signature = _signature(item)
+                selector_bytes = function_abi_to_4byte_selector(item)
+                selector = '0x' + selector_bytes.hex()
+                selectors[signature] = selector
+                self.functions_by_selector.setdefault(selector, signature)
+                self._encoders.setdefault(
+                    (name, item['name']),
+                    (selector_bytes, [_canonical_type(p) for p in item.get('inputs', [])])
+                )
+            elif item.get('type') == 'event':
+                topics[_signature(item)] = '0x' + event_abi_to_log_topic(item).hex()
+
+    def abi_name_for_dex(self, dex: str) -> str:
+        """ABI name used for a DEX's router, with the fallback if it is not loaded."""
+        name = self.dex_abis.get(dex, DEFAULT_DEX_ABI)
+        return name if name in self.abis else 'fallback_router'
+
+    def dex_abi(self, dex: str) -> List[Dict[str, Any]]:
+        """Router ABI for a DEX."""
+        return self.abis[self.abi_name_for_dex(dex)]
+
+    def selector(self, abi_name: str, signature: str) -> str:
+        """Precomputed 0x selector for a function signature in an ABI."""
+        return self.selectors[abi_name][signature]
+
+    def encode_call(self, abi_name: str, function_name: str, args: List[Any]) -> str:
+        """Calldata for a function call using the precomputed selector and types.
+
+        Raises:
+            KeyError: If the ABI has no function with that name.
+        """
+        selector, types = self._encoders[(abi_name, function_name)]
+        return '0x' + (selector + abi_encode(types, args)).hex()
+
+    def contract(self, w3: Web3, chain: str, address: str, abi_name: str):
+        """Cached Contract for an address on a chain.
+
+        Args:
+            w3: The chain's current Web3 connection.
+            chain: Chain name.
+            address: Contract address.
+            abi_name: Registered ABI name.
+        """
+        key = (chain, address.lower(), abi_name)
+        cached = self._contracts.get(key)
+        if cached is not None and cached[0] is w3:
+            self.stats['contract_hits'] += 1
+            return cached[1]
+
+        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=self.abis[abi_name])
+        self._contracts[key] = (w3, contract)
+        self.stats['contracts_built'] += 1
+        return contract
+
+    def router_contract(self, w3: Web3, chain: str, address: str, dex: str):
+        """Cached router Contract for a DEX."""
+        return self.contract(w3, chain, address, self.abi_name_for_dex(dex))
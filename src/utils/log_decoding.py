@@ -0,0 +1,22 @@
+"""Helpers for reading raw event logs from web3 and JSON-RPC."""
+
+from typing import Any
+
+from hexbytes import HexBytes
+
+# Transfer(address indexed from, address indexed to, uint256 value)
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+
+def hex_str(value: Any) -> str:
+    """Lowercase 0x hex for bytes, HexBytes or hex strings.
+
+    web3 returns topics and hashes as HexBytes while raw JSON-RPC returns
+    strings; normalizing both lets them be compared with the topic constants.
+    """
+    return '0x' + HexBytes(value).hex().removeprefix('0x')
+
+
+def topic_address(topic: Any) -> str:
+    """Lowercase 0x address held in the low 20 bytes of an indexed topic."""
+    return '0x' + hex_str(topic)[-40:]
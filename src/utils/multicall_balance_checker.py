@@ -1,21 +1,79 @@
 """
 Multicall Balance Checker
-Ultra-fast token balance checking using direct Web3 multicall.
+Ultra-fast token balance checking using Multicall3 aggregate3.
 """
 
 import logging
 import asyncio
 import concurrent.futures
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Optional, Tuple
 from web3 import Web3
 
 logger = logging.getLogger(__name__)
 
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [{
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"}
+            ],
+            "name": "calls",
+            "type": "tuple[]"
+        }],
+        "name": "aggregate3",
+        "outputs": [{
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"}
+            ],
+            "name": "returnData",
+            "type": "tuple[]"
+        }],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# ERC20 / Multicall3 function selectors
+BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')
+DECIMALS_SELECTOR = bytes.fromhex('313ce567')
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex('4d2301cc')
+
+ERC20_BALANCE_ABI = [{
+    "constant": True,
+    "inputs": [{"name": "_owner", "type": "address"}],
+    "name": "balanceOf",
+    "outputs": [{"name": "balance", "type": "uint256"}],
+    "type": "function"
+}]
+
 class MulticallBalanceChecker:
     """Ultra-fast balance checking using multicall batching."""
     
-    def __init__(self, web3_connections: Dict[str, Web3]):
+    def __init__(self, web3_connections: Dict[str, Web3], multicall_address: str = MULTICALL3_ADDRESS,
+                 max_calls_per_batch: int = 500):
         self.web3_connections = web3_connections
+
+        # Multicall3 settings; large token lists are split into several aggregate3 calls
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+        self.max_calls_per_batch = max_calls_per_batch
+        self.multicall_contracts = {}
+
+        # Token decimals read on-chain, keyed by (chain, token name)
+        self.token_decimals: Dict[Tuple[str, str], int] = {}
         
         # Token addresses for multicall
         self.token_addresses = {
@@ -46,113 +104,27 @@ class MulticallBalanceChecker:
         logger.info("🚀 Multicall Balance Checker initialized")
     
     async def get_all_token_balances_fast(self, wallet_address: str, chain: str = 'arbitrum') -> Dict[str, Any]:
-        """Get all token balances using multicall - 6x faster than individual calls."""
+        """Get all token balances, native ETH included, in a single aggregate3 eth_call."""
         try:
             logger.info("🚀 MULTICALL: Getting all token balances in single call")
-            start_time = logger.info.__globals__.get('time', __import__('time')).time()
+            start_time = time.time()
             
             if chain not in self.web3_connections:
                 raise ValueError(f"No Web3 connection for {chain}")
             
-            w3 = self.web3_connections[chain]
             tokens = self.token_addresses.get(chain, {})
             
             if not tokens:
                 raise ValueError(f"No token addresses configured for {chain}")
             
-            # 🚀 DIRECT WEB3 MULTICALL: Use simple parallel execution instead of external library
-            token_names = []
-            token_addresses_list = []
-
-            for token_name, token_address in tokens.items():
-                if token_name == 'ETH':
-                    continue  # Handle ETH separately (native balance)
-
-                token_names.append(token_name)
-                token_addresses_list.append(token_address)
-
-            # Execute parallel balance calls - 🔧 SIMPLE FIX: Direct Web3 calls
-            logger.info(f"   📡 Executing parallel balance calls for {len(token_names)} tokens...")
-
-            def get_token_balance(token_address: str) -> int:
-                """Get single token balance."""
-                try:
-                    # ERC20 balanceOf ABI
-                    erc20_abi = [{
-                        "constant": True,
-                        "inputs": [{"name": "_owner", "type": "address"}],
-                        "name": "balanceOf",
-                        "outputs": [{"name": "balance", "type": "uint256"}],
-                        "type": "function"
-                    }]
-
-                    contract = w3.eth.contract(address=w3.to_checksum_address(token_address), abi=erc20_abi)
-                    return contract.functions.balanceOf(wallet_address).call()
-                except Exception as e:
-                    logger.warning(f"Failed to get balance for {token_address}: {e}")
-                    return 0
-
-            # Execute all balance calls in parallel
-            loop = asyncio.get_event_loop()
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                balance_futures = [
-                    loop.run_in_executor(executor, get_token_balance, addr)
-                    for addr in token_addresses_list
-                ]
-                balance_results = await asyncio.gather(*balance_futures)
-
-            # Create results dictionary
-            multicall_results = {}
-            for i, token_name in enumerate(token_names):
-                multicall_results[token_name] = balance_results[i]
-            
-            # Get ETH balance separately (native balance)
-            eth_balance_wei = w3.eth.get_balance(wallet_address)
-            
-            # Process results
-            balances = {
-                'ETH': {
-                    'balance_wei': eth_balance_wei,
-                    'balance_eth': float(w3.from_wei(eth_balance_wei, 'ether')),
-                    'balance_usd': float(w3.from_wei(eth_balance_wei, 'ether')) * self.eth_price_usd
-                }
-            }
-            
-            # Process multicall results
-            for token_name in token_names:
-                if token_name in multicall_results:
-                    balance_wei = multicall_results[token_name]
-                    
-                    if token_name in ['WETH']:
-                        # WETH has 18 decimals
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens * self.eth_price_usd
-                    elif token_name in ['USDC', 'USDC.e', 'USDT']:
-                        # Stablecoins have 6 decimals
-                        balance_tokens = balance_wei / 1e6
-                        balance_usd = balance_tokens  # 1:1 with USD
-                    elif token_name in ['DAI']:
-                        # DAI has 18 decimals
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens  # 1:1 with USD
-                    else:
-                        # Other tokens (ARB, GMX, LINK, UNI) - assume 18 decimals, estimate USD value
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens * 1.0  # Placeholder price
-                    
-                    balances[token_name] = {
-                        'balance_wei': balance_wei,
-                        'balance_tokens': balance_tokens,
-                        'balance_usd': balance_usd
-                    }
+            balances, rpc_calls = await self._read_balances(wallet_address, chain, list(tokens))
             
             # Calculate total wallet value
             total_usd = sum(token_data['balance_usd'] for token_data in balances.values())
             
-            end_time = logger.info.__globals__.get('time', __import__('time')).time()
-            execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
-            logger.info(f"🚀 MULTICALL COMPLETE: {len(balances)} tokens in {execution_time:.0f}ms")
+            logger.info(f"🚀 MULTICALL COMPLETE: {len(balances)} tokens in {execution_time:.0f}ms ({rpc_calls} RPC calls)")
             logger.info(f"   💰 Total wallet value: ${total_usd:.2f}")
             
             return {
@@ -161,6 +133,7 @@ class MulticallBalanceChecker:
                 'total_usd': total_usd,
                 'execution_time_ms': execution_time,
                 'tokens_checked': len(balances),
+                'rpc_calls': rpc_calls,
                 'method': 'multicall'
             }
             
@@ -181,95 +154,16 @@ class MulticallBalanceChecker:
             if chain not in self.web3_connections:
                 raise ValueError(f"No Web3 connection for {chain}")
             
-            w3 = self.web3_connections[chain]
             tokens = self.token_addresses.get(chain, {})
             
-            # 🚀 DIRECT WEB3 PARALLEL CALLS: Simple and compatible
             token_names = []
-            token_addresses_list = []
-
             for token_name in token_list:
                 if token_name not in tokens:
                     logger.warning(f"⚠️ Token {token_name} not configured for {chain}")
                     continue
-
-                if token_name == 'ETH':
-                    continue  # Handle ETH separately
-
-                token_address = tokens[token_name]
                 token_names.append(token_name)
-                token_addresses_list.append(token_address)
-
-            # Execute parallel balance calls
-            if token_addresses_list:
-                def get_token_balance(token_address: str) -> int:
-                    """Get single token balance."""
-                    try:
-                        # ERC20 balanceOf ABI
-                        erc20_abi = [{
-                            "constant": True,
-                            "inputs": [{"name": "_owner", "type": "address"}],
-                            "name": "balanceOf",
-                            "outputs": [{"name": "balance", "type": "uint256"}],
-                            "type": "function"
-                        }]
-
-                        contract = w3.eth.contract(address=w3.to_checksum_address(token_address), abi=erc20_abi)
-                        return contract.functions.balanceOf(wallet_address).call()
-                    except Exception as e:
-                        logger.warning(f"Failed to get balance for {token_address}: {e}")
-                        return 0
-
-                # Execute all balance calls in parallel
-                loop = asyncio.get_event_loop()
-                with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                    balance_futures = [
-                        loop.run_in_executor(executor, get_token_balance, addr)
-                        for addr in token_addresses_list
-                    ]
-                    balance_results = await asyncio.gather(*balance_futures)
-
-                # Create results dictionary
-                multicall_results = {}
-                for i, token_name in enumerate(token_names):
-                    multicall_results[token_name] = balance_results[i]
-            else:
-                multicall_results = {}
-            
-            # Get ETH balance if requested
-            balances = {}
-            if 'ETH' in token_list:
-                eth_balance_wei = w3.eth.get_balance(wallet_address)
-                balances['ETH'] = {
-                    'balance_wei': eth_balance_wei,
-                    'balance_eth': float(w3.from_wei(eth_balance_wei, 'ether')),
-                    'balance_usd': float(w3.from_wei(eth_balance_wei, 'ether')) * self.eth_price_usd
-                }
             
-            # Process multicall results
-            for token_name in token_names:
-                if token_name in multicall_results:
-                    balance_wei = multicall_results[token_name]
-                    
-                    # Convert based on token type
-                    if token_name in ['WETH']:
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens * self.eth_price_usd
-                    elif token_name in ['USDC', 'USDC.e', 'USDT']:
-                        balance_tokens = balance_wei / 1e6
-                        balance_usd = balance_tokens
-                    elif token_name in ['DAI']:
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens
-                    else:
-                        balance_tokens = float(w3.from_wei(balance_wei, 'ether'))
-                        balance_usd = balance_tokens * 1.0
-                    
-                    balances[token_name] = {
-                        'balance_wei': balance_wei,
-                        'balance_tokens': balance_tokens,
-                        'balance_usd': balance_usd
-                    }
+            balances, rpc_calls = await self._read_balances(wallet_address, chain, token_names)
             
             total_usd = sum(token_data['balance_usd'] for token_data in balances.values())
             
@@ -280,6 +174,7 @@ class MulticallBalanceChecker:
                 'balances': balances,
                 'total_usd': total_usd,
                 'tokens_checked': len(balances),
+                'rpc_calls': rpc_calls,
                 'method': 'targeted_multicall'
             }
             
@@ -290,6 +185,161 @@ class MulticallBalanceChecker:
                 'error': str(e),
                 'method': 'targeted_multicall'
             }
+
+    async def _read_balances(self, wallet_address: str, chain: str,
+                             token_names: List[str]) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Read native and token balances through Multicall3.
+
+        Falls back to one eth_call per token if the aggregate3 call fails,
+        e.g. on a chain without Multicall3.
+
+        Returns:
+            (balances keyed by token name, number of RPC calls made)
+        """
+        w3 = self.web3_connections[chain]
+        tokens = self.token_addresses.get(chain, {})
+        wallet_address = w3.to_checksum_address(wallet_address)
+
+        include_eth = 'ETH' in token_names
+        erc20_names = [name for name in token_names if name != 'ETH']
+        erc20_addresses = [w3.to_checksum_address(tokens[name]) for name in erc20_names]
+
+        loop = asyncio.get_running_loop()
+        try:
+            eth_balance_wei, token_balances, token_decimals, rpc_calls = await loop.run_in_executor(
+                None, self._read_balances_multicall, w3, chain, wallet_address,
+                include_eth, erc20_names, erc20_addresses
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Multicall3 unavailable on {chain} ({e}), using individual calls")
+            eth_balance_wei, token_balances = await self._read_balances_threaded(
+                w3, wallet_address, include_eth, erc20_addresses
+            )
+            token_decimals = [self.token_decimals.get((chain, name)) for name in erc20_names]
+            rpc_calls = len(erc20_addresses) + int(include_eth)
+
+        balances = {}
+        if include_eth:
+            balances['ETH'] = {
+                'balance_wei': eth_balance_wei,
+                'balance_eth': float(w3.from_wei(eth_balance_wei, 'ether')),
+                'balance_usd': float(w3.from_wei(eth_balance_wei, 'ether')) * self.eth_price_usd
+            }
+
+        for token_name, balance_wei, decimals in zip(erc20_names, token_balances, token_decimals):
+            if balance_wei is None:
+                continue
+            balance_tokens, balance_usd = self._token_value(token_name, balance_wei, decimals)
+            balances[token_name] = {
+                'balance_wei': balance_wei,
+                'balance_tokens': balance_tokens,
+                'balance_usd': balance_usd
+            }
+
+        return balances, rpc_calls
+
+    def _read_balances_multicall(self, w3: Web3, chain: str, wallet_address: str, include_eth: bool,
+                                 token_names: List[str], token_addresses: List[str]
+                                 ) -> Tuple[int, List[Optional[int]], List[Optional[int]], int]:
+        """Encode every read into aggregate3 calls and decode the results in bulk.
+
+        decimals() is only read for tokens whose decimals are not cached yet.
+
+        Returns:
+            (native balance, token balances, token decimals, aggregate3 calls made);
+            a token whose balanceOf failed has a balance of None.
+        """
+        owner_word = bytes(12) + bytes.fromhex(wallet_address[2:])
+        balance_call = BALANCE_OF_SELECTOR + owner_word
+
+        calls = []
+        if include_eth:
+            calls.append((self.multicall_address, True, GET_ETH_BALANCE_SELECTOR + owner_word))
+        calls.extend((address, True, balance_call) for address in token_addresses)
+        missing_decimals = [
+            index for index, name in enumerate(token_names)
+            if (chain, name) not in self.token_decimals
+        ]
+        calls.extend((token_addresses[index], True, DECIMALS_SELECTOR) for index in missing_decimals)
+
+        contract = self._get_multicall_contract(w3, chain)
+        results = []
+        rpc_calls = 0
+        for offset in range(0, len(calls), self.max_calls_per_batch):
+            chunk = calls[offset:offset + self.max_calls_per_batch]
+            results.extend(contract.functions.aggregate3(chunk).call())
+            rpc_calls += 1
+
+        # Every read returns a single 32-byte word
+        words = [
+            int.from_bytes(return_data[:32], 'big') if success and len(return_data) >= 32 else None
+            for success, return_data in results
+        ]
+
+        eth_balance_wei = 0
+        if include_eth:
+            if words[0] is None:
+                raise ValueError("getEthBalance failed inside aggregate3")
+            eth_balance_wei = words[0]
+            words = words[1:]
+
+        token_balances = words[:len(token_addresses)]
+        for index, decimals in zip(missing_decimals, words[len(token_addresses):]):
+            if decimals is not None:
+                self.token_decimals[(chain, token_names[index])] = decimals
+
+        token_decimals = [self.token_decimals.get((chain, name)) for name in token_names]
+        return eth_balance_wei, token_balances, token_decimals, rpc_calls
+
+    async def _read_balances_threaded(self, w3: Web3, wallet_address: str, include_eth: bool,
+                                      token_addresses: List[str]) -> Tuple[int, List[Optional[int]]]:
+        """One balanceOf eth_call per token on a thread pool (pre-Multicall3 path)."""
+
+        def get_token_balance(token_address: str) -> Optional[int]:
+            """Get single token balance."""
+            try:
+                contract = w3.eth.contract(address=token_address, abi=ERC20_BALANCE_ABI)
+                return contract.functions.balanceOf(wallet_address).call()
+            except Exception as e:
+                logger.warning(f"Failed to get balance for {token_address}: {e}")
+                return None
+
+        # Execute all balance calls in parallel
+        loop = asyncio.get_running_loop()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            balance_futures = [
+                loop.run_in_executor(executor, get_token_balance, address)
+                for address in token_addresses
+            ]
+            token_balances = await asyncio.gather(*balance_futures)
+
+        # Get ETH balance separately (native balance)
+        eth_balance_wei = w3.eth.get_balance(wallet_address) if include_eth else 0
+        return eth_balance_wei, list(token_balances)
+
+    def _get_multicall_contract(self, w3: Web3, chain: str):
+        """Cached Multicall3 contract object for a chain."""
+        contract = self.multicall_contracts.get(chain)
+        if contract is None:
+            contract = w3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+            self.multicall_contracts[chain] = contract
+        return contract
+
+    def _token_value(self, token_name: str, balance_wei: int, decimals: Optional[int]) -> Tuple[float, float]:
+        """Convert a raw balance to (token amount, USD value)."""
+        if decimals is None:
+            # Stablecoins have 6 decimals, everything else 18
+            decimals = 6 if token_name in ['USDC', 'USDC.e', 'USDT'] else 18
+        balance_tokens = balance_wei / 10 ** decimals
+
+        if token_name in ['WETH']:
+            balance_usd = balance_tokens * self.eth_price_usd
+        elif token_name in ['USDC', 'USDC.e', 'USDT', 'DAI']:
+            balance_usd = balance_tokens  # 1:1 with USD
+        else:
+            # Other tokens (ARB, GMX, LINK, UNI) - estimate USD value
+            balance_usd = balance_tokens * 1.0  # Placeholder price
+        return balance_tokens, balance_usd
     
     def update_eth_price(self, new_price: float):
         """Update ETH price for USD calculations."""
@@ -0,0 +1,305 @@
+"""
+Trade Path Logging
+==================
+
+Structured, sampled and non-blocking logging for the scan → filter → execute
+hot path.
+
+Call sites log an event name, a %-style template and keyword fields:
+
+    filter_log = get_trade_log('filter')
+    filter_log.info('rejected', "FILTERED OUT: %(token)s", token=token)
+
+Nothing is formatted at the call site. The fields ride on the LogRecord and
+the template is only rendered by a handler that prints text. Each category
+has its own sampling and rate limit, checked before a record is built.
+Records dropped by a limit are counted, and the next record that gets
+through carries the count as `suppressed`.
+
+Until start_trade_logging() is called, trade records propagate to the root
+logger like any other log line. Once it is called, they go through a
+bounded queue to a background QueueListener, so the event loop never waits
+on console or disk I/O. They are written to an optional compact JSONL sink
+and, if wanted, to the existing console handlers.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+TRADE_LOGGER = 'trade'
+
+
+@dataclass
+class CategoryLimit:
+    """Sampling and rate limit for one log category."""
+    sample_every: int = 1                    # keep one record in N
+    max_per_second: Optional[float] = None   # token-bucket rate, None for unlimited
+    burst: Optional[float] = None            # bucket size (default: one second's worth)
+
+
+DEFAULT_LIMITS: Dict[str, CategoryLimit] = {
+    'scan': CategoryLimit(max_per_second=20),
+    'filter': CategoryLimit(max_per_second=50),
+    'execution': CategoryLimit(),
+}
+
+
+class _CategoryGate:
+    """Decides, before any formatting, whether a category's record is kept."""
+
+    def __init__(self, limit: CategoryLimit):
+        self._lock = threading.Lock()
+        self.configure(limit)
+        self.emitted = 0
+        self.dropped = 0
+
+    def configure(self, limit: CategoryLimit) -> None:
+        with self._lock:
+            self.limit = limit
+            self._seen = 0
+            self._pending_suppressed = 0
+            self._capacity = limit.burst or limit.max_per_second or 0.0
+            self._tokens = self._capacity
+            self._refilled = time.monotonic()
+
+    def admit(self) -> Optional[int]:
+        """None if the record is dropped, else records suppressed since the last one kept."""
+        with self._lock:
+            limit = self.limit
+            self._seen += 1
+            keep = limit.sample_every <= 1 or self._seen % limit.sample_every == 1
+            if keep and limit.max_per_second is not None:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._refilled) * limit.max_per_second)
+                self._refilled = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                else:
+                    keep = False
+            if not keep:
+                self.dropped += 1
+                self._pending_suppressed += 1
+                return None
+            self.emitted += 1
+            suppressed, self._pending_suppressed = self._pending_suppressed, 0
+            return suppressed
+
+
+_gates: Dict[str, _CategoryGate] = {}
+_trade_logs: Dict[str, 'TradeLog'] = {}
+_registry_lock = threading.Lock()
+
+
+def _gate(category: str) -> _CategoryGate:
+    with _registry_lock:
+        gate = _gates.get(category)
+        if gate is None:
+            gate = _gates[category] = _CategoryGate(DEFAULT_LIMITS.get(category, CategoryLimit()))
+        return gate
+
+
+def configure_limits(limits: Dict[str, CategoryLimit]) -> None:
+    """Replace the sampling/rate limits of the given categories."""
+    for category, limit in limits.items():
+        _gate(category).configure(limit)
+
+
+class TradeLog:
+    """Category logger whose records are structured and lazily formatted."""
+
+    def __init__(self, category: str):
+        self.category = category
+        self.logger = logging.getLogger(f"{TRADE_LOGGER}.{category}")
+        self.gate = _gate(category)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, event: str, msg: str, **fields: Any) -> bool:
+        """Log one event.
+
+        Args:
+            level: logging level.
+            event: Short machine-readable event name.
+            msg: %-style template over the fields, e.g. "%(token)s".
+            **fields: Structured values; keep them plain (str, int, float, bool).
+
+        Returns:
+            True if the record was emitted.
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+        suppressed = self.gate.admit()
+        if suppressed is None:
+            return False
+        if suppressed:
+            fields['suppressed'] = suppressed
+        # A lone mapping argument becomes record.args, so msg % fields happens in the handler
+        args = (fields,) if fields else ()
+        self.logger.log(level, msg, *args,
+                        extra={'category': self.category, 'event': event, 'fields': fields},
+                        stacklevel=2)
+        return True
+
+    def debug(self, event: str, msg: str, **fields: Any) -> bool:
+        return self.log(logging.DEBUG, event, msg, **fields)
+
+    def info(self, event: str, msg: str, **fields: Any) -> bool:
+        return self.log(logging.INFO, event, msg, **fields)
+
+    def warning(self, event: str, msg: str, **fields: Any) -> bool:
+        return self.log(logging.WARNING, event, msg, **fields)
+
+
+def get_trade_log(category: str) -> TradeLog:
+    """The shared TradeLog for a category."""
+    with _registry_lock:
+        trade_log = _trade_logs.get(category)
+    if trade_log is None:
+        trade_log = TradeLog(category)
+        with _registry_lock:
+            trade_log = _trade_logs.setdefault(category, trade_log)
+    return trade_log
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that neither formats nor blocks on the calling thread.
+
+    The stock prepare() renders the message before enqueueing, which is the
+    cost we want off the hot path. Records only cross threads here, so they
+    can be queued as-is. A full queue drops the record instead of waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _TradeQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room instead of raising when the queue is full."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class JsonlSink(logging.Handler):
+    """Writes one compact JSON object per record: time, level, category, event and fields."""
+
+    def __init__(self, path: str, flush_every: int = 256):
+        super().__init__()
+        self.path = path
+        self.flush_every = flush_every
+        self.written = 0
+        self._stream = open(path, 'a', encoding='utf-8', buffering=1 << 16)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = {
+                'ts': round(record.created, 6),
+                'level': record.levelname,
+                'cat': getattr(record, 'category', record.name),
+                'event': getattr(record, 'event', None),
+            }
+            fields = getattr(record, 'fields', None)
+            if fields is not None:
+                entry.update(fields)
+            else:
+                entry['msg'] = record.getMessage()
+            self._stream.write(json.dumps(entry, separators=(',', ':'), default=str) + '\n')
+            self.written += 1
+            if self.written % self.flush_every == 0:
+                self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        if self._stream and not self._stream.closed:
+            self._stream.flush()
+
+    def close(self) -> None:
+        try:
+            if self._stream and not self._stream.closed:
+                self._stream.flush()
+                self._stream.close()
+        finally:
+            super().close()
+
+
+class TradeLogPipeline:
+    """Routes the trade loggers through a queue to a background writer."""
+
+    def __init__(self, jsonl_path: Optional[str] = None, console: bool = True,
+                 level: int = logging.INFO, queue_size: int = 10000):
+        """Initialize the pipeline.
+
+        Args:
+            jsonl_path: File for the JSONL sink, or None for no file.
+            console: Also render records to the root logger's handlers.
+            level: Lowest level recorded for the trade categories.
+            queue_size: Records buffered before new ones are dropped.
+        """
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = LazyQueueHandler(self.queue)
+        self.sink = JsonlSink(jsonl_path) if jsonl_path else None
+        self.level = level
+        handlers: List[logging.Handler] = [self.sink] if self.sink else []
+        if console:
+            handlers.extend(logging.getLogger().handlers)
+        self.listener = _TradeQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.logger = logging.getLogger(TRADE_LOGGER)
+        self._previous = (self.logger.level, self.logger.propagate)
+
+    def start(self) -> 'TradeLogPipeline':
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(self.level)
+        self.logger.propagate = False
+        self.listener.start()
+        return self
+
+    def stop(self) -> None:
+        """Drain the queue, stop the writer thread and restore normal propagation."""
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self._previous[0])
+        self.logger.propagate = self._previous[1]
+        self.listener.stop()
+        if self.sink:
+            self.sink.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': self.queue.qsize(),
+            'queue_full_drops': self.handler.dropped,
+            'written': self.sink.written if self.sink else 0,
+            'categories': get_category_stats(),
+        }
+
+
+def start_trade_logging(jsonl_path: Optional[str] = None, console: bool = True,
+                        level: int = logging.INFO,
+                        limits: Optional[Dict[str, CategoryLimit]] = None) -> TradeLogPipeline:
+    """Start the background writer for trade records; call stop() on the result at shutdown."""
+    if limits:
+        configure_limits(limits)
+    return TradeLogPipeline(jsonl_path, console, level).start()
+
+
+def get_category_stats() -> Dict[str, Dict[str, int]]:
+    """Records emitted and dropped by sampling/rate limits, per category."""
+    with _registry_lock:
+        gates = dict(_gates)
+    return {category: {'emitted': gate.emitted, 'dropped': gate.dropped} for category, gate in gates.items()}
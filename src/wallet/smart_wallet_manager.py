@@ -85,10 +85,20 @@ class SmartWalletManager:
             logger.warning(f"⚠️ Multicall initialization failed: {e}")
             self.multicall_checker = None
 
+    def _wallet_snapshot(self, chain: str):
+        """The executor's wallet state snapshot for a chain, if it is running."""
+        wallet_state = getattr(self.executor, 'wallet_state', None)
+        return wallet_state.snapshot(chain) if wallet_state else None
+
+    def _eth_price_usd(self) -> float:
+        """ETH price tracked by the executor's wallet state, or a conservative default."""
+        wallet_state = getattr(self.executor, 'wallet_state', None)
+        return wallet_state.eth_price_usd if wallet_state else 3000.0
+
     async def ensure_sufficient_eth_for_trade(self, required_eth_amount: float, chain: str = 'arbitrum') -> Dict[str, Any]:
         """🎯 CORE JUST-IN-TIME CONVERSION: Ensure sufficient ETH for arbitrage trade."""
         try:
-            logger.info(f"🔍 SMART BALANCER: Checking ETH requirement for ${required_eth_amount * 3000:.2f} trade")
+            logger.info(f"🔍 SMART BALANCER: Checking ETH requirement for ${required_eth_amount * self._eth_price_usd():.2f} trade")
 
             if not self.jit_conversion_enabled:
                 logger.info("⚠️  Just-in-time conversion disabled")
@@ -100,8 +110,8 @@ class SmartWalletManager:
                 return {'success': False, 'error': 'Could not get wallet balances'}
 
             current_eth_usd = balances.get('ETH', 0)
-            current_eth = current_eth_usd / 3000.0  # Convert USD to ETH
-            required_eth_usd = required_eth_amount * 3000.0
+            current_eth = current_eth_usd / self._eth_price_usd()  # Convert USD to ETH
+            required_eth_usd = required_eth_amount * self._eth_price_usd()
 
             logger.info(f"   💰 Current ETH: {current_eth:.6f} ETH (${current_eth_usd:.2f})")
             logger.info(f"   🎯 Required ETH: {required_eth_amount:.6f} ETH (${required_eth_usd:.2f})")
@@ -121,7 +131,7 @@ class SmartWalletManager:
 
             # Calculate shortage
             shortage_eth = total_eth_needed - current_eth
-            shortage_usd = shortage_eth * 3000.0
+            shortage_usd = shortage_eth * self._eth_price_usd()
 
             logger.info(f"   🚨 ETH shortage: {shortage_eth:.6f} ETH (${shortage_usd:.2f})")
 
@@ -245,7 +255,7 @@ class SmartWalletManager:
             logger.info(f"   🔥 EXECUTING REAL DEX CONVERSION via SushiSwap...")
 
             # Calculate conversion parameters
-            eth_expected = (amount_usd / 3000.0) * (1 - self.conversion_slippage)
+            eth_expected = (amount_usd / self._eth_price_usd()) * (1 - self.conversion_slippage)
             gas_cost_eth = 0.002
 
             logger.info(f"   💱 Conversion rate: ${amount_usd:.2f} {from_token} → {eth_expected:.6f} ETH")
@@ -271,7 +281,7 @@ class SmartWalletManager:
 
             # Get updated balance from blockchain
             updated_balances = await self.get_real_wallet_balances(chain)
-            new_eth_balance = updated_balances.get('ETH', 0) / 3000.0
+            new_eth_balance = updated_balances.get('ETH', 0) / self._eth_price_usd()
 
             logger.info(f"   📊 Updated ETH balance: {new_eth_balance:.6f} ETH")
 
@@ -361,8 +371,14 @@ class SmartWalletManager:
                     'error': f'Insufficient {from_token} balance: have {actual_balance} raw units, cannot trade safely'
                 }
 
-            # Check current allowance
-            current_allowance = token_contract.functions.allowance(self.wallet_account.address, sushiswap_router).call()
+            # Check current allowance - 🔐 from the executor's allowance cache when it covers the trade
+            allowances = getattr(self.executor, 'allowance_manager', None)
+            if allowances is not None and allowances.covers(chain, token_address, sushiswap_router, token_amount):
+                current_allowance = allowances.get(chain, token_address, sushiswap_router)
+            else:
+                current_allowance = token_contract.functions.allowance(self.wallet_account.address, sushiswap_router).call()
+                if allowances is not None:
+                    allowances.set(chain, token_address, sushiswap_router, current_allowance)
             logger.info(f"   🔍 DEBUG APPROVAL:")
             logger.info(f"      🏦 Router: {sushiswap_router}")
             logger.info(f"      📝 Current allowance: {current_allowance}")
@@ -377,33 +393,29 @@ class SmartWalletManager:
                 logger.info(f"   💡 Using MAX approval: {max_approval}")
 
                 # Build approval transaction
-                # 🔧 FIXED: Use executor's nonce management if available
-                nonce = (self.executor._get_next_nonce(chain) if self.executor and hasattr(self.executor, '_get_next_nonce')
-                        else w3.eth.get_transaction_count(self.wallet_account.address))
-
                 approve_tx = token_contract.functions.approve(sushiswap_router, max_approval).build_transaction({
                     'from': self.wallet_account.address,
                     'gas': 100000,
-                    'gasPrice': w3.eth.gas_price,
-                    'nonce': nonce
+                    'gasPrice': w3.eth.gas_price
                 })
 
                 # Sign and send approval
-                signed_approve = w3.eth.account.sign_transaction(approve_tx, self.wallet_account.key)
-                approve_hash = w3.eth.send_raw_transaction(signed_approve.raw_transaction)
+                approve_hash = self._sign_and_send(w3, chain, approve_tx)
                 logger.info(f"   ✅ Approval tx: {approve_hash.hex()}")
 
                 # Wait for approval confirmation
                 approve_receipt = w3.eth.wait_for_transaction_receipt(approve_hash, timeout=60)
                 if approve_receipt.status != 1:
                     return {'success': False, 'error': 'Token approval failed'}
+                if allowances is not None:
+                    allowances.apply_receipt(chain, approve_receipt)
 
                 logger.info(f"   ✅ Token approval confirmed with MAX allowance!")
             else:
                 logger.info(f"   ✅ Sufficient allowance already exists")
 
             # Calculate minimum ETH out (with slippage)
-            eth_expected = (amount_usd / 3000.0) * (1 - self.conversion_slippage)
+            eth_expected = (amount_usd / self._eth_price_usd()) * (1 - self.conversion_slippage)
             min_eth_out = w3.to_wei(eth_expected * 0.95, 'ether')  # 5% additional slippage protection
 
             # SushiSwap router ABI (minimal)
@@ -490,10 +502,6 @@ class SmartWalletManager:
             min_gas_price = w3.to_wei(0.1, 'gwei')  # Minimum 0.1 gwei for Arbitrum
             gas_price = max(network_gas_price, min_gas_price)
 
-            # 🔧 FIXED: Use executor's nonce management if available
-            nonce = (self.executor._get_next_nonce(chain) if self.executor and hasattr(self.executor, '_get_next_nonce')
-                    else w3.eth.get_transaction_count(self.wallet_account.address))
-
             transaction = router_contract.functions.swapExactTokensForETH(
                 token_amount,
                 min_eth_out,
@@ -503,13 +511,11 @@ class SmartWalletManager:
             ).build_transaction({
                 'from': self.wallet_account.address,
                 'gas': gas_limit,
-                'gasPrice': gas_price,  # Use minimum gas price to ensure processing
-                'nonce': nonce
+                'gasPrice': gas_price  # Use minimum gas price to ensure processing
             })
 
             # Sign and send transaction
-            signed_txn = w3.eth.account.sign_transaction(transaction, self.wallet_account.key)
-            tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            tx_hash = self._sign_and_send(w3, chain, transaction)
 
             logger.info(f"   🔗 REAL transaction sent: {tx_hash.hex()}")
 
@@ -518,6 +524,8 @@ class SmartWalletManager:
 
             if receipt.status == 1:
                 logger.info(f"   ✅ Transaction confirmed! Block: {receipt.blockNumber}")
+                if allowances is not None:
+                    allowances.apply_receipt(chain, receipt)
 
                 return {
                     'success': True,
@@ -545,7 +553,7 @@ class SmartWalletManager:
             weth_address = token_addresses.get('WETH', '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1')
 
             # Convert USD to WETH amount (WETH = ETH price)
-            eth_amount = amount_usd / 3000.0  # Conservative ETH price
+            eth_amount = amount_usd / self._eth_price_usd()
             weth_amount_wei = w3.to_wei(eth_amount, 'ether')
 
             # WETH contract ABI (minimal - just withdraw)
@@ -568,20 +576,14 @@ class SmartWalletManager:
             )
 
             # Build withdrawal transaction
-            # 🔧 FIXED: Use executor's nonce management if available
-            nonce = (self.executor._get_next_nonce(chain) if self.executor and hasattr(self.executor, '_get_next_nonce')
-                    else w3.eth.get_transaction_count(self.wallet_account.address))
-
             transaction = weth_contract.functions.withdraw(weth_amount_wei).build_transaction({
                 'from': self.wallet_account.address,
                 'gas': 150000,  # Sufficient gas for WETH withdrawal
-                'gasPrice': max(w3.eth.gas_price, w3.to_wei(0.1, 'gwei')),
-                'nonce': nonce
+                'gasPrice': max(w3.eth.gas_price, w3.to_wei(0.1, 'gwei'))
             })
 
             # Sign and send transaction
-            signed_txn = w3.eth.account.sign_transaction(transaction, self.wallet_account.key)
-            tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            tx_hash = self._sign_and_send(w3, chain, transaction)
 
             logger.info(f"   🔗 WETH withdrawal sent: {tx_hash.hex()}")
 
@@ -607,6 +609,22 @@ class SmartWalletManager:
             logger.error(f"WETH withdrawal error: {e}")
             return {'success': False, 'error': str(e)}
 
+    def _sign_and_send(self, w3: Web3, chain: str, transaction: Dict[str, Any]):
+        """Sign and broadcast a built transaction, returning its hash.
+
+        The nonce comes from the executor's nonce manager when one is shared,
+        so conversions and trades on the same wallet never collide.
+        """
+        def sign_and_send(nonce: int):
+            transaction['nonce'] = nonce
+            signed_txn = w3.eth.account.sign_transaction(transaction, self.wallet_account.key)
+            return w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+
+        nonce_manager = getattr(self.executor, 'nonce_manager', None)
+        if nonce_manager is not None:
+            return nonce_manager.submit(chain, sign_and_send)
+        return sign_and_send(w3.eth.get_transaction_count(self.wallet_account.address))
+
     async def get_smart_balance_status(self, chain: str = 'arbitrum') -> Dict[str, Any]:
         """Get comprehensive smart balance status for monitoring."""
         try:
@@ -616,7 +634,7 @@ class SmartWalletManager:
 
             total_value = sum(balances.values())
             eth_balance_usd = balances.get('ETH', 0)
-            eth_balance_eth = eth_balance_usd / 3000.0
+            eth_balance_eth = eth_balance_usd / self._eth_price_usd()
 
             # Calculate available for conversion
             available_for_conversion = {}
@@ -632,7 +650,7 @@ class SmartWalletManager:
 
             # Calculate maximum possible ETH after conversions
             max_possible_eth_usd = eth_balance_usd + total_available
-            max_possible_eth = max_possible_eth_usd / 3000.0
+            max_possible_eth = max_possible_eth_usd / self._eth_price_usd()
 
             return {
                 'total_wallet_value_usd': total_value,
@@ -712,6 +730,14 @@ class SmartWalletManager:
 
             wallet_address = self.wallet_account.address
 
+            # 👛 WALLET STATE: Event-driven snapshot, no RPC at all
+            snapshot = self._wallet_snapshot(chain)
+            if snapshot is not None:
+                balances = dict(snapshot.balances_usd)
+                self.current_balances = balances
+                self.last_balance_update = datetime.now()
+                return balances
+
             # 🚀 MULTICALL OPTIMIZATION: Use multicall for ultra-fast balance checking
             if self.multicall_checker:
                 logger.info(f"🚀 MULTICALL: Getting all balances in single call for {wallet_address}")
@@ -751,8 +777,7 @@ class SmartWalletManager:
             # Get ETH balance
             eth_balance_wei = w3.eth.get_balance(wallet_address)
             eth_balance = float(w3.from_wei(eth_balance_wei, 'ether'))
-            eth_price_usd = 3000.0  # Conservative ETH price
-            balances['ETH'] = eth_balance * eth_price_usd
+            balances['ETH'] = eth_balance * self._eth_price_usd()
 
             logger.info(f"💰 Real ETH balance: {eth_balance:.6f} ETH (${balances['ETH']:.2f})")
 
@@ -821,8 +846,7 @@ class SmartWalletManager:
             if token_symbol in ['USDC', 'USDC.e', 'USDT', 'DAI']:
                 balance_usd = balance_tokens  # Stablecoins = $1
             elif token_symbol == 'WETH':
-                eth_price_usd = 3000.0  # Conservative ETH price
-                balance_usd = balance_tokens * eth_price_usd
+                balance_usd = balance_tokens * self._eth_price_usd()
             else:
                 balance_usd = balance_tokens  # Default to $1
 
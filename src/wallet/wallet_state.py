@@ -0,0 +1,387 @@
+"""Event-driven wallet balances with O(1) per-chain snapshots."""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from src.utils.log_decoding import TRANSFER_TOPIC, hex_str, topic_address
+from src.utils.multicall_balance_checker import (
+    BALANCE_OF_SELECTOR, DECIMALS_SELECTOR, GET_ETH_BALANCE_SELECTOR, MULTICALL3_ABI, MULTICALL3_ADDRESS
+)
+
+logger = logging.getLogger(__name__)
+
+# WETH9 wraps and unwraps without a Transfer log
+DEPOSIT_TOPIC = '0xe1fffcc4923d04b559f4d29a8bfc6cda04eb5b0d3c460751c2402c5c5cc9109c'
+WITHDRAWAL_TOPIC = '0x7fcf532c15f0a6db0bd6d0e038bea71d30d808c7d98cb3bf7268a95bf5081b65'
+
+STABLECOINS = {'USDC', 'USDC.e', 'USDT', 'DAI'}
+
+
+@dataclass(frozen=True)
+class WalletSnapshot:
+    """Wallet balances on one chain as of a block."""
+    chain: str
+    block: int
+    eth_balance: float
+    eth_price_usd: float
+    token_balances: Dict[str, float]   # symbol -> token amount, ETH included
+    balances_usd: Dict[str, float]     # symbol -> USD value; tokens without a price are left out
+    total_value_usd: float
+    updated_at: float
+
+
+class _ChainWallet:
+    """Raw balances for one chain."""
+
+    __slots__ = ("block", "eth_wei", "eth_block", "balances", "decimals", "symbols", "applied", "receipts",
+                 "snapshot")
+
+    def __init__(self):
+        self.block = 0
+        self.eth_wei = 0
+        self.eth_block = 0                    # block of the last absolute ETH reading
+        self.balances: Dict[str, int] = {}    # token address -> raw balance
+        self.decimals: Dict[str, int] = {}
+        self.symbols: Dict[str, str] = {}
+        self.applied: Dict[Tuple[str, int], int] = {}  # (tx hash, log index) -> block, for logs seen in receipts
+        self.receipts: Dict[str, int] = {}    # tx hash -> block, for receipts charged since that reading
+        self.snapshot: Optional[WalletSnapshot] = None
+
+
+class WalletStateService:
+    """Keeps the wallet's balances current without scanning before each trade.
+
+    Balances are read once per chain in a single aggregate3 call pinned to a
+    block. From then on they move only by events: receipts of our own
+    transactions are applied the moment they are mined (gas, value and
+    token logs), and a follower task per chain applies each new block's
+    Transfer/Deposit/Withdrawal logs involving the wallet plus the native
+    balance at that block. Logs already applied from a receipt are skipped
+    when their block comes in.
+
+    snapshot(chain) returns a prebuilt WalletSnapshot and never touches the
+    network. USD values use the ETH price from eth_price_source, refreshed
+    every price_refresh_seconds; stablecoins count at $1 and tokens with no
+    known price are left out of the total.
+    """
+
+    def __init__(self, web3_connections: Dict[str, Web3], owner: str,
+                 token_addresses: Dict[str, Dict[str, str]],
+                 eth_price_source: Optional[Callable[[], Optional[float]]] = None,
+                 eth_price_usd: float = 3000.0,
+                 poll_interval: float = 1.0,
+                 price_refresh_seconds: float = 60.0,
+                 max_block_range: int = 2000,
+                 multicall_address: str = MULTICALL3_ADDRESS):
+        """Initialize the service.
+
+        Args:
+            web3_connections: Web3 connection per chain.
+            owner: Wallet address.
+            token_addresses: Symbol -> ERC20 address per chain; 'ETH' entries are ignored.
+            eth_price_source: Returns the current ETH price in USD, or None if unavailable.
+            eth_price_usd: Price used until eth_price_source first answers.
+            poll_interval: Seconds between new-block checks per chain.
+            price_refresh_seconds: Minimum seconds between eth_price_source calls.
+            max_block_range: A follower further behind than this reloads instead of replaying logs.
+            multicall_address: Multicall3 address used for the initial load.
+        """
+        self.web3_connections = web3_connections
+        self.owner = Web3.to_checksum_address(owner)
+        self.token_addresses = token_addresses
+        self.eth_price_source = eth_price_source
+        self.eth_price_usd = eth_price_usd
+        self.poll_interval = poll_interval
+        self.price_refresh_seconds = price_refresh_seconds
+        self.max_block_range = max_block_range
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+
+        self._owner_lower = self.owner.lower()
+        self._owner_topic = '0x' + '00' * 12 + self._owner_lower[2:]
+        self._chains: Dict[str, _ChainWallet] = {}
+        self._lock = threading.Lock()
+        self._price_checked_at = 0.0
+        self._tasks: List[asyncio.Task] = []
+
+        self.stats = {
+            'loads': 0,
+            'blocks_synced': 0,
+            'logs_applied': 0,
+            'receipts_applied': 0,
+        }
+
+    async def start(self, chains: Optional[List[str]] = None) -> None:
+        """Load every chain, then follow new blocks in the background."""
+        loop = asyncio.get_running_loop()
+        chains = [chain for chain in (chains or list(self.web3_connections)) if chain in self.web3_connections]
+        await loop.run_in_executor(None, self.refresh_eth_price, True)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, self.load, chain) for chain in chains),
+            return_exceptions=True
+        )
+        for chain, result in zip(chains, results):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Wallet state load failed on {chain}: {result}")
+                continue
+            self._tasks.append(asyncio.ensure_future(self._follow(chain)))
+
+    async def stop(self) -> None:
+        """Stop the block followers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def snapshot(self, chain: str) -> Optional[WalletSnapshot]:
+        """Latest balances on a chain, or None before the chain has loaded."""
+        state = self._chains.get(chain)
+        return state.snapshot if state is not None else None
+
+    def load(self, chain: str) -> WalletSnapshot:
+        """Read every balance on a chain at the latest block, replacing local state.
+
+        Blocking; one aggregate3 call, or one call per token without Multicall3.
+        """
+        w3 = self.web3_connections[chain]
+        tokens = {
+            address.lower(): symbol
+            for symbol, address in self.token_addresses.get(chain, {}).items() if symbol != 'ETH'
+        }
+        addresses = list(tokens)
+        block = w3.eth.block_number
+
+        previous = self._chains.get(chain)
+        known_decimals = previous.decimals if previous is not None else {}
+        missing_decimals = [address for address in addresses if address not in known_decimals]
+
+        owner_word = bytes(12) + bytes.fromhex(self._owner_lower[2:])
+        calls = [(self.multicall_address, True, GET_ETH_BALANCE_SELECTOR + owner_word)]
+        calls += [(Web3.to_checksum_address(address), True, BALANCE_OF_SELECTOR + owner_word) for address in addresses]
+        calls += [(Web3.to_checksum_address(address), True, DECIMALS_SELECTOR) for address in missing_decimals]
+
+        try:
+            multicall = w3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+            results = multicall.functions.aggregate3(calls).call(block_identifier=block)
+        except Exception as e:
+            logger.warning(f"⚠️ Multicall3 unavailable on {chain} ({e}), loading balances one by one")
+            results = [(True, w3.eth.get_balance(self.owner, block).to_bytes(32, 'big'))]
+            for target, _, call_data in calls[1:]:
+                try:
+                    results.append((True, bytes(w3.eth.call({'to': target, 'data': call_data}, block))))
+                except Exception:
+                    results.append((False, b''))
+
+        words = [
+            int.from_bytes(return_data[:32], 'big') if success and len(return_data) >= 32 else None
+            for success, return_data in results
+        ]
+
+        state = _ChainWallet()
+        state.block = block
+        state.eth_block = block
+        state.eth_wei = words[0] or 0
+        state.symbols = tokens
+        state.decimals = dict(known_decimals)
+        for address, decimals in zip(missing_decimals, words[1 + len(addresses):]):
+            if decimals is not None:
+                state.decimals[address] = decimals
+        for address, balance in zip(addresses, words[1:1 + len(addresses)]):
+            state.balances[address] = balance or 0
+
+        with self._lock:
+            self._chains[chain] = state
+            self._rebuild(chain, state)
+        self.stats['loads'] += 1
+        logger.info(f"👛 {chain}: wallet state loaded at block {block}, ${state.snapshot.total_value_usd:.2f}")
+        return state.snapshot
+
+    def sync(self, chain: str) -> Optional[WalletSnapshot]:
+        """Apply every block mined since the last sync. Blocking.
+
+        Returns:
+            The new snapshot, or None if no block was mined.
+        """
+        state = self._chains.get(chain)
+        if state is None:
+            return self.load(chain)
+
+        w3 = self.web3_connections[chain]
+        latest = w3.eth.block_number
+        if latest <= state.block:
+            return None
+        if latest - state.block > self.max_block_range:
+            logger.info(f"👛 {chain}: {latest - state.block} blocks behind, reloading")
+            return self.load(chain)
+
+        addresses = [Web3.to_checksum_address(address) for address in state.symbols]
+        block_range = {'fromBlock': state.block + 1, 'toBlock': latest, 'address': addresses}
+        logs = []
+        if addresses:
+            # Outgoing transfers, wraps and unwraps share the owner in topic 1
+            logs += w3.eth.get_logs({
+                **block_range,
+                'topics': [[TRANSFER_TOPIC, DEPOSIT_TOPIC, WITHDRAWAL_TOPIC], self._owner_topic]
+            })
+            logs += w3.eth.get_logs({
+                **block_range,
+                'topics': [TRANSFER_TOPIC, None, self._owner_topic]
+            })
+        eth_wei = w3.eth.get_balance(self.owner, latest)
+
+        with self._lock:
+            for log in logs:
+                key = (hex_str(log['transactionHash']), log['logIndex'])
+                if key in state.applied:
+                    continue
+                self._apply_log(state, log, native=False)
+            # A reading older than a receipt already charged would undo the charge
+            if latest >= state.eth_block and latest >= max(state.receipts.values(), default=0):
+                state.eth_wei = eth_wei
+                state.eth_block = latest
+                state.receipts.clear()
+            state.applied = {key: block for key, block in state.applied.items() if block > latest}
+            state.block = latest
+            self._rebuild(chain, state)
+
+        self.stats['blocks_synced'] += 1
+        return state.snapshot
+
+    def apply_receipt(self, chain: str, receipt: Dict[str, Any], transaction: Optional[Dict[str, Any]] = None) -> None:
+        """Apply one of our own mined transactions straight away.
+
+        Gas is charged whatever the status; the transaction's value and its
+        token logs only if it succeeded. ETH paid to the wallet by internal
+        calls, e.g. a router unwrapping WETH, has no log and shows up at the
+        next block sync. A receipt is applied once: a repeat, or one whose
+        block the last balance reading already covers, changes nothing.
+
+        Args:
+            chain: Chain name.
+            receipt: The transaction receipt.
+            transaction: The transaction as sent, for its value.
+        """
+        state = self._chains.get(chain)
+        if state is None:
+            return
+
+        with self._lock:
+            block = receipt.get('blockNumber') or 0
+            tx_hash = hex_str(receipt['transactionHash']) if receipt.get('transactionHash') else None
+            # The native balance read at eth_block already includes everything mined by then
+            native = block > state.eth_block and tx_hash not in state.receipts
+            if native and tx_hash is not None:
+                state.receipts[tx_hash] = block
+
+            if native and (receipt.get('from') or '').lower() == self._owner_lower:
+                gas_price = receipt.get('effectiveGasPrice') or (transaction or {}).get('gasPrice', 0)
+                state.eth_wei -= receipt.get('gasUsed', 0) * gas_price
+                if receipt.get('status', 1) == 1 and transaction:
+                    state.eth_wei -= transaction.get('value', 0)
+
+            if receipt.get('status', 1) == 1:
+                for log in receipt.get('logs', []):
+                    key = (hex_str(log['transactionHash']), log['logIndex'])
+                    if block <= state.block or key in state.applied:
+                        continue
+                    state.applied[key] = block
+                    self._apply_log(state, log, native=native)
+
+            self._rebuild(chain, state)
+        self.stats['receipts_applied'] += 1
+
+    def set_eth_price(self, eth_price_usd: float) -> None:
+        """Reprice every chain's snapshot."""
+        with self._lock:
+            self.eth_price_usd = eth_price_usd
+            for chain, state in self._chains.items():
+                self._rebuild(chain, state)
+
+    def refresh_eth_price(self, force: bool = False) -> float:
+        """Ask eth_price_source for a new price if the last one is old enough. Blocking."""
+        now = time.monotonic()
+        if self.eth_price_source is None or (not force and now - self._price_checked_at < self.price_refresh_seconds):
+            return self.eth_price_usd
+        self._price_checked_at = now
+        try:
+            price = self.eth_price_source()
+        except Exception as e:
+            logger.warning(f"⚠️ ETH price refresh failed, keeping ${self.eth_price_usd:.2f}: {e}")
+            return self.eth_price_usd
+        if price and price > 0:
+            self.set_eth_price(price)
+        return self.eth_price_usd
+
+    async def _follow(self, chain: str) -> None:
+        """Sync a chain every poll_interval until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await loop.run_in_executor(None, self.refresh_eth_price)
+                await loop.run_in_executor(None, self.sync, chain)
+            except Exception as e:
+                logger.warning(f"⚠️ Wallet state sync failed on {chain}: {e}")
+
+    def _apply_log(self, state: _ChainWallet, log: Dict[str, Any], native: bool) -> None:
+        """Move balances for one token log. Caller holds the lock.
+
+        native says whether the ETH side of an unwrap should be credited;
+        block syncs read the native balance directly instead.
+        """
+        token = log['address'].lower()
+        topics = log.get('topics') or []
+        if token not in state.balances or len(topics) < 2:
+            return
+
+        topic0 = hex_str(topics[0])
+        value = int.from_bytes(HexBytes(log['data'])[:32], 'big')
+        first = topic_address(topics[1])
+
+        if topic0 == TRANSFER_TOPIC and len(topics) >= 3:
+            if first == self._owner_lower:
+                state.balances[token] -= value
+            if topic_address(topics[2]) == self._owner_lower:
+                state.balances[token] += value
+        elif topic0 == DEPOSIT_TOPIC and first == self._owner_lower:
+            state.balances[token] += value
+        elif topic0 == WITHDRAWAL_TOPIC and first == self._owner_lower:
+            state.balances[token] -= value
+            if native:
+                state.eth_wei += value
+        else:
+            return
+        self.stats['logs_applied'] += 1
+
+    def _rebuild(self, chain: str, state: _ChainWallet) -> None:
+        """Build the chain's immutable snapshot. Caller holds the lock."""
+        eth_balance = state.eth_wei / 10**18
+        token_balances = {'ETH': eth_balance}
+        balances_usd = {'ETH': eth_balance * self.eth_price_usd}
+
+        for address, raw in state.balances.items():
+            symbol = state.symbols[address]
+            decimals = state.decimals.get(address, 6 if symbol in ('USDC', 'USDC.e', 'USDT') else 18)
+            amount = raw / 10**decimals
+            token_balances[symbol] = amount
+            if symbol == 'WETH':
+                balances_usd[symbol] = amount * self.eth_price_usd
+            elif symbol in STABLECOINS:
+                balances_usd[symbol] = amount
+
+        state.snapshot = WalletSnapshot(
+            chain=chain,
+            block=state.block,
+            eth_balance=eth_balance,
+            eth_price_usd=self.eth_price_usd,
+            token_balances=token_balances,
+            balances_usd=balances_usd,
+            total_value_usd=sum(balances_usd.values()),
+            updated_at=time.time()
+        )
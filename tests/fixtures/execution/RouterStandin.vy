@@ -0,0 +1,12 @@
+# pragma version ^0.4.0
+"""
+@notice Spends the caller's tokens through transferFrom, like a router's swap leg.
+"""
+
+interface ERC20:
+    def transferFrom(src: address, dst: address, wad: uint256) -> bool: nonpayable
+
+
+@external
+def pull(token: address, amount: uint256):
+    extcall ERC20(token).transferFrom(msg.sender, self, amount)
@@ -0,0 +1,65 @@
+# pragma version ^0.4.0
+"""
+@notice Minimal WETH9: deposit/withdraw wrapping plus ERC20 balances and allowances.
+"""
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Deposit:
+    dst: indexed(address)
+    wad: uint256
+
+event Withdrawal:
+    src: indexed(address)
+    wad: uint256
+
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+
+
+@external
+@payable
+def deposit():
+    self.balanceOf[msg.sender] += msg.value
+    log Deposit(dst=msg.sender, wad=msg.value)
+
+
+@external
+def withdraw(wad: uint256):
+    self.balanceOf[msg.sender] -= wad
+    send(msg.sender, wad)
+    log Withdrawal(src=msg.sender, wad=wad)
+
+
+@external
+def approve(spender: address, amount: uint256) -> bool:
+    self.allowance[msg.sender][spender] = amount
+    log Approval(owner=msg.sender, spender=spender, value=amount)
+    return True
+
+
+@external
+def transfer(dst: address, wad: uint256) -> bool:
+    self.balanceOf[msg.sender] -= wad
+    self.balanceOf[dst] += wad
+    log Transfer(sender=msg.sender, receiver=dst, value=wad)
+    return True
+
+
+@external
+def transferFrom(src: address, dst: address, wad: uint256) -> bool:
+    # Like WETH9, an unlimited allowance is never decremented
+    if msg.sender != src and self.allowance[src][msg.sender] != max_value(uint256):
+        self.allowance[src][msg.sender] -= wad
+    self.balanceOf[src] -= wad
+    self.balanceOf[dst] += wad
+    log Transfer(sender=src, receiver=dst, value=wad)
+    return True
@@ -0,0 +1,34 @@
+# pragma version ^0.4.0
+"""
+@notice Minimal stand-in for Multicall3 with the same aggregate3 and
+        getEthBalance ABI, used to test multicall paths on a local EVM.
+"""
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[128]
+
+struct Result:
+    success: bool
+    returnData: Bytes[64]
+
+
+@external
+def aggregate3(calls: DynArray[Call3, 256]) -> DynArray[Result, 256]:
+    results: DynArray[Result, 256] = []
+    for call: Call3 in calls:
+        success: bool = False
+        data: Bytes[64] = b""
+        success, data = raw_call(
+            call.target, call.callData, max_outsize=64, revert_on_failure=False, is_static_call=True
+        )
+        assert success or call.allowFailure, "Multicall3: call failed"
+        results.append(Result(success=success, returnData=data))
+    return results
+
+
+@view
+@external
+def getEthBalance(addr: address) -> uint256:
+    return addr.balance
@@ -0,0 +1,17 @@
+# pragma version ^0.4.0
+"""
+@notice Minimal ERC20 exposing balanceOf and decimals, with open minting.
+"""
+
+balanceOf: public(HashMap[address, uint256])
+decimals: public(uint8)
+
+
+@deploy
+def __init__(_decimals: uint8):
+    self.decimals = _decimals
+
+
+@external
+def mint(to: address, amount: uint256):
+    self.balanceOf[to] += amount
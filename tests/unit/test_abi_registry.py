@@ -0,0 +1,65 @@
+"""
+Unit tests for the preloaded ABI registry.
+"""
+
+import json
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from web3 import Web3
+
+from utils.abi_registry import ABI_DIR, AbiRegistry
+
+ROUTER = "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506"
+WETH = "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
+USDC = "0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8"
+WALLET = "0x000000000000000000000000000000000000dEaD"
+
+
+class TestAbiRegistry:
+    """Test suite for AbiRegistry."""
+
+    def test_dex_mapping_matches_files(self):
+        registry = AbiRegistry()
+        mapping = json.loads((ABI_DIR / "dex_abi_mapping.json").read_text())
+
+        for dex, abi_name in mapping.items():
+            assert registry.dex_abi(dex) == json.loads((ABI_DIR / f"{abi_name}_abi.json").read_text())
+        assert registry.abi_name_for_dex('unknown_dex') == 'uniswap_v2_router'
+
+    def test_selectors_precomputed(self):
+        registry = AbiRegistry()
+
+        assert registry.selector(
+            'uniswap_v2_router', 'swapExactETHForTokens(uint256,address[],address,uint256)'
+        ) == '0x7ff36ab5'
+        assert registry.selector('erc20_approval', 'approve(address,uint256)') == '0x095ea7b3'
+        assert registry.functions_by_selector['0x2e1a7d4d'] == 'withdraw(uint256)'
+
+    def test_contract_cached_per_connection(self):
+        registry = AbiRegistry()
+        w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:1"))
+
+        first = registry.router_contract(w3, 'arbitrum', ROUTER.lower(), 'sushiswap')
+        assert registry.router_contract(w3, 'arbitrum', ROUTER, 'sushiswap') is first
+        assert registry.router_contract(w3, 'base', ROUTER, 'sushiswap') is not first
+
+        # A reconnected chain gets a Contract bound to the new provider
+        reconnected = Web3(Web3.HTTPProvider("http://127.0.0.1:2"))
+        assert registry.router_contract(reconnected, 'arbitrum', ROUTER, 'sushiswap').w3 is reconnected
+        assert registry.stats == {'contracts_built': 3, 'contract_hits': 1}
+
+    def test_encode_call_matches_web3(self):
+        registry = AbiRegistry()
+        w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:1"))
+        router = registry.router_contract(w3, 'arbitrum', ROUTER, 'sushiswap')
+        args = [10**15, [WETH, USDC], WALLET, 2**32]
+
+        expected = router.functions.swapExactETHForTokens(*args).build_transaction({
+            'from': WALLET, 'value': 0, 'gas': 500000, 'gasPrice': 10**8, 'nonce': 0, 'chainId': 42161
+        })['data']
+
+        assert registry.encode_call(registry.abi_name_for_dex('sushiswap'), 'swapExactETHForTokens', args) == expected
@@ -0,0 +1,98 @@
+"""
+Unit tests for the in-memory allowance cache.
+"""
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from execution.allowance_manager import (
+    APPROVAL_TOPIC, MAX_UINT256, TRANSFER_TOPIC, AllowanceManager
+)
+
+WALLET = '0x000000000000000000000000000000000000dEaD'
+OTHER = '0x000000000000000000000000000000000000bEEF'
+ROUTER = '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506'
+TOKEN = '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1'
+
+
+def topic(address):
+    return '0x' + '00' * 12 + address[2:].lower()
+
+
+def log(event, first, second, value, token=TOKEN):
+    return {
+        'address': token,
+        'topics': [event, topic(first), topic(second)],
+        'data': '0x' + value.to_bytes(32, 'big').hex(),
+    }
+
+
+def receipt(to, *logs, status=1):
+    return {'status': status, 'to': to, 'logs': list(logs)}
+
+
+class TestAllowanceManager:
+    """Test suite for AllowanceManager."""
+
+    def test_unknown_allowance_is_a_miss(self):
+        manager = AllowanceManager(WALLET)
+
+        assert manager.get('arbitrum', TOKEN, ROUTER) is None
+        assert not manager.covers('arbitrum', TOKEN, ROUTER, 0)
+
+        manager.set('arbitrum', TOKEN.lower(), ROUTER, 10)
+        assert manager.covers('arbitrum', TOKEN, ROUTER.lower(), 10)
+        assert not manager.covers('arbitrum', TOKEN, ROUTER, 11)
+        assert not manager.covers('base', TOKEN, ROUTER, 1)
+        assert manager.stats['hits'] == 1 and manager.stats['misses'] == 3
+
+    def test_sent_approval_counts_until_it_fails(self):
+        manager = AllowanceManager(WALLET)
+        manager.approval_sent('arbitrum', TOKEN, ROUTER, MAX_UINT256)
+        assert manager.covers('arbitrum', TOKEN, ROUTER, 10**30)
+
+        manager.approval_failed('arbitrum', TOKEN, ROUTER)
+        assert manager.get('arbitrum', TOKEN, ROUTER) is None
+
+    def test_approval_log_sets_allowance(self):
+        manager = AllowanceManager(WALLET)
+        manager.apply_receipt('arbitrum', receipt(TOKEN, log(APPROVAL_TOPIC, WALLET, ROUTER, 500)))
+
+        assert manager.get('arbitrum', TOKEN, ROUTER) == 500
+
+    def test_transfer_spends_limited_allowance(self):
+        manager = AllowanceManager(WALLET)
+        manager.set('arbitrum', TOKEN, ROUTER, 500)
+        manager.apply_receipt('arbitrum', receipt(ROUTER, log(TRANSFER_TOPIC, WALLET, ROUTER, 200)))
+        assert manager.get('arbitrum', TOKEN, ROUTER) == 300
+
+        # Incoming transfers and other owners' approvals are not ours to track
+        manager.apply_receipt('arbitrum', receipt(
+            ROUTER, log(TRANSFER_TOPIC, ROUTER, WALLET, 1000), log(APPROVAL_TOPIC, OTHER, ROUTER, 0)
+        ))
+        assert manager.get('arbitrum', TOKEN, ROUTER) == 300
+
+    def test_transfer_leaves_unlimited_allowance(self):
+        manager = AllowanceManager(WALLET)
+        manager.set('arbitrum', TOKEN, ROUTER, MAX_UINT256)
+        manager.apply_receipt('arbitrum', receipt(ROUTER, log(TRANSFER_TOPIC, WALLET, ROUTER, 200)))
+
+        assert manager.get('arbitrum', TOKEN, ROUTER) == MAX_UINT256
+
+    def test_reverted_receipt_is_ignored(self):
+        manager = AllowanceManager(WALLET)
+        manager.apply_receipt('arbitrum', receipt(TOKEN, log(APPROVAL_TOPIC, WALLET, ROUTER, 500), status=0))
+
+        assert manager.get('arbitrum', TOKEN, ROUTER) is None
+
+    def test_missing_pairs(self):
+        manager = AllowanceManager(WALLET)
+        manager.set('arbitrum', TOKEN, ROUTER, MAX_UINT256)
+        manager.set('arbitrum', TOKEN, OTHER, 10)
+
+        assert manager.missing('arbitrum', [(TOKEN, ROUTER), (TOKEN, OTHER), (ROUTER, OTHER)]) == [
+            (TOKEN, OTHER), (ROUTER, OTHER)
+        ]
@@ -0,0 +1,93 @@
+"""
+Unit tests for local constant-product and Solidly stable pool math.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from dex.amm_math import AmmPool, get_amount_in, get_amount_out, get_amount_out_stable, optimal_arbitrage_input
+
+WETH = 10**18
+USDC = 10**6
+
+
+def test_constant_product_matches_router_formula():
+    # UniswapV2Library.getAmountOut with 997/1000
+    amount_in, reserve_in, reserve_out = 5 * WETH, 1000 * WETH, 2_000_000 * USDC
+    expected = amount_in * 997 * reserve_out // (reserve_in * 1000 + amount_in * 997)
+    assert get_amount_out(amount_in, reserve_in, reserve_out, 30) == expected
+
+    needed = get_amount_in(expected, reserve_in, reserve_out, 30)
+    assert get_amount_out(needed, reserve_in, reserve_out, 30) >= expected
+    assert get_amount_out(needed - 1, reserve_in, reserve_out, 30) < expected
+
+
+def test_stable_pool_trades_near_par_and_bends_with_imbalance():
+    balanced = get_amount_out_stable(1000 * USDC, 10**6 * USDC, 10**6 * WETH, 6, 18, fee_bps=5)
+    assert 999.49 < balanced / WETH < 999.5
+
+    # Much flatter than x*y=k for the same imbalance
+    imbalanced = get_amount_out_stable(1000 * USDC, 10**6 * USDC, 3 * 10**6 * WETH, 6, 18, fee_bps=5)
+    assert 1000 < imbalanced / WETH < 1500
+
+
+def test_closed_form_optimum_matches_brute_force():
+    cheap = AmmPool(1000 * WETH, 2_000_000 * USDC, 30, decimals1=6)
+    rich = AmmPool(1000 * WETH, 2_100_000 * USDC, 30, decimals1=6)
+
+    # USDC -> WETH where WETH is cheap, WETH -> USDC where it is rich
+    amount_in, profit = optimal_arbitrage_input(cheap, False, rich, True)
+
+    def cycle(x):
+        return rich.get_amount_out(cheap.get_amount_out(x, False), True) - x
+
+    best_whole = max(range(1, 100_000), key=lambda k: cycle(k * USDC))
+    assert abs(amount_in / USDC - best_whole) < 1
+    assert profit == cycle(amount_in)
+    assert profit >= cycle(best_whole * USDC)
+
+
+def test_no_input_profits_when_spread_is_inside_fees():
+    a = AmmPool(1000 * WETH, 2_000_000 * USDC, 30)
+    b = AmmPool(1000 * WETH, 2_004_000 * USDC, 30)
+    assert optimal_arbitrage_input(a, False, b, True) == (0, 0)
+
+
+def test_stable_pools_are_sized_by_search():
+    par = AmmPool(10**6 * USDC, 10**6 * WETH, 5, stable=True, decimals0=6, decimals1=18)
+    dai_heavy = AmmPool(10**6 * USDC, 3 * 10**6 * WETH, 5, stable=True, decimals0=6, decimals1=18)
+
+    amount_in, profit = optimal_arbitrage_input(dai_heavy, True, par, False)
+    assert profit > 0
+
+    def cycle(x):
+        return par.get_amount_out(dai_heavy.get_amount_out(x, True), False) - x
+
+    assert cycle(amount_in) == profit
+    assert profit >= max(cycle(k * 10**9) for k in range(1, 2000, 5))
+
+
+def test_detector_quotes_pairs_with_reserves_locally():
+    pytest.importorskip("web3")
+    from src.core.detection.cross_dex_detector import CrossDexDetector
+
+    detector = CrossDexDetector([])
+    pair = SimpleNamespace(token0_address="WETH", token1_address="USDC", reserve0=1000 * WETH,
+                           reserve1=2_000_000 * USDC, fee="0.003", token0_decimals=18, token1_decimals=6)
+
+    token0_price, token1_price = detector._quote_from_reserves(pair)
+    assert token0_price == Decimal(get_amount_out(WETH, 1000 * WETH, 2_000_000 * USDC, 30)) / USDC
+    assert token1_price == Decimal(get_amount_out(USDC, 2_000_000 * USDC, 1000 * WETH, 30)) / WETH
+    assert 1992 < token0_price < 1993  # 0.3% fee and the price impact of one WETH
+
+    # No reserves: the detector falls back to router quotes
+    assert detector._quote_from_reserves(SimpleNamespace(reserve0=0, reserve1=10**18)) is None
+    assert detector._quote_from_reserves(SimpleNamespace(token0_address="WETH")) is None
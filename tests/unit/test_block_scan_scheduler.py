@@ -0,0 +1,189 @@
+"""
+Unit tests for the per-chain, block-driven scan scheduler.
+
+Chains are simulated by a clock: block_number advances every block_time
+seconds, and heads are picked up by the polling fallback.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.core.block_scan_scheduler import BlockScanScheduler, _ChainSchedule
+
+
+class ClockEth:
+    def __init__(self, block_time):
+        self.block_time = block_time
+        self.start = time.monotonic()
+
+    @property
+    def block_number(self):
+        return 1000 + int((time.monotonic() - self.start) / self.block_time)
+
+
+def clock_chains(block_times):
+    return {chain: SimpleNamespace(eth=ClockEth(block_time)) for chain, block_time in block_times.items()}
+
+
+def run_for(scheduler, seconds):
+    async def run():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        await scheduler.stop()
+        await task
+
+    asyncio.run(run())
+
+
+def test_each_chain_scans_every_block_at_its_own_cadence():
+    block_times = {'fast': 0.05, 'slow': 0.2}
+    scanned = {'fast': [], 'slow': []}
+    results = []
+    running = {'fast': 0, 'slow': 0}
+    overlap = []
+
+    async def scan(chain, block):
+        running[chain] += 1
+        overlap.append(running[chain])
+        scanned[chain].append(block)
+        await asyncio.sleep(0.005)
+        running[chain] -= 1
+        return [block]
+
+    async def on_result(chain, block, result):
+        results.append((chain, block, result))
+
+    scheduler = BlockScanScheduler(clock_chains(block_times), scan, on_result,
+                                   block_times=block_times, min_deadline=0.0, min_poll_interval=0.005)
+    run_for(scheduler, 0.65)
+
+    assert len(scanned['fast']) >= 8
+    assert 2 <= len(scanned['slow']) <= 4
+    for blocks in scanned.values():
+        assert blocks == sorted(set(blocks))
+    assert max(overlap) == 1
+    assert ('slow', scanned['slow'][0], [scanned['slow'][0]]) in results
+
+    stats = scheduler.get_stats()
+    assert stats['fast']['completed'] == len(scanned['fast'])
+    assert stats['fast']['head_source'] == 'poll'
+    assert stats['slow']['deadline_seconds'] == 0.2 * 0.8
+
+
+def test_slow_scans_are_cancelled_at_the_block_deadline():
+    block_times = {'arbitrum': 0.1}
+    cancelled = []
+    results = []
+
+    async def scan(chain, block):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(block)
+            raise
+        return block
+
+    async def on_result(chain, block, result):
+        results.append(block)
+
+    scheduler = BlockScanScheduler(clock_chains(block_times), scan, on_result,
+                                   block_times=block_times, deadline_fraction=0.5, min_deadline=0.0,
+                                   min_poll_interval=0.005)
+    run_for(scheduler, 0.45)
+
+    stats = scheduler.get_stats()['arbitrum']
+    assert results == []
+    assert stats['completed'] == 0
+    assert stats['deadline_cancels'] >= 3
+    # Every scan that started was cancelled before the next one began
+    assert len(cancelled) == stats['scans']
+
+
+def test_scans_slower_than_a_block_run_to_the_deadline_floor():
+    block_times = {'arbitrum': 0.05}
+    scanned = []
+    results = []
+
+    async def scan(chain, block):
+        scanned.append(block)
+        await asyncio.sleep(0.12)
+        return block
+
+    async def on_result(chain, block, result):
+        results.append(result)
+
+    scheduler = BlockScanScheduler(clock_chains(block_times), scan, on_result,
+                                   block_times=block_times, min_deadline=0.3, min_poll_interval=0.005)
+    run_for(scheduler, 0.65)
+
+    stats = scheduler.get_stats()['arbitrum']
+    assert stats['deadline_seconds'] == 0.3
+    assert stats['superseded'] == 0 and stats['deadline_cancels'] == 0
+    assert stats['completed'] >= 3 and results == scanned[:stats['completed']]
+    # Heads that arrived mid-scan were coalesced into the next scan of the latest block
+    assert stats['skipped_heads'] > 0
+    assert scanned == sorted(set(scanned))
+
+
+def test_newer_head_supersedes_a_running_scan():
+    started = []
+
+    async def scan(chain, block):
+        started.append(block)
+        await asyncio.sleep(5)
+
+    scheduler = BlockScanScheduler({'base': None}, scan, block_times={'base': 10.0})
+
+    async def run():
+        scheduler.running = True
+        scheduler._chains['base'] = _ChainSchedule()
+        loop_task = asyncio.create_task(scheduler._scan_loop('base'))
+        scheduler._on_head('base', 7)
+        await asyncio.sleep(0.01)
+        scheduler._on_head('base', 8)
+        await asyncio.sleep(0.01)
+        scheduler.running = False
+        loop_task.cancel()
+        await asyncio.gather(loop_task, return_exceptions=True)
+        for state in scheduler._chains.values():
+            if state.scan_task:
+                state.scan_task.cancel()
+
+    asyncio.run(run())
+    assert started == [7, 8]
+    assert scheduler.get_stats()['base']['superseded'] == 1
+
+
+def test_missing_websocket_provider_falls_back_to_polling():
+    block_times = {'arbitrum': 0.05}
+    scanned = []
+    attempts = []
+
+    async def scan(chain, block):
+        scanned.append(block)
+
+    async def on_result(chain, block, result):
+        pass
+
+    async def subscribe_heads(chain, url):
+        # What web3 6 raises for `from web3 import WebSocketProvider`
+        attempts.append(url)
+        raise ImportError("cannot import name 'WebSocketProvider' from 'web3'")
+
+    scheduler = BlockScanScheduler(clock_chains(block_times), scan, on_result,
+                                   ws_urls={'arbitrum': 'wss://example.invalid'}, block_times=block_times,
+                                   min_deadline=0.0, min_poll_interval=0.005, ws_retry_seconds=0.05)
+    scheduler._subscribe_heads = subscribe_heads
+    run_for(scheduler, 0.3)
+
+    # Polled for the whole run instead of retrying the subscription
+    assert attempts == ['wss://example.invalid']
+    assert len(scanned) >= 3
+    assert scheduler.get_stats()['arbitrum']['head_source'] == 'poll'
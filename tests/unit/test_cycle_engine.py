@@ -0,0 +1,158 @@
+"""
+Unit tests for the negative-cycle engine behind PathFinder.
+"""
+
+import math
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.arbitrage.cycle_engine import NegativeCycleEngine
+from core.arbitrage.graph_store import ArrayGraphStore
+from core.arbitrage.path_finder import PathFinder
+
+
+def _market(pairs):
+    return {
+        "pairs": [
+            {"base_token": b, "quote_token": q, "dex": d, "price": p, "liquidity": l, "fee": f}
+            for b, q, d, p, l, f in pairs
+        ]
+    }
+
+
+class TestNegativeCycleEngine:
+    """Test suite for NegativeCycleEngine."""
+
+    def test_edge_weight_includes_fee(self):
+        store = ArrayGraphStore()
+        edge_id = store.set_edge("WETH", "USDC", "uniswap", 2000.0, 1e6, fee=0.003)
+        assert math.isclose(store.weights()[edge_id], -math.log(2000.0 * 0.997))
+
+    def test_finds_two_dex_cycle(self):
+        engine = NegativeCycleEngine(max_hops=3)
+        engine.add_pair("WETH", "USDC", "uniswap", 2000.0, 1e6, fee=0.003)
+        engine.add_pair("WETH", "USDC", "sushiswap", 2050.0, 1e6, fee=0.003)
+
+        cycles = engine.find_cycles()
+
+        assert len(cycles) == 1
+        cycle = cycles[0]
+        assert cycle["hops"] == 2
+        assert {edge["dex"] for edge in cycle["path"]} == {"uniswap", "sushiswap"}
+        expected = 2050.0 * 0.997 * 0.997 / 2000.0
+        assert math.isclose(cycle["profit_ratio"], expected)
+
+    def test_no_cycle_when_fees_exceed_spread(self):
+        engine = NegativeCycleEngine(max_hops=3)
+        engine.add_pair("WETH", "USDC", "uniswap", 2000.0, 1e6, fee=0.003)
+        engine.add_pair("WETH", "USDC", "sushiswap", 2005.0, 1e6, fee=0.003)
+
+        assert engine.find_cycles() == []
+
+    def test_triangle_is_hop_bounded(self):
+        pairs = [
+            ("WETH", "USDC", "uniswap", 2000.0, 1e6),
+            ("WBTC", "USDC", "uniswap", 40000.0, 1e6),
+            ("WBTC", "WETH", "camelot", 20.4, 1e6),
+        ]
+        engine = NegativeCycleEngine(max_hops=3)
+        short_engine = NegativeCycleEngine(max_hops=2)
+        for pair in pairs:
+            engine.add_pair(*pair)
+            short_engine.add_pair(*pair)
+
+        cycles = engine.find_cycles()
+
+        assert len(cycles) == 1
+        assert cycles[0]["tokens"] == ["USDC", "WBTC", "WETH", "USDC"]
+        assert math.isclose(cycles[0]["profit_ratio"], 20.4 * 2000.0 / 40000.0)
+        assert short_engine.find_cycles() == []
+
+    def test_cycles_ranked_by_profit(self):
+        engine = NegativeCycleEngine(max_hops=3)
+        engine.add_pair("WETH", "USDC", "uniswap", 2000.0, 1e6)
+        engine.add_pair("WETH", "USDC", "sushiswap", 2010.0, 1e6)
+        engine.add_pair("WBTC", "USDC", "uniswap", 40000.0, 1e6)
+        engine.add_pair("WBTC", "USDC", "camelot", 41000.0, 1e6)
+
+        cycles = engine.find_cycles()
+
+        assert len(cycles) == 2
+        assert cycles[0]["profit_ratio"] > cycles[1]["profit_ratio"]
+        assert "WBTC" in cycles[0]["tokens"]
+
+    def test_min_liquidity_filters_edges(self):
+        engine = NegativeCycleEngine(max_hops=3)
+        engine.add_pair("WETH", "USDC", "uniswap", 2000.0, 1e6)
+        engine.add_pair("WETH", "USDC", "tiny", 2100.0, 10.0)
+
+        assert engine.find_cycles(min_liquidity=0.0)
+        assert engine.find_cycles(min_liquidity=1000.0) == []
+
+
+class TestPathFinder:
+    """Test suite for PathFinder on top of the cycle engine."""
+
+    def test_paths_start_at_requested_token(self):
+        finder = PathFinder(max_path_length=3)
+        finder.update_graph(_market([
+            ("WETH", "USDC", "uniswap", 2000.0, 1e6, 0.003),
+            ("WETH", "USDC", "sushiswap", 2050.0, 1e6, 0.003),
+        ]))
+
+        for token in ("WETH", "USDC"):
+            paths = finder.find_arbitrage_paths(token)
+            assert len(paths) == 1
+            assert paths[0][0]["from_token"] == token
+            assert paths[0][-1]["to_token"] == token
+
+        all_paths = finder.find_all_arbitrage_paths()
+        assert sum(len(paths) for paths in all_paths.values()) == 1
+
+    def test_pool_delta_matches_full_rebuild(self):
+        pairs = [
+            ("WETH", "USDC", "uniswap", 2000.0, 1e6, 0.003),
+            ("WETH", "USDC", "sushiswap", 2001.0, 1e6, 0.003),
+            ("OP", "USDT", "velodrome", 2.0, 1e6, 0.003),
+            ("OP", "USDT", "uniswap", 2.1, 1e6, 0.003),
+        ]
+        finder = PathFinder(max_path_length=3)
+        finder.update_graph(_market(pairs))
+        assert [cycle["tokens"][0] for cycle in finder.find_cycles()] == ["OP"]
+
+        repriced = {"base_token": "WETH", "quote_token": "USDC", "dex": "sushiswap",
+                    "price": 2060.0, "liquidity": 1e6, "fee": 0.003}
+        removed = {"base_token": "OP", "quote_token": "USDT", "dex": "uniswap"}
+        searched = finder.apply_pool_delta({"repriced": [repriced], "removed": [removed]})
+
+        assert searched == {"WETH", "USDC", "OP", "USDT"}
+        rebuilt = PathFinder(max_path_length=3)
+        rebuilt.update_graph(_market([
+            ("WETH", "USDC", "uniswap", 2000.0, 1e6, 0.003),
+            ("WETH", "USDC", "sushiswap", 2060.0, 1e6, 0.003),
+            ("OP", "USDT", "velodrome", 2.0, 1e6, 0.003),
+        ]))
+        assert finder.find_cycles() == rebuilt.find_cycles()
+
+    def test_pool_delta_leaves_untouched_components(self):
+        finder = PathFinder(max_path_length=3)
+        finder.update_graph(_market([
+            ("WETH", "USDC", "uniswap", 2000.0, 1e6, 0.003),
+            ("WETH", "USDC", "sushiswap", 2060.0, 1e6, 0.003),
+            ("OP", "USDT", "velodrome", 2.0, 1e6, 0.003),
+            ("OP", "USDT", "uniswap", 2.0, 1e6, 0.003),
+        ]))
+        before = finder.find_cycles()
+
+        searched = finder.apply_pool_delta({"added": [
+            {"base_token": "OP", "quote_token": "USDT", "dex": "aerodrome",
+             "price": 2.2, "liquidity": 1e6, "fee": 0.003},
+        ]})
+
+        assert searched == {"OP", "USDT"}
+        after = finder.find_cycles()
+        assert before[0] in after
+        assert len(after) == 2
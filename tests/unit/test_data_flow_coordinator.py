@@ -0,0 +1,202 @@
+"""
+Unit tests for DataFlowCoordinator packet routing.
+"""
+
+import asyncio
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.data_coordination import DataFlowCoordinator, DataFlowType, DataState
+
+PRICE = DataFlowType.PRICE_DATA
+
+
+def unbatched(config=None):
+    """Coordinator with every flow delivering packet by packet."""
+    coordinator = DataFlowCoordinator(config or {})
+    for flow in coordinator.data_flows.values():
+        flow.batch_size = 1
+    coordinator._compile_routes()
+    return coordinator
+
+
+def drain(coordinator, component):
+    queue = coordinator.flow_queues[component]
+    packets = []
+    while not queue.empty():
+        packets.append(queue.get_nowait())
+    return packets
+
+
+def test_fan_out_shares_one_packet_and_untracks_it_once_processed():
+    coordinator = unbatched()
+    received = []
+    coordinator.register_data_handler('arbitrage_engine', PRICE, lambda data, metadata: received.append(data) or True)
+    validated = []
+    coordinator.register_validation_rule(PRICE, lambda data: validated.append(data) or True)
+    payload = {'token': 'WETH', 'price': 2500.0}
+
+    async def run():
+        first = await coordinator.send_data('price_feeds', PRICE, payload)
+        second = await coordinator.send_data('price_feeds', PRICE, payload)
+        assert isinstance(first, int) and second == first + 1
+
+        engine, bridge = drain(coordinator, 'arbitrage_engine'), drain(coordinator, 'bridge_monitor')
+        assert [p.packet_id for p in engine] == [first, second]
+        # Both targets get the same packet object and the caller's payload
+        assert engine[0] is bridge[0] and engine[0].data is payload
+        assert engine[0].target_components == ('arbitrage_engine', 'bridge_monitor')
+        assert engine[0].pending == 2 and engine[0].history is None
+        assert len(validated) == 2  # once per packet, not per target
+
+        for packet in engine:
+            await coordinator._process_packet(packet, 'arbitrage_engine')
+        assert set(coordinator.active_packets) == {first, second}
+        for packet in bridge:
+            await coordinator._process_packet(packet, 'bridge_monitor')
+        return first
+
+    first = asyncio.run(run())
+    assert received == [payload, payload] and received[0] is payload
+    assert coordinator.active_packets == {}
+    assert coordinator.get_packet_lineage(first) == ['processed_by_arbitrage_engine', 'processed_by_bridge_monitor']
+    assert coordinator.get_flow_statistics()['delivery_outcomes'] == {'completed': 4}
+    assert coordinator.flow_statistics['price_feeds_price_data']['sent'] == 2
+
+
+def test_transformations_copy_only_when_they_change_the_data():
+    coordinator = unbatched({'max_lineage_entries': 1})
+    payload = {'token': 'WETH', 'price': 2500.0}
+
+    async def send():
+        packet_id = await coordinator.send_data('price_feeds', PRICE, payload, metadata={'block': 1})
+        return packet_id, drain(coordinator, 'arbitrage_engine')[0], drain(coordinator, 'bridge_monitor')[0]
+
+    coordinator.register_transformation_rule('bridge_monitor', PRICE, lambda data: data)
+    _, engine, bridge = asyncio.run(send())
+    assert bridge is engine
+
+    coordinator.register_transformation_rule('bridge_monitor', PRICE, lambda data: {**data, 'scaled': True})
+    packet_id, engine, bridge = asyncio.run(send())
+    assert engine.data is payload and 'scaled' not in payload
+    assert bridge is not engine and bridge.data == {**payload, 'scaled': True}
+    assert bridge.packet_id == engine.packet_id == packet_id
+    assert bridge.target_components == ('bridge_monitor',)
+    assert bridge.metadata is engine.metadata
+    assert engine.history is None and bridge.processing_history == ['transformed_for_bridge_monitor']
+
+    async def process():
+        await coordinator._process_packet(bridge, 'bridge_monitor')
+        await coordinator._process_packet(engine, 'arbitrage_engine')
+
+    asyncio.run(process())
+    assert packet_id not in coordinator.active_packets
+    assert coordinator.get_packet_lineage(packet_id) == [
+        'transformed_for_bridge_monitor', 'processed_by_bridge_monitor', 'processed_by_arbitrage_engine'
+    ]
+    # Only the newest packet's lineage is kept
+    assert list(coordinator.data_lineage) == [packet_id]
+
+
+def test_explicit_targets_skip_components_that_cannot_take_the_flow():
+    coordinator = unbatched()
+    coordinator.register_validation_rule(PRICE, lambda data: data.get('price', 0) > 0)
+
+    async def run():
+        packet_id = await coordinator.send_data('price_feeds', PRICE, {'price': 1.0},
+                                                target_components=['bridge_monitor', 'wallet_manager', 'nowhere'])
+        assert [p.packet_id for p in drain(coordinator, 'bridge_monitor')] == [packet_id]
+        assert drain(coordinator, 'wallet_manager') == []
+        assert coordinator.active_packets[packet_id].state == DataState.PENDING
+
+        # Rejected everywhere: nothing is queued or left tracked
+        rejected = await coordinator.send_data('price_feeds', PRICE, {'price': -1.0})
+        assert rejected and rejected not in coordinator.active_packets
+        assert drain(coordinator, 'arbitrage_engine') == []
+
+    asyncio.run(run())
+
+
+def test_price_data_is_dispatched_once_per_full_batch():
+    coordinator = DataFlowCoordinator({})
+    validated, transformed, handled = [], [], []
+    coordinator.register_validation_rule(PRICE, lambda data: validated.append(data) or data['price'] > 0)
+    coordinator.register_transformation_rule('arbitrage_engine', PRICE,
+                                             lambda batch: transformed.append(len(batch)) or batch[::-1])
+    coordinator.register_data_handler('arbitrage_engine', PRICE,
+                                      lambda batch, metadata: handled.append((batch, metadata)) or True)
+
+    async def run():
+        ids = [await coordinator.send_data('price_feeds', PRICE, {'price': float(i)}) for i in range(11)]
+        engine, bridge = drain(coordinator, 'arbitrage_engine'), drain(coordinator, 'bridge_monitor')
+        # price_feeds_to_arbitrage batches 10, price_feeds_to_bridge batches 5
+        assert [len(p.data) for p in engine] == [9] and [len(p.data) for p in bridge] == [4, 5]
+        assert engine[0].members == tuple(ids[1:10]) and engine[0].data[0] == {'price': 9.0}
+        assert bridge[0].data[0] is engine[0].data[-1]
+        for packet in engine:
+            await coordinator._process_packet(packet, 'arbitrage_engine')
+        for packet in bridge:
+            await coordinator._process_packet(packet, 'bridge_monitor')
+        return ids
+
+    ids = asyncio.run(run())
+    # Each packet validated once for both flows; price 0 was dropped from both
+    assert len(validated) == 10
+    assert transformed == [9]
+    (batch, metadata), = handled
+    assert [item['price'] for item in batch] == [9.0, 8.0, 7.0, 6.0, 5.0, 4.0, 3.0, 2.0, 1.0]
+    assert metadata['batch_size'] == 9 and metadata['batch_flow'] == 'price_feeds_to_arbitrage'
+    # The eleventh packet is still buffered for both flows
+    assert list(coordinator.active_packets) == [ids[10]]
+    transformed_by, engine_batch, bridge_batch = coordinator.get_packet_lineage(ids[1])
+    assert transformed_by == 'transformed_for_arbitrage_engine'
+    assert engine_batch.endswith('_processed_by_arbitrage_engine')
+    assert bridge_batch.endswith('_processed_by_bridge_monitor')
+    stats = coordinator.get_flow_statistics()
+    assert stats['batch_buffers']['price_feeds_to_arbitrage'] == 1
+    assert stats['batching']['price_feeds_to_arbitrage']['dropped_invalid'] == 1
+    assert coordinator.flow_statistics['arbitrage_engine_price_data']['processed'] == 9
+
+
+def test_partial_batches_go_out_on_timeout():
+    coordinator = DataFlowCoordinator({})
+    flow = coordinator.data_flows['price_feeds_to_arbitrage']
+    flow.batch_timeout = 0.05
+
+    async def run():
+        for i in range(3):
+            await coordinator.send_data('price_feeds', PRICE, {'price': 1.0 + i})
+        assert await coordinator._flush_due_batches() == 0
+        await asyncio.sleep(0.06)
+        assert await coordinator._flush_due_batches() == 1
+        return drain(coordinator, 'arbitrage_engine')
+
+    engine = asyncio.run(run())
+    assert [len(p.data) for p in engine] == [3]
+    assert flow.last_activity is not None
+
+
+def test_flow_rate_limit_holds_batches_at_the_boundary():
+    coordinator = DataFlowCoordinator({})
+    flow = coordinator.data_flows['price_feeds_to_arbitrage']
+    flow.flow_rate_limit = 20.0  # packets per second: two batches of ten at once, then one per 0.5s
+    coordinator._compile_routes()
+
+    async def run():
+        for i in range(30):
+            await coordinator.send_data('price_feeds', PRICE, {'price': 1.0 + i})
+        assert len(drain(coordinator, 'arbitrage_engine')) == 2
+        assert await coordinator._flush_due_batches() == 0
+        await asyncio.sleep(0.55)
+        assert await coordinator._flush_due_batches() == 1
+        return drain(coordinator, 'arbitrage_engine')
+
+    engine = asyncio.run(run())
+    assert [len(p.data) for p in engine] == [10]
+    stats = coordinator.get_flow_statistics()['batching']['price_feeds_to_arbitrage']
+    assert stats['batches'] == 3 and stats['packets'] == 30
+    assert stats['throttled'] >= 2
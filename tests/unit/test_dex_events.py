@@ -0,0 +1,154 @@
+"""
+Unit tests for pool log scanning and dispatch in the DEX event monitor.
+
+Uses a scripted eth namespace: get_logs serves logs from a list filtered by
+block range, and raises a scripted error first when one is queued.
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("web3")
+
+# dex_events only needs the emitter's types; RecordingEmitter below stands in
+# for it, so a bare module is enough where arbitrage_bot is not installed
+try:
+    import arbitrage_bot.core.events.event_emitter  # noqa: F401
+except ImportError:
+    import types
+    event_emitter = types.ModuleType("arbitrage_bot.core.events.event_emitter")
+    event_emitter.Event = event_emitter.EventEmitter = object
+    for name in ("arbitrage_bot", "arbitrage_bot.core", "arbitrage_bot.core.events"):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    sys.modules[event_emitter.__name__] = event_emitter
+
+from eth_abi import encode as abi_encode
+from web3 import Web3
+
+from dexmind.dex_events import DEXEventMonitor, PoolLogScanner, _PoolInfo
+
+SYNC_TOPIC = "0x" + Web3.keccak(text="Sync(uint112,uint112)").hex().removeprefix("0x")
+POOL = "0x" + "ab" * 20
+
+
+class ScriptedEth:
+    def __init__(self, logs, errors=()):
+        self.logs = logs
+        self.errors = list(errors)
+        self.requests = []
+
+    async def get_logs(self, params):
+        self.requests.append((params["fromBlock"], params["toBlock"]))
+        if self.errors:
+            error = self.errors.pop(0)
+            if error:
+                raise ValueError(error)
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    async def get_block(self, number):
+        return {"timestamp": 1_700_000_000 + number}
+
+
+class ScriptedWeb3Manager:
+    def __init__(self, eth):
+        self.w3 = type("W3", (), {"eth": eth})()
+
+
+class RecordingEmitter:
+    def __init__(self):
+        self.events = []
+
+    async def emit(self, name, event, source=None):
+        self.events.append((name, event))
+
+
+def sync_log(block, log_index, reserve0, reserve1, tx="11", **extra):
+    return {
+        "address": POOL,
+        "topics": [SYNC_TOPIC],
+        "data": abi_encode(["uint112", "uint112"], [reserve0, reserve1]),
+        "blockNumber": block,
+        "logIndex": log_index,
+        "transactionHash": "0x" + tx * 32,
+        **extra,
+    }
+
+
+def scanner_for(eth, **kwargs):
+    return PoolLogScanner(ScriptedWeb3Manager(eth), [SYNC_TOPIC], **kwargs)
+
+
+def test_oversized_ranges_are_halved_and_grow_back():
+    logs = [sync_log(block, 0, 1, 1) for block in range(100, 120)]
+    eth = ScriptedEth(logs, errors=["query returned more than 10000 results", None,
+                                    "Log response size exceeded"])
+    scanner = scanner_for(eth, max_block_range=16)
+
+    found = asyncio.run(scanner.scan([POOL], 100, 131))
+
+    assert [log["blockNumber"] for log in found] == list(range(100, 120))
+    assert eth.requests == [(100, 115), (100, 107), (108, 123), (108, 115), (116, 131)]
+    assert scanner.stats["splits"] == 2 and scanner.stats["logs"] == 20
+
+
+def test_rate_limits_back_off_without_splitting():
+    eth = ScriptedEth([sync_log(100, 0, 1, 1)],
+                      errors=["429 Client Error: Too Many Requests", "request rate exceeded"])
+    scanner = scanner_for(eth, max_block_range=50, rate_limit_backoff=0.001)
+
+    found = asyncio.run(scanner.scan([POOL], 100, 149))
+
+    assert len(found) == 1
+    assert eth.requests == [(100, 149)] * 3
+    assert scanner.stats["rate_limited"] == 2 and scanner.stats["splits"] == 0
+
+
+def test_persistent_rate_limit_and_other_errors_are_raised():
+    eth = ScriptedEth([], errors=["Too Many Requests"] * 3)
+    scanner = scanner_for(eth, rate_limit_retries=2, rate_limit_backoff=0.001)
+    with pytest.raises(ValueError, match="Too Many Requests"):
+        asyncio.run(scanner.scan([POOL], 100, 149))
+    assert len(eth.requests) == 3
+
+    eth = ScriptedEth([], errors=["execution reverted"])
+    with pytest.raises(ValueError, match="reverted"):
+        asyncio.run(scanner_for(eth).scan([POOL], 100, 149))
+
+
+def monitor_with(emitter):
+    monitor = DEXEventMonitor(emitter, ScriptedWeb3Manager(ScriptedEth([])))
+    monitor._pools[POOL] = _PoolInfo("uniswap_v2", Web3.to_checksum_address(POOL), "0xtoken0", "0xtoken1")
+    return monitor
+
+
+def test_sync_logs_update_reserves_in_order_once():
+    emitter = RecordingEmitter()
+    monitor = monitor_with(emitter)
+    newest = sync_log(12, 3, 500, 700, tx="33")
+
+    # Out of order, with a duplicate and a log removed by a reorg
+    asyncio.run(monitor._dispatch_logs([
+        newest,
+        sync_log(10, 0, 100, 200),
+        sync_log(10, 0, 100, 200),
+        sync_log(11, 1, 999, 999, tx="22", removed=True),
+    ]))
+
+    assert [(name, event.block_number) for name, event in emitter.events] == [("dex:sync", 10), ("dex:sync", 12)]
+    reserves = monitor.get_pool_reserves(POOL.upper().replace("0X", "0x"))
+    assert (reserves.reserve0, reserves.reserve1) == (Decimal(500), Decimal(700))
+    assert reserves.timestamp == 1_700_000_012
+    assert reserves.token0_address == "0xtoken0"
+
+    # A later scan re-delivering an old Sync neither re-emits nor rolls the reserves back
+    asyncio.run(monitor._dispatch_logs([newest, sync_log(11, 0, 1, 1, tx="44")]))
+    assert len(emitter.events) == 2
+    assert monitor.get_pool_reserves(POOL).reserve0 == Decimal(500)
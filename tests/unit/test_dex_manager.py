@@ -0,0 +1,93 @@
+"""
+Unit tests for DEXManager's cross-DEX opportunity sizing.
+"""
+
+import asyncio
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from dex.amm_math import optimal_arbitrage_input
+from dex.dex_manager import DEXManager
+
+DEFAULT_DEXS = ('uniswap_v3', 'sushiswap', 'coingecko', '1inch', 'paraswap', 'stablecoin_specialist')
+
+
+class PricedDex:
+    """Adapter stand-in with a fixed price and liquidity."""
+
+    def __init__(self, price, liquidity=None):
+        self.price = price
+        self.liquidity = liquidity
+
+    async def get_price(self, base_token, quote_token):
+        return self.price
+
+    async def get_liquidity(self, base_token, quote_token):
+        return self.liquidity
+
+
+def manager_with(dexs):
+    manager = DEXManager({'dexs': {name: {'enabled': False} for name in DEFAULT_DEXS}})
+    manager.dexs = dexs
+    manager.connected_dexs = list(dexs)
+    return manager
+
+
+def pair(base, quote, reserve0, reserve1):
+    return {'base_token': base, 'quote_token': quote, 'reserve0': reserve0, 'reserve1': reserve1, 'fee_bps': 30}
+
+
+def test_amm_sizing_is_valued_at_the_quote_token_price():
+    # _find_common_pairs sorts symbols, so USDC/WETH is quoted in WETH
+    all_pairs = {
+        'cheap': [pair('USDC', 'WETH', 2_000_000, 1000)],
+        'rich': [pair('USDC', 'WETH', 2_000_000, 1010)],
+    }
+    manager = manager_with({'cheap': PricedDex(0.0005), 'rich': PricedDex(0.000505)})
+
+    opportunity = asyncio.run(manager._check_arbitrage_opportunity('USDC', 'WETH', all_pairs, 0.1))
+
+    buy, _, _ = manager._find_pool(all_pairs['cheap'], 'USDC', 'WETH')
+    sell, _, _ = manager._find_pool(all_pairs['rich'], 'USDC', 'WETH')
+    # Spend WETH (token1) on USDC where USDC is cheap, sell the USDC back where it is rich
+    amount_in, profit = optimal_arbitrage_input(buy, False, sell, True)
+    assert opportunity['sizing'] == 'amm'
+    assert opportunity['trade_size_quote'] == amount_in / DEXManager.AMM_UNIT
+    assert opportunity['estimated_profit_quote'] == profit / DEXManager.AMM_UNIT
+    # One WETH is worth 1 / 0.0005 = $2000
+    assert opportunity['max_trade_size_usd'] == pytest.approx(opportunity['trade_size_quote'] * 2000)
+    assert opportunity['estimated_profit_usd'] == pytest.approx(opportunity['estimated_profit_quote'] * 2000)
+    assert 1000 < opportunity['max_trade_size_usd'] < 20_000
+
+
+def test_stable_quote_token_counts_at_par():
+    all_pairs = {
+        'cheap': [pair('WETH', 'USDC', 1000, 2_000_000)],
+        'rich': [pair('WETH', 'USDC', 1000, 2_020_000)],
+    }
+    manager = manager_with({'cheap': PricedDex(2000.0), 'rich': PricedDex(2020.0)})
+
+    opportunity = asyncio.run(manager._check_arbitrage_opportunity('WETH', 'USDC', all_pairs, 0.1))
+
+    assert opportunity['sizing'] == 'amm'
+    assert opportunity['max_trade_size_usd'] == opportunity['trade_size_quote']
+
+
+def test_unpriced_quote_token_falls_back_to_the_liquidity_heuristic():
+    all_pairs = {
+        'cheap': [pair('ARB', 'WETH', 1_000_000, 500)],
+        'rich': [pair('ARB', 'WETH', 1_000_000, 505)],
+    }
+    manager = manager_with({'cheap': PricedDex(0.0005, 200_000.0), 'rich': PricedDex(0.000505, 300_000.0)})
+
+    opportunity = asyncio.run(manager._check_arbitrage_opportunity('ARB', 'WETH', all_pairs, 0.1))
+
+    assert opportunity['sizing'] == 'liquidity_heuristic'
+    assert opportunity['max_trade_size_usd'] == 2000.0
+    assert opportunity['trade_size_quote'] is None
@@ -0,0 +1,152 @@
+"""
+Unit tests for the array-backed arbitrage graph store.
+
+Each test checks the store against a plain dict of
+(from_token, to_token, dex) -> (price, liquidity, fee, direction).
+"""
+
+import math
+import random
+
+import numpy as np
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.arbitrage.graph_store import ArrayGraphStore, BACKWARD, FORWARD, build_csr
+
+EDGES = [
+    ("WETH", "USDC", "uniswap", 2000.0, 1e6, 0.003, FORWARD),
+    ("USDC", "WETH", "uniswap", 1 / 2000.0, 1e6, 0.003, BACKWARD),
+    ("WETH", "USDC", "sushi", 2010.0, 5e5, 0.003, FORWARD),
+    ("USDC", "DAI", "curve", 1.0, 2e6, 0.0004, FORWARD),
+    ("DAI", "WETH", "sushi", 0.0005, 0.0, 0.003, FORWARD),
+    ("WETH", "ARB", "camelot", 0.0, 1e4, 0.003, FORWARD),
+]
+
+
+def out_edges_by_name(store):
+    """token -> sorted (to_token, dex) pairs, read through the CSR index."""
+    return {
+        token: sorted((store.token_names[store.dst[e]], store.dex_names[store.dex_id[e]])
+                      for e in store.out_edges(token))
+        for token in store.tokens
+    }
+
+
+def reference_out_edges(reference):
+    adjacency = {}
+    for from_token, to_token, dex in reference:
+        adjacency.setdefault(from_token, []).append((to_token, dex))
+        adjacency.setdefault(to_token, [])
+    return {token: sorted(edges) for token, edges in adjacency.items()}
+
+
+class TestArrayGraphStore:
+    """Test suite for ArrayGraphStore."""
+
+    def test_load_builds_csr_over_every_edge(self):
+        store = ArrayGraphStore(capacity=2)
+        # Repeated keys: the later row wins
+        store.load(EDGES + [("WETH", "USDC", "sushi", 2020.0, 6e5, 0.003, FORWARD)])
+
+        reference = {edge[:3]: edge[3:] for edge in EDGES}
+        reference[("WETH", "USDC", "sushi")] = (2020.0, 6e5, 0.003, FORWARD)
+        assert store.edge_count == len(reference)
+        assert store.tokens == {"WETH", "USDC", "DAI", "ARB"}
+        assert out_edges_by_name(store) == reference_out_edges(reference)
+
+        offsets, edge_ids = store.csr()
+        assert offsets[0] == 0 and offsets[-1] == len(edge_ids) == store.edge_count
+        assert all(np.all(store.src[edge_ids[offsets[u]:offsets[u + 1]]] == u) for u in range(store.node_count))
+
+        for key, (price, liquidity, fee, direction) in reference.items():
+            edge = store.edge_dict(store.find_edge(*key))
+            assert (edge["from_token"], edge["to_token"], edge["dex"]) == key
+            assert edge["liquidity"] == liquidity and edge["fee"] == fee
+            assert edge["direction"] == ("forward" if direction == FORWARD else "backward")
+            if price > 0:
+                assert math.isclose(edge["price"], price)
+
+    def test_weights_and_usable_mask(self):
+        store = ArrayGraphStore()
+        store.load(EDGES)
+        weights = store.weights()
+
+        edge = store.find_edge("WETH", "USDC", "uniswap")
+        assert math.isclose(weights[edge], -math.log(2000.0 * (1 - 0.003)))
+        # A zero price can never be traded
+        assert weights[store.find_edge("WETH", "ARB", "camelot")] == np.inf
+
+        usable = store.usable_mask(min_liquidity=1.0, weights=weights)
+        assert not usable[store.find_edge("DAI", "WETH", "sushi")]
+        assert not usable[store.find_edge("WETH", "ARB", "camelot")]
+        assert usable.sum() == len(EDGES) - 2
+
+    def test_delta_updates_keep_ids_and_rebuild_csr_only_on_topology_changes(self):
+        store = ArrayGraphStore(capacity=2)
+        store.load(EDGES)
+        edge = store.find_edge("WETH", "USDC", "uniswap")
+        csr = store.csr()
+
+        # Repricing an edge is in place: same id, same CSR
+        assert store.set_edge("WETH", "USDC", "uniswap", 2100.0, 9e5, 0.003) == edge
+        assert math.isclose(store.edge_dict(edge)["price"], 2100.0)
+        assert store.csr() is csr
+
+        # Removal deactivates; tokens without active edges disappear
+        assert store.remove_edge("WETH", "ARB", "camelot") is not None
+        assert store.remove_edge("WETH", "ARB", "camelot") is None
+        assert not store.has_token("ARB") and "ARB" in store.token_ids
+        assert store.csr() is not csr
+        assert store.find_edge("WETH", "ARB", "camelot") is None
+
+        # Re-adding reuses the slot; new edges grow the arrays
+        assert store.set_edge("WETH", "ARB", "camelot", 1500.0, 1e4, 0.003) == len(EDGES) - 1
+        new_edge = store.set_edge("ARB", "GMX", "camelot", 0.02, 3e4, 0.003)
+        assert new_edge == len(EDGES)
+        assert store.has_token("GMX") and store.edge_count == len(EDGES) + 1
+        assert [store.edge_dict(e)["to_token"] for e in store.out_edges("ARB")] == ["GMX"]
+
+    def test_random_deltas_match_a_dict_model(self):
+        rng = random.Random(7)
+        tokens = [f"T{i}" for i in range(40)]
+        dexes = ["uniswap", "sushi", "curve"]
+        store = ArrayGraphStore(capacity=4)
+        reference = {}
+
+        def random_key():
+            from_token, to_token = rng.sample(tokens, 2)
+            return from_token, to_token, rng.choice(dexes)
+
+        initial = [random_key() + (rng.uniform(0.5, 2.0), 1e5, 0.003, FORWARD) for _ in range(200)]
+        store.load(initial)
+        reference.update({edge[:3]: edge[3] for edge in initial})
+
+        # Enough inserts to push the recent-slot buffer through a merge
+        for _ in range(3000):
+            key = random_key()
+            if rng.random() < 0.2 and key in reference:
+                store.remove_edge(*key)
+                del reference[key]
+            else:
+                price = rng.uniform(0.5, 2.0)
+                store.set_edge(*key, price, 1e5)
+                reference[key] = price
+
+        assert store.edge_count == len(reference)
+        for key, price in reference.items():
+            edge = store.find_edge(*key)
+            assert edge is not None and math.isclose(store.edge_dict(edge)["price"], price)
+        present = {key[0] for key in reference} | {key[1] for key in reference}
+        assert store.tokens == present
+        assert out_edges_by_name(store) == reference_out_edges(reference)
+
+
+def test_build_csr_groups_by_source_and_keeps_order():
+    src = np.array([2, 0, 2, 1, 0], dtype=np.int32)
+    offsets, ordered = build_csr(src, np.array([0, 1, 2, 4]), node_count=4)
+    assert offsets.tolist() == [0, 2, 2, 4, 4]
+    assert ordered.tolist() == [1, 4, 0, 2]
@@ -0,0 +1,108 @@
+"""
+Unit tests for the Multicall3 path of MulticallBalanceChecker.
+
+Runs against an in-process EVM (eth-tester) with a Vyper stand-in for
+Multicall3 and a minimal ERC20; see tests/fixtures/multicall.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("eth_tester")
+
+from web3 import Web3, EthereumTesterProvider
+
+from utils.multicall_balance_checker import MulticallBalanceChecker
+
+CONTRACTS = json.loads(
+    (Path(__file__).parent.parent / "fixtures" / "multicall" / "contracts.json").read_text()
+)
+
+
+def _deploy(w3, name, *args):
+    contract = w3.eth.contract(abi=CONTRACTS[name]["abi"], bytecode=CONTRACTS[name]["bytecode"])
+    tx_hash = contract.constructor(*args).transact({"from": w3.eth.accounts[0]})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return w3.eth.contract(address=receipt.contractAddress, abi=CONTRACTS[name]["abi"])
+
+
+@pytest.fixture
+def chain():
+    w3 = Web3(EthereumTesterProvider())
+    multicall = _deploy(w3, "Multicall3Standin")
+    wallet = w3.eth.accounts[1]
+    deployer = w3.eth.accounts[0]
+
+    tokens = {"ETH": "0x0000000000000000000000000000000000000000"}
+    for name, decimals, amount in [("WETH", 18, 2 * 10**18), ("USDC", 6, 1500 * 10**6), ("ARB", 18, 0)]:
+        token = _deploy(w3, "TestToken", decimals)
+        if amount:
+            token.functions.mint(wallet, amount).transact({"from": deployer})
+        tokens[name] = token.address
+
+    checker = MulticallBalanceChecker({"arbitrum": w3}, multicall_address=multicall.address)
+    checker.token_addresses = {"arbitrum": tokens}
+    checker.eth_price_usd = 2000.0
+    return w3, checker, wallet
+
+
+class TestMulticallBalanceChecker:
+    """Test suite for the aggregate3 balance path."""
+
+    def test_reads_all_balances_in_one_call(self, chain):
+        w3, checker, wallet = chain
+
+        result = asyncio.run(checker.get_all_token_balances_fast(wallet, "arbitrum"))
+
+        assert result["success"]
+        assert result["rpc_calls"] == 1
+        balances = result["balances"]
+        assert balances["ETH"]["balance_wei"] == w3.eth.get_balance(wallet)
+        assert balances["WETH"]["balance_tokens"] == 2.0
+        assert balances["WETH"]["balance_usd"] == 4000.0
+        assert balances["USDC"]["balance_tokens"] == 1500.0
+        assert balances["ARB"]["balance_wei"] == 0
+        assert checker.token_decimals[("arbitrum", "USDC")] == 6
+
+    def test_chunks_large_call_lists(self, chain):
+        _, checker, wallet = chain
+        checker.max_calls_per_batch = 2
+
+        result = asyncio.run(checker.get_all_token_balances_fast(wallet, "arbitrum"))
+
+        # 1 native + 3 balanceOf + 3 decimals reads
+        assert result["rpc_calls"] == 4
+        assert result["balances"]["USDC"]["balance_tokens"] == 1500.0
+
+        # Decimals are cached, so the next sweep only reads balances
+        result = asyncio.run(checker.get_all_token_balances_fast(wallet, "arbitrum"))
+        assert result["rpc_calls"] == 2
+
+    def test_failed_token_read_is_skipped(self, chain):
+        w3, checker, wallet = chain
+        # An address without code returns no data for balanceOf
+        checker.token_addresses["arbitrum"]["DAI"] = w3.eth.accounts[5]
+
+        result = asyncio.run(checker.get_specific_token_balances(wallet, ["USDC", "DAI"], "arbitrum"))
+
+        assert result["success"]
+        assert set(result["balances"]) == {"USDC"}
+
+    def test_falls_back_without_multicall(self, chain):
+        w3, checker, wallet = chain
+        checker.multicall_address = Web3.to_checksum_address(w3.eth.accounts[6])
+        checker.multicall_contracts.clear()
+
+        result = asyncio.run(checker.get_specific_token_balances(wallet, ["ETH", "USDC"], "arbitrum"))
+
+        assert result["success"]
+        assert result["rpc_calls"] == 2
+        assert result["balances"]["USDC"]["balance_tokens"] == 1500.0
@@ -0,0 +1,139 @@
+"""
+Unit tests for the local per-chain nonce manager.
+"""
+
+import threading
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from execution.nonce_manager import NonceManager
+
+
+class FakeNode:
+    """Pending transaction counts per chain, counting lookups."""
+
+    def __init__(self, **pending):
+        self.pending = pending
+        self.lookups = 0
+
+    def __call__(self, chain):
+        self.lookups += 1
+        return self.pending[chain]
+
+
+class TestNonceManager:
+    """Test suite for NonceManager."""
+
+    def test_reserves_locally_after_one_lookup(self):
+        node = FakeNode(arbitrum=7, base=0)
+        manager = NonceManager(node)
+
+        assert [manager.reserve('arbitrum') for _ in range(3)] == [7, 8, 9]
+        assert manager.reserve('base') == 0
+        assert node.lookups == 2
+
+    def test_released_nonce_is_reused_first(self):
+        manager = NonceManager(FakeNode(arbitrum=0))
+        first, second, third = (manager.reserve('arbitrum') for _ in range(3))
+
+        manager.release('arbitrum', second)
+        manager.mark_sent('arbitrum', first)
+        manager.mark_sent('arbitrum', third)
+
+        assert manager.reserve('arbitrum') == second
+        assert manager.reserve('arbitrum') == 3
+
+    def test_releasing_top_nonces_rewinds_counter(self):
+        manager = NonceManager(FakeNode(arbitrum=0))
+        nonces = [manager.reserve('arbitrum') for _ in range(3)]
+
+        manager.release('arbitrum', nonces[1])
+        manager.release('arbitrum', nonces[2])
+
+        assert manager.reserve('arbitrum') == 1
+        assert manager.reserve('arbitrum') == 2
+        assert manager.reserve('arbitrum') == 3
+
+    def test_release_is_idempotent(self):
+        manager = NonceManager(FakeNode(arbitrum=0))
+        nonce = manager.reserve('arbitrum')
+        manager.reserve('arbitrum')
+
+        manager.release('arbitrum', nonce)
+        manager.release('arbitrum', nonce)
+
+        assert manager.reserve('arbitrum') == nonce
+        assert manager.reserve('arbitrum') == 2
+
+    def test_nonce_too_low_resyncs_to_node(self):
+        node = FakeNode(arbitrum=0)
+        manager = NonceManager(node)
+        nonce = manager.reserve('arbitrum')
+
+        # Another process on the same wallet sent five transactions
+        node.pending['arbitrum'] = 5
+        manager.handle_send_error('arbitrum', nonce, ValueError("nonce too low: next nonce 5, tx nonce 0"))
+
+        assert manager.reserve('arbitrum') == 5
+        assert node.lookups == 2
+
+    def test_resync_refills_dropped_nonces(self):
+        node = FakeNode(arbitrum=0)
+        manager = NonceManager(node)
+        for _ in range(3):
+            manager.mark_sent('arbitrum', manager.reserve('arbitrum'))
+        held = manager.reserve('arbitrum')
+
+        # The node only kept the first transaction; 1 and 2 were dropped
+        node.pending['arbitrum'] = 1
+        manager.sync('arbitrum')
+
+        assert [manager.reserve('arbitrum') for _ in range(3)] == [1, 2, held + 1]
+
+    def test_other_send_errors_release(self):
+        node = FakeNode(arbitrum=3)
+        manager = NonceManager(node)
+
+        def failing_send(nonce):
+            raise ValueError("insufficient funds for gas * price + value")
+
+        with pytest.raises(ValueError):
+            manager.submit('arbitrum', failing_send)
+
+        assert manager.submit('arbitrum', lambda nonce: nonce) == 3
+        assert node.lookups == 1
+
+    def test_replace_requires_used_nonce(self):
+        manager = NonceManager(FakeNode(arbitrum=0))
+        nonce = manager.reserve('arbitrum')
+        manager.mark_sent('arbitrum', nonce)
+
+        assert manager.replace('arbitrum', nonce) == nonce
+        with pytest.raises(ValueError):
+            manager.replace('arbitrum', nonce + 1)
+        # A replacement does not advance the counter
+        assert manager.reserve('arbitrum') == 1
+
+    def test_concurrent_reservations_are_unique(self):
+        manager = NonceManager(FakeNode(arbitrum=0))
+        reserved = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(200):
+                nonce = manager.reserve('arbitrum')
+                with lock:
+                    reserved.append(nonce)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(reserved) == list(range(1600))
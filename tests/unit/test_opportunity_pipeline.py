@@ -0,0 +1,211 @@
+"""
+Unit tests for the staged scan → filter → execute opportunity pipeline.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.core.opportunity_pipeline import OpportunityPipeline
+
+
+def opp(name):
+    return {'opportunity_id': name, 'token': 'WETH'}
+
+
+def test_scans_overlap_execution():
+    executed = []
+
+    async def keep_all(opportunities):
+        return opportunities
+
+    async def slow_execute(opportunities):
+        await asyncio.sleep(0.1)
+        executed.append([o['opportunity_id'] for o in opportunities])
+
+    async def run():
+        pipeline = OpportunityPipeline(keep_all, slow_execute, max_age_seconds=10,
+                                       scan_queue_size=4, execute_queue_size=1)
+        pipeline.start()
+        started = time.perf_counter()
+        # Six 20ms scans; the scanner never waits for the 100ms executions
+        for i in range(6):
+            scan_started = time.monotonic()
+            await asyncio.sleep(0.02)
+            pipeline.submit([opp(f"scan{i}")], key='arbitrum', scan_started=scan_started)
+        scanning = time.perf_counter() - started
+        await asyncio.sleep(0.25)
+        await pipeline.stop()
+        return scanning, pipeline.get_stats()
+
+    scanning, stats = asyncio.run(run())
+    assert scanning < 0.2
+    # The first scan executes; the one-slot execute queue keeps only the newest after it
+    assert executed[0] == ['scan0']
+    assert executed[-1] == ['scan5']
+    assert stats['execute']['dropped_overflow'] > 0
+    assert stats['scan']['processed'] == 6
+    assert stats['scan']['service_time']['p50_ms'] >= 15
+    assert stats['execute']['service_time']['avg_ms'] >= 90
+    assert stats['execute']['queue_capacity'] == 1
+
+
+def test_stale_results_are_not_handed_to_execution():
+    executed = []
+
+    async def slow_filter(opportunities):
+        await asyncio.sleep(0.08)
+        return opportunities
+
+    async def execute(opportunities):
+        executed.append(opportunities)
+
+    async def run():
+        pipeline = OpportunityPipeline(slow_filter, execute, max_age_seconds=0.05)
+        pipeline.start()
+        pipeline.submit([opp("old")], key='base')
+        await asyncio.sleep(0.15)
+        await pipeline.stop()
+        return pipeline.get_stats()
+
+    stats = asyncio.run(run())
+    assert executed == []
+    assert stats['filter']['processed'] == 1
+    assert stats['filter']['dropped_stale'] == 1
+
+
+def test_queued_scan_is_skipped_when_a_newer_one_for_its_chain_arrives():
+    filtered = []
+
+    async def record_filter(opportunities):
+        filtered.append(opportunities[0]['opportunity_id'])
+        await asyncio.sleep(0.03)
+        return []
+
+    async def execute(opportunities):
+        pass
+
+    async def run():
+        pipeline = OpportunityPipeline(record_filter, execute, max_age_seconds=10)
+        pipeline.start()
+        pipeline.submit([opp("arb1")], key='arbitrum')
+        await asyncio.sleep(0.005)
+        # Queued behind arb1 while it is being filtered
+        pipeline.submit([opp("arb2")], key='arbitrum')
+        pipeline.submit([opp("op1")], key='optimism')
+        pipeline.submit([opp("arb3")], key='arbitrum')
+        await asyncio.sleep(0.15)
+        await pipeline.stop()
+        return pipeline.get_stats()
+
+    stats = asyncio.run(run())
+    assert filtered == ['arb1', 'op1', 'arb3']
+    assert stats['filter']['dropped_stale'] == 1
+    assert stats['filter']['max_depth'] == 3
+
+
+def test_stop_lets_a_running_execution_finish():
+    finished = []
+
+    async def keep_all(opportunities):
+        return opportunities
+
+    async def execute(opportunities):
+        await asyncio.sleep(0.05)
+        finished.append(opportunities[0]['opportunity_id'])
+
+    async def run():
+        pipeline = OpportunityPipeline(keep_all, execute, max_age_seconds=10)
+        pipeline.start()
+        pipeline.submit([opp("trade")])
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+        assert not pipeline.submit([opp("late")])
+
+    asyncio.run(run())
+    assert finished == ['trade']
+
+
+def test_queued_execution_is_skipped_when_a_newer_batch_for_its_chain_passes_the_filter():
+    executed = []
+
+    async def keep_all(opportunities):
+        return opportunities
+
+    async def slow_execute(opportunities):
+        await asyncio.sleep(0.05)
+        executed.append(opportunities[0]['opportunity_id'])
+
+    async def run():
+        pipeline = OpportunityPipeline(keep_all, slow_execute, max_age_seconds=10, execute_queue_size=4)
+        pipeline.start()
+        # arb2 and op1 pass the filter while arb1 executes; arb3 then passes behind arb2
+        for name, key in (('arb1', 'arbitrum'), ('arb2', 'arbitrum'), ('op1', 'optimism'), ('arb3', 'arbitrum')):
+            pipeline.submit([opp(name)], key=key)
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.2)
+        await pipeline.stop()
+        return pipeline.get_stats()
+
+    stats = asyncio.run(run())
+    assert executed == ['arb1', 'op1', 'arb3']
+    assert stats['filter']['dropped_stale'] == 0
+    assert stats['execute']['dropped_stale'] == 1
+
+
+def test_scan_time_counts_toward_the_max_age():
+    executed = []
+
+    async def keep_all(opportunities):
+        return opportunities
+
+    async def execute(opportunities):
+        executed.append(opportunities)
+
+    async def run():
+        pipeline = OpportunityPipeline(keep_all, execute, max_age_seconds=0.5)
+        pipeline.start()
+        # The scan itself took longer than the max age
+        pipeline.submit([opp("slow_scan")], key='base', scan_started=time.monotonic() - 1.0)
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+        return pipeline.get_stats()
+
+    stats = asyncio.run(run())
+    assert executed == []
+    assert stats['filter']['dropped_stale'] == 1
+
+
+def test_master_rechecks_busy_routes_right_before_executing():
+    pytest.importorskip("psutil")
+    pytest.importorskip("web3")
+    from src.core.master_arbitrage_system import MasterArbitrageSystem
+
+    executed = []
+
+    class RecordingExecutor:
+        async def execute_arbitrage(self, opportunity, wallet_private_key=None):
+            executed.append(opportunity['opportunity_id'])
+            return {'success': True, 'profit_usd': 1.0}
+
+    def route(name, token, chain):
+        return {'opportunity_id': name, 'token': token, 'direction': 'buy',
+                'source_chain': chain, 'target_chain': chain, 'estimated_profit_usd': 5.0}
+
+    system = MasterArbitrageSystem({})
+    system.executor = RecordingExecutor()
+    system.execution_settings['max_concurrent_executions'] = 3
+    # Started after this batch passed the filter
+    system.active_executions['running'] = {'route_key': 'WETH_arbitrum_arbitrum'}
+
+    asyncio.run(system._execute_opportunities([route('dup', 'WETH', 'arbitrum'), route('free', 'ARB', 'base')]))
+
+    assert executed == ['free']
+    assert list(system.active_executions) == ['running']
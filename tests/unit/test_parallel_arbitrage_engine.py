@@ -0,0 +1,127 @@
+"""
+Unit tests for the ParallelArbitrageEngine deadline-aware scheduler.
+"""
+
+import asyncio
+import time
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.core.parallel_arbitrage_engine import LatencyHistogram, OpportunityTask, ParallelArbitrageEngine
+
+
+class RecordingEngine(ParallelArbitrageEngine):
+    """Engine whose preparation step records what runs and for how long."""
+
+    def __init__(self, prepare_seconds=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.prepare_seconds = prepare_seconds
+        self.started = []
+        self.running = 0
+        self.peak_by_chain = {}
+
+    async def _prepare_opportunity(self, opportunity):
+        chain = opportunity['source_chain']
+        self.started.append(opportunity['token'])
+        self.running += 1
+        self.peak_by_chain[chain] = max(self.peak_by_chain.get(chain, 0),
+                                        sum(1 for t in self.active_tasks.values()
+                                            if t.opportunity['source_chain'] == chain))
+        try:
+            await asyncio.sleep(self.prepare_seconds)
+        finally:
+            self.running -= 1
+        return {'success': True}
+
+
+def opp(token, chain='arbitrum', buy='uniswap', sell='sushiswap', profit=1.0, age=0.0):
+    return {'token': token, 'source_chain': chain, 'buy_dex': buy, 'sell_dex': sell,
+            'estimated_profit_usd': profit, 'discovered_at': time.time() - age}
+
+
+def task(opportunity, priority, timeout=30.0):
+    return OpportunityTask(opportunity['token'], opportunity, 'validate_and_prepare', priority, time.time(), timeout)
+
+
+def test_tasks_start_in_priority_then_deadline_order():
+    engine = RecordingEngine(max_workers=2, max_concurrent=1)
+
+    async def run():
+        tasks = [task(opp('low'), 9), task(opp('urgent', age=10.0), 3),
+                 task(opp('high'), 3), task(opp('mid'), 5)]
+        results = await engine._process_tasks_parallel(tasks)
+        await engine.stop()
+        return results
+
+    results = asyncio.run(run())
+    # Same priority: the older opportunity has the earlier deadline
+    assert engine.started == ['urgent', 'high', 'mid', 'low']
+    assert all(result['success'] for result in results)
+    stats = engine.get_performance_stats()
+    assert stats['tasks_processed'] == 4
+    assert stats['queue_wait']['count'] == 4
+    assert stats['service_time']['p50_ms'] >= 20
+
+
+def test_concurrency_is_bounded_per_chain_and_per_dex():
+    engine = RecordingEngine(prepare_seconds=0.05, max_workers=4, max_concurrent=8,
+                             max_per_chain=2, max_per_dex=3)
+
+    async def run():
+        opportunities = [opp(f"arb{i}", 'arbitrum', 'uniswap', f"dex{i}") for i in range(4)]
+        opportunities += [opp(f"base{i}", 'base', 'uniswap', f"dex{i}") for i in range(4)]
+        started = time.perf_counter()
+        results = await engine._process_tasks_parallel([task(o, 5) for o in opportunities])
+        elapsed = time.perf_counter() - started
+        await engine.stop()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+    assert len(results) == 8 and all(result['success'] for result in results)
+    assert engine.peak_by_chain == {'arbitrum': 2, 'base': 2}
+    # 'uniswap' is on every route, so at most three run at once overall
+    assert engine.get_performance_stats()['concurrent_tasks_peak'] == 3
+    assert elapsed >= 0.15
+
+
+def test_stale_opportunities_are_dropped_or_cancelled():
+    engine = RecordingEngine(prepare_seconds=0.5, max_workers=2, max_concurrent=1,
+                             max_opportunity_age=0.3)
+
+    async def run():
+        # The first runs past its deadline and is cancelled; the second goes
+        # stale waiting behind it and never starts
+        tasks = [task(opp('slow', age=0.1), 1), task(opp('queued', age=0.1), 2)]
+        started = time.perf_counter()
+        results = await engine._process_tasks_parallel(tasks)
+        elapsed = time.perf_counter() - started
+        await engine.stop()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+    assert engine.started == ['slow']
+    assert [result['success'] for result in results] == [False, False]
+    assert 'during processing' in results[0]['error']
+    assert 'before processing' in results[1]['error']
+    assert elapsed < 0.4
+    stats = engine.get_performance_stats()
+    assert stats['tasks_cancelled_running'] == 1
+    assert stats['tasks_expired'] == 1
+    assert engine.running == 0
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in [1] * 90 + [40] * 9 + [700]:
+        histogram.observe(ms / 1000)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    assert snapshot['p50_ms'] == 1
+    assert snapshot['p95_ms'] == 50
+    assert snapshot['p99_ms'] == 50
+    assert snapshot['max_ms'] == 700
+    assert snapshot['buckets'] == {'<=1ms': 90, '<=50ms': 9, '<=1000ms': 1}
@@ -0,0 +1,133 @@
+"""
+Unit tests for the persistent factory pool index.
+
+Uses a scripted eth namespace: creation logs are served from a list and
+filtered by block range, address and topic like eth_getLogs.
+"""
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("web3")
+
+from dex.pool_index import FactorySource, PoolIndex, PAIR_CREATED_TOPIC, POOL_CREATED_TOPIC
+
+V2_FACTORY = '0x' + '11' * 20
+V3_FACTORY = '0x' + '22' * 20
+WETH = '0x' + 'aa' * 20
+USDC = '0x' + 'bb' * 20
+ARB = '0x' + 'cc' * 20
+DECIMALS = {WETH: 18, USDC: 6, ARB: 18}
+
+
+def _word(value) -> bytes:
+    if isinstance(value, str):
+        return bytes(12) + bytes.fromhex(value[2:])
+    return value.to_bytes(32, 'big', signed=value < 0)
+
+
+def pair_created(block, token0, token1, pair):
+    return {
+        'address': V2_FACTORY, 'blockNumber': block,
+        'topics': [bytes.fromhex(PAIR_CREATED_TOPIC[2:]), _word(token0), _word(token1)],
+        'data': _word(pair) + _word(1),
+    }
+
+
+def pool_created(block, token0, token1, fee, pool):
+    return {
+        'address': V3_FACTORY, 'blockNumber': block,
+        'topics': [bytes.fromhex(POOL_CREATED_TOPIC[2:]), _word(token0), _word(token1), _word(fee)],
+        'data': _word(60) + _word(pool),
+    }
+
+
+class ScriptedEth:
+    """The parts of w3.eth the index uses."""
+
+    def __init__(self, logs, block_number, max_span=None):
+        self.logs = logs
+        self.block_number = block_number
+        self.max_span = max_span
+        self.requests = []
+
+    def get_logs(self, params):
+        start, end = params['fromBlock'], params['toBlock']
+        if self.max_span and end - start + 1 > self.max_span:
+            raise ValueError("query returned more than 10000 results")
+        self.requests.append((start, end, len(params['address'])))
+        addresses = {address.lower() for address in params['address']}
+        return [
+            log for log in self.logs
+            if start <= log['blockNumber'] <= end and log['address'].lower() in addresses
+        ]
+
+    def contract(self, **kwargs):
+        raise ValueError("no Multicall3 here")
+
+    def call(self, tx):
+        return DECIMALS[tx['to'].lower()].to_bytes(32, 'big')
+
+
+class ScriptedWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+FACTORIES = [
+    FactorySource(dex='sushiswap', address=V2_FACTORY, kind='v2', start_block=100),
+    FactorySource(dex='uniswap_v3', address=V3_FACTORY, kind='v3', start_block=500),
+]
+
+
+@pytest.fixture
+def logs():
+    return [
+        pair_created(150, WETH, USDC, '0x' + '01' * 20),
+        pair_created(900, ARB, WETH, '0x' + '02' * 20),
+        pool_created(600, WETH, USDC, 500, '0x' + '03' * 20),
+        pool_created(700, USDC, ARB, 3000, '0x' + '04' * 20),
+    ]
+
+
+def test_backfill_indexes_pools_with_fee_and_decimals(tmp_path, logs):
+    eth = ScriptedEth(logs, block_number=1000, max_span=400)
+    index = PoolIndex(ScriptedWeb3(eth), 'arbitrum', FACTORIES, path=tmp_path / 'arbitrum.json',
+                      max_block_range=1000)
+
+    assert index.sync() == 4
+    assert index.stats['range_splits'] > 0
+    # Every request carries both factories once the V3 factory is live
+    assert all(count == 2 for start, end, count in eth.requests if end >= 500)
+
+    weth_usdc = index.pools_for(USDC, WETH)
+    assert {(pool.dex, pool.fee) for pool in weth_usdc} == {('sushiswap', 3000), ('uniswap_v3', 500)}
+    v3 = index.pools_for(WETH, USDC, dex='uniswap_v3')[0]
+    assert (v3.token0_decimals, v3.token1_decimals) == (18, 6)
+
+    among = index.pools_among([WETH, USDC])
+    assert [pool.address.lower() for pool in among] == ['0x' + '01' * 20, '0x' + '03' * 20]
+    assert len(index.pools(dex='uniswap_v3')) == 2
+
+
+def test_restart_resumes_from_saved_cursor(tmp_path, logs):
+    path = tmp_path / 'arbitrum.json'
+    mined_by_800 = [log for log in logs if log['blockNumber'] <= 800]
+    first = PoolIndex(ScriptedWeb3(ScriptedEth(mined_by_800, block_number=800)), 'arbitrum', FACTORIES, path=path)
+    first.sync()
+    assert len(first) == 3
+
+    eth = ScriptedEth(logs, block_number=1000)
+    second = PoolIndex(ScriptedWeb3(eth), 'arbitrum', FACTORIES, path=path)
+    assert second.load()
+    assert len(second) == 3
+    assert second.pool('0x' + '03' * 20).fee == 500
+
+    assert second.sync() == 1
+    assert eth.requests == [(801, 1000, 2)]
+    assert len(second.pools_for(ARB, WETH)) == 1
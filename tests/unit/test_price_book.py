@@ -0,0 +1,137 @@
+"""
+Unit tests for the (chain, token) price book behind RealTimePriceFeeds.
+
+The running best ask/bid and the detected spread are checked after every
+update against the scan they replaced: a dict of "token_dex_chain" keys
+searched for every venue pair of the updated token.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from feeds.price_book import PriceBook, TokenBook
+
+# Venue names without underscores: the old cache key split on them
+DEXES = ["uniswap", "sushiswap", "camelot", "curve"]
+CHAINS = ["arbitrum", "base"]
+TOKENS = {"WETH": 2000.0, "ARB": 1.1}
+
+
+def updates(count, seed=11):
+    """A fixed update stream: small moves around each token's base price."""
+    rng = random.Random(seed)
+    stream = []
+    for timestamp in range(count):
+        token = rng.choice(list(TOKENS))
+        stream.append(dict(
+            token=token, dex=rng.choice(DEXES), chain=rng.choice(CHAINS),
+            price=TOKENS[token] * rng.uniform(0.99, 1.01), timestamp=float(timestamp),
+        ))
+    return stream
+
+
+def cache_scan(price_cache, token, chain):
+    """The previous detection pass; returns its opportunities as tuples."""
+    token_prices = {}
+    for cache_key, price_data in price_cache.items():
+        parts = cache_key.split('_')
+        if len(parts) >= 3:
+            if parts[0] == token and parts[2] == chain:
+                token_prices[parts[1]] = price_data['price']
+
+    opportunities = []
+    dex_prices = list(token_prices.items())
+    for i in range(len(dex_prices)):
+        for j in range(i + 1, len(dex_prices)):
+            (dex_a, price_a), (dex_b, price_b) = dex_prices[i], dex_prices[j]
+            if price_a > 0 and price_b > 0:
+                price_diff_pct = abs(price_a - price_b) / min(price_a, price_b) * 100
+                if price_diff_pct > 0.1:
+                    if price_a < price_b:
+                        opportunities.append((dex_a, price_a, dex_b, price_b, price_diff_pct))
+                    else:
+                        opportunities.append((dex_b, price_b, dex_a, price_a, price_diff_pct))
+    return token_prices, opportunities
+
+
+def test_best_prices_match_the_cache_scan_after_every_update():
+    book = PriceBook()
+    price_cache = {}
+
+    for update in updates(400):
+        quote = SimpleNamespace(**update)
+        book.update(update['chain'], update['token'], update['dex'], quote)
+        price_cache[f"{update['token']}_{update['dex']}_{update['chain']}"] = {'price': update['price']}
+
+        token_book = book.book(update['chain'], update['token'])
+        token_prices, opportunities = cache_scan(price_cache, update['token'], update['chain'])
+        assert {dex: q.price for dex, q in token_book.quotes.items()} == token_prices
+        assert token_book.best_ask == min(token_prices, key=token_prices.get)
+        assert token_book.best_bid == max(token_prices, key=token_prices.get)
+
+        # The book reports the widest of the pairs the scan found
+        spread = token_book.spread()
+        if len(token_prices) < 2:
+            assert spread is None
+        else:
+            buy_dex, buy_quote, sell_dex, sell_quote = spread
+            if opportunities:
+                widest = max(opportunities, key=lambda opportunity: opportunity[4])
+                assert (buy_dex, buy_quote.price, sell_dex, sell_quote.price) == widest[:4]
+
+    assert len(book) == len(price_cache)
+
+
+def test_removing_the_best_venue_rescans():
+    book = TokenBook()
+    for venue, price in (("a", 10.0), ("b", 12.0), ("c", 11.0)):
+        book.update(venue, SimpleNamespace(price=price))
+    assert (book.best_ask, book.best_bid) == ("a", "b")
+
+    # Worsening the best ask and removing the best bid both fall back to the others
+    book.update("a", SimpleNamespace(price=13.0))
+    assert (book.best_ask, book.best_bid) == ("c", "a")
+    book.remove("a")
+    assert (book.best_ask, book.best_bid) == ("c", "b")
+    book.remove("b")
+    assert book.spread() is None
+    book.remove("c")
+    assert (book.best_ask, book.best_bid) == (None, None)
+
+
+def test_feed_detection_reports_the_cache_scans_widest_pair():
+    pytest.importorskip("websockets")
+    from feeds.realtime_price_feeds import PriceUpdate, RealTimePriceFeeds
+
+    feeds = RealTimePriceFeeds()
+    price_cache = {}
+
+    async def run():
+        for update in updates(200, seed=5):
+            update = PriceUpdate(**update)
+            await feeds._process_price_update(update)
+            price_cache[f"{update.token}_{update.dex}_{update.chain}"] = {'price': update.price}
+
+            found = await feeds._detect_arbitrage_opportunities(update)
+            _, opportunities = cache_scan(price_cache, update.token, update.chain)
+            if not opportunities:
+                assert found == []
+                continue
+            widest = max(opportunities, key=lambda opportunity: opportunity[4])
+            assert len(found) == 1
+            opportunity = found[0]
+            assert (opportunity['buy_dex'], opportunity['buy_price'],
+                    opportunity['sell_dex'], opportunity['sell_price']) == widest[:4]
+            assert opportunity['price_difference_pct'] == pytest.approx(widest[4])
+            assert feeds.get_latest_price(update.token, update.dex, update.chain) == update.price
+
+    asyncio.run(run())
@@ -0,0 +1,114 @@
+"""
+Unit tests for the token x venue price matrix.
+
+top_spreads is checked against the per-token sort and nested loop that
+MultiDEXAggregator used before the matrix, on a small fixed quote set.
+"""
+
+import math
+from types import SimpleNamespace
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from feeds.price_matrix import PriceMatrix
+
+# token -> {(dex, chain): price}
+PRICES = {
+    "WETH": {("uniswap_v3", "arbitrum"): 2000.0, ("sushiswap", "arbitrum"): 2012.0,
+             ("camelot", "arbitrum"): 1994.0, ("uniswap_v3", "base"): 2031.0},
+    "ARB": {("uniswap_v3", "arbitrum"): 1.10, ("camelot", "arbitrum"): 1.1165,
+            ("sushiswap", "arbitrum"): 1.104},
+    "GMX": {("camelot", "arbitrum"): 41.0, ("sushiswap", "arbitrum"): 40.0},
+    "USDC": {("uniswap_v3", "arbitrum"): 1.0, ("uniswap_v3", "base"): 1.0002},
+    "PEPE": {("uniswap_v3", "base"): 0.0},
+}
+
+
+def build_quotes():
+    return [
+        SimpleNamespace(token=token, dex_name=dex, chain=chain, price=price)
+        for token, venues in PRICES.items()
+        for (dex, chain), price in venues.items()
+    ]
+
+
+def nested_loop_spreads(quotes, min_profit_percentage):
+    """The pre-matrix pass: sort each token's quotes and try every low/high pair."""
+    token_prices = {}
+    for quote in quotes:
+        token_prices.setdefault(quote.token, []).append(quote)
+
+    spreads = []
+    for token, prices in token_prices.items():
+        prices.sort(key=lambda x: x.price)
+        for i, low_price in enumerate(prices[:-1]):
+            for high_price in prices[i + 1:]:
+                if low_price.price > 0 and high_price.price > 0:
+                    profit_pct = (high_price.price - low_price.price) / low_price.price * 100
+                    if profit_pct >= min_profit_percentage:
+                        spreads.append((token, (low_price.dex_name, low_price.chain),
+                                        (high_price.dex_name, high_price.chain), profit_pct))
+    spreads.sort(key=lambda spread: spread[3], reverse=True)
+    return spreads
+
+
+def matrix_spreads(matrix, min_profit_percentage, top_k):
+    spreads, survivors = matrix.top_spreads(min_profit_percentage, top_k)
+    named = [(token, matrix.venues[buy], matrix.venues[sell], profit) for token, buy, sell, profit in spreads]
+    return named, survivors
+
+
+def assert_same_spreads(actual, expected):
+    assert [spread[:3] for spread in actual] == [spread[:3] for spread in expected]
+    assert all(math.isclose(a[3], e[3]) for a, e in zip(actual, expected))
+
+
+def test_top_spreads_match_the_nested_loop():
+    quotes = build_quotes()
+    matrix = PriceMatrix(quotes)
+    assert matrix.shape == (4, 4)
+
+    for min_profit in (0.01, 0.3, 0.8, 1.5, 50.0):
+        expected = nested_loop_spreads(build_quotes(), min_profit)
+        actual, survivors = matrix_spreads(matrix, min_profit, top_k=100)
+        assert survivors == len(expected)
+        assert_same_spreads(actual, expected)
+
+
+def test_top_k_keeps_the_most_profitable_spreads():
+    matrix = PriceMatrix(build_quotes())
+    expected = nested_loop_spreads(build_quotes(), 0.01)
+
+    actual, survivors = matrix_spreads(matrix, 0.01, top_k=3)
+
+    assert survivors == len(expected) > 3
+    assert_same_spreads(actual, expected[:3])
+    assert matrix_spreads(matrix, 0.01, top_k=0) == ([], 0)
+
+
+def test_quote_returns_the_original_object_and_later_quotes_replace_earlier_ones():
+    first = SimpleNamespace(token="WETH", dex_name="uniswap_v3", chain="arbitrum", price=2000.0)
+    second = SimpleNamespace(token="WETH", dex_name="uniswap_v3", chain="arbitrum", price=2005.0)
+    other = SimpleNamespace(token="WETH", dex_name="sushiswap", chain="arbitrum", price=2000.0)
+    matrix = PriceMatrix([first, other, second])
+
+    assert matrix.quote("WETH", 0) is second
+    spreads, _ = matrix.top_spreads(0.0, 10)
+    assert spreads == [("WETH", 1, 0, (2005.0 - 2000.0) / 2000.0 * 100)]
+
+
+def test_equal_prices_count_once():
+    quotes = [
+        SimpleNamespace(token="USDC", dex_name=dex, chain="arbitrum", price=1.0)
+        for dex in ("uniswap_v3", "sushiswap", "camelot")
+    ]
+    matrix = PriceMatrix(quotes)
+
+    spreads, survivors = matrix.top_spreads(0.0, 10)
+
+    assert survivors == len(nested_loop_spreads(quotes, 0.0)) == 3
+    assert sorted((buy, sell) for _, buy, sell, _ in spreads) == [(0, 1), (0, 2), (1, 2)]
@@ -0,0 +1,118 @@
+"""
+Unit tests for the detector's lock-free quote cache and its use in CrossDexDetector.
+"""
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.core.detection.quote_cache import QuoteCache
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = QuoteCache(ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Decimal("2500")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch("WETH/USDC", fetch) for _ in range(20)))
+
+    assert asyncio.run(run()) == [Decimal("2500")] * 20
+    assert len(calls) == 1
+    assert cache.stats['coalesced'] == 19
+    assert cache.get("WETH/USDC") == Decimal("2500")
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_not_cached():
+    cache = QuoteCache(ttl=60)
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("no route")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch("k", failing) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(attempts) == 1
+    assert cache.get("k") is None
+
+    asyncio.run(run())
+    assert len(attempts) == 2
+
+
+def test_entries_expire_individually():
+    cache = QuoteCache(ttl=60)
+    cache.set("short", 1, ttl=0)
+    cache.set("long", 2)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_fetch():
+    cache = QuoteCache(ttl=60)
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 7
+
+    async def run():
+        owner = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await owner
+
+    assert asyncio.run(run()) == 7
+    assert cache.get("k") == 7
+
+
+def test_size_bound_drops_oldest_entries():
+    cache = QuoteCache(ttl=60, max_entries=10)
+    for i in range(11):
+        cache.set(i, i)
+    assert len(cache) == 9
+    assert cache.get(0) is None and cache.get(10) == 10
+
+
+def test_detector_quotes_each_direction_once_across_pair_groups():
+    pytest.importorskip("web3")
+    from src.core.detection.cross_dex_detector import CrossDexDetector
+
+    quotes = []
+
+    class QuotingDex:
+        id = "sushiswap"
+
+        async def get_amounts_out(self, amount, path):
+            quotes.append(tuple(path))
+            await asyncio.sleep(0.01)
+            return [amount, Decimal("2500") if path[0] == "WETH" else Decimal("0.0004")]
+
+    detector = CrossDexDetector([], {"cache_ttl_seconds": 5})
+    dex = QuotingDex()
+    pair = SimpleNamespace(token0_address="WETH", token1_address="USDC")
+
+    async def run():
+        return await asyncio.gather(*(detector._get_token_pair_prices(dex, pair) for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert results == [(Decimal("2500"), Decimal("0.0004"))] * 50
+    assert sorted(quotes) == [("USDC", "WETH"), ("WETH", "USDC")]
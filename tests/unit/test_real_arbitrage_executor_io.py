@@ -0,0 +1,286 @@
+"""
+Latency tests for RealArbitrageExecutor's non-blocking RPC path.
+
+Runs against an in-process EVM (eth-tester) behind a provider that adds a
+fixed delay to every request, and checks the event loop keeps serving other
+tasks while swaps and approvals are built, sent and confirmed.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("eth_tester")
+
+from eth_account import Account
+from web3 import Web3, EthereumTesterProvider
+
+from execution.allowance_manager import MAX_UINT256, AllowanceManager
+from execution.real_arbitrage_executor import RealArbitrageExecutor
+
+CONTRACTS = json.loads(
+    (Path(__file__).parent.parent / "fixtures" / "execution" / "contracts.json").read_text()
+)
+
+RPC_LATENCY = 0.05
+
+
+class SlowProvider(EthereumTesterProvider):
+    """eth-tester provider that models a remote node's round trip."""
+
+    def __init__(self):
+        super().__init__()
+        self.latency = 0.0
+        self.methods = []
+        self._lock = threading.Lock()
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        time.sleep(self.latency)
+        # eth-tester is not thread-safe; a real node serializes for us
+        with self._lock:
+            return super().make_request(method, params)
+
+
+class LoopMonitor:
+    """Ticks on the event loop and records the longest gap between ticks."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.ticks = 0
+        self.max_gap = 0.0
+        self._task = None
+
+    async def _run(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self.max_gap = max(self.max_gap, now - last - self.interval)
+            self.ticks += 1
+            last = now
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.fixture
+def executor():
+    provider = SlowProvider()
+    w3 = Web3(provider)
+
+    contract = w3.eth.contract(abi=CONTRACTS["WETHStandin"]["abi"], bytecode=CONTRACTS["WETHStandin"]["bytecode"])
+    receipt = w3.eth.wait_for_transaction_receipt(
+        contract.constructor().transact({"from": w3.eth.accounts[0]})
+    )
+    weth = w3.eth.contract(address=receipt.contractAddress, abi=CONTRACTS["WETHStandin"]["abi"])
+
+    account = Account.create()
+    w3.eth.send_transaction({"from": w3.eth.accounts[0], "to": account.address, "value": 10**19})
+
+    executor = RealArbitrageExecutor({'alchemy_api_key': 'test-key-0000', 'receipt_poll_interval': 0.01})
+    executor.web3_connections['arbitrum'] = w3
+    executor.wallet_account = account
+    executor.allowance_manager = AllowanceManager(account.address)
+    executor.token_addresses['arbitrum']['WETH'] = weth.address
+
+    provider.latency = RPC_LATENCY
+    yield w3, executor, weth
+    asyncio.run(executor.cleanup())
+
+
+class TestNonBlockingExecution:
+    """The event loop stays responsive while trades are in flight."""
+
+    def test_swap_does_not_block_event_loop(self, executor):
+        w3, executor, weth = executor
+
+        async def run():
+            monitor = LoopMonitor()
+            monitor.start()
+            start = time.perf_counter()
+            result = await executor._execute_dex_swap_fast(w3, 'arbitrum', 'uniswap_v3', 'ETH', 'WETH', 10**17)
+            elapsed = time.perf_counter() - start
+            await monitor.stop()
+            return result, elapsed, monitor
+
+        result, elapsed, monitor = asyncio.run(run())
+
+        assert result['success'], result
+        assert weth.functions.balanceOf(executor.wallet_account.address).call() == 10**17
+        # The swap spans several round trips, yet the loop never stalls for one
+        assert elapsed > 3 * RPC_LATENCY
+        assert monitor.max_gap < RPC_LATENCY / 2
+        assert monitor.ticks >= elapsed / monitor.interval / 2
+
+    def test_weth_conversion_does_not_block_event_loop(self, executor):
+        w3, executor, weth = executor
+
+        hits = executor.abi_registry.stats['contract_hits']
+
+        async def run():
+            monitor = LoopMonitor()
+            monitor.start()
+            start = time.perf_counter()
+            # The non-fast swap path hands ETH <-> WETH to _execute_weth_conversion
+            deposit = await executor._execute_dex_swap(w3, 'arbitrum', 'uniswap_v3', 'ETH', 'WETH', 10**17)
+            withdrawal = await executor._execute_dex_swap(w3, 'arbitrum', 'uniswap_v3', 'WETH', 'ETH', 4 * 10**16)
+            elapsed = time.perf_counter() - start
+            await monitor.stop()
+            return deposit, withdrawal, elapsed, monitor
+
+        deposit, withdrawal, elapsed, monitor = asyncio.run(run())
+
+        assert deposit['success'] and withdrawal['success'], (deposit, withdrawal)
+        assert weth.functions.balanceOf(executor.wallet_account.address).call() == 6 * 10**16
+        # The second conversion reuses the registry's WETH contract
+        assert executor.abi_registry.stats['contract_hits'] > hits
+        assert elapsed > 3 * RPC_LATENCY
+        assert monitor.max_gap < RPC_LATENCY / 2
+        assert monitor.ticks >= elapsed / monitor.interval / 2
+
+    def test_approval_does_not_block_event_loop(self, executor):
+        w3, executor, weth = executor
+        router = w3.eth.accounts[3]
+
+        async def run():
+            monitor = LoopMonitor()
+            monitor.start()
+            start = time.perf_counter()
+            result = await executor._ensure_token_approval(w3, 'arbitrum', weth.address, router, 10**18)
+            elapsed = time.perf_counter() - start
+            await monitor.stop()
+            return result, elapsed, monitor
+
+        result, elapsed, monitor = asyncio.run(run())
+
+        assert result['success'], result
+        assert weth.functions.allowance(executor.wallet_account.address, router).call() == 2**256 - 1
+        assert monitor.max_gap < RPC_LATENCY / 2
+        assert monitor.ticks >= elapsed / monitor.interval / 2
+
+    def test_independent_preparations_overlap(self, executor):
+        w3, executor, weth = executor
+        routers = w3.eth.accounts[3:7]
+
+        def check(router):
+            return executor._ensure_token_approval(w3, 'arbitrum', weth.address, router, 0)
+
+        async def one_by_one():
+            return [await check(router) for router in routers]
+
+        async def together():
+            return await asyncio.gather(*(check(router) for router in routers))
+
+        start = time.perf_counter()
+        sequential = asyncio.run(one_by_one())
+        sequential_time = time.perf_counter() - start
+
+        executor.allowance_manager = AllowanceManager(executor.wallet_account.address)
+        start = time.perf_counter()
+        concurrent = asyncio.run(together())
+        concurrent_time = time.perf_counter() - start
+
+        assert all(result['success'] for result in sequential + concurrent)
+        # Nothing to approve, so each check is a single allowance read; the
+        # reads overlap instead of queueing behind one another
+        assert concurrent_time < sequential_time / 2
+
+    def test_back_to_back_sends_skip_nonce_lookup(self, executor):
+        w3, executor, weth = executor
+        router = w3.eth.accounts[3]
+
+        async def run():
+            deposit = await executor._execute_dex_swap_fast(w3, 'arbitrum', 'uniswap_v3', 'ETH', 'WETH', 10**17)
+            # Approval is only broadcast; the withdrawal goes out right behind it
+            approval = await executor._ensure_token_approval(
+                w3, 'arbitrum', weth.address, router, 10**18, wait_for_receipt=False
+            )
+            withdrawal = await executor._execute_dex_swap_fast(w3, 'arbitrum', 'uniswap_v3', 'WETH', 'ETH', 10**17)
+            return deposit, approval, withdrawal
+
+        deposit, approval, withdrawal = asyncio.run(run())
+        lookups = w3.provider.methods.count('eth_getTransactionCount')
+
+        assert deposit['success'] and withdrawal['success']
+        assert approval['pending']
+        assert weth.functions.allowance(executor.wallet_account.address, router).call() == 2**256 - 1
+        # One sync for the first transaction, then local reservations only
+        assert lookups == 1
+        assert w3.eth.get_transaction_count(executor.wallet_account.address) == 3
+
+
+class TestAllowanceWarmup:
+    """Approvals are settled at startup so trades skip allowance RPCs."""
+
+    def test_warmed_pairs_skip_allowance_rpc(self, executor):
+        w3, executor, weth = executor
+        routers = w3.eth.accounts[3:5]
+        executor.token_addresses['arbitrum'] = {'ETH': executor.token_addresses['arbitrum']['ETH'], 'WETH': weth.address}
+        executor.dex_routers['arbitrum'] = {'sushiswap': routers[0], 'camelot': routers[1], 'ramses': routers[1]}
+
+        sent = asyncio.run(executor.warm_token_approvals(['arbitrum']))
+
+        assert sent == {'arbitrum': 2}
+        for router in routers:
+            assert weth.functions.allowance(executor.wallet_account.address, router).call() == MAX_UINT256
+
+        async def trade_checks():
+            return [
+                await executor._ensure_token_approval(w3, 'arbitrum', weth.address, router, 10**18)
+                for router in routers
+            ]
+
+        requests_before = len(w3.provider.methods)
+        start = time.perf_counter()
+        results = asyncio.run(trade_checks())
+        elapsed = time.perf_counter() - start
+
+        assert all(result['success'] and 'pending' not in result for result in results)
+        assert len(w3.provider.methods) == requests_before
+        assert elapsed < RPC_LATENCY
+
+    def test_router_spend_updates_cached_allowance(self, executor):
+        w3, executor, weth = executor
+        spec = CONTRACTS["RouterStandin"]
+        receipt = w3.eth.wait_for_transaction_receipt(
+            w3.eth.contract(abi=spec["abi"], bytecode=spec["bytecode"]).constructor().transact({"from": w3.eth.accounts[0]})
+        )
+        router = w3.eth.contract(address=receipt.contractAddress, abi=spec["abi"])
+        wallet = executor.wallet_account.address
+
+        async def run():
+            chain_id = w3.eth.chain_id
+            base = {'from': wallet, 'gas': 200000, 'gasPrice': w3.eth.gas_price, 'chainId': chain_id}
+            await executor._execute_dex_swap_fast(w3, 'arbitrum', 'uniswap_v3', 'ETH', 'WETH', 10**18)
+            approval = await executor._send_transaction(
+                w3, 'arbitrum', weth.functions.approve(router.address, 10**17).build_transaction(base)
+            )
+            executor.allowance_manager.apply_receipt('arbitrum', await executor._wait_for_receipt(w3, approval, 10))
+            pull = await executor._send_transaction(
+                w3, 'arbitrum', router.functions.pull(weth.address, 4 * 10**16).build_transaction(base)
+            )
+            executor.allowance_manager.apply_receipt('arbitrum', await executor._wait_for_receipt(w3, pull, 10))
+
+        asyncio.run(run())
+
+        cached = executor.allowance_manager.get('arbitrum', weth.address, router.address)
+        assert cached == 6 * 10**16
+        assert cached == weth.functions.allowance(wallet, router.address).call()
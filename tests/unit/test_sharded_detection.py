@@ -0,0 +1,247 @@
+"""
+Unit tests for chain-sharded detection over a shared-memory price book.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.core.sharded_detection import (
+    RECORD_FIELDS, PriceBookLayout, SharedPriceBook, ShardedDetectionSupervisor, scan_chain,
+)
+
+TOKENS = ['WETH', 'USDC', 'ARB']
+DEXES = ['uniswap_v3', 'camelot', 'sushiswap']
+
+
+def quote(token, dex, price, chain='arbitrum', liquidity=50000.0):
+    return SimpleNamespace(token=token, dex_name=dex, price=price, chain=chain, liquidity=liquidity)
+
+
+class SpreadSource:
+    """Picklable quote source: WETH is 1% cheaper on camelot on every chain."""
+
+    async def __call__(self, chain):
+        return [
+            quote('WETH', 'uniswap_v3', 2500.0, chain), quote('WETH', 'camelot', 2475.0, chain),
+            quote('USDC', 'uniswap_v3', 1.0, chain), quote('USDC', 'camelot', 1.0, chain),
+        ]
+
+
+def test_ring_keeps_the_newest_records_and_reports_losses():
+    layout = PriceBookLayout(['arbitrum'], TOKENS, DEXES, ring_capacity=4)
+    book = SharedPriceBook.create(layout)
+    try:
+        def records(start, count):
+            rows = np.zeros((count, len(RECORD_FIELDS)))
+            rows[:, 0] = np.arange(start, start + count)
+            return rows
+
+        book.push(0, records(0, 3))
+        popped, cursor, lost = book.pop(0, 0)
+        assert popped[:, 0].tolist() == [0, 1, 2] and (cursor, lost) == (3, 0)
+
+        # Six more into a four-slot ring: the reader lost two
+        book.push(0, records(3, 6))
+        popped, cursor, lost = book.pop(0, cursor)
+        assert popped[:, 0].tolist() == [5, 6, 7, 8] and (cursor, lost) == (9, 2)
+        assert book.pop(0, cursor)[0].shape == (0, len(RECORD_FIELDS))
+
+        # A reader attached by name sees the same quotes
+        prices = np.full((3, 3), np.nan)
+        prices[0, 1] = 2500.0
+        book.publish_quotes(0, prices, np.zeros((3, 3)), time.time())
+        other = SharedPriceBook.attach(book.name, layout)
+        snapshot = other.read_quotes(0)
+        assert snapshot[0, 1, 0] == 2500.0 and np.isnan(snapshot[1, 1, 0])
+        assert book.chain_seq[0] == 2
+        other.close()
+    finally:
+        book.close()
+
+
+def test_scan_chain_publishes_spreads_and_triangles():
+    supervisor = ShardedDetectionSupervisor(['arbitrum', 'base'], TOKENS, DEXES, quote_source=SpreadSource())
+    supervisor.book = SharedPriceBook.create(supervisor.layout)
+    try:
+        quotes = [
+            quote('WETH', 'uniswap_v3', 2500.0), quote('WETH', 'camelot', 2475.0),
+            quote('USDC', 'uniswap_v3', 1.0), quote('USDC', 'camelot', 1.0), quote('USDC', 'sushiswap', 1.0),
+            quote('ARB', 'camelot', 1.0), quote('ARB', 'sushiswap', 1.03),
+            quote('PEPE', 'camelot', 0.001),   # not in the book
+        ]
+        published, pushed = scan_chain(supervisor.book, 'arbitrum', quotes, 0.5, 10)
+        assert published == 7 and pushed > 1
+
+        assert supervisor.read_quotes('arbitrum')['WETH'] == {'uniswap_v3': 2500.0, 'camelot': 2475.0}
+        assert supervisor.read_quotes('base') == {}
+
+        opportunities = supervisor.drain_opportunities()
+        simple = [opp for opp in opportunities if opp['type'] == 'simple_arbitrage']
+        assert {(opp['token'], opp['buy_dex'], opp['sell_dex']) for opp in simple} == {
+            ('WETH', 'camelot', 'uniswap_v3'), ('ARB', 'camelot', 'sushiswap')
+        }
+        weth = next(opp for opp in simple if opp['token'] == 'WETH')
+        assert weth['profit_percentage'] == (2500.0 - 2475.0) / 2475.0 * 100
+        assert weth['source_chain'] == 'arbitrum' and weth['liquidity'] == 50000.0
+        assert any(opp['type'] == 'triangular_arbitrage' for opp in opportunities)
+        assert opportunities == sorted(opportunities, key=lambda opp: opp['profit_percentage'], reverse=True)
+
+        # Drained records are not returned twice, and old ones are dropped
+        assert supervisor.drain_opportunities() == []
+        supervisor.max_age_seconds = -1
+        scan_chain(supervisor.book, 'arbitrum', quotes, 0.5, 10)
+        assert supervisor.drain_opportunities(['arbitrum']) == []
+        assert supervisor.stats['dropped_stale'] == pushed
+    finally:
+        supervisor.book.close()
+
+
+def test_shard_processes_scan_their_chains_and_rescale():
+    supervisor = ShardedDetectionSupervisor(['arbitrum', 'base', 'optimism'], TOKENS, DEXES,
+                                            quote_source=SpreadSource(), scan_interval=0.05,
+                                            min_profit_percentage=0.5)
+    supervisor.start()
+    try:
+        assert supervisor.shard_count == 3
+        assert supervisor.assignments == [['arbitrum'], ['base'], ['optimism']]
+
+        def drain_until(chains, timeout=30.0):
+            seen = set()
+            deadline = time.monotonic() + timeout
+            while seen != chains and time.monotonic() < deadline:
+                seen |= {opp['source_chain'] for opp in supervisor.drain_opportunities()}
+                time.sleep(0.05)
+            return seen
+
+        assert drain_until({'arbitrum', 'base', 'optimism'}) == {'arbitrum', 'base', 'optimism'}
+        pids = {process.pid for process in supervisor.processes}
+
+        assert supervisor.scale_in()
+        assert supervisor.shard_count == 2
+        assert supervisor.assignments == [['arbitrum', 'optimism'], ['base']]
+        assert pids.isdisjoint(process.pid for process in supervisor.processes)
+        assert drain_until({'arbitrum', 'base', 'optimism'}) == {'arbitrum', 'base', 'optimism'}
+
+        # One chain per process is the most it will split
+        assert supervisor.scale_to(10) and supervisor.shard_count == 3
+        assert not supervisor.scale_out()
+
+        stats = supervisor.get_stats()
+        assert stats['rebalances'] == 2
+        assert stats['chains']['base']['scans'] >= 1
+        assert 0 <= stats['utilization_pct'] <= 100
+    finally:
+        supervisor.stop()
+    assert not supervisor.running
+
+
+def test_scaling_controller_scales_detection_processes():
+    pytest.importorskip("psutil")
+    from resource_management.scaling_controller import ScalingAction, ScalingController, ScalingTrigger
+
+    class FakeSupervisor:
+        layout = SimpleNamespace(chains=['arbitrum', 'base', 'optimism'])
+
+        def __init__(self):
+            self.shard_count = 1
+            self.load = 95.0
+
+        def utilization(self):
+            return self.load
+
+        def scale_to(self, count):
+            changed = count != self.shard_count
+            self.shard_count = count
+            return changed
+
+    supervisor = FakeSupervisor()
+    controller = ScalingController()
+    controller.register_detection_shards(supervisor)
+
+    async def evaluate():
+        await controller._evaluate_scaling_rules()
+        decisions = [d for d in controller.pending_decisions if d.component == 'detection_shards']
+        controller.pending_decisions = decisions
+        await controller._execute_scaling_decisions()
+        controller.component_policies['detection_shards'].scaling_rules[0].last_triggered = None
+        return decisions
+
+    decisions = asyncio.run(evaluate())
+    assert [d.action for d in decisions] == [ScalingAction.SCALE_OUT]
+    assert decisions[0].trigger == ScalingTrigger.CPU_UTILIZATION
+    assert supervisor.shard_count == 2
+
+    asyncio.run(evaluate())
+    assert supervisor.shard_count == 3
+    # One process per chain is the ceiling
+    assert asyncio.run(evaluate()) == []
+
+    # Back-to-back decisions lower confidence; start the scale-in from a quiet history
+    controller.decision_history['detection_shards'].clear()
+    supervisor.load = 5.0
+    assert [d.action for d in asyncio.run(evaluate())] == [ScalingAction.SCALE_IN]
+    assert supervisor.shard_count == 2
+    metrics = controller.component_metrics['detection_shards']
+    assert (metrics.scale_up_count, metrics.scale_down_count) == (2, 1)
+
+
+def test_check_shards_skips_a_round_while_a_rescale_holds_the_processes():
+    import threading
+
+    supervisor = ShardedDetectionSupervisor(['arbitrum'], TOKENS, DEXES, quote_source=SpreadSource())
+    dead = SimpleNamespace(name='detect-arbitrum', exitcode=1, is_alive=lambda: False)
+    supervisor.processes, supervisor.assignments = [dead], [['arbitrum']]
+    supervisor._start_process = lambda chains: SimpleNamespace(name='restarted', is_alive=lambda: True)
+
+    rescaling, done = threading.Event(), threading.Event()
+
+    def rescale():
+        with supervisor._lock:
+            rescaling.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=rescale)
+    thread.start()
+    rescaling.wait(5)
+    try:
+        assert supervisor.check_shards() == 0
+        assert supervisor.processes == [dead]
+    finally:
+        done.set()
+        thread.join()
+
+    assert supervisor.check_shards() == 1
+    assert supervisor.processes[0].name == 'restarted'
+
+
+def test_master_system_registers_shards_with_the_scaling_controller(monkeypatch):
+    pytest.importorskip("psutil")
+    pytest.importorskip("web3")
+    from src.core.master_arbitrage_system import MasterArbitrageSystem
+    from src.resource_management.scaling_controller import ScalingController
+
+    started = []
+
+    async def start(controller):
+        started.append(controller)
+
+    monkeypatch.setattr(ScalingController, 'start_scaling_controller', start)
+    system = MasterArbitrageSystem({'detection_mode': 'sharded'})
+    assert system.execution_settings['shard_autoscale']
+    system.shard_supervisor = SimpleNamespace(layout=SimpleNamespace(chains=['arbitrum', 'base']), shard_count=2)
+
+    asyncio.run(system._start_shard_scaling())
+
+    assert started == [system.scaling_controller]
+    assert system.scaling_controller.resource_managers['detection_shards'] is system.shard_supervisor
+    assert system.scaling_controller.component_policies['detection_shards'].scaling_rules[0].max_value == 2
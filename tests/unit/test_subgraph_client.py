@@ -0,0 +1,135 @@
+"""
+Unit tests for the batched subgraph client shared by the GraphQL DEX adapters.
+"""
+
+import asyncio
+import re
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from dex.subgraph_client import SubgraphClient, get_subgraph_client
+
+ALIAS = re.compile(r"^\s*(q\d+): pairs\((\w+)\)", re.MULTILINE)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Answers each alias with its argument; a document naming "bad" is rejected whole."""
+
+    def __init__(self):
+        self.documents = []
+        self.closed = False
+
+    def post(self, url, json, headers):
+        document = json['query']
+        self.documents.append(document)
+        selections = ALIAS.findall(document)
+        if any(argument == 'bad' for _, argument in selections):
+            return FakeResponse({'data': None, 'errors': [{'message': 'Unknown argument "bad"'}]})
+        return FakeResponse({'data': {alias: [{'id': argument}] for alias, argument in selections}})
+
+    async def close(self):
+        self.closed = True
+
+
+def test_concurrent_fetches_share_one_document():
+    client = SubgraphClient("https://example.invalid/subgraph")
+    client.session = session = FakeSession()
+
+    async def run():
+        return await asyncio.gather(*(client.fetch('pairs', f"p{i}", "id") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [[{'id': f"p{i}"}] for i in range(5)]
+    assert len(session.documents) == 1
+    assert [alias for alias, _ in ALIAS.findall(session.documents[0])] == [f"q{i}" for i in range(5)]
+    assert client.stats == {'selections': 5, 'requests': 1, 'failed_requests': 0, 'split_batches': 0}
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    client = SubgraphClient("https://example.invalid/subgraph", batch_window=10.0, max_batch_size=3)
+    client.session = session = FakeSession()
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(client.fetch('pairs', f"p{i}", "id") for i in range(3))), timeout=1.0
+        )
+
+    assert len(asyncio.run(run())) == 3
+    assert len(session.documents) == 1
+
+
+def test_rejected_document_is_retried_one_selection_at_a_time():
+    client = SubgraphClient("https://example.invalid/subgraph")
+    client.session = session = FakeSession()
+
+    async def run():
+        return await asyncio.gather(*(client.fetch('pairs', argument, "id") for argument in ('p0', 'bad', 'p2')))
+
+    assert asyncio.run(run()) == [[{'id': 'p0'}], None, [{'id': 'p2'}]]
+    # The batch, then each selection alone
+    assert len(session.documents) == 4
+    assert client.stats['split_batches'] == 1
+    assert client.stats['failed_requests'] == 1
+
+
+def test_client_rebinds_to_a_new_loop_and_closes_its_session():
+    client = SubgraphClient("https://example.invalid/subgraph")
+    first, second = FakeSession(), FakeSession()
+
+    async def fetch_with(session):
+        if client.session is None:
+            client.session = session
+        rows = await client.fetch('pairs', "p0", "id")
+        await client.close()
+        return rows
+
+    client.session = first
+    assert asyncio.run(fetch_with(first)) == [{'id': 'p0'}]
+    lock = client._send_lock
+    assert first.closed and client.session is None
+
+    # A second asyncio.run gets its own lock rather than the first loop's
+    async def second_loop():
+        client._bind()
+        return await fetch_with(second)
+
+    assert asyncio.run(second_loop()) == [{'id': 'p0'}]
+    assert client._send_lock is not lock
+    assert second.closed and len(second.documents) == 1
+
+
+def test_adapters_share_a_client_per_endpoint_and_close_it_on_disconnect():
+    from dex.camelot_adapter import CamelotAdapter
+
+    adapter = CamelotAdapter({})
+    other = get_subgraph_client(adapter.subgraph_url, 0.5)
+    assert other is adapter.subgraph
+    assert other.min_interval == adapter.rate_limit_delay
+
+    async def run():
+        adapter.subgraph._bind()
+        adapter.subgraph.session = session = FakeSession()
+        await adapter.disconnect()
+        return session
+
+    session = asyncio.run(run())
+    assert session.closed and adapter.subgraph.session is None
@@ -0,0 +1,130 @@
+"""
+Unit tests for the sampled, queued trade-path logging pipeline.
+"""
+
+import json
+import logging
+import queue
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from src.utils.trade_log import (
+    CategoryLimit, LazyQueueHandler, configure_limits, get_trade_log, start_trade_logging,
+)
+
+
+class CountingStr:
+    """Field whose rendering is counted."""
+
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "WETH"
+
+
+def capture(trade_log):
+    """Route a trade log into a plain queue and return the queue."""
+    records = queue.Queue()
+    handler = LazyQueueHandler(records)
+    trade_log.logger.addHandler(handler)
+    trade_log.logger.setLevel(logging.DEBUG)
+    trade_log.logger.propagate = False
+    return records
+
+
+def release(trade_log):
+    trade_log.logger.handlers.clear()
+    trade_log.logger.setLevel(logging.NOTSET)
+    trade_log.logger.propagate = True
+
+
+def drain(records):
+    items = []
+    while not records.empty():
+        items.append(records.get_nowait())
+    return items
+
+
+def test_records_are_structured_and_formatted_lazily():
+    trade_log = get_trade_log('test_lazy')
+    records = capture(trade_log)
+    try:
+        token = CountingStr()
+        assert trade_log.info('rejected', "FILTERED OUT: %(token)s at %(profit_usd).2f",
+                              token=token, profit_usd=1.5)
+        assert trade_log.info('plain', "no fields, 100%")
+        first, second = drain(records)
+
+        # Nothing rendered on the calling side
+        assert token.renders == 0
+        assert first.msg == "FILTERED OUT: %(token)s at %(profit_usd).2f"
+        assert (first.category, first.event) == ('test_lazy', 'rejected')
+        assert first.fields == {'token': token, 'profit_usd': 1.5}
+        assert first.getMessage() == "FILTERED OUT: WETH at 1.50"
+        assert token.renders == 1
+        assert second.getMessage() == "no fields, 100%"
+
+        # Below the logger level nothing is built at all
+        trade_log.logger.setLevel(logging.INFO)
+        assert not trade_log.debug('skipped', "%(token)s", token=token)
+        assert records.empty()
+    finally:
+        release(trade_log)
+
+
+def test_sampling_and_rate_limits_count_what_they_drop():
+    sampled = get_trade_log('test_sampled')
+    limited = get_trade_log('test_limited')
+    configure_limits({
+        'test_sampled': CategoryLimit(sample_every=3),
+        'test_limited': CategoryLimit(max_per_second=0.001, burst=2),
+    })
+    sampled_records, limited_records = capture(sampled), capture(limited)
+    try:
+        kept = [sampled.info('tick', "tick %(n)d", n=n) for n in range(7)]
+        assert kept == [True, False, False, True, False, False, True]
+        assert [r.fields for r in drain(sampled_records)] == [
+            {'n': 0}, {'n': 3, 'suppressed': 2}, {'n': 6, 'suppressed': 2}
+        ]
+
+        assert [limited.info('tick', "tick %(n)d", n=n) for n in range(5)] == [True, True, False, False, False]
+        assert len(drain(limited_records)) == 2
+        assert (limited.gate.emitted, limited.gate.dropped) == (2, 3)
+    finally:
+        release(sampled)
+        release(limited)
+
+
+def test_pipeline_writes_jsonl_from_a_background_thread(tmp_path):
+    path = tmp_path / "trade.jsonl"
+    trade_log = get_trade_log('test_jsonl')
+    pipeline = start_trade_logging(str(path), console=False, level=logging.DEBUG)
+    try:
+        assert not logging.getLogger('trade').propagate
+        trade_log.info('viable', "✅ VIABLE: %(token)s", token='WETH', profit_usd=2.5)
+        trade_log.debug('sample_price', "%(price).4f", price=2500.0)
+    finally:
+        pipeline.stop()
+
+    assert logging.getLogger('trade').propagate
+    entries = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [(e['level'], e['cat'], e['event']) for e in entries] == [
+        ('INFO', 'test_jsonl', 'viable'), ('DEBUG', 'test_jsonl', 'sample_price')
+    ]
+    assert entries[0]['token'] == 'WETH' and entries[0]['profit_usd'] == 2.5
+    assert pipeline.get_stats()['written'] == 2
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = LazyQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord('trade.test', logging.INFO, __file__, 1, "msg", None, None)
+    for _ in range(3):
+        handler.emit(record)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
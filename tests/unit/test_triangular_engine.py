@@ -0,0 +1,99 @@
+"""
+Unit tests for the triangular route search over per-venue pair quotes.
+
+find_triangles is checked against the brute-force loop it replaced: every
+ordered token triple on a chain, every venue for each leg, with the leg
+rate price(in) / price(out) taken at a venue quoting both tokens.
+"""
+
+import itertools
+import math
+from types import SimpleNamespace
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from feeds.price_matrix import PriceMatrix
+from feeds.triangular_engine import TriangularEngine
+
+# (dex, chain) -> {token: USD price}
+VENUES = {
+    ("uniswap_v3", "arbitrum"): {"WETH": 2000.0, "USDC": 1.0, "ARB": 1.10, "GMX": 40.0},
+    ("sushiswap", "arbitrum"): {"WETH": 2016.0, "USDC": 1.001, "ARB": 1.092},
+    ("camelot", "arbitrum"): {"WETH": 1991.0, "ARB": 1.117, "GMX": 40.6},
+    ("uniswap_v3", "base"): {"WETH": 2004.0, "USDC": 0.9995, "DEGEN": 0.012},
+    ("aerodrome", "base"): {"WETH": 1998.0, "DEGEN": 0.0122},
+    # Two tokens only: no triangle on this chain
+    ("velodrome", "optimism"): {"WETH": 2000.0, "OP": 2.0},
+}
+
+
+def build_matrix():
+    return PriceMatrix(
+        SimpleNamespace(token=token, dex_name=dex, chain=chain, price=price)
+        for (dex, chain), prices in VENUES.items()
+        for token, price in prices.items()
+    )
+
+
+def brute_force_triangles(matrix, min_profit_percentage):
+    """Best route per triangle, keyed by (chain, tokens) from its earliest matrix token."""
+    best = {}
+    chains = {chain for _, chain in VENUES}
+    for chain in chains:
+        venues = [(dex, prices) for (dex, venue_chain), prices in VENUES.items() if venue_chain == chain]
+        tokens = sorted({token for _, prices in venues for token in prices}, key=matrix.token_index.get)
+        for route in itertools.permutations(tokens, 3):
+            if route[0] != min(route, key=matrix.token_index.get):
+                continue
+            legs = list(zip(route, route[1:] + route[:1]))
+            leg_quotes = [
+                [(prices[token_in] / prices[token_out], dex)
+                 for dex, prices in venues if token_in in prices and token_out in prices]
+                for token_in, token_out in legs
+            ]
+            for combo in itertools.product(*leg_quotes):
+                profit = (math.prod(rate for rate, _ in combo) - 1) * 100
+                key = (chain, route)
+                if profit >= min_profit_percentage and profit > best.get(key, (-math.inf,))[0]:
+                    best[key] = (profit, tuple(dex for _, dex in combo))
+    return best
+
+
+def test_triangles_match_the_brute_force_search():
+    matrix = build_matrix()
+    engine = TriangularEngine(matrix)
+    assert set(engine.indexes) == {"arbitrum", "base"}
+
+    for min_profit in (0.01, 0.5, 1.0, 2.0):
+        expected = brute_force_triangles(matrix, min_profit)
+        triangles = engine.find_triangles(min_profit, top_k=100)
+
+        assert {(t.chain, t.tokens) for t in triangles} == set(expected)
+        for triangle in triangles:
+            profit, dexes = expected[(triangle.chain, triangle.tokens)]
+            assert math.isclose(triangle.profit_percentage, profit)
+            assert triangle.dexes == dexes
+            assert math.isclose(math.prod(triangle.rates), 1 + profit / 100)
+        assert [t.profit_percentage for t in triangles] == sorted(
+            (t.profit_percentage for t in triangles), reverse=True)
+
+
+def test_top_k_keeps_the_most_profitable_triangles():
+    matrix = build_matrix()
+    expected = sorted((profit for profit, _ in brute_force_triangles(matrix, 0.01).values()), reverse=True)
+
+    triangles = TriangularEngine(matrix).find_triangles(0.01, top_k=2)
+
+    assert len(expected) > 2
+    assert all(math.isclose(t.profit_percentage, profit) for t, profit in zip(triangles, expected[:2]))
+
+
+def test_start_price_is_the_first_leg_venue_quote():
+    matrix = build_matrix()
+    for triangle in TriangularEngine(matrix).find_triangles(0.01, top_k=100):
+        start = VENUES[(triangle.dexes[0], triangle.chain)][triangle.tokens[0]]
+        assert triangle.start_price == start
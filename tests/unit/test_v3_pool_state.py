@@ -0,0 +1,147 @@
+"""
+Unit tests for the Uniswap V3 tick-level pool mirror and its swap simulation.
+"""
+
+import asyncio
+import math
+import random
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("web3")
+
+from dex.v3_pool_state import (
+    BURN_TOPIC, MAX_SQRT_RATIO, MAX_TICK, MIN_SQRT_RATIO, MIN_TICK, MINT_TOPIC, Q96, SWAP_TOPIC,
+    V3PoolState, get_amount1_delta, get_sqrt_ratio_at_tick, get_tick_at_sqrt_ratio,
+)
+
+L = 10**24
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big', signed=value < 0)
+
+
+def test_tick_math_matches_contract_bounds_and_round_trips():
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_tick_at_sqrt_ratio(MAX_SQRT_RATIO - 1) == MAX_TICK - 1
+
+    rng = random.Random(7)
+    for tick in rng.sample(range(MIN_TICK, MAX_TICK), 300):
+        ratio = get_sqrt_ratio_at_tick(tick)
+        assert ratio / (math.sqrt(1.0001 ** tick) * Q96) == pytest.approx(1, rel=1e-9)
+        assert get_tick_at_sqrt_ratio(ratio) == tick
+        assert get_tick_at_sqrt_ratio(ratio - 1) == tick - 1
+
+
+def test_swap_inside_one_range_follows_the_curve():
+    state = V3PoolState.from_ticks(Q96, L, 3000, [(-600, L, L), (600, L, -L)])
+    amount_in = 10**20
+
+    consumed, out, sqrt_price, crossed = state.simulate_exact_input(amount_in, zero_for_one=True)
+    assert consumed == amount_in and crossed == 0
+
+    # 1/sqrtP' = 1/sqrtP + dx/L after the 0.3% fee
+    after_fee = amount_in * 997 // 1000
+    expected_sqrt = 1 / (1 + after_fee / L)
+    assert sqrt_price / Q96 == pytest.approx(expected_sqrt, rel=1e-12)
+    assert out == pytest.approx(L * (1 - expected_sqrt), rel=1e-12)
+    assert out < after_fee
+
+
+def test_swap_crosses_initialized_ticks():
+    # Two positions; the price sits where both are active
+    ticks = [(-600, L, L), (0, 2 * L, 2 * L), (600, L, -L), (1200, 2 * L, -2 * L)]
+    state = V3PoolState.from_ticks(get_sqrt_ratio_at_tick(300), 3 * L, 3000, ticks)
+
+    # Token1 in pushes the price up through tick 600, where liquidity drops to 2L
+    to_600 = get_amount1_delta(state.sqrt_price_x96, get_sqrt_ratio_at_tick(600), 3 * L, True)
+    gross = to_600 * 1000 // 997 + 10**21
+    consumed, out, sqrt_price, crossed = state.simulate_exact_input(gross, zero_for_one=False)
+    assert consumed == gross and crossed == 1
+    assert 600 < get_tick_at_sqrt_ratio(sqrt_price) < 1200
+
+    # Same result as swapping up to 600, then the rest from a pool resting there
+    first_in, first_out, _, _ = state.simulate_exact_input(gross, False, get_sqrt_ratio_at_tick(600))
+    above = V3PoolState.from_ticks(get_sqrt_ratio_at_tick(600), 2 * L, 3000, ticks, tick=600)
+    assert out == first_out + above.quote_exact_input(gross - first_in, False)
+
+    # Far more input than the ranges hold drains them and stops at the last tick
+    drained, _, _, crossed = state.simulate_exact_input(10**40, zero_for_one=False)
+    assert drained < 10**40 and crossed == 2
+
+
+def test_logs_update_ticks_and_liquidity():
+    pool = '0x' + '33' * 20
+    state = V3PoolState.from_ticks(Q96, L, 3000, [(-600, L, L), (600, L, -L)], address=pool)
+
+    def mint_log(block, lower, upper, amount, topic=MINT_TOPIC):
+        data = _word(amount) + _word(1) + _word(1) if topic == BURN_TOPIC else \
+            _word(0) + _word(amount) + _word(1) + _word(1)
+        return {'address': pool, 'blockNumber': block, 'logIndex': 0,
+                'topics': [topic, _word(0), _word(lower), _word(upper)], 'data': data}
+
+    assert state.apply_log(mint_log(10, -120, 120, L))
+    assert state.liquidity == 2 * L
+    assert state.ticks[-120] == [L, L] and state.ticks[120] == [L, -L]
+
+    # Replayed logs are ignored
+    assert not state.apply_log(mint_log(10, -120, 120, L))
+    assert state.liquidity == 2 * L
+
+    # Out-of-range positions add ticks but not active liquidity
+    assert state.apply_log(mint_log(11, 600, 1200, L))
+    assert state.liquidity == 2 * L and state.ticks[600] == [2 * L, 0]
+
+    assert state.apply_log(mint_log(12, -120, 120, L, topic=BURN_TOPIC))
+    assert state.liquidity == L and -120 not in state.ticks
+
+    sqrt_price = get_sqrt_ratio_at_tick(-30)
+    swap = {'address': pool, 'blockNumber': 13, 'logIndex': 2, 'topics': [SWAP_TOPIC, _word(0), _word(0)],
+            'data': _word(10**18) + _word(-10**18) + _word(sqrt_price) + _word(L) + _word(-30)}
+    assert state.apply_log(swap)
+    assert (state.sqrt_price_x96, state.tick, state.liquidity) == (sqrt_price, -30, L)
+
+
+def test_adapter_quotes_through_the_mirror():
+    pytest.importorskip("aiohttp")
+    from dex.uniswap_v3_adapter import UniswapV3Adapter
+
+    class FakeSubgraph:
+        def __init__(self):
+            self.calls = []
+
+        async def fetch(self, entity, arguments, fields):
+            self.calls.append(entity)
+            if entity == 'pools':
+                return [{
+                    'id': '0xPOOL', 'sqrtPrice': str(Q96), 'tick': '0', 'liquidity': str(L),
+                    'token0': {'symbol': 'WETH', 'decimals': '18'},
+                    'token1': {'symbol': 'DAI', 'decimals': '18'},
+                    'totalValueLockedUSD': '1000000', 'feeTier': '3000',
+                }]
+            return [{'tickIdx': '-600', 'liquidityGross': str(L), 'liquidityNet': str(L)},
+                    {'tickIdx': '600', 'liquidityGross': str(L), 'liquidityNet': str(-L)}]
+
+    adapter = UniswapV3Adapter({})
+    adapter.subgraph = FakeSubgraph()
+
+    async def run():
+        small = await adapter.get_quote('WETH', 'DAI', 1.0)
+        large = await adapter.get_quote('WETH', 'DAI', 1000.0)
+        return small, large
+
+    small, large = asyncio.run(run())
+    assert small['expected_output'] == pytest.approx(0.997, rel=1e-5)
+    assert large['expected_output'] < 1000 * 0.997
+    assert large['slippage_estimate'] > small['slippage_estimate']
+    # Ticks are loaded once and reused for later quotes
+    assert adapter.subgraph.calls == ['pools', 'ticks']
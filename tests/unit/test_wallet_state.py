@@ -0,0 +1,160 @@
+"""
+Unit tests for the event-driven wallet state service.
+
+Runs against an in-process EVM (eth-tester) with the WETH stand-in from
+tests/fixtures/execution and the Multicall3 stand-in from tests/fixtures/multicall.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Set up path for imports
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+pytest.importorskip("eth_tester")
+
+from web3 import Web3, EthereumTesterProvider
+
+from wallet.wallet_state import WalletStateService
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+CONTRACTS = {
+    **json.loads((FIXTURES / "execution" / "contracts.json").read_text()),
+    **json.loads((FIXTURES / "multicall" / "contracts.json").read_text()),
+}
+
+
+class CountingProvider(EthereumTesterProvider):
+    """eth-tester provider that records every RPC method called."""
+
+    def __init__(self):
+        super().__init__()
+        self.methods = []
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        return super().make_request(method, params)
+
+
+def _deploy(w3, name):
+    contract = w3.eth.contract(abi=CONTRACTS[name]["abi"], bytecode=CONTRACTS[name]["bytecode"])
+    receipt = w3.eth.wait_for_transaction_receipt(contract.constructor().transact({"from": w3.eth.accounts[0]}))
+    return w3.eth.contract(address=receipt.contractAddress, abi=CONTRACTS[name]["abi"])
+
+
+@pytest.fixture
+def wallet():
+    w3 = Web3(CountingProvider())
+    multicall = _deploy(w3, "Multicall3Standin")
+    weth = _deploy(w3, "WETHStandin")
+    owner = w3.eth.accounts[1]
+    weth.functions.deposit().transact({"from": owner, "value": 3 * 10**18})
+
+    service = WalletStateService(
+        {"arbitrum": w3}, owner, {"arbitrum": {"ETH": "0x" + "00" * 20, "WETH": weth.address}},
+        eth_price_source=lambda: 2000.0, multicall_address=multicall.address
+    )
+    service.refresh_eth_price(force=True)
+    service.load("arbitrum")
+    return w3, service, weth, owner
+
+
+def assert_matches_chain(w3, service, weth, owner):
+    snapshot = service.snapshot("arbitrum")
+    assert snapshot.block == w3.eth.block_number
+    assert snapshot.eth_balance == w3.eth.get_balance(owner) / 10**18
+    assert snapshot.token_balances["WETH"] == weth.functions.balanceOf(owner).call() / 10**18
+
+
+class TestWalletStateService:
+    """Test suite for WalletStateService."""
+
+    def test_load_values_wallet(self, wallet):
+        w3, service, weth, owner = wallet
+        snapshot = service.snapshot("arbitrum")
+
+        assert_matches_chain(w3, service, weth, owner)
+        assert snapshot.eth_price_usd == 2000.0
+        assert snapshot.balances_usd["WETH"] == 6000.0
+        assert snapshot.total_value_usd == (snapshot.eth_balance + 3) * 2000.0
+
+    def test_snapshot_makes_no_rpc_calls(self, wallet):
+        w3, service, weth, owner = wallet
+        requests_before = len(w3.provider.methods)
+
+        for _ in range(1000):
+            service.snapshot("arbitrum")
+
+        assert len(w3.provider.methods) == requests_before
+
+    def test_block_sync_applies_wallet_logs(self, wallet):
+        w3, service, weth, owner = wallet
+        other = w3.eth.accounts[2]
+
+        # Incoming transfer, outgoing transfer, unwrap, plain ETH receipt and unrelated activity
+        weth.functions.deposit().transact({"from": other, "value": 5 * 10**18})
+        weth.functions.transfer(owner, 2 * 10**18).transact({"from": other})
+        weth.functions.transfer(other, 10**18).transact({"from": owner})
+        weth.functions.withdraw(5 * 10**17).transact({"from": owner})
+        w3.eth.send_transaction({"from": other, "to": owner, "value": 10**17})
+        weth.functions.transfer(w3.eth.accounts[3], 10**18).transact({"from": other})
+
+        assert service.sync("arbitrum") is not None
+        assert_matches_chain(w3, service, weth, owner)
+        assert service.snapshot("arbitrum").token_balances["WETH"] == 3.5
+        assert service.sync("arbitrum") is None
+
+    def test_own_receipt_applies_immediately_once(self, wallet):
+        w3, service, weth, owner = wallet
+        transaction = {"from": owner, "value": 10**18}
+        tx_hash = weth.functions.deposit().transact(transaction)
+        receipt = w3.eth.get_transaction_receipt(tx_hash)
+
+        service.apply_receipt("arbitrum", receipt, transaction)
+        snapshot = service.snapshot("arbitrum")
+        assert snapshot.token_balances["WETH"] == 4.0
+        assert snapshot.eth_balance == w3.eth.get_balance(owner) / 10**18
+
+        # The block sync sees the same Deposit log and must not count it again
+        service.sync("arbitrum")
+        assert_matches_chain(w3, service, weth, owner)
+
+    def test_receipt_after_sync_is_not_charged_again(self, wallet):
+        w3, service, weth, owner = wallet
+        transaction = {"from": owner, "value": 10**18}
+        tx_hash = weth.functions.deposit().transact(transaction)
+
+        # The sync reads the balance at the receipt's block, gas and value included
+        service.sync("arbitrum")
+        service.apply_receipt("arbitrum", w3.eth.get_transaction_receipt(tx_hash), transaction)
+        assert_matches_chain(w3, service, weth, owner)
+        assert service.snapshot("arbitrum").token_balances["WETH"] == 4.0
+
+    def test_duplicate_receipt_is_applied_once(self, wallet):
+        w3, service, weth, owner = wallet
+        transaction = {"from": owner, "value": 10**18}
+        tx_hash = weth.functions.deposit().transact(transaction)
+        receipt = w3.eth.get_transaction_receipt(tx_hash)
+
+        service.apply_receipt("arbitrum", receipt, transaction)
+        service.apply_receipt("arbitrum", receipt, transaction)
+        snapshot = service.snapshot("arbitrum")
+        assert snapshot.token_balances["WETH"] == 4.0
+        assert snapshot.eth_balance == w3.eth.get_balance(owner) / 10**18
+
+        service.sync("arbitrum")
+        service.apply_receipt("arbitrum", receipt, transaction)
+        assert_matches_chain(w3, service, weth, owner)
+
+    def test_price_change_reprices_snapshot(self, wallet):
+        w3, service, weth, owner = wallet
+        service.set_eth_price(2500.0)
+
+        snapshot = service.snapshot("arbitrum")
+        assert snapshot.eth_price_usd == 2500.0
+        assert snapshot.balances_usd["WETH"] == 7500.0